@@ -1,15 +1,101 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS btree_gist;
 
+-- Monthly range partitions on start_time (see create_booking_partition). The primary key
+-- has to include the partition key; ids are still unique since they are random uuids.
 CREATE TABLE IF NOT EXISTS bookings (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL,
     classroom_id UUID NOT NULL,
     start_time timestamptz NOT NULL,
     end_time timestamptz NOT NULL,
     subject VARCHAR(255),
     status VARCHAR(30) NOT NULL,
-    created_at timestamptz DEFAULT now()
+    created_at timestamptz DEFAULT now(),
+    -- [start, end) as a range, so Postgres itself rejects overlapping CONFIRMED bookings
+    period tstzrange GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED,
+    CONSTRAINT bookings_valid_period CHECK (end_time > start_time),
+    PRIMARY KEY (id, start_time)
+) PARTITION BY RANGE (start_time);
+
+-- Overlap lookups of one room: start_time < :end AND end_time > :start
+CREATE INDEX IF NOT EXISTS idx_bookings_classroom_window ON bookings(classroom_id, status, start_time, end_time);
+CREATE INDEX IF NOT EXISTS idx_bookings_time ON bookings(start_time, end_time);
+
+-- Past partitions are moved here by booking-command (see below)
+CREATE TABLE IF NOT EXISTS bookings_archive (LIKE bookings INCLUDING DEFAULTS INCLUDING GENERATED)
+    PARTITION BY RANGE (start_time);
+
+-- One partition per UTC month. Postgres 15 cannot declare an exclusion constraint
+-- on a partitioned table, so every partition gets its own bookings_YYYY_MM_no_overlap.
+-- It cannot see rows of the neighbouring months: a booking crossing midnight into the
+-- next month is only caught by booking-command, which checks the room's bookings from
+-- every partition the window touches while holding the per-classroom lock.
+CREATE OR REPLACE FUNCTION create_booking_partition(month date) RETURNS text
+LANGUAGE plpgsql AS $$
+DECLARE
+    part text := format('bookings_%s', to_char(month, 'YYYY_MM'));
+    range_start timestamptz := date_trunc('month', month::timestamp) AT TIME ZONE 'UTC';
+    range_end timestamptz := (date_trunc('month', month::timestamp) + interval '1 month') AT TIME ZONE 'UTC';
+BEGIN
+    IF to_regclass(part) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF bookings FOR VALUES FROM (%L) TO (%L)', part, range_start, range_end);
+        EXECUTE format(
+            'ALTER TABLE %I ADD CONSTRAINT %I EXCLUDE USING gist (classroom_id WITH =, period WITH &&) WHERE (status = %L)',
+            part, part || '_no_overlap', 'CONFIRMED'
+        );
+    END IF;
+    RETURN part;
+END $$;
+
+-- Expired partitions are moved to bookings_archive by booking-command
+-- (src/infrastructure/partitions.py) with DETACH PARTITION ... CONCURRENTLY, which
+-- cannot run inside a function. A plain DETACH would lock all of bookings.
+
+-- Current month and the next 24; booking-command keeps extending the horizon
+SELECT create_booking_partition((date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => m))::date)
+FROM generate_series(0, 24) AS m;
+
+CREATE TABLE IF NOT EXISTS booking_series (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL,
+    classroom_id UUID NOT NULL,
+    subject VARCHAR(255),
+    start_time timestamptz NOT NULL,
+    end_time timestamptz NOT NULL,
+    frequency VARCHAR(10) NOT NULL CHECK (frequency IN ('DAILY', 'WEEKLY')),
+    repeat_interval SMALLINT NOT NULL DEFAULT 1 CHECK (repeat_interval >= 1),
+    by_weekday SMALLINT[] NOT NULL DEFAULT '{}',
+    until timestamptz,
+    occurrence_count INTEGER,
+    exdates DATE[] NOT NULL DEFAULT '{}',
+    utc_offset_minutes SMALLINT NOT NULL DEFAULT 0,
+    last_end_time timestamptz NOT NULL,
+    status VARCHAR(30) NOT NULL,
+    created_at timestamptz DEFAULT now(),
+    CHECK (until IS NOT NULL OR occurrence_count IS NOT NULL)
+);
+
+CREATE INDEX IF NOT EXISTS idx_booking_series_classroom_span
+    ON booking_series(classroom_id, start_time, last_end_time)
+    WHERE status = 'CONFIRMED';
+
+-- Transactional outbox: booking events written with the change, relayed to RabbitMQ by OutboxRelay
+CREATE TABLE IF NOT EXISTS outbox_events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(100) NOT NULL,
+    payload JSONB NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+
+-- Idempotency-Key dedupe for POST /bookings; rows older than IDEMPOTENCY_TTL_SECONDS are purged
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id UUID NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    response JSONB NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (user_id, key)
 );
 
-CREATE INDEX IF NOT EXISTS idx_bookings_classroom_id ON bookings(classroom_id);
-CREATE INDEX IF NOT EXISTS idx_bookings_time ON bookings(start_time, end_time);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at ON idempotency_keys(created_at);
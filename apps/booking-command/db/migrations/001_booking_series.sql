@@ -0,0 +1,27 @@
+-- Recurring booking series: one row per series, occurrences expanded on demand.
+-- Idempotent; safe to run on databases created before this table existed.
+-- Requires uuid-ossp (created by init.sql).
+
+CREATE TABLE IF NOT EXISTS booking_series (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL,
+    classroom_id UUID NOT NULL,
+    subject VARCHAR(255),
+    start_time timestamptz NOT NULL,
+    end_time timestamptz NOT NULL,
+    frequency VARCHAR(10) NOT NULL CHECK (frequency IN ('DAILY', 'WEEKLY')),
+    repeat_interval SMALLINT NOT NULL DEFAULT 1 CHECK (repeat_interval >= 1),
+    by_weekday SMALLINT[] NOT NULL DEFAULT '{}',
+    until timestamptz,
+    occurrence_count INTEGER,
+    exdates DATE[] NOT NULL DEFAULT '{}',
+    utc_offset_minutes SMALLINT NOT NULL DEFAULT 0,
+    last_end_time timestamptz NOT NULL,
+    status VARCHAR(30) NOT NULL,
+    created_at timestamptz DEFAULT now(),
+    CHECK (until IS NOT NULL OR occurrence_count IS NOT NULL)
+);
+
+CREATE INDEX IF NOT EXISTS idx_booking_series_classroom_span
+    ON booking_series(classroom_id, start_time, last_end_time)
+    WHERE status = 'CONFIRMED';
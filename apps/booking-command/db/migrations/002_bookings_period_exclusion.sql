@@ -0,0 +1,51 @@
+-- Overlap protection in the database: a tstzrange column per booking and an
+-- exclusion constraint so two CONFIRMED bookings of the same classroom can
+-- never overlap, whatever the application does.
+-- Idempotent; run inside a transaction:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -1 -f 002_bookings_period_exclusion.sql
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- Half-open [start, end), like the overlap check of the timetable engine.
+-- A STORED generated column is computed for every existing row when added (backfill).
+ALTER TABLE bookings
+    ADD COLUMN IF NOT EXISTS period tstzrange
+    GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED;
+
+DO $$
+DECLARE
+    invalid_rows bigint;
+    overlapping_pairs bigint;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'bookings_valid_period') THEN
+        SELECT count(*) INTO invalid_rows FROM bookings WHERE end_time <= start_time;
+        IF invalid_rows > 0 THEN
+            RAISE EXCEPTION 'bookings has % rows with end_time <= start_time; fix them before migrating', invalid_rows;
+        END IF;
+
+        ALTER TABLE bookings ADD CONSTRAINT bookings_valid_period CHECK (end_time > start_time);
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'bookings_no_overlap') THEN
+        -- Existing double bookings would make the constraint fail halfway: report them first
+        SELECT count(*) INTO overlapping_pairs
+        FROM bookings a
+        JOIN bookings b
+          ON a.classroom_id = b.classroom_id
+         AND a.id < b.id
+         AND a.period && b.period
+        WHERE a.status = 'CONFIRMED' AND b.status = 'CONFIRMED';
+
+        IF overlapping_pairs > 0 THEN
+            RAISE EXCEPTION 'bookings has % overlapping CONFIRMED pairs; cancel the duplicates before migrating '
+                            '(SELECT a.id, b.id FROM bookings a JOIN bookings b ON a.classroom_id = b.classroom_id '
+                            'AND a.id < b.id AND a.period && b.period WHERE a.status = ''CONFIRMED'' AND b.status = ''CONFIRMED'')',
+                            overlapping_pairs;
+        END IF;
+
+        ALTER TABLE bookings
+            ADD CONSTRAINT bookings_no_overlap
+            EXCLUDE USING gist (classroom_id WITH =, period WITH &&)
+            WHERE (status = 'CONFIRMED');
+    END IF;
+END $$;
@@ -0,0 +1,13 @@
+-- Composite index for the windowed overlap query of BookingService:
+--   WHERE classroom_id = :room AND status = 'CONFIRMED'
+--     AND start_time < :end AND end_time > :start
+-- end_time is part of the key so the second bound is checked on the index
+-- tuple, without visiting the heap. It also covers every lookup by
+-- classroom_id alone, so the old single-column index is dropped.
+-- CONCURRENTLY does not block writes but cannot run inside a transaction:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f 003_bookings_classroom_window_index.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bookings_classroom_window
+    ON bookings(classroom_id, status, start_time, end_time);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_bookings_classroom_id;
@@ -0,0 +1,12 @@
+-- Transactional outbox for booking events. BookingService writes one row per
+-- event in the same transaction as the booking change; OutboxRelay publishes
+-- them in id order with publisher confirms and deletes the confirmed rows.
+-- Idempotent:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -1 -f 004_outbox_events.sql
+
+CREATE TABLE IF NOT EXISTS outbox_events (
+    id BIGSERIAL PRIMARY KEY,
+    event_type VARCHAR(100) NOT NULL,
+    payload JSONB NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
@@ -0,0 +1,16 @@
+-- Idempotency-Key dedupe store for POST /bookings. One row per (user, key)
+-- holding the created booking; the janitor in booking-command deletes rows
+-- older than IDEMPOTENCY_TTL_SECONDS using idx_idempotency_keys_created_at.
+-- Idempotent:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -1 -f 005_idempotency_keys.sql
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id UUID NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    response JSONB NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (user_id, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at ON idempotency_keys(created_at);
@@ -0,0 +1,105 @@
+-- Monthly range partitioning of bookings on start_time, plus bookings_archive
+-- for partitions past the retention horizon (see src/infrastructure/partitions.py).
+-- Rewrites the table: stop booking-command writers while it runs.
+-- Idempotent (skipped when bookings is already partitioned); run inside a transaction:
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -1 -f 006_bookings_partitioning.sql
+
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'bookings'::regclass) = 'p' THEN
+        RAISE NOTICE 'bookings is already partitioned';
+        RETURN;
+    END IF;
+
+    -- Index names are per schema: move the old ones out of the way
+    ALTER TABLE bookings RENAME TO bookings_unpartitioned;
+    ALTER INDEX IF EXISTS bookings_pkey RENAME TO bookings_unpartitioned_pkey;
+    ALTER INDEX IF EXISTS idx_bookings_classroom_window RENAME TO idx_bookings_unpartitioned_classroom_window;
+    ALTER INDEX IF EXISTS idx_bookings_time RENAME TO idx_bookings_unpartitioned_time;
+
+    CREATE TABLE bookings (
+        id UUID NOT NULL DEFAULT uuid_generate_v4(),
+        user_id UUID NOT NULL,
+        classroom_id UUID NOT NULL,
+        start_time timestamptz NOT NULL,
+        end_time timestamptz NOT NULL,
+        subject VARCHAR(255),
+        status VARCHAR(30) NOT NULL,
+        created_at timestamptz DEFAULT now(),
+        period tstzrange GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED,
+        CONSTRAINT bookings_valid_period CHECK (end_time > start_time),
+        PRIMARY KEY (id, start_time)
+    ) PARTITION BY RANGE (start_time);
+
+    CREATE INDEX idx_bookings_classroom_window ON bookings(classroom_id, status, start_time, end_time);
+    CREATE INDEX idx_bookings_time ON bookings(start_time, end_time);
+END $$;
+
+CREATE TABLE IF NOT EXISTS bookings_archive (LIKE bookings INCLUDING DEFAULTS INCLUDING GENERATED)
+    PARTITION BY RANGE (start_time);
+
+-- One partition per UTC month. Postgres 15 cannot declare an exclusion constraint
+-- on a partitioned table, so every partition gets its own bookings_YYYY_MM_no_overlap.
+-- It cannot see rows of the neighbouring months: a booking crossing midnight into the
+-- next month is only caught by booking-command, which checks the room's bookings from
+-- every partition the window touches while holding the per-classroom lock.
+CREATE OR REPLACE FUNCTION create_booking_partition(month date) RETURNS text
+LANGUAGE plpgsql AS $$
+DECLARE
+    part text := format('bookings_%s', to_char(month, 'YYYY_MM'));
+    range_start timestamptz := date_trunc('month', month::timestamp) AT TIME ZONE 'UTC';
+    range_end timestamptz := (date_trunc('month', month::timestamp) + interval '1 month') AT TIME ZONE 'UTC';
+BEGIN
+    IF to_regclass(part) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF bookings FOR VALUES FROM (%L) TO (%L)', part, range_start, range_end);
+        EXECUTE format(
+            'ALTER TABLE %I ADD CONSTRAINT %I EXCLUDE USING gist (classroom_id WITH =, period WITH &&) WHERE (status = %L)',
+            part, part || '_no_overlap', 'CONFIRMED'
+        );
+    END IF;
+    RETURN part;
+END $$;
+
+-- Expired partitions are moved to bookings_archive by booking-command
+-- (src/infrastructure/partitions.py) with DETACH PARTITION ... CONCURRENTLY, which
+-- cannot run inside a function. A plain DETACH would lock all of bookings.
+DROP FUNCTION IF EXISTS archive_booking_partition(text);
+
+DO $$
+DECLARE
+    first_month date;
+    last_month date;
+    long_bookings bigint;
+BEGIN
+    IF to_regclass('bookings_unpartitioned') IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Conflict checks only look back BOOKING_MAX_DURATION_HOURS (24 by default) from the
+    -- candidate window so old partitions are pruned; longer live bookings would be missed
+    SELECT count(*) INTO long_bookings
+    FROM bookings_unpartitioned
+    WHERE status = 'CONFIRMED' AND end_time > now() AND end_time - start_time > interval '24 hours';
+    IF long_bookings > 0 THEN
+        RAISE NOTICE '% upcoming CONFIRMED bookings last more than 24 hours; raise BOOKING_MAX_DURATION_HOURS accordingly', long_bookings;
+    END IF;
+
+    SELECT date_trunc('month', min(start_time) AT TIME ZONE 'UTC')::date,
+           date_trunc('month', max(start_time) AT TIME ZONE 'UTC')::date
+    INTO first_month, last_month
+    FROM bookings_unpartitioned;
+    first_month := LEAST(coalesce(first_month, current_date), date_trunc('month', now() AT TIME ZONE 'UTC')::date);
+    last_month := GREATEST(coalesce(last_month, current_date), (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '24 months')::date);
+
+    -- From the oldest booking to the newest one or 24 months ahead, whichever is later,
+    -- so every existing row has a partition. No DEFAULT partition: it would rule out
+    -- DETACH PARTITION ... CONCURRENTLY when archiving
+    PERFORM create_booking_partition(month::date)
+    FROM generate_series(first_month::timestamp, last_month::timestamp, interval '1 month') AS month;
+
+    INSERT INTO bookings (id, user_id, classroom_id, start_time, end_time, subject, status, created_at)
+    SELECT id, user_id, classroom_id, start_time, end_time, subject, status, created_at
+    FROM bookings_unpartitioned;
+
+    DROP TABLE bookings_unpartitioned;
+END $$;
@@ -1,24 +1,38 @@
-from typing import Optional
+from typing import Literal, Optional
 import os
 from fastapi import Header
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field, model_validator
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime, time
 
-from src.infrastructure.database import get_db
-from src.infrastructure.gateways.classroom_gateway import HttpClassroomGateway
-from src.infrastructure.gateways.timetable_gateway import GrpcTimetableGateway
-from src.infrastructure.gateways.rabbitmq_gateway import RabbitMQGateway
-from src.domain.service import BookingService, ClassroomNotFoundError, ClassroomUnavailableError, ScheduleConflictError, BookingNotFoundError, BookingForbiddenError
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.infrastructure.database import SessionLocal, get_async_db, get_db
+from src.infrastructure.booking_export import export_item, iter_ndjson, keyset_page_query, offset_page_query
+from src.infrastructure.classroom_replica import AsyncReplicatedClassroomGateway, ReplicatedClassroomGateway
+from src.infrastructure.gateways.timetable_gateway import AsyncGrpcTimetableGateway, GrpcTimetableGateway
+from src.infrastructure.gateways.outbox_gateway import OutboxEventBus
+from src.infrastructure.idempotency_store import PostgresIdempotencyStore
+from src.infrastructure.hold_store import HOLD_MAX_TTL_SECONDS, HOLD_TTL_SECONDS, AsyncRedisHoldStore, RedisHoldStore
+from src.domain.async_service import AsyncBookingService
+from src.domain.service import BOOKING_MAX_DURATION, BULK_MAX_ITEMS, BookingService, BulkBookingItem, ClassroomNotFoundError, ClassroomUnavailableError, HoldNotFoundError, ScheduleConflictError, BookingNotFoundError, BookingForbiddenError
+from src.domain.recurrence import MAX_SERIES_OCCURRENCES
 from src.infrastructure.gateways.timetable_gateway import TimetableUnavailableError
+from src.domain.ports import HoldStoreUnavailableError, IdempotencyKeyReusedError
 from common.security import get_current_user, TokenData
 
 router = APIRouter()
 
 INTERNAL_API_KEY = os.getenv("INTERNAL_API_KEY", "")
 
+def _validate_period(start_time: datetime, end_time: datetime) -> None:
+    if end_time <= start_time:
+        raise ValueError("end_time must be greater than start_time")
+    if end_time - start_time > BOOKING_MAX_DURATION:
+        raise ValueError(f"a booking cannot last more than {BOOKING_MAX_DURATION}")
+
 class BookingCreateRequest(BaseModel):
     classroom_id: UUID
     start_time: datetime
@@ -27,8 +41,7 @@ class BookingCreateRequest(BaseModel):
 
     @model_validator(mode="after")
     def validate_times(self):
-        if self.end_time <= self.start_time:
-            raise ValueError("end_time must be greater than start_time")
+        _validate_period(self.start_time, self.end_time)
         return self
 
 class BookingResponse(BaseModel):
@@ -36,6 +49,16 @@ class BookingResponse(BaseModel):
     status: str
     message: str
 
+def _async_booking_service(db: AsyncSession) -> AsyncBookingService:
+    return AsyncBookingService(
+        db=db,
+        classroom_gateway=AsyncReplicatedClassroomGateway(),
+        timetable_gateway=AsyncGrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+        idempotency_store=PostgresIdempotencyStore(db),
+        hold_store=AsyncRedisHoldStore(),
+    )
+
 @router.post("/",
              response_model=BookingResponse,
              status_code=status.HTTP_201_CREATED,
@@ -45,28 +68,30 @@ class BookingResponse(BaseModel):
                  201: {"description": "Booking created successfully."},
                  401: {"description": "Unauthorized."},
                  404: {"description": "Classroom not found."},
-                 409: {"description": "Classroom unavailable or schedule conflict."},
-                 422: {"description": "Validation error."},
+                 409: {"description": "Classroom unavailable, slot held by another user, or schedule conflict."},
+                 422: {"description": "Validation error, or Idempotency-Key reused with a different request."},
                  503: {"description": "Timetable service unavailable."},})
-def create_booking(
+async def create_booking(
     request: BookingCreateRequest,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenData = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(
+        default=None,
+        min_length=1,
+        max_length=255,
+        description="Retries with the same key return the original booking instead of creating another.",
+    ),
 ):
-    service = BookingService(
-        db=db,
-        classroom_gateway=HttpClassroomGateway(),
-        timetable_gateway=GrpcTimetableGateway(),
-        event_bus=RabbitMQGateway(),
-    )
+    service = _async_booking_service(db)
 
     try:
-        booking = service.create_booking(
+        booking = await service.create_booking(
             user_id=UUID(current_user.user_id),
             classroom_id=request.classroom_id,
             start_time=request.start_time,
             end_time=request.end_time,
             subject=request.subject,
+            idempotency_key=idempotency_key,
         )
         return BookingResponse(
             id=booking.id,
@@ -74,6 +99,9 @@ def create_booking(
             message="Booking created successfully"
         )
 
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
     except ClassroomNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -93,6 +121,603 @@ def create_booking(
         print(f"[booking-command] Internal error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+class HoldCreateRequest(BaseModel):
+    classroom_id: UUID
+    start_time: datetime
+    end_time: datetime
+    ttl_seconds: int = Field(HOLD_TTL_SECONDS, ge=1, le=HOLD_MAX_TTL_SECONDS, description="Seconds the slot stays held")
+
+    @model_validator(mode="after")
+    def validate_times(self):
+        _validate_period(self.start_time, self.end_time)
+        return self
+
+class HoldConfirmRequest(BaseModel):
+    subject: str = Field(..., min_length=2, max_length=255, description="Materia o motivo de la reserva")
+
+class HoldResponse(BaseModel):
+    hold_id: UUID
+    classroom_id: UUID
+    start_time: datetime
+    end_time: datetime
+    expires_at: datetime
+
+@router.post("/holds",
+             response_model=HoldResponse,
+             status_code=status.HTTP_201_CREATED,
+             summary="Hold a slot",
+             description="Reserve a slot for a few seconds while the user completes the booking. "
+                         "Confirm it to book the slot; otherwise it expires on its own.",
+             responses={
+                 201: {"description": "Slot held."},
+                 401: {"description": "Unauthorized."},
+                 404: {"description": "Classroom not found."},
+                 409: {"description": "Slot already held or booked, or classroom unavailable."},
+                 422: {"description": "Validation error."},
+                 503: {"description": "Hold store unavailable."},})
+async def place_hold(
+    request: HoldCreateRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    service = _async_booking_service(db)
+
+    try:
+        hold = await service.place_hold(
+            user_id=UUID(current_user.user_id),
+            classroom_id=request.classroom_id,
+            start_time=request.start_time,
+            end_time=request.end_time,
+            ttl_seconds=request.ttl_seconds,
+        )
+        return HoldResponse(
+            hold_id=hold.hold_id,
+            classroom_id=hold.classroom_id,
+            start_time=hold.start_time,
+            end_time=hold.end_time,
+            expires_at=hold.expires_at,
+        )
+
+    except ClassroomNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except (ClassroomUnavailableError, ScheduleConflictError) as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    except HoldStoreUnavailableError as e:
+        raise HTTPException(status_code=503, detail="Hold store no está disponible: " + str(e))
+
+    except Exception as e:
+        print(f"[booking-command] Internal error (hold): {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/holds/{hold_id}/confirm",
+             response_model=BookingResponse,
+             status_code=status.HTTP_201_CREATED,
+             summary="Confirm a hold",
+             description="Turn a held slot into a booking. Retrying a confirm returns the same booking.",
+             responses={
+                 201: {"description": "Booking created successfully."},
+                 401: {"description": "Unauthorized."},
+                 404: {"description": "Hold not found or expired, or classroom not found."},
+                 409: {"description": "Classroom unavailable or schedule conflict."},
+                 422: {"description": "Validation error, or confirm retried with another subject."},
+                 503: {"description": "Hold store or timetable service unavailable."},})
+async def confirm_hold(
+    hold_id: UUID,
+    request: HoldConfirmRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    service = _async_booking_service(db)
+
+    try:
+        booking = await service.confirm_hold(str(hold_id), UUID(current_user.user_id), subject=request.subject)
+        return BookingResponse(
+            id=booking.id,
+            status=booking.status,
+            message="Booking created successfully"
+        )
+
+    except (HoldNotFoundError, ClassroomNotFoundError) as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except (ClassroomUnavailableError, ScheduleConflictError) as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    except (IdempotencyKeyReusedError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    except HoldStoreUnavailableError as e:
+        raise HTTPException(status_code=503, detail="Hold store no está disponible: " + str(e))
+
+    except TimetableUnavailableError as e:
+        raise HTTPException(status_code=503, detail="Timetable service no está disponible"+ str(e))
+
+    except Exception as e:
+        print(f"[booking-command] Internal error (confirm hold): {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.delete("/holds/{hold_id}",
+               status_code=status.HTTP_204_NO_CONTENT,
+               summary="Release a hold",
+               description="Give a held slot back before it expires.",
+               responses={
+                   204: {"description": "Hold released."},
+                   401: {"description": "Unauthorized."},
+                   404: {"description": "Hold not found or expired."},
+                   503: {"description": "Hold store unavailable."},})
+async def release_hold(
+    hold_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    service = _async_booking_service(db)
+
+    try:
+        await service.release_hold(str(hold_id), UUID(current_user.user_id))
+
+    except HoldNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except HoldStoreUnavailableError as e:
+        raise HTTPException(status_code=503, detail="Hold store no está disponible: " + str(e))
+
+class BulkBookingCreateRequest(BaseModel):
+    items: list[BookingCreateRequest] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkBookingCancelRequest(BaseModel):
+    booking_ids: list[UUID] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkItemResponse(BaseModel):
+    index: int
+    status: str
+    booking_id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    total: int
+    succeeded: int
+    results: list[BulkItemResponse]
+
+def _bulk_response(results, success_status: str) -> BulkResponse:
+    return BulkResponse(
+        total=len(results),
+        succeeded=sum(1 for r in results if r.status == success_status),
+        results=[BulkItemResponse(**r._asdict()) for r in results],
+    )
+
+@router.post("/bulk",
+             response_model=BulkResponse,
+             status_code=status.HTTP_200_OK,
+             summary="Create many bookings at once",
+             description="Items are grouped by classroom and checked against existing occupancy and against each other in one pass. Bookable items are stored in a single transaction; the result of every item is reported at its position.",
+             responses={
+                 200: {"description": "Per-item results."},
+                 401: {"description": "Unauthorized."},
+                 409: {"description": "Schedule conflict detected by the database; nothing was stored."},
+                 422: {"description": "Validation error."},
+                 503: {"description": "Timetable service unavailable."},})
+def create_bookings_bulk(
+    request: BulkBookingCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+):
+    service = BookingService(
+        db=db,
+        classroom_gateway=ReplicatedClassroomGateway(),
+        timetable_gateway=GrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+        hold_store=RedisHoldStore(),
+    )
+
+    try:
+        results = service.create_bookings_bulk(
+            user_id=UUID(current_user.user_id),
+            items=[BulkBookingItem(i.classroom_id, i.start_time, i.end_time, i.subject) for i in request.items],
+        )
+        return _bulk_response(results, "CREATED")
+
+    except ScheduleConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    except TimetableUnavailableError as e:
+        raise HTTPException(status_code=503, detail="Timetable service no está disponible"+ str(e))
+
+    except Exception as e:
+        print(f"[booking-command] Internal error (bulk create): {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/bulk/cancel",
+             response_model=BulkResponse,
+             status_code=status.HTTP_200_OK,
+             summary="Cancel many bookings at once",
+             description="Cancels every booking the caller may cancel in a single transaction and reports the result of each id at its position.",
+             responses={
+                 200: {"description": "Per-item results."},
+                 401: {"description": "Unauthorized."},
+                 422: {"description": "Validation error."},})
+def cancel_bookings_bulk(
+    request: BulkBookingCancelRequest,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+):
+    service = BookingService(
+        db=db,
+        classroom_gateway=ReplicatedClassroomGateway(),
+        timetable_gateway=GrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+    )
+
+    try:
+        results = service.cancel_bookings_bulk(
+            request.booking_ids,
+            UUID(current_user.user_id),
+            requester_role=current_user.role,
+        )
+        return _bulk_response(results, "CANCELLED")
+
+    except Exception as e:
+        print(f"[booking-command] Internal error (bulk cancel): {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+class FreeSlot(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+class FreeSlotsResponse(BaseModel):
+    classroom_id: UUID
+    total: int
+    slots: list[FreeSlot]
+
+@router.get("/free-slots",
+            response_model=FreeSlotsResponse,
+            status_code=status.HTTP_200_OK,
+            summary="Find free slots of a classroom",
+            description="Free time of a classroom inside a window, optionally split into slots aligned to a granularity and restricted to daily opening hours.",
+            responses={
+                200: {"description": "Free slots returned."},
+                401: {"description": "Unauthorized."},
+                422: {"description": "Validation error."},
+                503: {"description": "Timetable service unavailable."},})
+def find_free_slots(
+    classroom_id: UUID,
+    start: datetime,
+    end: datetime,
+    duration_minutes: int,
+    granularity_minutes: int = 0,
+    open_time: Optional[time] = None,
+    close_time: Optional[time] = None,
+    utc_offset_minutes: int = 0,
+    max_results: int = 200,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    # Guardrails
+    max_results = max(1, min(max_results, 1000))
+    granularity_minutes = max(0, granularity_minutes)
+
+    opening_hours = None
+    if open_time is not None and close_time is not None:
+        open_minute = open_time.hour * 60 + open_time.minute
+        close_minute = close_time.hour * 60 + close_time.minute
+        opening_hours = [(weekday, open_minute, close_minute) for weekday in range(7)]
+
+    service = BookingService(
+        db=db,
+        classroom_gateway=ReplicatedClassroomGateway(),
+        timetable_gateway=GrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+    )
+
+    try:
+        slots = service.find_free_slots(
+            classroom_id,
+            start,
+            end,
+            duration_minutes,
+            granularity_minutes=granularity_minutes,
+            opening_hours=opening_hours,
+            utc_offset_minutes=utc_offset_minutes,
+            max_results=max_results,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except TimetableUnavailableError as e:
+        raise HTTPException(status_code=503, detail="Timetable service no está disponible"+ str(e))
+
+    return FreeSlotsResponse(
+        classroom_id=classroom_id,
+        total=len(slots),
+        slots=[FreeSlot(start_time=s, end_time=e) for s, e in slots],
+    )
+
+class AvailableClassroom(BaseModel):
+    classroom_id: UUID
+    code: str
+    capacity: int
+    location_details: Optional[str] = None
+    is_operational: bool
+
+class AvailableClassroomsResponse(BaseModel):
+    total: int
+    items: list[AvailableClassroom]
+
+@router.get("/available-classrooms",
+            response_model=AvailableClassroomsResponse,
+            status_code=status.HTTP_200_OK,
+            summary="Search free classrooms",
+            description="Classrooms free for the whole window with at least the requested capacity, smallest fitting room first.",
+            responses={
+                200: {"description": "Free classrooms returned."},
+                401: {"description": "Unauthorized."},
+                422: {"description": "Validation error."},
+                503: {"description": "Timetable service unavailable."},})
+def search_available_classrooms(
+    start: datetime,
+    end: datetime,
+    min_capacity: int = 0,
+    include_non_operational: bool = False,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    # Guardrails
+    limit = max(1, min(limit, 500))
+
+    service = BookingService(
+        db=db,
+        classroom_gateway=ReplicatedClassroomGateway(),
+        timetable_gateway=GrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+    )
+
+    try:
+        items = service.search_available_classrooms(
+            start,
+            end,
+            min_capacity=min_capacity,
+            include_non_operational=include_non_operational,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except TimetableUnavailableError as e:
+        raise HTTPException(status_code=503, detail="Timetable service no está disponible"+ str(e))
+
+    return {"total": len(items), "items": items}
+
+class BookingSeriesCreateRequest(BaseModel):
+    classroom_id: UUID
+    start_time: datetime = Field(..., description="Start of the first occurrence")
+    end_time: datetime = Field(..., description="End of the first occurrence")
+    subject: str = Field(..., min_length=2, max_length=255, description="Materia o motivo de la reserva")
+    frequency: Literal["DAILY", "WEEKLY"] = "WEEKLY"
+    interval: int = Field(1, ge=1, le=52, description="Repeat every N days/weeks")
+    by_weekday: list[int] = Field(default_factory=list, description="Local weekdays, 0 = Monday ... 6 = Sunday")
+    until: Optional[datetime] = Field(None, description="No occurrence starts after this instant")
+    count: Optional[int] = Field(None, ge=1, le=MAX_SERIES_OCCURRENCES, description="Number of occurrences")
+    exceptions: list[date] = Field(default_factory=list, description="Local dates to skip")
+    utc_offset_minutes: int = Field(0, ge=-720, le=840, description="Local time offset used for weekdays and exceptions")
+
+    @model_validator(mode="after")
+    def validate_rule(self):
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be greater than start_time")
+        if self.until is None and self.count is None:
+            raise ValueError("until or count is required")
+        return self
+
+class SeriesOccurrence(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+class BookingSeriesResponse(BaseModel):
+    id: UUID
+    status: str
+    message: str
+    total_occurrences: int
+    occurrences: list[SeriesOccurrence]
+
+@router.post("/series",
+             response_model=BookingSeriesResponse,
+             status_code=status.HTTP_201_CREATED,
+             summary="Create a recurring booking series",
+             description="Book a classroom on a daily or weekly pattern. All occurrences are checked at once and the series is stored only if none conflicts.",
+             responses={
+                 201: {"description": "Series created successfully."},
+                 401: {"description": "Unauthorized."},
+                 404: {"description": "Classroom not found."},
+                 409: {"description": "Classroom unavailable or schedule conflict."},
+                 422: {"description": "Validation error."},
+                 503: {"description": "Timetable service unavailable."},})
+def create_series(
+    request: BookingSeriesCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+):
+    service = BookingService(
+        db=db,
+        classroom_gateway=ReplicatedClassroomGateway(),
+        timetable_gateway=GrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+        hold_store=RedisHoldStore(),
+    )
+
+    try:
+        series, occurrences = service.create_series(
+            user_id=UUID(current_user.user_id),
+            classroom_id=request.classroom_id,
+            start_time=request.start_time,
+            end_time=request.end_time,
+            frequency=request.frequency,
+            interval=request.interval,
+            by_weekday=request.by_weekday,
+            until=request.until,
+            count=request.count,
+            exceptions=request.exceptions,
+            utc_offset_minutes=request.utc_offset_minutes,
+            subject=request.subject,
+        )
+        return BookingSeriesResponse(
+            id=series.id,
+            status=series.status,
+            message="Booking series created successfully",
+            total_occurrences=len(occurrences),
+            occurrences=[SeriesOccurrence(start_time=s, end_time=e) for s, e in occurrences],
+        )
+
+    except ClassroomNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except (ClassroomUnavailableError, ScheduleConflictError) as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    except TimetableUnavailableError as e:
+        raise HTTPException(status_code=503, detail="Timetable service no está disponible"+ str(e))
+
+    except Exception as e:
+        print(f"[booking-command] Internal error (series): {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+class SeriesOccurrencesResponse(BaseModel):
+    series_id: UUID
+    status: str
+    total: int
+    occurrences: list[SeriesOccurrence]
+
+@router.get("/series/{series_id}/occurrences",
+            response_model=SeriesOccurrencesResponse,
+            status_code=status.HTTP_200_OK,
+            summary="List occurrences of a series",
+            description="Occurrences expanded from the series rule, optionally limited to a window.",
+            responses={
+                200: {"description": "Occurrences returned."},
+                401: {"description": "Unauthorized."},
+                403: {"description": "Forbidden."},
+                404: {"description": "Series not found."},})
+def list_series_occurrences(
+    series_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    service = BookingService(
+        db=db,
+        classroom_gateway=ReplicatedClassroomGateway(),
+        timetable_gateway=GrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+    )
+
+    try:
+        series, occurrences = service.list_series_occurrences(
+            series_id,
+            requester_user_id=UUID(current_user.user_id),
+            requester_role=current_user.role,
+            window_start=start,
+            window_end=end,
+        )
+    except BookingNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except BookingForbiddenError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    return SeriesOccurrencesResponse(
+        series_id=series.id,
+        status=series.status,
+        total=len(occurrences),
+        occurrences=[SeriesOccurrence(start_time=s, end_time=e) for s, e in occurrences],
+    )
+
+@router.delete("/series/{series_id}",
+               response_model=BookingResponse,
+               status_code=status.HTTP_200_OK,
+               summary="Cancel a booking series",
+               description="Cancel every occurrence of a series.",
+               responses={
+                   200: {"description": "Series canceled successfully."},
+                   401: {"description": "Unauthorized."},
+                   403: {"description": "Forbidden."},
+                   404: {"description": "Series not found."},})
+def cancel_series(
+    series_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    service = BookingService(
+        db=db,
+        classroom_gateway=ReplicatedClassroomGateway(),
+        timetable_gateway=GrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+    )
+
+    try:
+        series = service.cancel_series(
+            series_id,
+            requester_user_id=UUID(current_user.user_id),
+            requester_role=current_user.role,
+        )
+        return BookingResponse(id=series.id, status=series.status, message="Booking series canceled successfully")
+
+    except BookingNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except BookingForbiddenError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    except Exception as e:
+        print(f"[booking-command] Internal error (cancel series): {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.delete("/series/{series_id}/occurrences/{occurrence_date}",
+               response_model=BookingResponse,
+               status_code=status.HTTP_200_OK,
+               summary="Cancel one occurrence of a series",
+               description="Add the local date as an exception of the series.",
+               responses={
+                   200: {"description": "Occurrence canceled successfully."},
+                   401: {"description": "Unauthorized."},
+                   403: {"description": "Forbidden."},
+                   404: {"description": "Series or occurrence not found."},})
+def cancel_series_occurrence(
+    series_id: UUID,
+    occurrence_date: date,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    service = BookingService(
+        db=db,
+        classroom_gateway=ReplicatedClassroomGateway(),
+        timetable_gateway=GrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
+    )
+
+    try:
+        service.cancel_series_occurrence(
+            series_id,
+            occurrence_date,
+            requester_user_id=UUID(current_user.user_id),
+            requester_role=current_user.role,
+        )
+        return BookingResponse(id=series_id, status="CANCELLED", message="Occurrence canceled successfully")
+
+    except BookingNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    except BookingForbiddenError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    except Exception as e:
+        print(f"[booking-command] Internal error (cancel occurrence): {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.delete("/{booking_id}",
                response_model=BookingResponse,
                status_code=status.HTTP_200_OK,
@@ -104,21 +729,21 @@ def create_booking(
                    403: {"description": "Forbidden."},
                    404: {"description": "Booking not found."},
                    422: {"description": "Validation error."},})
-def cancel_booking(
+async def cancel_booking(
     booking_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TokenData = Depends(get_current_user),
 ):
     
-    service = BookingService(
+    service = AsyncBookingService(
         db=db,
-        classroom_gateway=HttpClassroomGateway(),
-        timetable_gateway=GrpcTimetableGateway(),
-        event_bus=RabbitMQGateway(),
+        classroom_gateway=AsyncReplicatedClassroomGateway(),
+        timetable_gateway=AsyncGrpcTimetableGateway(),
+        event_bus=OutboxEventBus(db),
     )
 
     try:
-        booking = service.cancel_booking(
+        booking = await service.cancel_booking(
             booking_id=booking_id,
             requester_user_id=UUID(current_user.user_id),
             requester_role=current_user.role,
@@ -150,44 +775,89 @@ def _require_internal_key(x_internal_api_key: Optional[str]):
 @router.get("/internal/bookings",
             tags=["internal"],
             summary="List all bookings (internal use only)",
-            description="Retrieve a list of all bookings. This endpoint is for internal use only.",
+            description="Retrieve a page of bookings ordered by id. Pass the returned `next_cursor` as `after` to get the next page. This endpoint is for internal use only.",
             responses={
                 200: {"description": "List of bookings retrieved successfully."},
                 401: {"description": "Unauthorized."},
+                422: {"description": "Both `offset` and `after` were sent."},
             })
 def internal_list_bookings(
-    limit: int = 1000,
-    offset: int = 0,
+    response: Response,
+    limit: int = Query(default=1000, ge=1, le=10000),
+    after: Optional[UUID] = None,
+    offset: Optional[int] = Query(
+        default=None,
+        ge=0,
+        deprecated=True,
+        description="Deprecated: pages by start_time DESC with OFFSET, as before. Use `after` with the returned `next_cursor`.",
+    ),
+    booking_status: Optional[str] = Query(default=None, alias="status"),
     db: Session = Depends(get_db),
     x_internal_api_key: Optional[str] = Header(default=None),
 ):
     _require_internal_key(x_internal_api_key)
 
-    # Ajusta la referencia al modelo Booking según tu proyecto
-    from src.domain.models import Booking
+    if offset is not None:
+        if after is not None:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Use either `after` or the deprecated `offset`, not both")
+        # Existing offset callers keep their pages; keyset callers never take this path
+        response.headers["Deprecation"] = "true"
+        rows = db.execute(offset_page_query(offset, limit, booking_status)).all()
+        items = [export_item(row) for row in rows]
+        return {"total": len(items), "items": items, "next_cursor": None}
 
-    rows = (
-        db.query(Booking)
-        .order_by(Booking.created_at.desc() if hasattr(Booking, "created_at") else Booking.start_time.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
+    rows = db.execute(keyset_page_query(after, limit, booking_status)).all()
+    items = [export_item(row) for row in rows]
+    next_cursor = items[-1]["booking_id"] if len(items) == limit else None
+
+    return {"total": len(items), "items": items, "next_cursor": next_cursor}
+
+
+@router.get("/internal/bookings/export",
+            tags=["internal"],
+            summary="Stream all bookings as NDJSON (internal use only)",
+            description="Every booking in a single response, one JSON document per line, read from a server-side cursor. Used by read models and the timetable engine to rehydrate.",
+            response_class=StreamingResponse,
+            responses={
+                200: {"description": "NDJSON stream of bookings.", "content": {"application/x-ndjson": {}}},
+                401: {"description": "Unauthorized."},
+            })
+def internal_export_bookings(
+    booking_status: Optional[str] = Query(default=None, alias="status"),
+    x_internal_api_key: Optional[str] = Header(default=None),
+):
+    _require_internal_key(x_internal_api_key)
+
+    return StreamingResponse(iter_ndjson(SessionLocal, booking_status), media_type="application/x-ndjson")
+
+
+@router.get("/internal/series",
+            tags=["internal"],
+            summary="List active booking series (internal use only)",
+            description="Active series with their expanded occurrences, used to warm up the timetable engine index. Ordered by id; pass the returned `next_cursor` as `after` to get the next page.",
+            responses={
+                200: {"description": "List of series retrieved successfully."},
+                401: {"description": "Unauthorized."},
+            })
+def internal_list_series(
+    limit: int = Query(default=100, ge=1, le=1000),
+    after: Optional[UUID] = None,
+    db: Session = Depends(get_db),
+    x_internal_api_key: Optional[str] = Header(default=None),
+):
+    _require_internal_key(x_internal_api_key)
+
+    from src.domain.models import BookingSeries
+    from src.domain.recurrence import iter_occurrences
+    from src.domain.service import series_event_payload
+
+    # Keyset on the primary key, like /internal/bookings: every page walks the pk index from the cursor
+    query = db.query(BookingSeries).filter(BookingSeries.status == "CONFIRMED")
+    if after is not None:
+        query = query.filter(BookingSeries.id > after)
+    rows = query.order_by(BookingSeries.id).limit(limit).all()
+
+    items = [series_event_payload(series, iter_occurrences(series.rule())) for series in rows]
+    next_cursor = items[-1]["series_id"] if len(items) == limit else None
 
-    items = []
-    for b in rows:
-        items.append(
-            {
-                "booking_id": str(b.id),
-                "user_id": str(b.user_id),
-                "classroom_id": str(b.classroom_id),
-                "status": b.status,
-                "start_time": b.start_time.isoformat() if b.start_time else None,
-                "end_time": b.end_time.isoformat() if b.end_time else None,
-                "subject": getattr(b, "subject", None),
-                # opcional
-                "created_at": b.created_at.isoformat() if getattr(b, "created_at", None) else None,
-            }
-        )
-
-    return {"total": len(items), "items": items}
\ No newline at end of file
+    return {"total": len(items), "items": items, "next_cursor": next_cursor}
@@ -0,0 +1,362 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.models import Booking, BookingSeries
+from src.domain.ports import (
+    AsyncClassroomGateway,
+    AsyncTimetableGateway,
+    EventBusGateway,
+    AsyncHoldStore,
+    HoldStoreUnavailableError,
+    IdempotencyStore,
+    SlotHold,
+    TimetableUnavailableError,
+)
+from src.domain.recurrence import as_utc, iter_occurrences
+from src.metrics.latency import timed
+from src.domain.service import (
+    BOOKING_LOCK_NAMESPACE,
+    BOOKING_MAX_DURATION,
+    TIMETABLE_CHECK_MODE,
+    BookingForbiddenError,
+    BookingNotFoundError,
+    ClassroomNotFoundError,
+    ClassroomUnavailableError,
+    HELD_SLOT_MESSAGE,
+    HoldNotFoundError,
+    ScheduleConflictError,
+    booking_event_payload,
+    classroom_lock_key,
+    conflict_flags,
+    is_missing_partition,
+    is_overlap_violation,
+)
+
+def request_fingerprint(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+def booking_from_payload(payload: Dict[str, Any]) -> Booking:
+    """Detached Booking rebuilt from booking_event_payload, as it was when created."""
+    return Booking(
+        id=UUID(payload["booking_id"]),
+        user_id=UUID(payload["user_id"]),
+        classroom_id=UUID(payload["classroom_id"]),
+        status=payload["status"],
+        start_time=datetime.fromisoformat(payload["start_time"]),
+        end_time=datetime.fromisoformat(payload["end_time"]),
+        subject=payload.get("subject"),
+    )
+
+class AsyncBookingService:
+    """
+    BookingService.create_booking / cancel_booking on the async stack.
+
+    Same rules, lock and events as the sync service; the difference is that
+    nothing blocks a worker thread and independent I/O runs concurrently:
+    the classroom lookup overlaps the locked availability check, and the
+    engine call overlaps the series query.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        classroom_gateway: AsyncClassroomGateway,
+        timetable_gateway: AsyncTimetableGateway,
+        event_bus: EventBusGateway,
+        timetable_check_mode: str = TIMETABLE_CHECK_MODE,
+        idempotency_store: Optional[IdempotencyStore] = None,
+        hold_store: Optional[AsyncHoldStore] = None,
+    ):
+        self.db = db
+        self.classroom_gw = classroom_gateway
+        self.timetable_gw = timetable_gateway
+        self.event_bus = event_bus
+        self.timetable_check_mode = timetable_check_mode
+        self.idempotency = idempotency_store
+        self.holds = hold_store
+
+    async def _ensure_bookable(self, classroom_id: UUID) -> None:
+        with timed("classroom"):
+            classroom = await self.classroom_gw.get_classroom(classroom_id)
+
+        if classroom is None:
+            raise ClassroomNotFoundError("Aula no encontrada")
+
+        if classroom.get("is_operational") is False:
+            raise ClassroomUnavailableError("Aula no disponible para reservas")
+
+    async def _bookings_in_window(self, classroom_id: UUID, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+        with timed("bookings_query"):
+            result = await self.db.execute(
+                select(Booking.start_time, Booking.end_time).where(
+                    Booking.classroom_id == classroom_id,
+                    Booking.status == "CONFIRMED",
+                    Booking.start_time < window_end,
+                    Booking.end_time > window_start,
+                    Booking.start_time > window_start - BOOKING_MAX_DURATION,
+                )
+            )
+        return [(start, end) for start, end in result.all()]
+
+    async def _series_busy(self, classroom_id: UUID, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+        window_start, window_end = as_utc(window_start), as_utc(window_end)
+        with timed("series_query"):
+            result = await self.db.execute(
+                select(BookingSeries).where(
+                    BookingSeries.classroom_id == classroom_id,
+                    BookingSeries.status == "CONFIRMED",
+                    BookingSeries.start_time < window_end,
+                    BookingSeries.last_end_time > window_start,
+                )
+            )
+        busy: List[Tuple[datetime, datetime]] = []
+        for series in result.scalars().all():
+            busy.extend(iter_occurrences(series.rule(), window_start, window_end))
+        return busy
+
+    async def _occupancy(self, classroom_id: UUID, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        # One session: the two queries run one after the other
+        existing = await self._bookings_in_window(classroom_id, start_time, end_time)
+        return existing + await self._series_busy(classroom_id, start_time, end_time)
+
+    async def _engine_index_check(self, classroom_id: UUID, start_time: datetime, end_time: datetime) -> Optional[bool]:
+        with timed("timetable"):
+            return await self.timetable_gw.check_classroom_availability(classroom_id, start_time, end_time)
+
+    async def _locked_availability(self, user_id: UUID, classroom_id: UUID, start_time: datetime, end_time: datetime) -> bool:
+        # Same per-classroom advisory lock as BookingService, held until commit/rollback
+        with timed("lock"):
+            await self.db.execute(
+                text("SELECT pg_advisory_xact_lock(:namespace, :key)"),
+                {"namespace": BOOKING_LOCK_NAMESPACE, "key": classroom_lock_key(classroom_id)},
+            )
+
+        # Neither Redis nor the engine touch the session, so they overlap the occupancy queries
+        checks = [
+            self._occupancy(classroom_id, start_time, end_time),
+            self._ensure_not_held(user_id, classroom_id, start_time, end_time),
+        ]
+        if self.timetable_check_mode != "off":
+            checks.append(self._engine_index_check(classroom_id, start_time, end_time))
+        existing, held, *engine = await asyncio.gather(*checks, return_exceptions=True)
+        for outcome in (existing, held):
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+        if self.timetable_check_mode == "off":
+            return not conflict_flags([(start_time, end_time)], existing)[0]
+
+        is_available = engine[0]
+
+        try:
+            if isinstance(is_available, BaseException):
+                raise is_available
+            if is_available is None:
+                # Index not ready: full check with only the bookings that can overlap
+                with timed("timetable"):
+                    is_available = await self.timetable_gw.check_availability(start_time, end_time, existing)
+        except TimetableUnavailableError:
+            if self.timetable_check_mode == "required":
+                raise
+            print("[booking-command] Timetable engine unavailable, relying on the local overlap check")
+            is_available = None
+
+        if is_available is False:
+            return False
+        # The engine index lags behind commits, the constraint only sees one monthly
+        # partition, and series are not rows of bookings: the room's occupancy decides
+        return not conflict_flags([(start_time, end_time)], existing)[0]
+
+    async def _ensure_not_held(self, user_id: UUID, classroom_id: UUID, start_time: datetime, end_time: datetime) -> None:
+        """Another user's live hold on the slot is a conflict; the caller's own holds are not."""
+        if self.holds is None:
+            return
+        try:
+            with timed("holds"):
+                holds = await self.holds.overlapping(classroom_id, start_time, end_time)
+        except HoldStoreUnavailableError as e:
+            print(f"[booking-command] Hold store unavailable, ignoring holds: {e}")
+            return
+        if any(hold.user_id != user_id for hold in holds):
+            raise ScheduleConflictError(HELD_SLOT_MESSAGE)
+
+    async def place_hold(self, user_id: UUID, classroom_id: UUID, start_time: datetime, end_time: datetime, ttl_seconds: int) -> SlotHold:
+        """
+        Reserves the slot for ttl_seconds without touching Postgres. Losers of a
+        race fail at the hold store; only the winner pays for the classroom
+        lookup and the engine index check, and loses the hold if either fails.
+        """
+        with timed("holds"):
+            hold = await self.holds.place(user_id, classroom_id, start_time, end_time, ttl_seconds)
+        if hold is None:
+            raise ScheduleConflictError(HELD_SLOT_MESSAGE)
+
+        try:
+            outcomes = await asyncio.gather(
+                self._ensure_bookable(classroom_id),
+                self._engine_index_check(classroom_id, start_time, end_time),
+                return_exceptions=True,
+            )
+            for outcome in outcomes:
+                # An engine outage leaves the hold in place; confirming runs the full checks
+                if isinstance(outcome, BaseException) and not isinstance(outcome, TimetableUnavailableError):
+                    raise outcome
+            if outcomes[1] is False:
+                raise ScheduleConflictError("Conflicto de horario con reservas existentes")
+        except BaseException:
+            with contextlib.suppress(HoldStoreUnavailableError):
+                await self.holds.release(hold)
+            raise
+
+        return hold
+
+    async def confirm_hold(self, hold_id: str, user_id: UUID, subject: str | None = None):
+        """
+        Books the caller's held slot with the same checks as create_booking and
+        releases the hold. Confirms are idempotent per hold: a retry after the
+        hold was consumed returns the booking the first confirm created.
+        """
+        idempotency_key = f"hold:{hold_id}"
+        request_hash = request_fingerprint({"hold_id": hold_id, "subject": subject})
+
+        hold = await self.holds.get(hold_id)
+        if hold is None or hold.user_id != user_id:
+            try:
+                stored = await self.idempotency.claim(user_id, idempotency_key, request_hash)
+            finally:
+                await self.db.rollback()
+            if stored is None:
+                raise HoldNotFoundError("Retención no encontrada o expirada")
+            return booking_from_payload(stored)
+
+        booking = await self.create_booking(
+            user_id,
+            hold.classroom_id,
+            hold.start_time,
+            hold.end_time,
+            subject,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+        )
+        try:
+            await self.holds.release(hold)
+        except HoldStoreUnavailableError as e:
+            # The booking is committed; the hold only lingers until it expires
+            print(f"[booking-command] Could not release hold {hold_id}: {e}")
+        return booking
+
+    async def release_hold(self, hold_id: str, user_id: UUID) -> None:
+        hold = await self.holds.get(hold_id)
+        if hold is None or hold.user_id != user_id:
+            raise HoldNotFoundError("Retención no encontrada o expirada")
+        await self.holds.release(hold)
+
+    async def create_booking(
+        self,
+        user_id: UUID,
+        classroom_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+        subject: str | None = None,
+        *,
+        idempotency_key: Optional[str] = None,
+        request_hash: Optional[str] = None,
+    ):
+        """
+        With an idempotency key, a request already completed under that key
+        returns the booking it created, as it was then, without calling
+        classroom-service or the engine and without writing anything.
+        request_hash overrides the fingerprint the key is checked against.
+        """
+        try:
+            if idempotency_key is not None and request_hash is None:
+                request_hash = request_fingerprint({
+                    "classroom_id": classroom_id,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "subject": subject,
+                })
+            if idempotency_key is not None:
+                with timed("idempotency"):
+                    stored = await self.idempotency.claim(user_id, idempotency_key, request_hash)
+                if stored is not None:
+                    # Nothing was written; ends the transaction and its key lock
+                    await self.db.rollback()
+                    return booking_from_payload(stored)
+
+            # Classroom lookup (replica or HTTP) runs while the locked check talks to Postgres and the engine
+            outcomes = await asyncio.gather(
+                self._ensure_bookable(classroom_id),
+                self._locked_availability(user_id, classroom_id, start_time, end_time),
+                return_exceptions=True,
+            )
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+
+            if not outcomes[1]:
+                raise ScheduleConflictError("Conflicto de horario con reservas existentes")
+
+            new_booking = Booking(
+                user_id=user_id,
+                classroom_id=classroom_id,
+                start_time=start_time,
+                end_time=end_time,
+                subject=subject,
+                status="CONFIRMED"
+            )
+
+            self.db.add(new_booking)
+            with timed("insert"):
+                await self.db.flush()
+                await self.db.refresh(new_booking)
+
+            payload = booking_event_payload(new_booking)
+            with timed("outbox"):
+                self.event_bus.publish("booking.created", payload)
+            if idempotency_key is not None:
+                self.idempotency.remember(user_id, idempotency_key, request_hash, payload)
+            with timed("commit"):
+                await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if is_overlap_violation(e):
+                # Per-partition constraint: backs up the locked check within a month only
+                raise ScheduleConflictError("Conflicto de horario con reservas existentes") from e
+            if is_missing_partition(e):
+                raise ValueError("La fecha de la reserva está fuera del horizonte de reservas") from e
+            raise
+        except BaseException:
+            # Releases the classroom lock right away
+            await self.db.rollback()
+            raise
+
+        return new_booking
+
+    async def cancel_booking(self, booking_id: UUID, requester_user_id: UUID, *, requester_role: str):
+        booking: Booking | None = await self.db.get(Booking, booking_id)
+        if booking is None:
+            raise BookingNotFoundError("Reserva no encontrada")
+
+        if requester_role != "ADMIN" and booking.user_id != requester_user_id:
+            raise BookingForbiddenError("No tienes permisos para cancelar esta reserva")
+
+        if booking.status == "CANCELLED":
+            return booking
+
+        booking.status = "CANCELLED"
+        with timed("outbox"):
+            self.event_bus.publish("booking.canceled", booking_event_payload(booking))
+        with timed("commit"):
+            await self.db.commit()
+
+        return booking
@@ -1,11 +1,14 @@
 import uuid
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, Column, Computed, String, DateTime, Date, Integer, SmallInteger, func
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB, TSTZRANGE
 from src.infrastructure.database import Base
+from src.domain.recurrence import RecurrenceRule, as_utc
 
 class Booking(Base):
     __tablename__ = "bookings"
 
+    # Partitioned by month on start_time, so the database key is (id, start_time);
+    # ids are random uuids and remain the identity on this side
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False)      
     classroom_id = Column(UUID(as_uuid=True), nullable=False)
@@ -16,4 +19,77 @@ class Booking(Base):
     subject = Column(String(255), nullable=True)
 
     status = Column(String, default="CONFIRMED") # CONFIRMED, CANCELLED
-    
\ No newline at end of file
+
+    # [start_time, end_time) computed by Postgres; each monthly partition's
+    # bookings_YYYY_MM_no_overlap excludes overlapping CONFIRMED periods of a classroom
+    period = Column(TSTZRANGE, Computed("tstzrange(start_time, end_time, '[)')", persisted=True))
+
+
+class BookingSeries(Base):
+    """
+    A recurring booking stored as one row. Occurrences are never materialized:
+    they are expanded from the rule when conflicts are checked or read.
+    """
+    __tablename__ = "booking_series"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    classroom_id = Column(UUID(as_uuid=True), nullable=False)
+    subject = Column(String(255), nullable=True)
+
+    # First occurrence
+    start_time = Column(DateTime(timezone=True), nullable=False)
+    end_time = Column(DateTime(timezone=True), nullable=False)
+
+    frequency = Column(String(10), nullable=False)  # DAILY, WEEKLY
+    repeat_interval = Column(SmallInteger, nullable=False, default=1)
+    by_weekday = Column(ARRAY(SmallInteger), nullable=False, default=list)
+    until = Column(DateTime(timezone=True), nullable=True)
+    occurrence_count = Column(Integer, nullable=True)
+    exdates = Column(ARRAY(Date), nullable=False, default=list)
+    utc_offset_minutes = Column(SmallInteger, nullable=False, default=0)
+
+    # End of the last occurrence, so windowed queries can skip finished series
+    last_end_time = Column(DateTime(timezone=True), nullable=False)
+
+    status = Column(String, default="CONFIRMED") # CONFIRMED, CANCELLED
+
+    def rule(self) -> RecurrenceRule:
+        return RecurrenceRule(
+            start_time=as_utc(self.start_time),
+            end_time=as_utc(self.end_time),
+            frequency=self.frequency,
+            interval=self.repeat_interval or 1,
+            by_weekday=tuple(self.by_weekday or ()),
+            until=as_utc(self.until),
+            count=self.occurrence_count,
+            exdates=tuple(self.exdates or ()),
+            utc_offset_minutes=self.utc_offset_minutes or 0,
+        )
+
+
+class OutboxEvent(Base):
+    """
+    A booking event waiting to be relayed to RabbitMQ. Written in the same
+    transaction as the change it describes; deleted once the broker confirms it.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String(100), nullable=False)  # routing key
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class IdempotencyKey(Base):
+    """
+    Outcome of a create sent with an Idempotency-Key header, kept for the TTL
+    so a retried request is answered from here instead of being re-run.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # sha256 of the request body
+    response = Column(JSONB, nullable=False)  # the booking as it was created
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,7 +1,24 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, NamedTuple, Tuple, Optional, Dict, Any
+
+class TimetableUnavailableError(Exception):
+    pass
+
+class IdempotencyKeyReusedError(Exception):
+    pass
+
+class HoldStoreUnavailableError(Exception):
+    pass
+
+class SlotHold(NamedTuple):
+    hold_id: str
+    user_id: UUID
+    classroom_id: UUID
+    start_time: datetime
+    end_time: datetime
+    expires_at: datetime
 
 class ClassroomGateway(ABC):
     @abstractmethod
@@ -13,7 +30,106 @@ class TimetableGateway(ABC):
     def check_availability(self, start: datetime, end: datetime, existing_bookings: List[Tuple[datetime, datetime]]) -> bool:
         pass
 
+    @abstractmethod
+    def check_classroom_availability(self, classroom_id: UUID, start: datetime, end: datetime) -> Optional[bool]:
+        """Checks against the engine's own classroom index. None when the index is not ready."""
+        pass
+
+    @abstractmethod
+    def check_availability_batch(self, candidates: List[Tuple[datetime, datetime]], existing_bookings: List[Tuple[datetime, datetime]]) -> Tuple[List[bool], List[Tuple[int, int]]]:
+        """Per-candidate conflict flags against existing bookings, plus overlapping candidate index pairs."""
+        pass
+
+    @abstractmethod
+    def find_free_slots(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration_minutes: int,
+        *,
+        classroom_id: Optional[UUID] = None,
+        busy: Optional[List[Tuple[datetime, datetime]]] = None,
+        granularity_minutes: int = 0,
+        opening_hours: Optional[List[Tuple[int, int, int]]] = None,
+        utc_offset_minutes: int = 0,
+        max_results: int = 0,
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
+        """Free slots in the window. None when classroom_id is given and the engine index is not ready."""
+        pass
+
+    @abstractmethod
+    def search_available_classrooms(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        min_capacity: int = 0,
+        include_non_operational: bool = False,
+        limit: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Classrooms free for the whole range with capacity >= min_capacity, best fit first."""
+        pass
+
+class HoldStore(ABC):
+    @abstractmethod
+    def overlapping(self, classroom_id: UUID, start: datetime, end: datetime) -> List[SlotHold]:
+        """Live holds of the classroom overlapping [start, end)."""
+        pass
+
 class EventBusGateway(ABC):
     @abstractmethod
     def publish(self, event_type: str, payload: dict):
         pass
+
+
+# Async counterparts for AsyncBookingService (only what the create/cancel path needs)
+
+class AsyncClassroomGateway(ABC):
+    @abstractmethod
+    async def get_classroom(self, classroom_id: UUID) -> Optional[Dict[str, Any]]:
+        pass
+
+class AsyncTimetableGateway(ABC):
+    @abstractmethod
+    async def check_availability(self, start: datetime, end: datetime, existing_bookings: List[Tuple[datetime, datetime]]) -> bool:
+        pass
+
+    @abstractmethod
+    async def check_classroom_availability(self, classroom_id: UUID, start: datetime, end: datetime) -> Optional[bool]:
+        """Checks against the engine's own classroom index. None when the index is not ready."""
+        pass
+
+class IdempotencyStore(ABC):
+    @abstractmethod
+    async def claim(self, user_id: UUID, key: str, request_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Waits for any in-flight request with the same key, then returns what it
+        stored (None if the key is new). Raises IdempotencyKeyReusedError when
+        the key was used for a different request.
+        """
+        pass
+
+    @abstractmethod
+    def remember(self, user_id: UUID, key: str, request_hash: str, response: Dict[str, Any]) -> None:
+        """Stores the outcome in the current transaction."""
+        pass
+
+class AsyncHoldStore(ABC):
+    @abstractmethod
+    async def place(self, user_id: UUID, classroom_id: UUID, start: datetime, end: datetime, ttl_seconds: int) -> Optional[SlotHold]:
+        """Holds the slot for ttl_seconds. None when a live hold overlaps it."""
+        pass
+
+    @abstractmethod
+    async def get(self, hold_id: str) -> Optional[SlotHold]:
+        """None once the hold expired or was released."""
+        pass
+
+    @abstractmethod
+    async def overlapping(self, classroom_id: UUID, start: datetime, end: datetime) -> List[SlotHold]:
+        """Live holds of the classroom overlapping [start, end)."""
+        pass
+
+    @abstractmethod
+    async def release(self, hold: SlotHold) -> None:
+        pass
@@ -0,0 +1,126 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+FREQUENCIES = ("DAILY", "WEEKLY")
+
+# Hard cap per series: a semester of daily classes fits comfortably
+MAX_SERIES_OCCURRENCES = 500
+
+
+class RecurrenceRule(NamedTuple):
+    """
+    RRULE-like pattern (FREQ, INTERVAL, BYDAY, UNTIL, COUNT, EXDATE).
+
+    start_time/end_time are the first occurrence. Weekdays and exception dates
+    are evaluated in local time (UTC + utc_offset_minutes), 0 = Monday.
+    As in RFC 5545, `count` counts occurrences before exceptions are removed.
+    """
+    start_time: datetime
+    end_time: datetime
+    frequency: str
+    interval: int = 1
+    by_weekday: Tuple[int, ...] = ()
+    until: Optional[datetime] = None
+    count: Optional[int] = None
+    exdates: Tuple[date, ...] = ()
+    utc_offset_minutes: int = 0
+
+
+def as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Naive datetimes are taken as UTC, like the rest of booking-command."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def validate_rule(rule: RecurrenceRule) -> None:
+    if rule.end_time <= rule.start_time:
+        raise ValueError("end_time must be greater than start_time")
+    if rule.frequency not in FREQUENCIES:
+        raise ValueError(f"frequency must be one of {', '.join(FREQUENCIES)}")
+    if rule.interval < 1:
+        raise ValueError("interval must be positive")
+    if any(d < 0 or d > 6 for d in rule.by_weekday):
+        raise ValueError("by_weekday values must be between 0 (Monday) and 6 (Sunday)")
+    if rule.until is None and rule.count is None:
+        raise ValueError("A series needs until or count")
+    if rule.until is not None and rule.until < rule.start_time:
+        raise ValueError("until must not be before start_time")
+    if rule.count is not None and not 1 <= rule.count <= MAX_SERIES_OCCURRENCES:
+        raise ValueError(f"count must be between 1 and {MAX_SERIES_OCCURRENCES}")
+
+    starts = list(_iter_rule(rule, MAX_SERIES_OCCURRENCES + 1))
+    if len(starts) > MAX_SERIES_OCCURRENCES:
+        raise ValueError(f"A series cannot have more than {MAX_SERIES_OCCURRENCES} occurrences")
+
+    duration = rule.end_time - rule.start_time
+    if any(b - a < duration for a, b in zip(starts, starts[1:])):
+        raise ValueError("Occurrences of a series must not overlap each other")
+
+
+def _iter_rule(rule: RecurrenceRule, limit: int) -> Iterator[datetime]:
+    """Occurrence starts in local time, before exceptions, in increasing order."""
+    offset = timedelta(minutes=rule.utc_offset_minutes)
+    first = rule.start_time + offset
+    until = rule.until + offset if rule.until is not None else None
+    limit = min(limit, rule.count or limit)
+
+    if rule.frequency == "DAILY":
+        days = set(rule.by_weekday)
+        step = timedelta(days=rule.interval)
+        candidates = (first + k * step for k in range(limit * 7 + 1))
+        candidates = (c for c in candidates if not days or c.weekday() in days)
+    else:
+        weekdays = sorted(set(rule.by_weekday)) or [first.weekday()]
+        week_start = first - timedelta(days=first.weekday())
+        step = timedelta(weeks=rule.interval)
+        candidates = (
+            week_start + w * step + timedelta(days=d)
+            for w in range(limit + 1)
+            for d in weekdays
+        )
+        candidates = (c for c in candidates if c >= first)
+
+    produced = 0
+    for start in candidates:
+        if produced >= limit or (until is not None and start > until):
+            return
+        produced += 1
+        yield start
+
+
+def iter_occurrences(
+    rule: RecurrenceRule,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Lazily yields (start, end) occurrences, optionally only those touching
+    [window_start, window_end). Nothing is stored per occurrence.
+    """
+    offset = timedelta(minutes=rule.utc_offset_minutes)
+    duration = rule.end_time - rule.start_time
+    exdates = set(rule.exdates)
+
+    for local_start in _iter_rule(rule, MAX_SERIES_OCCURRENCES):
+        start = local_start - offset
+        end = start + duration
+        if window_end is not None and start >= window_end:
+            return
+        if window_start is not None and end <= window_start:
+            continue
+        if local_start.date() in exdates:
+            continue
+        yield start, end
+
+
+def occurrence_id(series_id, start: datetime) -> str:
+    """Stable id of one occurrence, used by the timetable engine index."""
+    return f"{series_id}@{start.isoformat()}"
+
+
+def local_date(rule: RecurrenceRule, start: datetime) -> date:
+    return (start + timedelta(minutes=rule.utc_offset_minutes)).date()
+
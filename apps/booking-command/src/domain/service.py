@@ -1,9 +1,18 @@
+import os
+import zlib
+from bisect import bisect_left
+from itertools import accumulate
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from src.domain.models import Booking
-from src.domain.ports import ClassroomGateway, TimetableGateway, EventBusGateway
+from src.domain.models import Booking, BookingSeries
+from src.domain.ports import ClassroomGateway, TimetableGateway, EventBusGateway, HoldStore, HoldStoreUnavailableError, TimetableUnavailableError
+from src.domain.recurrence import RecurrenceRule, as_utc, iter_occurrences, local_date, occurrence_id, validate_rule
+from src.metrics.latency import timed
 
 class ClassroomNotFoundError(Exception):
     pass
@@ -20,54 +29,298 @@ class BookingNotFoundError(Exception):
 class BookingForbiddenError(Exception):
     pass
 
+class HoldNotFoundError(Exception):
+    pass
+
+HELD_SLOT_MESSAGE = "Franja retenida temporalmente por otro usuario"
+
+# How much create_booking relies on the timetable engine. Under the classroom lock
+# booking-command always checks the room's bookings and series itself, and Postgres
+# rejects overlaps inside one monthly partition (bookings_YYYY_MM_no_overlap):
+#   "required" - the engine must answer; an outage surfaces as 503
+#   "optional" - pre-check with the engine when it answers, otherwise continue
+#   "off"      - never call the engine on create
+TIMETABLE_CHECK_MODE = os.getenv("TIMETABLE_CHECK_MODE", "optional").lower()
+
+# Upper bound on items per bulk create/cancel request
+BULK_MAX_ITEMS = int(os.getenv("BOOKING_BULK_MAX_ITEMS", 500))
+
+# Longest booking accepted. Overlap lookups only read bookings starting this long
+# before the window, which lets Postgres prune the older monthly partitions
+BOOKING_MAX_DURATION = timedelta(hours=int(os.getenv("BOOKING_MAX_DURATION_HOURS", 24)))
+
+# SQLSTATE exclusion_violation
+EXCLUSION_VIOLATION = "23P01"
+# SQLSTATE check_violation, raised as well when no partition accepts the row
+CHECK_VIOLATION = "23514"
+
+# First key of the two-key advisory locks taken by booking-command, so they
+# never collide with locks other code takes on the same database
+BOOKING_LOCK_NAMESPACE = 0x424B
+
+def classroom_lock_key(classroom_id: UUID) -> int:
+    """Signed int4 derived from the classroom id (collisions only serialize two rooms)."""
+    key = zlib.crc32(UUID(str(classroom_id)).bytes)
+    return key - (1 << 32) if key >= (1 << 31) else key
+
+def is_overlap_violation(error: IntegrityError) -> bool:
+    orig = getattr(error, "orig", None)
+    return getattr(orig, "pgcode", None) == EXCLUSION_VIOLATION or "_no_overlap" in str(orig)
+
+def is_missing_partition(error: IntegrityError) -> bool:
+    orig = getattr(error, "orig", None)
+    return getattr(orig, "pgcode", None) == CHECK_VIOLATION and "no partition" in str(orig)
+
+def conflict_flags(candidates: List[Tuple[datetime, datetime]], existing: Iterable[Tuple[datetime, datetime]]) -> List[bool]:
+    """In-process equivalent of the engine's batch check (per-candidate flags only)."""
+    busy = sorted((as_utc(s), as_utc(e)) for s, e in existing)
+    starts = [s for s, _ in busy]
+    max_end = list(accumulate((e for _, e in busy), max))
+    flags = []
+    for start, end in candidates:
+        i = bisect_left(starts, as_utc(end))
+        flags.append(i > 0 and max_end[i - 1] > as_utc(start))
+    return flags
+
+def candidate_overlap_pairs(candidates: List[Tuple[datetime, datetime]]) -> List[Tuple[int, int]]:
+    """Index pairs (i, j), i < j, of candidates that overlap each other (the engine's candidate_conflicts)."""
+    order = sorted(range(len(candidates)), key=lambda i: as_utc(candidates[i][0]))
+    active: List[int] = []
+    pairs = []
+    for i in order:
+        start = as_utc(candidates[i][0])
+        active = [j for j in active if as_utc(candidates[j][1]) > start]
+        pairs.extend((min(i, j), max(i, j)) for j in active)
+        active.append(i)
+    return pairs
+
+class BulkBookingItem(NamedTuple):
+    classroom_id: UUID
+    start_time: datetime
+    end_time: datetime
+    subject: Optional[str] = None
+
+class BulkItemResult(NamedTuple):
+    """Outcome of one item of a bulk request, reported at the item's position."""
+    index: int
+    status: str  # CREATED, CONFLICT, CLASSROOM_NOT_FOUND, CLASSROOM_UNAVAILABLE / CANCELLED, ALREADY_CANCELLED, NOT_FOUND, FORBIDDEN
+    booking_id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+def booking_event_payload(booking: Booking) -> Dict[str, Any]:
+    return {
+        "booking_id": str(booking.id),
+        "user_id": str(booking.user_id),
+        "classroom_id": str(booking.classroom_id),
+        "status": booking.status,
+        "start_time": booking.start_time.isoformat(),
+        "end_time": booking.end_time.isoformat(),
+        "subject": getattr(booking, "subject", None),
+    }
+
+def series_event_payload(series: BookingSeries, occurrences: Iterable[Tuple[datetime, datetime]]) -> Dict[str, Any]:
+    """Series event body; each occurrence carries the id the timetable engine indexes it under."""
+    return {
+        "series_id": str(series.id),
+        "user_id": str(series.user_id),
+        "classroom_id": str(series.classroom_id),
+        "status": series.status,
+        "subject": series.subject,
+        "occurrences": [
+            {
+                "occurrence_id": occurrence_id(series.id, start),
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+            }
+            for start, end in occurrences
+        ],
+    }
+
 class BookingService:
-    def __init__(self, db: Session, classroom_gateway: ClassroomGateway, timetable_gateway: TimetableGateway, event_bus: EventBusGateway):
+    def __init__(
+        self,
+        db: Session,
+        classroom_gateway: ClassroomGateway,
+        timetable_gateway: TimetableGateway,
+        event_bus: EventBusGateway,
+        timetable_check_mode: str = TIMETABLE_CHECK_MODE,
+        hold_store: Optional[HoldStore] = None,
+    ):
         self.db = db
         self.classroom_gw = classroom_gateway
         self.timetable_gw = timetable_gateway
         self.event_bus = event_bus
+        self.timetable_check_mode = timetable_check_mode
+        self.hold_store = hold_store
 
-    def create_booking(self, user_id: UUID, classroom_id: UUID, start_time: datetime, end_time: datetime, subject: str | None = None):
-
-        classroom = self.classroom_gw.get_classroom(classroom_id)
+    def _ensure_bookable(self, classroom_id: UUID) -> None:
+        with timed("classroom"):
+            classroom = self.classroom_gw.get_classroom(classroom_id)
 
         if classroom is None:
             raise ClassroomNotFoundError("Aula no encontrada")
 
         if classroom.get("is_operational") is False:
             raise ClassroomUnavailableError("Aula no disponible para reservas")
-        
-        existing = (self.db.query(Booking).filter(Booking.classroom_id == classroom_id,Booking.status == "CONFIRMED").all())
 
-        existing_intervals = [(b.start_time.isoformat(), b.end_time.isoformat()) for b in existing]
+    def _lock_classroom(self, classroom_id: UUID) -> None:
+        """
+        Serializes check-then-insert for one classroom until the transaction
+        ends (commit or rollback). Creates for other rooms do not wait.
+        """
+        with timed("lock"):
+            self.db.execute(
+                text("SELECT pg_advisory_xact_lock(:namespace, :key)"),
+                {"namespace": BOOKING_LOCK_NAMESPACE, "key": classroom_lock_key(classroom_id)},
+            )
 
-        is_available = self.timetable_gw.check_availability(start_time, end_time, existing_intervals)
+    def _bookings_in_window(self, classroom_id: UUID, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        CONFIRMED bookings of the room that can overlap [window_start, window_end).
+        Served by idx_bookings_classroom_window; the lower bound on start_time
+        keeps the scan to the partitions of the window's months.
+        """
+        with timed("bookings_query"):
+            rows = (
+                self.db.query(Booking.start_time, Booking.end_time)
+                .filter(
+                    Booking.classroom_id == classroom_id,
+                    Booking.status == "CONFIRMED",
+                    Booking.start_time < window_end,
+                    Booking.end_time > window_start,
+                    Booking.start_time > window_start - BOOKING_MAX_DURATION,
+                )
+                .all()
+            )
+        return [(start, end) for start, end in rows]
 
-        if not is_available:
-            raise ScheduleConflictError("Conflicto de horario con reservas existentes")
+    def _series_busy(self, classroom_id: UUID, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+        """Occurrences of the room's active series inside the window, expanded on the fly."""
+        window_start, window_end = as_utc(window_start), as_utc(window_end)
+        with timed("series_query"):
+            series_rows = (
+                self.db.query(BookingSeries)
+                .filter(
+                    BookingSeries.classroom_id == classroom_id,
+                    BookingSeries.status == "CONFIRMED",
+                    BookingSeries.start_time < window_end,
+                    BookingSeries.last_end_time > window_start,
+                )
+                .all()
+            )
+        busy: List[Tuple[datetime, datetime]] = []
+        for series in series_rows:
+            busy.extend(iter_occurrences(series.rule(), window_start, window_end))
+        return busy
 
-        new_booking = Booking(
-            user_id=user_id,
-            classroom_id=classroom_id,
-            start_time=start_time,
-            end_time=end_time,
-            subject=subject,
-            status="CONFIRMED"
-        )
+    def _held_intervals(self, user_id: UUID, classroom_id: UUID, window_start: datetime, window_end: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Slots of the room other users hold (see POST /bookings/holds); the
+        caller's own holds do not count. Checked with the room locked, like
+        the bookings. Without the hold store, holds are ignored.
+        """
+        if self.hold_store is None:
+            return []
+        try:
+            with timed("holds"):
+                holds = self.hold_store.overlapping(classroom_id, window_start, window_end)
+        except HoldStoreUnavailableError as e:
+            print(f"[booking-command] Hold store unavailable, ignoring holds: {e}")
+            return []
+        return [(hold.start_time, hold.end_time) for hold in holds if hold.user_id != user_id]
 
-        self.db.add(new_booking)
-        self.db.commit()
-        self.db.refresh(new_booking)
+    def _timetable_precheck(
+        self,
+        classroom_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+        existing_intervals: List[Tuple[datetime, datetime]],
+    ) -> Optional[bool]:
+        """
+        Engine verdict, or None when the check is off or the engine is down in
+        optional mode. existing_intervals (the room's occupancy around the
+        candidate) is only sent when the engine index is not ready.
+        """
+        if self.timetable_check_mode == "off":
+            return None
+
+        try:
+            # Fast path: the engine keeps its own per-classroom index fed by booking events
+            with timed("timetable"):
+                is_available = self.timetable_gw.check_classroom_availability(classroom_id, start_time, end_time)
+
+            if is_available is None:
+                with timed("timetable"):
+                    is_available = self.timetable_gw.check_availability(start_time, end_time, existing_intervals)
+
+            return is_available
+
+        except TimetableUnavailableError:
+            if self.timetable_check_mode == "required":
+                raise
+            print("[booking-command] Timetable engine unavailable, relying on the local overlap check")
+            return None
+
+    def create_booking(self, user_id: UUID, classroom_id: UUID, start_time: datetime, end_time: datetime, subject: str | None = None):
+
+        self._ensure_bookable(classroom_id)
+
+        # Held from here to commit/rollback: the read, the engine check and the insert
+        # of this room cannot interleave with another create of the same room
+        self._lock_classroom(classroom_id)
+        try:
+            # Read on every path: the engine index is fed through the outbox and lags
+            # behind commits, the overlap constraint only sees one monthly partition
+            # (not a booking crossing midnight into the next month), and series
+            # occurrences are not rows of bookings at all
+            existing_intervals = self._bookings_in_window(classroom_id, start_time, end_time)
+            existing_intervals += self._series_busy(classroom_id, start_time, end_time)
 
-        self.event_bus.publish("booking.created", {
-            "booking_id": str(new_booking.id),
-            "user_id": str(new_booking.user_id),
-            "classroom_id": str(new_booking.classroom_id),
-            "status": new_booking.status,
-            "start_time": new_booking.start_time.isoformat(),
-            "end_time": new_booking.end_time.isoformat(),
-            "subject": new_booking.subject,
-        })
+            if self._held_intervals(user_id, classroom_id, start_time, end_time):
+                raise ScheduleConflictError(HELD_SLOT_MESSAGE)
+
+            is_available = self._timetable_precheck(classroom_id, start_time, end_time, existing_intervals)
+
+            if is_available is not False:
+                is_available = not conflict_flags([(start_time, end_time)], existing_intervals)[0]
+
+            if not is_available:
+                raise ScheduleConflictError("Conflicto de horario con reservas existentes")
+
+            new_booking = Booking(
+                user_id=user_id,
+                classroom_id=classroom_id,
+                start_time=start_time,
+                end_time=end_time,
+                subject=subject,
+                status="CONFIRMED"
+            )
+
+            self.db.add(new_booking)
+            # The overlap constraint fires here, before the event is written
+            with timed("insert"):
+                self.db.flush()
+                self.db.refresh(new_booking)
+
+            # Written to the outbox in this same transaction (see OutboxEventBus)
+            with timed("outbox"):
+                self.event_bus.publish("booking.created", booking_event_payload(new_booking))
+            with timed("commit"):
+                self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            if is_overlap_violation(e):
+                # bookings_YYYY_MM_no_overlap lives on each monthly partition: it backs up the locked
+                # check above within a month but cannot see a booking in the next partition
+                raise ScheduleConflictError("Conflicto de horario con reservas existentes") from e
+            if is_missing_partition(e):
+                raise ValueError("La fecha de la reserva está fuera del horizonte de reservas") from e
+            raise
+        except Exception:
+            # Releases the classroom lock right away instead of when the session closes
+            self.db.rollback()
+            raise
+        self.db.refresh(new_booking)
 
         return new_booking
     
@@ -90,21 +343,363 @@ class BookingService:
 
         booking.status = "CANCELLED"
         self.db.add(booking)
+        self.event_bus.publish("booking.canceled", booking_event_payload(booking))
         self.db.commit()
         self.db.refresh(booking)
 
-        self.event_bus.publish(
-            "booking.canceled",
-            {
-                "booking_id": str(booking.id),
-                "user_id": str(booking.user_id),
-                "classroom_id": str(booking.classroom_id),
-                "status": booking.status,
-                "start_time": booking.start_time.isoformat(),
-                "end_time": booking.end_time.isoformat(),
-                "subject": getattr(booking, "subject", None),
-            },
+        return booking
+
+    def _accepted_candidates(self, user_id: UUID, classroom_id: UUID, candidates: List[Tuple[datetime, datetime]]) -> List[bool]:
+        """
+        Which candidates of one room can be booked: free against the room's
+        occupancy and other users' holds, and not overlapping an earlier
+        accepted candidate of the same request. Must run with the room locked.
+        """
+        window_start = min(start for start, _ in candidates)
+        window_end = max(end for _, end in candidates)
+        held = conflict_flags(candidates, self._held_intervals(user_id, classroom_id, window_start, window_end))
+        existing_intervals = self._bookings_in_window(classroom_id, window_start, window_end)
+        existing_intervals += self._series_busy(classroom_id, window_start, window_end)
+
+        conflicts = pairs = None
+        if self.timetable_check_mode != "off":
+            try:
+                with timed("timetable"):
+                    conflicts, pairs = self.timetable_gw.check_availability_batch(candidates, existing_intervals)
+            except TimetableUnavailableError:
+                if self.timetable_check_mode == "required":
+                    raise
+        if conflicts is None:
+            conflicts = conflict_flags(candidates, existing_intervals)
+            pairs = candidate_overlap_pairs(candidates)
+
+        earlier: Dict[int, List[int]] = {}
+        for i, j in pairs:
+            earlier.setdefault(max(i, j), []).append(min(i, j))
+
+        # Request order decides between candidates that overlap each other
+        accepted: List[bool] = []
+        for i, hit in enumerate(conflicts):
+            accepted.append(not hit and not held[i] and not any(accepted[j] for j in earlier.get(i, ())))
+        return accepted
+
+    def create_bookings_bulk(self, user_id: UUID, items: Sequence[BulkBookingItem]) -> List[BulkItemResult]:
+        """
+        Books many slots at once, e.g. an exam week.
+
+        Items are grouped by classroom: each room is looked up, locked and
+        checked once for all of its items (against its occupancy and against
+        each other). Items that cannot be booked are reported and skipped; the
+        rest are inserted, together with their events, in a single transaction.
+        """
+        results: List[Optional[BulkItemResult]] = [None] * len(items)
+        by_room: Dict[UUID, List[int]] = {}
+        for i, item in enumerate(items):
+            by_room.setdefault(item.classroom_id, []).append(i)
+
+        # Classroom lookups happen before any lock is taken
+        bookable = []
+        for classroom_id, indices in by_room.items():
+            try:
+                self._ensure_bookable(classroom_id)
+                bookable.append(classroom_id)
+            except ClassroomNotFoundError as e:
+                for i in indices:
+                    results[i] = BulkItemResult(i, "CLASSROOM_NOT_FOUND", detail=str(e))
+            except ClassroomUnavailableError as e:
+                for i in indices:
+                    results[i] = BulkItemResult(i, "CLASSROOM_UNAVAILABLE", detail=str(e))
+
+        created: List[Tuple[int, Booking]] = []
+        try:
+            # Locks taken in key order, so two bulk requests sharing rooms cannot deadlock
+            for classroom_id in sorted(bookable, key=classroom_lock_key):
+                indices = by_room[classroom_id]
+                self._lock_classroom(classroom_id)
+
+                candidates = [(items[i].start_time, items[i].end_time) for i in indices]
+                for i, ok in zip(indices, self._accepted_candidates(user_id, classroom_id, candidates)):
+                    if not ok:
+                        results[i] = BulkItemResult(i, "CONFLICT", detail="Conflicto de horario con reservas existentes")
+                        continue
+                    booking = Booking(
+                        user_id=user_id,
+                        classroom_id=classroom_id,
+                        start_time=items[i].start_time,
+                        end_time=items[i].end_time,
+                        subject=items[i].subject,
+                        status="CONFIRMED",
+                    )
+                    self.db.add(booking)
+                    created.append((i, booking))
+
+            # One flush for every insert; the outbox rows go in the same transaction
+            with timed("insert"):
+                self.db.flush()
+            with timed("outbox"):
+                for i, booking in created:
+                    self.event_bus.publish("booking.created", booking_event_payload(booking))
+                    results[i] = BulkItemResult(i, "CREATED", booking_id=booking.id)
+            with timed("commit"):
+                self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            if is_overlap_violation(e):
+                raise ScheduleConflictError("Conflicto de horario con reservas existentes") from e
+            if is_missing_partition(e):
+                raise ValueError("La fecha de la reserva está fuera del horizonte de reservas") from e
+            raise
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return results
+
+    def cancel_bookings_bulk(self, booking_ids: Sequence[UUID], requester_user_id: UUID, *, requester_role: str) -> List[BulkItemResult]:
+        """cancel_booking for many ids: one read, one commit, per-item outcome."""
+        found = {
+            b.id: b
+            for b in self.db.query(Booking).filter(Booking.id.in_(set(booking_ids))).all()
+        }
+
+        is_admin = (requester_role == "ADMIN")
+        results: List[BulkItemResult] = []
+        try:
+            for i, booking_id in enumerate(booking_ids):
+                booking = found.get(booking_id)
+                if booking is None:
+                    results.append(BulkItemResult(i, "NOT_FOUND", booking_id, "Reserva no encontrada"))
+                elif not is_admin and booking.user_id != requester_user_id:
+                    results.append(BulkItemResult(i, "FORBIDDEN", booking_id, "No tienes permisos para cancelar esta reserva"))
+                elif booking.status == "CANCELLED":
+                    results.append(BulkItemResult(i, "ALREADY_CANCELLED", booking_id))
+                else:
+                    booking.status = "CANCELLED"
+                    self.event_bus.publish("booking.canceled", booking_event_payload(booking))
+                    results.append(BulkItemResult(i, "CANCELLED", booking_id))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return results
+
+    def find_free_slots(
+        self,
+        classroom_id: UUID,
+        window_start: datetime,
+        window_end: datetime,
+        duration_minutes: int,
+        *,
+        granularity_minutes: int = 0,
+        opening_hours: Optional[List[Tuple[int, int, int]]] = None,
+        utc_offset_minutes: int = 0,
+        max_results: int = 0,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Free slots of a classroom, computed by the timetable engine in one sweep."""
+
+        if window_end <= window_start:
+            raise ValueError("end must be greater than start")
+        if duration_minutes <= 0:
+            raise ValueError("duration_minutes must be positive")
+
+        options = dict(
+            granularity_minutes=granularity_minutes,
+            opening_hours=opening_hours,
+            utc_offset_minutes=utc_offset_minutes,
+            max_results=max_results,
         )
 
-        return booking
+        slots = self.timetable_gw.find_free_slots(window_start, window_end, duration_minutes, classroom_id=classroom_id, **options)
+
+        if slots is None:
+            # Engine index not ready: send the room's occupancy inside the window
+            busy = self._bookings_in_window(classroom_id, window_start, window_end)
+            slots = self.timetable_gw.find_free_slots(
+                window_start, window_end, duration_minutes,
+                busy=busy + self._series_busy(classroom_id, window_start, window_end),
+                **options,
+            )
+
+        return slots
+
+    def search_available_classrooms(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        *,
+        min_capacity: int = 0,
+        include_non_operational: bool = False,
+        limit: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Classrooms free for the whole window, from the engine's catalog and index (smallest fit first)."""
+
+        if window_end <= window_start:
+            raise ValueError("end must be greater than start")
+
+        return self.timetable_gw.search_available_classrooms(
+            window_start,
+            window_end,
+            min_capacity=max(0, min_capacity),
+            include_non_operational=include_non_operational,
+            limit=limit,
+        )
+
+
+    # ----------------------------
+    # Recurring series
+    # ----------------------------
+
+    def create_series(
+        self,
+        user_id: UUID,
+        classroom_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+        *,
+        frequency: str,
+        interval: int = 1,
+        by_weekday: Iterable[int] = (),
+        until: Optional[datetime] = None,
+        count: Optional[int] = None,
+        exceptions: Iterable[date] = (),
+        utc_offset_minutes: int = 0,
+        subject: str | None = None,
+    ) -> Tuple[BookingSeries, List[Tuple[datetime, datetime]]]:
+        """
+        Books every occurrence of a recurring pattern as a single row.
+
+        All occurrences are checked in one batch call against the room's
+        occupancy over the series span; either the whole series is stored or
+        nothing is.
+        """
+        rule = RecurrenceRule(
+            start_time=as_utc(start_time),
+            end_time=as_utc(end_time),
+            frequency=frequency.upper(),
+            interval=interval,
+            by_weekday=tuple(sorted(set(by_weekday))),
+            until=as_utc(until),
+            count=count,
+            exdates=tuple(sorted(set(exceptions))),
+            utc_offset_minutes=utc_offset_minutes,
+        )
+        validate_rule(rule)
+
+        occurrences = list(iter_occurrences(rule))
+        if not occurrences:
+            raise ValueError("The series has no occurrences")
+
+        self._ensure_bookable(classroom_id)
+
+        span_start, span_end = occurrences[0][0], occurrences[-1][1]
+
+        # Same per-room lock as create_booking; the database constraint does not cover series
+        self._lock_classroom(classroom_id)
+        try:
+            existing_intervals = self._bookings_in_window(classroom_id, span_start, span_end)
+            existing_intervals += self._series_busy(classroom_id, span_start, span_end)
+
+            conflicts = None
+            if self.timetable_check_mode != "off":
+                try:
+                    with timed("timetable"):
+                        conflicts, _ = self.timetable_gw.check_availability_batch(occurrences, existing_intervals)
+                except TimetableUnavailableError:
+                    if self.timetable_check_mode == "required":
+                        raise
+            if conflicts is None:
+                conflicts = conflict_flags(occurrences, existing_intervals)
+            held = conflict_flags(occurrences, self._held_intervals(user_id, classroom_id, span_start, span_end))
+            conflicts = [hit or is_held for hit, is_held in zip(conflicts, held)]
+
+            clashing = [start for (start, _), hit in zip(occurrences, conflicts) if hit]
+            if clashing:
+                shown = ", ".join(s.isoformat() for s in clashing[:5])
+                more = "..." if len(clashing) > 5 else ""
+                raise ScheduleConflictError(
+                    f"Conflicto de horario en {len(clashing)} de {len(occurrences)} ocurrencias: {shown}{more}"
+                )
+
+            series = BookingSeries(
+                user_id=user_id,
+                classroom_id=classroom_id,
+                subject=subject,
+                start_time=rule.start_time,
+                end_time=rule.end_time,
+                frequency=rule.frequency,
+                repeat_interval=rule.interval,
+                by_weekday=list(rule.by_weekday),
+                until=rule.until,
+                occurrence_count=rule.count,
+                exdates=list(rule.exdates),
+                utc_offset_minutes=rule.utc_offset_minutes,
+                last_end_time=span_end,
+                status="CONFIRMED",
+            )
+
+            self.db.add(series)
+            self.db.flush()
+            self.event_bus.publish("booking.series.created", series_event_payload(series, occurrences))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        self.db.refresh(series)
+
+        return series, occurrences
+
+    def _get_series(self, series_id: UUID, requester_user_id: UUID, requester_role: str, *, action: str = "modificar") -> BookingSeries:
+        series: BookingSeries | None = self.db.query(BookingSeries).filter(BookingSeries.id == series_id).first()
+        if series is None:
+            raise BookingNotFoundError("Serie no encontrada")
+
+        if requester_role != "ADMIN" and series.user_id != requester_user_id:
+            raise BookingForbiddenError(f"No tienes permisos para {action} esta serie")
+        return series
+
+    def cancel_series(self, series_id: UUID, requester_user_id: UUID, *, requester_role: str) -> BookingSeries:
+        series = self._get_series(series_id, requester_user_id, requester_role)
+        if series.status == "CANCELLED":
+            return series
+
+        occurrences = list(iter_occurrences(series.rule()))
+        series.status = "CANCELLED"
+        self.db.add(series)
+        self.event_bus.publish("booking.series.canceled", series_event_payload(series, occurrences))
+        self.db.commit()
+        self.db.refresh(series)
+
+        return series
+
+    def cancel_series_occurrence(self, series_id: UUID, occurrence_date: date, requester_user_id: UUID, *, requester_role: str) -> Tuple[datetime, datetime]:
+        """Cancels one occurrence (by its local date) by adding it to the series exceptions."""
+        series = self._get_series(series_id, requester_user_id, requester_role)
+        if series.status == "CANCELLED":
+            raise BookingNotFoundError("Serie cancelada")
+
+        rule = series.rule()
+        occurrence = next((o for o in iter_occurrences(rule) if local_date(rule, o[0]) == occurrence_date), None)
+        if occurrence is None:
+            raise BookingNotFoundError("Ocurrencia no encontrada")
+
+        # Reassign so SQLAlchemy sees the array change
+        series.exdates = sorted(set(series.exdates or []) | {occurrence_date})
+        self.db.add(series)
+        self.event_bus.publish("booking.series.occurrence_canceled", series_event_payload(series, [occurrence]))
+        self.db.commit()
+        self.db.refresh(series)
+
+        return occurrence
 
+    def list_series_occurrences(
+        self,
+        series_id: UUID,
+        requester_user_id: UUID,
+        *,
+        requester_role: str,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+    ) -> Tuple[BookingSeries, List[Tuple[datetime, datetime]]]:
+        series = self._get_series(series_id, requester_user_id, requester_role, action="ver")
+        return series, list(iter_occurrences(series.rule(), as_utc(window_start), as_utc(window_end)))
@@ -0,0 +1,87 @@
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from src.domain.models import Booking
+
+# Rows fetched per round trip from the server-side cursor (and per chunk written to the response)
+EXPORT_CHUNK_ROWS = int(os.getenv("BOOKING_EXPORT_CHUNK_ROWS", 5000))
+
+EXPORT_COLUMNS = (
+    Booking.id,
+    Booking.user_id,
+    Booking.classroom_id,
+    Booking.status,
+    Booking.start_time,
+    Booking.end_time,
+    Booking.subject,
+)
+
+def export_item(row) -> Dict[str, Any]:
+    """Same document the internal list has always returned, built from a column row."""
+    booking_id, user_id, classroom_id, status, start_time, end_time, subject = row
+    return {
+        "booking_id": str(booking_id),
+        "user_id": str(user_id),
+        "classroom_id": str(classroom_id),
+        "status": status,
+        "start_time": start_time.isoformat() if start_time else None,
+        "end_time": end_time.isoformat() if end_time else None,
+        "subject": subject,
+        # bookings has no created_at column; kept for existing readers
+        "created_at": None,
+    }
+
+
+def keyset_page_query(after: Optional[UUID], limit: int, status: Optional[str] = None) -> Select:
+    """
+    One page ordered by primary key, starting right after the `after` cursor.
+    Walks the pk index, so every page costs the same regardless of its position.
+    """
+    stmt = select(*EXPORT_COLUMNS)
+    if status is not None:
+        stmt = stmt.where(Booking.status == status)
+    if after is not None:
+        stmt = stmt.where(Booking.id > after)
+    return stmt.order_by(Booking.id).limit(limit)
+
+
+def offset_page_query(offset: int, limit: int, status: Optional[str] = None) -> Select:
+    """
+    Deprecated ?offset= paging of /internal/bookings, kept for existing callers:
+    same order as before keyset paging (newest start first), O(offset) per page.
+    """
+    stmt = select(*EXPORT_COLUMNS)
+    if status is not None:
+        stmt = stmt.where(Booking.status == status)
+    return stmt.order_by(Booking.start_time.desc(), Booking.id).offset(offset).limit(limit)
+
+
+def iter_ndjson(
+    session_factory: Callable[[], Session],
+    status: Optional[str] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """
+    Every booking as one JSON document per line, read through a server-side
+    cursor so memory stays flat whatever the table size.
+
+    Opens its own session: the response body is produced after the request
+    dependencies may already have been closed.
+    """
+    stmt = select(*EXPORT_COLUMNS)
+    if status is not None:
+        stmt = stmt.where(Booking.status == status)
+
+    db = session_factory()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=chunk_rows))
+        for rows in result.partitions():
+            yield "".join(json.dumps(export_item(row)) + "\n" for row in rows).encode()
+    finally:
+        db.close()
@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+import pika
+
+from src.domain.ports import AsyncClassroomGateway, ClassroomGateway
+from src.infrastructure.gateways.classroom_gateway import AsyncHttpClassroomGateway, ClassroomServiceError, HttpClassroomGateway
+
+CLASSROOM_REPLICA_TTL_SECONDS = float(os.getenv("CLASSROOM_REPLICA_TTL_SECONDS", "60"))
+# After classroom-service fails, serve stale entries without retrying it for this long
+CLASSROOM_HTTP_BACKOFF_SECONDS = float(os.getenv("CLASSROOM_HTTP_BACKOFF_SECONDS", "10"))
+# maintenance-service publishes classroom.blocked_by_maintenance / unblocked_by_maintenance here
+CLASSROOM_EVENTS_EXCHANGE = os.getenv("CLASSROOM_EVENTS_EXCHANGE", "domain.events")
+
+class ClassroomReplica:
+    """
+    Read-through in-memory copy of classroom-service, keyed by classroom id.
+
+    Fresh entries (younger than the TTL) are answered locally. A stale entry
+    or a miss is read over HTTP; if classroom-service is down the stale entry
+    is served as-is, so an outage only affects rooms never seen before.
+    """
+
+    def __init__(
+        self,
+        http: Optional[HttpClassroomGateway] = None,
+        *,
+        ttl_seconds: float = CLASSROOM_REPLICA_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.http = http or HttpClassroomGateway()
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+        self._http_down_until = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def replace_all(self, classrooms) -> None:
+        now = self.clock()
+        entries = {str(c["id"]): (c, now) for c in classrooms}
+        with self._lock:
+            self._entries = entries
+
+    def invalidate(self, classroom_id) -> None:
+        """Marks the entry stale so the next read goes to classroom-service."""
+        key = str(classroom_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], float("-inf"))
+
+    def _lookup(self, key: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """(cached classroom or None, whether classroom-service must be asked)."""
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[1] < self.ttl_seconds:
+            return entry[0], False
+        return (entry[0] if entry is not None else None), now >= self._http_down_until
+
+    def _fetch_failed(self, error: Exception) -> None:
+        self._http_down_until = self.clock() + CLASSROOM_HTTP_BACKOFF_SECONDS
+        print(f"[booking-command] Classroom service unavailable ({error}), serving the local replica")
+
+    def _store(self, key: str, classroom: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            if classroom is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = (classroom, self.clock())
+
+    def get(self, classroom_id: UUID) -> Optional[Dict[str, Any]]:
+        key = str(classroom_id)
+        cached, must_fetch = self._lookup(key)
+        if not must_fetch:
+            return cached
+
+        try:
+            classroom = self.http.fetch_classroom(classroom_id)
+        except ClassroomServiceError as e:
+            self._fetch_failed(e)
+            return cached
+
+        self._store(key, classroom)
+        return classroom
+
+    async def aget(self, classroom_id: UUID, http: AsyncHttpClassroomGateway) -> Optional[Dict[str, Any]]:
+        """get() for the async path: a fresh hit never leaves the event loop."""
+        key = str(classroom_id)
+        cached, must_fetch = self._lookup(key)
+        if not must_fetch:
+            return cached
+
+        try:
+            classroom = await http.fetch_classroom(classroom_id)
+        except ClassroomServiceError as e:
+            self._fetch_failed(e)
+            return cached
+
+        self._store(key, classroom)
+        return classroom
+
+
+class ReplicatedClassroomGateway(ClassroomGateway):
+    """ClassroomGateway backed by the process-wide replica."""
+
+    def __init__(self, replica: Optional[ClassroomReplica] = None):
+        self.replica = replica or get_replica()
+
+    def get_classroom(self, classroom_id: UUID) -> Optional[Dict[str, Any]]:
+        return self.replica.get(classroom_id)
+
+
+class AsyncReplicatedClassroomGateway(AsyncClassroomGateway):
+    """Async ClassroomGateway over the same replica; misses go through httpx."""
+
+    def __init__(self, replica: Optional[ClassroomReplica] = None, http: Optional[AsyncHttpClassroomGateway] = None):
+        self.replica = replica or get_replica()
+        self.http = http or AsyncHttpClassroomGateway()
+
+    async def get_classroom(self, classroom_id: UUID) -> Optional[Dict[str, Any]]:
+        return await self.replica.aget(classroom_id, self.http)
+
+
+_replica: Optional[ClassroomReplica] = None
+_replica_lock = threading.Lock()
+
+def get_replica() -> ClassroomReplica:
+    global _replica
+    with _replica_lock:
+        if _replica is None:
+            _replica = ClassroomReplica()
+        return _replica
+
+
+def start_classroom_sync(replica: ClassroomReplica) -> None:
+    """
+    Warms the replica from classroom-service right away, reloads it every TTL,
+    and invalidates single rooms on classroom.* change events.
+    If a reload fails the previous copy is kept.
+    """
+
+    def _refresh_forever():
+        attempt = 0
+        while True:
+            try:
+                replica.replace_all(replica.http.fetch_all())
+                attempt = 0
+                time.sleep(replica.ttl_seconds)
+            except Exception as e:
+                attempt += 1
+                wait = min(2 ** attempt, replica.ttl_seconds)
+                print(f"[booking-command] Classroom replica refresh failed: ({e}). Reintentando en {wait}s...")
+                time.sleep(wait)
+
+    def _consume_changes():
+        attempt = 0
+        while True:
+            try:
+                params = pika.ConnectionParameters(
+                    host=os.getenv("RABBITMQ_HOST", "rabbitmq"),
+                    port=int(os.getenv("RABBITMQ_PORT", 5672)),
+                    heartbeat=30,
+                )
+                connection = pika.BlockingConnection(params)
+                channel = connection.channel()
+                channel.exchange_declare(exchange=CLASSROOM_EVENTS_EXCHANGE, exchange_type="topic", durable=True)
+                queue_name = channel.queue_declare(queue="", exclusive=True).method.queue
+                channel.queue_bind(exchange=CLASSROOM_EVENTS_EXCHANGE, queue=queue_name, routing_key="classroom.#")
+
+                def on_change(ch, method, properties, body):
+                    try:
+                        event = json.loads(body)
+                        classroom_id = (event.get("data") or event).get("classroom_id")
+                        if classroom_id:
+                            replica.invalidate(classroom_id)
+                    except Exception as e:
+                        print(f"[booking-command] Invalid classroom event: {e}")
+
+                channel.basic_consume(queue=queue_name, on_message_callback=on_change, auto_ack=True)
+                attempt = 0
+                channel.start_consuming()
+            except Exception as e:
+                attempt += 1
+                wait = min(2 ** attempt, 30)
+                print(f"[booking-command] Classroom events consumer error: ({e}). Reintentando en {wait}s...")
+                time.sleep(wait)
+
+    threading.Thread(target=_refresh_forever, name="classroom-replica", daemon=True).start()
+    threading.Thread(target=_consume_changes, name="classroom-events", daemon=True).start()
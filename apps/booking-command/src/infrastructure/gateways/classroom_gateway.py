@@ -1,17 +1,29 @@
 import os
+import asyncio
+import weakref
+import httpx
 import requests
 from uuid import UUID
 from typing import Optional, Dict, Any
 from src.domain.ports import ClassroomGateway
 
+CLASSROOM_PAGE_SIZE = 500
+
+# Keep-alive connections to classroom-service, shared by every gateway in the process
+_session = requests.Session()
+
+class ClassroomServiceError(Exception):
+    pass
+
 class HttpClassroomGateway(ClassroomGateway):
     def __init__(self):
         self.base_url = os.getenv("CLASSROOM_SERVICE_URL", "http://classroom-service:8000")
 
-    def get_classroom(self, classroom_id: UUID) -> Optional[Dict[str, Any]]:
+    def fetch_classroom(self, classroom_id: UUID) -> Optional[Dict[str, Any]]:
+        """Like get_classroom, but an unreachable service raises ClassroomServiceError instead of returning None."""
         url = f"{self.base_url}/api/v1/classrooms/{classroom_id}"
         try:
-            resp = requests.get(url, timeout=5)
+            resp = _session.get(url, timeout=5)
 
             if resp.status_code == 404:
                 return None
@@ -20,5 +32,55 @@ class HttpClassroomGateway(ClassroomGateway):
             return resp.json()
 
         except requests.RequestException as e:
+            raise ClassroomServiceError(str(e)) from e
+
+    def fetch_all(self) -> list:
+        url = f"{self.base_url}/api/v1/classrooms/"
+        classrooms: list = []
+        params = {"limit": CLASSROOM_PAGE_SIZE}
+        while True:
+            # Keyset paging on id: rooms created or deleted meanwhile are neither skipped nor repeated
+            resp = _session.get(url, params=params, timeout=10)
+            resp.raise_for_status()
+            page = resp.json()
+            classrooms.extend(page)
+            if len(page) < CLASSROOM_PAGE_SIZE:
+                return classrooms
+            params["after"] = page[-1]["id"]
+
+    def get_classroom(self, classroom_id: UUID) -> Optional[Dict[str, Any]]:
+        try:
+            return self.fetch_classroom(classroom_id)
+        except ClassroomServiceError as e:
             print(f"[booking-command] Classroom gateway error: {e}")
             return None
+
+
+# httpx clients are tied to the event loop they are used from: one per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = httpx.AsyncClient(timeout=5)
+    return client
+
+
+class AsyncHttpClassroomGateway:
+    def __init__(self):
+        self.base_url = os.getenv("CLASSROOM_SERVICE_URL", "http://classroom-service:8000")
+
+    async def fetch_classroom(self, classroom_id: UUID) -> Optional[Dict[str, Any]]:
+        url = f"{self.base_url}/api/v1/classrooms/{classroom_id}"
+        try:
+            resp = await _async_client().get(url)
+
+            if resp.status_code == 404:
+                return None
+
+            resp.raise_for_status()
+            return resp.json()
+
+        except httpx.HTTPError as e:
+            raise ClassroomServiceError(str(e)) from e
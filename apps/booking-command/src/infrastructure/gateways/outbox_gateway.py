@@ -0,0 +1,17 @@
+from sqlalchemy.orm import Session
+
+from src.domain.models import OutboxEvent
+from src.domain.ports import EventBusGateway
+
+class OutboxEventBus(EventBusGateway):
+    """
+    Transactional outbox: publish() only adds a row to the caller's session, so
+    the event is committed (or rolled back) together with the booking change.
+    OutboxRelay forwards it to RabbitMQ afterwards.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def publish(self, event_type: str, payload: dict):
+        self.db.add(OutboxEvent(event_type=event_type, payload=payload))
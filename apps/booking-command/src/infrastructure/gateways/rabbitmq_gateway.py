@@ -1,36 +1,354 @@
 import os
 import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
 import pika
 from src.domain.ports import EventBusGateway
 
+RABBITMQ_POOL_SIZE = int(os.getenv("RABBITMQ_POOL_SIZE", "4"))
+RABBITMQ_HEARTBEAT_SECONDS = int(os.getenv("RABBITMQ_HEARTBEAT_SECONDS", "30"))
+RABBITMQ_CONNECT_ATTEMPTS = int(os.getenv("RABBITMQ_CONNECT_ATTEMPTS", "3"))
+RABBITMQ_CHECKOUT_TIMEOUT_SECONDS = float(os.getenv("RABBITMQ_CHECKOUT_TIMEOUT_SECONDS", "5"))
+RABBITMQ_CONFIRM_TIMEOUT_SECONDS = float(os.getenv("RABBITMQ_CONFIRM_TIMEOUT_SECONDS", "30"))
+
+EXCHANGE = "booking_events"
+
+
+class PublishNotConfirmedError(Exception):
+    """The broker did not confirm every message sent; the first `confirmed` ones did get through."""
+
+    def __init__(self, confirmed: int, message: str):
+        super().__init__(message)
+        self.confirmed = confirmed
+
+
+class _Confirms:
+    """
+    Publisher-confirm bookkeeping for one channel. The broker numbers messages
+    from 1 per channel and may settle many with a single multiple=True ack, so
+    a batch is written in one go and its confirms are awaited together.
+    """
+
+    def __init__(self, wake: Callable[[], None]):
+        self.wake = wake
+        self.last_tag = 0
+        self.pending = set()
+        self.nacked = set()
+
+    def next_tag(self) -> int:
+        self.last_tag += 1
+        self.pending.add(self.last_tag)
+        return self.last_tag
+
+    def on_confirm(self, frame) -> None:
+        method = frame.method
+        if method.multiple:
+            settled = {tag for tag in self.pending if tag <= method.delivery_tag}
+        else:
+            settled = {method.delivery_tag}
+        if isinstance(method, pika.spec.Basic.Nack):
+            self.nacked |= settled
+        self.pending -= settled
+        # Acks are handled below BlockingConnection's dispatch; without this
+        # process_data_events would sleep out its whole time_limit
+        self.wake()
+
+    def confirmed_prefix(self, tags: Sequence[int]) -> int:
+        count = 0
+        for tag in tags:
+            if tag in self.pending or tag in self.nacked:
+                break
+            count += 1
+        return count
+
+
+class _PooledChannel:
+    """One BlockingConnection with its publishing channel (pika connections are not thread-safe)."""
+
+    def __init__(self, connection, channel, confirms: Optional[_Confirms] = None):
+        self.connection = connection
+        self.channel = channel
+        self.confirms = confirms
+
+    def publish(self, messages: Sequence[Tuple[str, str, Optional[pika.BasicProperties]]], timeout: float) -> int:
+        """
+        Writes every message, then in confirm mode waits once for all their
+        confirms. Returns how many leading messages the broker confirmed.
+        """
+        tags: List[int] = []
+        for routing_key, body, properties in messages:
+            self.channel.basic_publish(exchange=EXCHANGE, routing_key=routing_key, body=body, properties=properties)
+            if self.confirms is not None:
+                tags.append(self.confirms.next_tag())
+        if self.confirms is None:
+            return len(messages)
+
+        deadline = time.monotonic() + timeout
+        while self.confirms.pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.connection.process_data_events(time_limit=remaining)
+        return self.confirms.confirmed_prefix(tags)
+
+    @property
+    def is_open(self) -> bool:
+        return self.connection.is_open and self.channel.is_open
+
+    def close(self):
+        try:
+            if self.connection.is_open:
+                self.connection.close()
+        except Exception:
+            pass
+
+
+class RabbitMQPublisher:
+    """
+    Process-wide pool of long-lived channels to the booking_events exchange.
+
+    A publish checks a channel out, writes the message and puts it back, so
+    the TCP + AMQP handshake and the exchange declaration happen once per
+    pooled connection instead of once per request. Broken connections are
+    replaced with exponential backoff. A housekeeping thread services
+    heartbeats on idle connections, which BlockingConnection only does
+    while it is being called.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        pool_size: int = RABBITMQ_POOL_SIZE,
+        heartbeat: int = RABBITMQ_HEARTBEAT_SECONDS,
+        confirm_delivery: bool = False,
+        connect_attempts: int = RABBITMQ_CONNECT_ATTEMPTS,
+    ):
+        self.params = pika.ConnectionParameters(
+            host=host,
+            port=port,
+            heartbeat=heartbeat,
+            blocked_connection_timeout=heartbeat,
+        )
+        self.pool_size = pool_size
+        self.heartbeat = heartbeat
+        self.confirm_delivery = confirm_delivery
+        self.connect_attempts = connect_attempts
+        # None marks a slot whose connection is opened on first use
+        self._idle: "queue.LifoQueue[Optional[_PooledChannel]]" = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._idle.put(None)
+        self._closed = threading.Event()
+        self._housekeeper: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> _PooledChannel:
+        attempt = 0
+        while True:
+            try:
+                connection = pika.BlockingConnection(self.params)
+                channel = connection.channel()
+                channel.exchange_declare(exchange=EXCHANGE, exchange_type='topic')
+                confirms = None
+                if self.confirm_delivery:
+                    confirms = self._select_confirms(connection, channel)
+                return _PooledChannel(connection, channel, confirms)
+            except pika.exceptions.AMQPConnectionError:
+                attempt += 1
+                if attempt >= self.connect_attempts:
+                    raise
+                time.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+    @staticmethod
+    def _select_confirms(connection, channel) -> _Confirms:
+        # BlockingChannel.confirm_delivery() makes every basic_publish wait for
+        # its own ack and has no wait_for_confirms; the callback goes on the
+        # underlying channel so a whole batch shares one wait
+        confirms = _Confirms(wake=lambda: connection.add_callback_threadsafe(lambda: None))
+        selected = []
+        channel._impl.confirm_delivery(ack_nack_callback=confirms.on_confirm, callback=selected.append)
+        deadline = time.monotonic() + RABBITMQ_CONFIRM_TIMEOUT_SECONDS
+        while not selected:
+            if time.monotonic() >= deadline:
+                connection.close()
+                raise pika.exceptions.AMQPConnectionError("confirm.select timed out")
+            connection.process_data_events(time_limit=0.1)
+        return confirms
+
+    def _ensure_housekeeper(self):
+        with self._lock:
+            if self._housekeeper is None:
+                self._housekeeper = threading.Thread(target=self._service_heartbeats, name="rabbitmq-heartbeats", daemon=True)
+                self._housekeeper.start()
+
+    def _service_heartbeats(self):
+        while not self._closed.wait(max(self.heartbeat / 2, 1)):
+            # Only idle connections; the ones checked out are serviced by their publish
+            idle = []
+            while True:
+                try:
+                    idle.append(self._idle.get_nowait())
+                except queue.Empty:
+                    break
+            for pooled in reversed(idle):
+                try:
+                    if pooled is not None and pooled.is_open:
+                        pooled.connection.process_data_events(time_limit=0)
+                except Exception:
+                    pooled.close()
+                    pooled = None
+                self._idle.put(pooled)
+
+    @contextmanager
+    def channel(self):
+        with self._checkout() as pooled:
+            yield pooled.channel
+
+    @contextmanager
+    def _checkout(self):
+        if self._closed.is_set():
+            raise RuntimeError("RabbitMQ publisher is closed")
+        try:
+            pooled = self._idle.get(timeout=RABBITMQ_CHECKOUT_TIMEOUT_SECONDS)
+        except queue.Empty:
+            raise TimeoutError("No RabbitMQ channel available")
+        try:
+            if pooled is None or not pooled.is_open:
+                pooled = self._open()
+                self._ensure_housekeeper()
+            yield pooled
+        except Exception:
+            # A failed publish leaves the connection in an unknown state: replace it
+            if pooled is not None:
+                pooled.close()
+            pooled = None
+            raise
+        finally:
+            if self._closed.is_set() and pooled is not None:
+                # Closed while checked out: do not return it to a dead pool
+                pooled.close()
+            else:
+                self._idle.put(pooled)
+
+    def publish(self, routing_key: str, body: str, properties: Optional[pika.BasicProperties] = None):
+        """
+        Single basic_publish on a pooled channel; retried once on a fresh connection.
+        In confirm mode it returns only once the broker has acked the message.
+        """
+        for attempt in range(2):
+            try:
+                with self._checkout() as pooled:
+                    if pooled.publish([(routing_key, body, properties)], RABBITMQ_CONFIRM_TIMEOUT_SECONDS) != 1:
+                        # Raised inside the checkout: a channel with unsettled tags is not reused
+                        raise PublishNotConfirmedError(0, "Broker did not confirm the message")
+                return
+            except (pika.exceptions.AMQPConnectionError, pika.exceptions.ChannelClosed, pika.exceptions.StreamLostError):
+                if attempt == 1:
+                    raise
+
+    def publish_batch(self, messages: Sequence[Tuple[str, str, Optional[pika.BasicProperties]]]) -> None:
+        """
+        Publishes every message on one pooled channel and waits once for the
+        broker confirms of the whole batch. Not retried: on a nack, a timeout or
+        a lost connection PublishNotConfirmedError says how many leading
+        messages were confirmed, and the caller decides what to re-send.
+        """
+        if not self.confirm_delivery:
+            raise RuntimeError("publish_batch needs a publisher in confirm mode")
+
+        confirms, first_tag = None, 0
+        try:
+            with self._checkout() as pooled:
+                confirms, first_tag = pooled.confirms, pooled.confirms.last_tag + 1
+                confirmed = pooled.publish(messages, RABBITMQ_CONFIRM_TIMEOUT_SECONDS)
+                if confirmed < len(messages):
+                    raise PublishNotConfirmedError(
+                        confirmed, f"Broker confirmed {confirmed} of {len(messages)} messages"
+                    )
+        except (pika.exceptions.AMQPConnectionError, pika.exceptions.ChannelClosed, pika.exceptions.StreamLostError) as e:
+            # Acks that arrived before the connection dropped still count
+            confirmed = 0
+            if confirms is not None:
+                confirmed = confirms.confirmed_prefix(range(first_tag, confirms.last_tag + 1))
+            raise PublishNotConfirmedError(confirmed, str(e)) from e
+
+    def close(self):
+        self._closed.set()
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if pooled is not None:
+                pooled.close()
+
+
+_publishers: Dict[bool, RabbitMQPublisher] = {}
+_publishers_lock = threading.Lock()
+
+def get_publisher(confirm_delivery: bool = False) -> RabbitMQPublisher:
+    """Process-wide publisher per confirm mode, created on first use (after any fork)."""
+    with _publishers_lock:
+        publisher = _publishers.get(confirm_delivery)
+        if publisher is None or publisher._closed.is_set():
+            publisher = RabbitMQPublisher(
+                os.getenv("RABBITMQ_HOST", "rabbitmq"),
+                int(os.getenv("RABBITMQ_PORT", 5672)),
+                confirm_delivery=confirm_delivery,
+            )
+            _publishers[confirm_delivery] = publisher
+        return publisher
+
+def close_publishers() -> None:
+    """Closes every process-wide publisher; for process shutdown only."""
+    with _publishers_lock:
+        publishers = list(_publishers.values())
+        _publishers.clear()
+    for publisher in publishers:
+        publisher.close()
+
+
 class RabbitMQGateway(EventBusGateway):
-    def __init__(self):
-        self.host = os.getenv("RABBITMQ_HOST", "rabbitmq")
-        self.port = int(os.getenv("RABBITMQ_PORT", 5672))
-        self.connection = None
-        self.channel = None
-
-    def _connect(self):
-        """Conection to RabbitMQ server"""
-        if not self.connection or self.connection.is_closed:
-            params = pika.ConnectionParameters(host=self.host, port=self.port)
-            self.connection = pika.BlockingConnection(params)
-            self.channel = self.connection.channel()
-            self.channel.exchange_declare(exchange='booking_events', exchange_type='topic')
+    def __init__(self, confirm_delivery: bool = False):
+        # With publisher confirms basic_publish returns only once the broker has the message
+        self.confirm_delivery = confirm_delivery
+        self.publisher = get_publisher(confirm_delivery)
+
+    @staticmethod
+    def _persistent(message_id: str | None) -> pika.BasicProperties:
+        # message_id lets consumers drop the duplicates of at-least-once delivery
+        return pika.BasicProperties(
+            content_type="application/json",
+            delivery_mode=pika.DeliveryMode.Persistent,
+            message_id=message_id,
+        )
+
+    def publish_confirmed(self, event_type: str, payload: dict, message_id: str | None = None):
+        """
+        Publishes and, in confirm mode, waits for the broker ack. Unlike publish(),
+        failures are raised so the caller can retry.
+        """
+        self.publisher.publish(event_type, json.dumps(payload), self._persistent(message_id))
+
+    def publish_confirmed_batch(self, events: Sequence[Tuple[str, dict, str | None]]):
+        """
+        Publishes (event_type, payload, message_id) tuples and waits once for all
+        the broker acks (used by the outbox relay). Raises PublishNotConfirmedError
+        with how many leading events were confirmed.
+        """
+        self.publisher.publish_batch([
+            (event_type, json.dumps(payload), self._persistent(message_id))
+            for event_type, payload, message_id in events
+        ])
 
     def publish(self, event_type: str, payload: dict):
         try:
-            self._connect()
-            message = json.dumps(payload)
-            # Routing key
-            routing_key = event_type
-            
-            self.channel.basic_publish(
-                exchange='booking_events',
-                routing_key=routing_key,
-                body=message
-            )
+            self.publisher.publish(event_type, json.dumps(payload))
             print(f"[Evento publicado en RabbitMQ: {event_type}]")
         except Exception as e:
             print(f"[Error publicando en RabbitMQ: {e}]")
-            
\ No newline at end of file
@@ -1,15 +1,115 @@
 import os
+import asyncio
+import json
+import threading
+import weakref
 import grpc
 from datetime import datetime, timezone
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
 
-from src.domain.ports import TimetableGateway
+from src.domain.ports import AsyncTimetableGateway, TimetableGateway, TimetableUnavailableError
 import src.timetable_pb2 as pb2
 import src.timetable_pb2_grpc as pb2_grpc
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
-class TimetableUnavailableError(Exception):
-    pass
+# "epoch" sends int64 milliseconds once the engine confirms it reads them, "iso" always sends ISO 8601 strings
+TIMETABLE_WIRE_FORMAT = os.getenv("TIMETABLE_WIRE_FORMAT", "epoch").lower()
+
+# Per-call deadline; the engine answers index checks in well under a millisecond
+TIMETABLE_DEADLINE_MS = int(os.getenv("TIMETABLE_DEADLINE_MS", 2000))
+# Must stay above the engine's TIMETABLE_MIN_CLIENT_PING_INTERVAL_MS or it closes the connection
+TIMETABLE_KEEPALIVE_TIME_MS = int(os.getenv("TIMETABLE_KEEPALIVE_TIME_MS", 30000))
+TIMETABLE_KEEPALIVE_TIMEOUT_MS = int(os.getenv("TIMETABLE_KEEPALIVE_TIMEOUT_MS", 10000))
+TIMETABLE_MAX_MESSAGE_BYTES = int(os.getenv("TIMETABLE_MAX_MESSAGE_MB", 16)) * 1024 * 1024
+# Attempts per call (1 disables retries); only UNAVAILABLE is retried, every RPC used here is read-only
+TIMETABLE_RETRY_MAX_ATTEMPTS = int(os.getenv("TIMETABLE_RETRY_MAX_ATTEMPTS", 3))
+
+
+def retry_service_config(max_attempts: int = TIMETABLE_RETRY_MAX_ATTEMPTS) -> str:
+    config = {"methodConfig": [{"name": [{"service": "timetable.TimetableChecker"}]}]}
+    if max_attempts > 1:
+        config["methodConfig"][0]["retryPolicy"] = {
+            "maxAttempts": max_attempts,
+            "initialBackoff": "0.05s",
+            "maxBackoff": "0.5s",
+            "backoffMultiplier": 2,
+            "retryableStatusCodes": ["UNAVAILABLE"],
+        }
+    return json.dumps(config)
+
+
+def channel_options() -> list:
+    return [
+        ("grpc.keepalive_time_ms", TIMETABLE_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", TIMETABLE_KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.max_send_message_length", TIMETABLE_MAX_MESSAGE_BYTES),
+        ("grpc.max_receive_message_length", TIMETABLE_MAX_MESSAGE_BYTES),
+        ("grpc.enable_retries", 1),
+        ("grpc.service_config", retry_service_config()),
+    ]
+
+
+def _epoch_ranges_after(error: grpc.RpcError) -> Optional[bool]:
+    """
+    What a failed GetCapabilities says. UNIMPLEMENTED is the definite signal of an engine
+    that predates the epoch fields; any other error leaves the question open for the next call.
+    """
+    if error.code() == grpc.StatusCode.UNIMPLEMENTED:
+        print("[booking-command] Timetable engine has no GetCapabilities, sending ISO ranges")
+        return False
+    return None
+
+
+class _SharedChannel:
+    """One long-lived channel + stub per target, with its last connectivity state."""
+
+    def __init__(self, target: str):
+        self.pid = os.getpid()
+        self.channel = grpc.insecure_channel(target, options=channel_options())
+        self.stub = pb2_grpc.TimetableCheckerStub(self.channel)
+        self.state = grpc.ChannelConnectivity.IDLE
+        # Whether the engine behind this channel reads epoch ranges; None until it says so
+        self.epoch_ranges: Optional[bool] = None
+        # try_to_connect: the HTTP/2 handshake happens now, not on the first booking
+        self.channel.subscribe(self._on_state, try_to_connect=True)
+
+    def _on_state(self, state: grpc.ChannelConnectivity):
+        self.state = state
+        if state != grpc.ChannelConnectivity.READY:
+            # A reconnect may land on another engine build: ask again
+            self.epoch_ranges = None
+
+    def range_encoder(self, timeout: float) -> Callable:
+        """
+        epoch_range once the engine has confirmed it reads epoch fields, iso_range
+        otherwise. Every engine reads ISO, so an unanswered negotiation costs
+        bytes, never correctness.
+        """
+        if TIMETABLE_WIRE_FORMAT != "epoch":
+            return iso_range
+        if self.epoch_ranges is None:
+            try:
+                self.epoch_ranges = self.stub.GetCapabilities(pb2.CapabilitiesRequest(), timeout=timeout).epoch_ranges
+            except grpc.RpcError as e:
+                self.epoch_ranges = _epoch_ranges_after(e)
+        return epoch_range if self.epoch_ranges else iso_range
+
+
+_shared_channels: Dict[str, _SharedChannel] = {}
+_shared_channels_lock = threading.Lock()
+
+def shared_channel(target: str) -> _SharedChannel:
+    """Process-wide channel to `target`; a forked worker opens its own."""
+    with _shared_channels_lock:
+        shared = _shared_channels.get(target)
+        if shared is None or shared.pid != os.getpid():
+            shared = _SharedChannel(target)
+            _shared_channels[target] = shared
+        return shared
 
 
 def ensure_utc(dt: datetime) -> datetime:
@@ -18,33 +118,247 @@ def ensure_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
+def to_epoch_ms(dt: datetime) -> int:
+    delta = ensure_utc(dt) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+
+def from_epoch_ms(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def epoch_range(start: datetime, end: datetime) -> "pb2.TimeRange":
+    return pb2.TimeRange(start_ms=to_epoch_ms(start), end_ms=to_epoch_ms(end))
+
+
+def iso_range(start: datetime, end: datetime) -> "pb2.TimeRange":
+    return pb2.TimeRange(start=ensure_utc(start).isoformat(), end=ensure_utc(end).isoformat())
+
+
+class _SharedAioChannel:
+    """grpc.aio channel + stub; aio channels belong to the event loop that created them."""
+
+    def __init__(self, target: str):
+        self.channel = grpc.aio.insecure_channel(target, options=channel_options())
+        self.stub = pb2_grpc.TimetableCheckerStub(self.channel)
+        self.epoch_ranges: Optional[bool] = None
+
+    async def range_encoder(self, timeout: float) -> Callable:
+        """Same negotiation as _SharedChannel.range_encoder."""
+        if TIMETABLE_WIRE_FORMAT != "epoch":
+            return iso_range
+        if self.epoch_ranges is None:
+            try:
+                self.epoch_ranges = (await self.stub.GetCapabilities(pb2.CapabilitiesRequest(), timeout=timeout)).epoch_ranges
+            except grpc.RpcError as e:
+                self.epoch_ranges = _epoch_ranges_after(e)
+        return epoch_range if self.epoch_ranges else iso_range
+
+
+_shared_aio_channels: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _SharedAioChannel]]" = weakref.WeakKeyDictionary()
+
+def shared_aio_channel(target: str) -> _SharedAioChannel:
+    """Long-lived aio channel to `target` for the running event loop (one per worker in practice)."""
+    per_loop = _shared_aio_channels.setdefault(asyncio.get_running_loop(), {})
+    shared = per_loop.get(target)
+    if shared is None:
+        shared = per_loop[target] = _SharedAioChannel(target)
+    return shared
+
+
 class GrpcTimetableGateway(TimetableGateway):
     def __init__(self):
         host = os.getenv("TIMETABLE_SERVICE_HOST", "timetable-engine")
         port = os.getenv("TIMETABLE_SERVICE_PORT", "50051")
         self.channel_url = f"{host}:{port}"
+        self.deadline_seconds = TIMETABLE_DEADLINE_MS / 1000
+        self._shared = shared_channel(self.channel_url)
+
+    def channel_state(self) -> str:
+        """Connectivity of the shared channel (IDLE, CONNECTING, READY, TRANSIENT_FAILURE, SHUTDOWN)."""
+        return self._shared.state.name
+
+    def probe(self, timeout: float = 1.0) -> bool:
+        """True when the channel is (or gets) connected within `timeout` seconds."""
+        try:
+            grpc.channel_ready_future(self._shared.channel).result(timeout=timeout)
+            return True
+        except grpc.FutureTimeoutError:
+            return False
+
+    def _call(self, method: str, build_request: Callable):
+        """Calls `method` with a request built by `build_request(encode)`, in the encoding the channel negotiated."""
+        encode = self._shared.range_encoder(self.deadline_seconds)
+        return getattr(self._shared.stub, method)(build_request(encode), timeout=self.deadline_seconds)
+
+    def check_availability(self, start: datetime, end: datetime, existing_bookings: List[Tuple[datetime, datetime]]) -> bool:
+        try:
+            response = self._call(
+                "CheckAvailability",
+                lambda encode: pb2.CheckRequest(
+                    candidate=encode(start, end),
+                    existing_bookings=[encode(s, e) for (s, e) in existing_bookings],
+                ),
+            )
+            return not response.has_conflict
+
+        except grpc.RpcError as e:
+            raise TimetableUnavailableError("Timetable engine unavailable") from e
+
+    def check_classroom_availability(self, classroom_id: UUID, start: datetime, end: datetime) -> Optional[bool]:
+        try:
+            response = self._call(
+                "CheckClassroomAvailability",
+                lambda encode: pb2.ClassroomCheckRequest(
+                    classroom_id=str(classroom_id),
+                    candidate=encode(start, end),
+                ),
+            )
+            return not response.has_conflict
+
+        except grpc.RpcError as e:
+            # Index still warming up, or an engine without the RPC: caller falls back to the full check
+            if e.code() in (grpc.StatusCode.FAILED_PRECONDITION, grpc.StatusCode.UNIMPLEMENTED):
+                return None
+            raise TimetableUnavailableError("Timetable engine unavailable") from e
 
-    def check_availability(self,start: datetime,end: datetime,existing_bookings: List[Tuple[str, str]]) -> bool:
+    def check_availability_batch(self, candidates: List[Tuple[datetime, datetime]], existing_bookings: List[Tuple[datetime, datetime]]) -> Tuple[List[bool], List[Tuple[int, int]]]:
         try:
-            with grpc.insecure_channel(self.channel_url) as channel:
-                stub = pb2_grpc.TimetableCheckerStub(channel)
+            response = self._call(
+                "CheckAvailabilityBatch",
+                lambda encode: pb2.BatchCheckRequest(
+                    candidates=[encode(s, e) for (s, e) in candidates],
+                    existing_bookings=[encode(s, e) for (s, e) in existing_bookings],
+                ),
+            )
+            pairs = [(c.first, c.second) for c in response.candidate_conflicts]
+            return list(response.conflicts), pairs
 
-                candidate = pb2.TimeRange(
-                    start=ensure_utc(start).isoformat(),
-                    end=ensure_utc(end).isoformat()
-                )
+        except grpc.RpcError as e:
+            raise TimetableUnavailableError("Timetable engine unavailable") from e
 
-                existing_protos = [
-                    pb2.TimeRange(start=s, end=e) for (s, e) in existing_bookings
-                ]
+    def find_free_slots(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration_minutes: int,
+        *,
+        classroom_id: Optional[UUID] = None,
+        busy: Optional[List[Tuple[datetime, datetime]]] = None,
+        granularity_minutes: int = 0,
+        opening_hours: Optional[List[Tuple[int, int, int]]] = None,
+        utc_offset_minutes: int = 0,
+        max_results: int = 0,
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
+        try:
+            response = self._call(
+                "FindFreeSlots",
+                lambda encode: pb2.FreeSlotsRequest(
+                    classroom_id=str(classroom_id) if classroom_id else "",
+                    busy=[encode(s, e) for (s, e) in (busy or [])],
+                    window=encode(window_start, window_end),
+                    duration_minutes=duration_minutes,
+                    granularity_minutes=granularity_minutes,
+                    opening_hours=[
+                        pb2.OpeningHours(weekday=d, open_minute=o, close_minute=c)
+                        for (d, o, c) in (opening_hours or [])
+                    ],
+                    utc_offset_minutes=utc_offset_minutes,
+                    max_results=max_results,
+                ),
+            )
+            return [(from_epoch_ms(slot.start_ms), from_epoch_ms(slot.end_ms)) for slot in response.slots]
 
-                request = pb2.CheckRequest(
-                    candidate=candidate,
-                    existing_bookings=existing_protos
-                )
+        except grpc.RpcError as e:
+            if classroom_id and e.code() in (grpc.StatusCode.FAILED_PRECONDITION, grpc.StatusCode.UNIMPLEMENTED):
+                return None
+            if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+                raise ValueError(e.details()) from e
+            raise TimetableUnavailableError("Timetable engine unavailable") from e
 
-                response = stub.CheckAvailability(request)
-                return not response.has_conflict
+    def search_available_classrooms(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        min_capacity: int = 0,
+        include_non_operational: bool = False,
+        limit: int = 0,
+    ) -> List[Dict[str, Any]]:
+        try:
+            response = self._call(
+                "SearchAvailableClassrooms",
+                lambda encode: pb2.ClassroomSearchRequest(
+                    window=encode(start, end),
+                    min_capacity=min_capacity,
+                    include_non_operational=include_non_operational,
+                    limit=limit,
+                ),
+            )
+            return [
+                {
+                    "classroom_id": room.classroom_id,
+                    "code": room.code,
+                    "capacity": room.capacity,
+                    "location_details": room.location_details or None,
+                    "is_operational": room.is_operational,
+                }
+                for room in response.classrooms
+            ]
+
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.INVALID_ARGUMENT:
+                raise ValueError(e.details()) from e
+            # FAILED_PRECONDITION (catalog/index warming up) is also "not available yet"
+            raise TimetableUnavailableError("Timetable engine unavailable") from e
+
+
+class AsyncGrpcTimetableGateway(AsyncTimetableGateway):
+    """grpc.aio version of the calls on the create path; same options, deadline and error mapping."""
+
+    def __init__(self):
+        host = os.getenv("TIMETABLE_SERVICE_HOST", "timetable-engine")
+        port = os.getenv("TIMETABLE_SERVICE_PORT", "50051")
+        self.channel_url = f"{host}:{port}"
+        self.deadline_seconds = TIMETABLE_DEADLINE_MS / 1000
+
+    async def _call(self, method: str, build_request: Callable):
+        shared = shared_aio_channel(self.channel_url)
+        encode = await shared.range_encoder(self.deadline_seconds)
+        try:
+            return await getattr(shared.stub, method)(build_request(encode), timeout=self.deadline_seconds)
+        except grpc.RpcError as e:
+            # The engine went away; the one that comes back may be another build
+            if e.code() == grpc.StatusCode.UNAVAILABLE:
+                shared.epoch_ranges = None
+            raise
+
+    async def check_availability(self, start: datetime, end: datetime, existing_bookings: List[Tuple[datetime, datetime]]) -> bool:
+        try:
+            response = await self._call(
+                "CheckAvailability",
+                lambda encode: pb2.CheckRequest(
+                    candidate=encode(start, end),
+                    existing_bookings=[encode(s, e) for (s, e) in existing_bookings],
+                ),
+            )
+            return not response.has_conflict
+
+        except grpc.RpcError as e:
+            raise TimetableUnavailableError("Timetable engine unavailable") from e
+
+    async def check_classroom_availability(self, classroom_id: UUID, start: datetime, end: datetime) -> Optional[bool]:
+        try:
+            response = await self._call(
+                "CheckClassroomAvailability",
+                lambda encode: pb2.ClassroomCheckRequest(
+                    classroom_id=str(classroom_id),
+                    candidate=encode(start, end),
+                ),
+            )
+            return not response.has_conflict
 
         except grpc.RpcError as e:
+            if e.code() in (grpc.StatusCode.FAILED_PRECONDITION, grpc.StatusCode.UNIMPLEMENTED):
+                return None
             raise TimetableUnavailableError("Timetable engine unavailable") from e
@@ -0,0 +1,176 @@
+import os
+import asyncio
+import uuid
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+
+import redis
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.domain.ports import AsyncHoldStore, HoldStore, HoldStoreUnavailableError, SlotHold
+from src.domain.recurrence import as_utc
+from src.domain.service import BOOKING_MAX_DURATION
+
+REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+HOLD_TTL_SECONDS = int(os.getenv("HOLD_TTL_SECONDS", 120))
+HOLD_MAX_TTL_SECONDS = int(os.getenv("HOLD_MAX_TTL_SECONDS", 600))
+# Holds are a fast path: a slow Redis must not make them slower than the full pipeline
+HOLD_REDIS_TIMEOUT_SECONDS = float(os.getenv("HOLD_REDIS_TIMEOUT_SECONDS", 0.5))
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# A hold is bounded like a booking, so only holds starting this far back can overlap
+MAX_DURATION_MS = BOOKING_MAX_DURATION // timedelta(milliseconds=1)
+
+# One sorted set per classroom, scored by start, with members
+# "hold_id|user_id|classroom_id|start_ms|end_ms|expires_ms". Expired members
+# are pruned lazily; the set itself expires with its last hold.
+PLACE_HOLD = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local start_ms, ttl = tonumber(ARGV[4]), tonumber(ARGV[6])
+local held = redis.call('ZRANGEBYSCORE', KEYS[1], start_ms - tonumber(ARGV[7]), '(' .. ARGV[5])
+for _, member in ipairs(held) do
+  local held_end, expires = string.match(member, '|(%d+)|(%d+)$')
+  if tonumber(expires) <= now then
+    redis.call('ZREM', KEYS[1], member)
+  elseif tonumber(held_end) > start_ms then
+    return false
+  end
+end
+local member = table.concat({ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5], string.format('%d', now + ttl)}, '|')
+redis.call('ZADD', KEYS[1], start_ms, member)
+redis.call('SET', KEYS[2], member, 'PX', ttl)
+if redis.call('PTTL', KEYS[1]) < ttl then
+  redis.call('PEXPIRE', KEYS[1], ttl)
+end
+return member
+"""
+
+LIVE_HOLDS = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local start_ms = tonumber(ARGV[1])
+local live = {}
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], start_ms - tonumber(ARGV[3]), '(' .. ARGV[2])) do
+  local held_end, expires = string.match(member, '|(%d+)|(%d+)$')
+  if tonumber(expires) > now and tonumber(held_end) > start_ms then
+    table.insert(live, member)
+  end
+end
+return live
+"""
+
+RELEASE_HOLD = """
+local member = redis.call('GET', KEYS[2])
+if member then
+  redis.call('ZREM', KEYS[1], member)
+end
+return redis.call('DEL', KEYS[2])
+"""
+
+def classroom_holds_key(classroom_id: UUID) -> str:
+    return f"holds:classroom:{classroom_id}"
+
+def hold_key(hold_id: str) -> str:
+    return f"holds:id:{hold_id}"
+
+def to_ms(dt: datetime) -> int:
+    return (as_utc(dt) - EPOCH) // timedelta(milliseconds=1)
+
+def from_ms(ms: str) -> datetime:
+    return EPOCH + timedelta(milliseconds=int(ms))
+
+def decode_hold(member: str) -> SlotHold:
+    hold_id, user_id, classroom_id, start_ms, end_ms, expires_ms = member.split("|")
+    return SlotHold(hold_id, UUID(user_id), UUID(classroom_id), from_ms(start_ms), from_ms(end_ms), from_ms(expires_ms))
+
+
+REDIS_OPTIONS = dict(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    db=0,
+    decode_responses=True,
+    socket_timeout=HOLD_REDIS_TIMEOUT_SECONDS,
+    socket_connect_timeout=HOLD_REDIS_TIMEOUT_SECONDS,
+)
+
+# Connection pool shared by every sync store in the process (created on first connect)
+_sync_client = redis.Redis(**REDIS_OPTIONS)
+
+# redis.asyncio connections are tied to the event loop they are used from: one client per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = weakref.WeakKeyDictionary()
+
+def _async_client() -> aioredis.Redis:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = aioredis.Redis(**REDIS_OPTIONS)
+    return client
+
+
+class RedisHoldStore(HoldStore):
+    """Read side of the holds for BookingService (bulk, series), which only checks them."""
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.redis = client or _sync_client
+        self._live = self.redis.register_script(LIVE_HOLDS)
+
+    def overlapping(self, classroom_id: UUID, start: datetime, end: datetime) -> List[SlotHold]:
+        try:
+            members = self._live(keys=[classroom_holds_key(classroom_id)], args=[to_ms(start), to_ms(end), MAX_DURATION_MS])
+        except RedisError as e:
+            raise HoldStoreUnavailableError(str(e)) from e
+        return [decode_hold(member) for member in members]
+
+
+class AsyncRedisHoldStore(AsyncHoldStore):
+    """
+    Tentative holds in Redis. Placing one is a single script run: it checks
+    the classroom's live holds and adds the new one atomically, so of many
+    users racing for a slot exactly one gets it, without touching Postgres.
+    Holds expire on their own; the bookings table stays the source of truth.
+    """
+
+    def __init__(self, client: Optional[aioredis.Redis] = None):
+        self.redis = client or _async_client()
+        self._place = self.redis.register_script(PLACE_HOLD)
+        self._live = self.redis.register_script(LIVE_HOLDS)
+        self._release = self.redis.register_script(RELEASE_HOLD)
+
+    async def place(self, user_id: UUID, classroom_id: UUID, start: datetime, end: datetime, ttl_seconds: int) -> Optional[SlotHold]:
+        hold_id = str(uuid.uuid4())
+        try:
+            member = await self._place(
+                keys=[classroom_holds_key(classroom_id), hold_key(hold_id)],
+                args=[hold_id, str(user_id), str(classroom_id), to_ms(start), to_ms(end), ttl_seconds * 1000, MAX_DURATION_MS],
+            )
+        except RedisError as e:
+            raise HoldStoreUnavailableError(str(e)) from e
+        return decode_hold(member) if member else None
+
+    async def get(self, hold_id: str) -> Optional[SlotHold]:
+        try:
+            member = await self.redis.get(hold_key(hold_id))
+        except RedisError as e:
+            raise HoldStoreUnavailableError(str(e)) from e
+        return decode_hold(member) if member is not None else None
+
+    async def overlapping(self, classroom_id: UUID, start: datetime, end: datetime) -> List[SlotHold]:
+        try:
+            members = await self._live(
+                keys=[classroom_holds_key(classroom_id)],
+                args=[to_ms(start), to_ms(end), MAX_DURATION_MS],
+            )
+        except RedisError as e:
+            raise HoldStoreUnavailableError(str(e)) from e
+        return [decode_hold(member) for member in members]
+
+    async def release(self, hold: SlotHold) -> None:
+        try:
+            await self._release(keys=[classroom_holds_key(hold.classroom_id), hold_key(hold.hold_id)])
+        except RedisError as e:
+            raise HoldStoreUnavailableError(str(e)) from e
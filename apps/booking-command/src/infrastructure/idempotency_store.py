@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.domain.models import IdempotencyKey
+from src.domain.ports import IdempotencyKeyReusedError, IdempotencyStore
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+IDEMPOTENCY_PURGE_SECONDS = float(os.getenv("IDEMPOTENCY_PURGE_SECONDS", 300))
+IDEMPOTENCY_PURGE_BATCH = 5000
+
+# Second namespace next to BOOKING_LOCK_NAMESPACE: one lock per (user, key)
+IDEMPOTENCY_LOCK_NAMESPACE = 0x4944
+
+def idempotency_lock_key(user_id: UUID, key: str) -> int:
+    crc = zlib.crc32(f"{user_id}:{key}".encode())
+    return crc - (1 << 32) if crc >= (1 << 31) else crc
+
+
+class PostgresIdempotencyStore(IdempotencyStore):
+    """
+    idempotency_keys on the request's own session: the key is locked for the
+    rest of the transaction, and the outcome is written with the booking, so
+    a retry either waits and replays it or finds nothing was committed.
+    """
+
+    def __init__(self, db: AsyncSession, ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS):
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+
+    async def claim(self, user_id: UUID, key: str, request_hash: str) -> Optional[Dict[str, Any]]:
+        await self.db.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :key)"),
+            {"namespace": IDEMPOTENCY_LOCK_NAMESPACE, "key": idempotency_lock_key(user_id, key)},
+        )
+        row: IdempotencyKey | None = await self.db.get(IdempotencyKey, (user_id, key))
+        if row is None:
+            return None
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        if row.created_at is not None and row.created_at < cutoff:
+            # Expired but not purged yet: the key starts over
+            await self.db.delete(row)
+            await self.db.flush()
+            return None
+
+        if row.request_hash != request_hash:
+            raise IdempotencyKeyReusedError("Idempotency-Key ya utilizada con otra solicitud")
+        return row.response
+
+    def remember(self, user_id: UUID, key: str, request_hash: str, response: Dict[str, Any]) -> None:
+        self.db.add(IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash, response=response))
+
+
+def purge_expired_keys(session_factory: Callable[[], Session], ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS) -> int:
+    """Deletes expired keys in small batches so the purge never holds many row locks."""
+    purged = 0
+    while True:
+        db = session_factory()
+        try:
+            deleted = db.execute(
+                text(
+                    "DELETE FROM idempotency_keys WHERE ctid IN ("
+                    " SELECT ctid FROM idempotency_keys"
+                    " WHERE created_at < now() - make_interval(secs => :ttl)"
+                    " LIMIT :batch)"
+                ),
+                {"ttl": ttl_seconds, "batch": IDEMPOTENCY_PURGE_BATCH},
+            ).rowcount
+            db.commit()
+        finally:
+            db.close()
+        purged += deleted
+        if deleted < IDEMPOTENCY_PURGE_BATCH:
+            return purged
+
+
+def start_idempotency_janitor(session_factory: Callable[[], Session]) -> None:
+    def _purge_forever():
+        while True:
+            try:
+                purged = purge_expired_keys(session_factory)
+                if purged:
+                    print(f"[booking-command] Idempotency keys purged: {purged}")
+            except Exception as e:
+                print(f"[booking-command] Idempotency purge failed: {e}")
+            time.sleep(IDEMPOTENCY_PURGE_SECONDS)
+
+    threading.Thread(target=_purge_forever, name="idempotency-janitor", daemon=True).start()
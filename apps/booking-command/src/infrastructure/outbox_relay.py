@@ -0,0 +1,130 @@
+import os
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.domain.models import OutboxEvent
+from src.metrics.latency import timed
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "0.2"))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "30"))
+
+# Advisory lock held while a batch is relayed: with several replicas only one
+# drains at a time, so events keep their commit order. Own namespace: classroom
+# locks use BOOKING_LOCK_NAMESPACE with every possible int4 key
+OUTBOX_LOCK_NAMESPACE = 0x4F42
+OUTBOX_LOCK_KEY = 0
+
+class OutboxRelay:
+    """
+    Drains outbox_events into RabbitMQ in id order, in batches.
+
+    A batch is published in one go and its publisher confirms are awaited
+    once; the longest confirmed prefix is deleted in the same transaction that
+    read it. A crash between the broker ack and that commit re-sends the
+    batch, so delivery is at-least-once and every message carries the outbox
+    id as message_id.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        publisher,
+        *,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def relay_batch(self) -> int:
+        """Relays up to batch_size events; returns how many were confirmed."""
+        db = self.session_factory()
+        try:
+            locked = db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:namespace, :key)"),
+                {"namespace": OUTBOX_LOCK_NAMESPACE, "key": OUTBOX_LOCK_KEY},
+            ).scalar()
+            if not locked:
+                db.rollback()
+                return 0
+
+            events = db.query(OutboxEvent).order_by(OutboxEvent.id).limit(self.batch_size).all()
+
+            confirmed, error = len(events), None
+            if events:
+                try:
+                    # Broker publish is off the request path since the outbox; timed here instead, per batch
+                    with timed("broker_publish"):
+                        self.publisher.publish_confirmed_batch(
+                            [(event.event_type, event.payload, str(event.id)) for event in events]
+                        )
+                except Exception as e:
+                    # Only the leading events the broker confirmed are done; the rest stay, in order, for the next batch
+                    confirmed, error = getattr(e, "confirmed", 0), e
+
+            if confirmed:
+                confirmed_ids = [event.id for event in events[:confirmed]]
+                db.query(OutboxEvent).filter(OutboxEvent.id.in_(confirmed_ids)).delete(synchronize_session=False)
+            db.commit()
+
+            if error is not None:
+                raise error
+            return confirmed
+        finally:
+            db.close()
+
+    def run(self) -> None:
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                relayed = self.relay_batch()
+                attempt = 0
+            except Exception as e:
+                attempt += 1
+                wait = min(2 ** attempt, OUTBOX_MAX_BACKOFF_SECONDS)
+                # The pool already dropped the connection that failed; the shared publisher stays open
+                print(f"[booking-command] Outbox relay error: ({e}). Reintentando en {wait}s...")
+                self._stop.wait(wait)
+                continue
+
+            # A full batch means there is probably more waiting
+            if relayed < self.batch_size:
+                self._stop.wait(self.poll_seconds)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.run, name="outbox-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def create_relay() -> OutboxRelay:
+    from src.infrastructure.database import SessionLocal
+    from src.infrastructure.gateways.rabbitmq_gateway import RabbitMQGateway
+
+    return OutboxRelay(SessionLocal, RabbitMQGateway(confirm_delivery=True))
+
+
+if __name__ == "__main__":
+    # Standalone relay: python -m src.infrastructure.outbox_relay
+    from src.infrastructure.gateways.rabbitmq_gateway import close_publishers
+
+    relay = create_relay()
+    print("[booking-command] Outbox relay started")
+    try:
+        relay.run()
+    except KeyboardInterrupt:
+        relay.stop()
+    finally:
+        close_publishers()
@@ -0,0 +1,133 @@
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Session-level advisory lock with its own namespace: classroom locks use
+# BOOKING_LOCK_NAMESPACE with every possible int4 key
+MAINTENANCE_LOCK_NAMESPACE = 0x5041
+MAINTENANCE_LOCK_KEY = 0
+
+# Partition DDL waits behind long queries on bookings, and bookings writes would
+# queue behind it: give up quickly and retry on the next run instead
+MAINTENANCE_LOCK_TIMEOUT = "2s"
+
+# Partitions kept ready ahead of today; a booking beyond them is rejected with 422
+BOOKING_PARTITION_MONTHS_AHEAD = int(os.getenv("BOOKING_PARTITION_MONTHS_AHEAD", 24))
+# Whole months older than this move to bookings_archive (0 disables archival)
+BOOKING_ARCHIVE_AFTER_MONTHS = int(os.getenv("BOOKING_ARCHIVE_AFTER_MONTHS", 12))
+PARTITION_MAINTENANCE_SECONDS = float(os.getenv("PARTITION_MAINTENANCE_SECONDS", 6 * 3600))
+
+PARTITION_NAME = re.compile(r"^bookings_(\d{4})_(\d{2})$")
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def months_to_create(today: date, months_ahead: int = BOOKING_PARTITION_MONTHS_AHEAD) -> List[date]:
+    current = today.replace(day=1)
+    return [add_months(current, i) for i in range(months_ahead + 1)]
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def partitions_to_archive(partitions: List[str], today: date, archive_after_months: int = BOOKING_ARCHIVE_AFTER_MONTHS) -> List[str]:
+    """Partitions whose whole month ended at least `archive_after_months` months before the current one."""
+    if archive_after_months <= 0:
+        return []
+    cutoff = add_months(today.replace(day=1), -archive_after_months)
+    old = []
+    for name in partitions:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            old.append(name)
+    return sorted(old)
+
+def archive_bound(name: str) -> str:
+    """Same bounds create_booking_partition gives the month (UTC midnights)."""
+    month = partition_month(name)
+    return f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{add_months(month, 1)} 00:00:00+00')"
+
+
+def maintain_partitions(session_factory: Callable[[], Session], today: Optional[date] = None) -> List[str]:
+    """
+    Creates the monthly partitions up to the horizon and archives the expired
+    ones. Safe to run from every replica: only one holds the maintenance lock.
+    Returns the archived partitions.
+
+    Archiving uses DETACH PARTITION ... CONCURRENTLY, which only takes SHARE
+    UPDATE EXCLUSIVE on bookings, so reads and writes go on while it waits
+    for them (a plain DETACH takes ACCESS EXCLUSIVE). CONCURRENTLY cannot run
+    inside a transaction, hence the autocommit connection. A run interrupted
+    between the detach and the attach is finished by the next one.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    db = session_factory()
+    try:
+        conn = db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+        lock = {"namespace": MAINTENANCE_LOCK_NAMESPACE, "key": MAINTENANCE_LOCK_KEY}
+        if not conn.execute(text("SELECT pg_try_advisory_lock(:namespace, :key)"), lock).scalar():
+            return []
+
+        try:
+            conn.execute(text(f"SET lock_timeout = '{MAINTENANCE_LOCK_TIMEOUT}'"))
+            for month in months_to_create(today):
+                conn.execute(text("SELECT create_booking_partition(:month)"), {"month": month})
+
+            # Monthly tables with their parent: bookings, bookings_archive, or none if an
+            # earlier run stopped between detach and attach
+            tables = conn.execute(
+                text(
+                    "SELECT c.relname, p.relname, coalesce(i.inhdetachpending, false)"
+                    " FROM pg_class c"
+                    " LEFT JOIN pg_inherits i ON i.inhrelid = c.oid"
+                    " LEFT JOIN pg_class p ON p.oid = i.inhparent"
+                    " WHERE c.relkind = 'r' AND c.relname ~ '^bookings_[0-9]{4}_[0-9]{2}$'"
+                )
+            ).all()
+            live = [name for name, parent, pending in tables if parent == "bookings" and not pending]
+            pending = sorted(name for name, parent, detaching in tables if parent == "bookings" and detaching)
+            detached = sorted(name for name, parent, _ in tables if parent is None)
+
+            archived = partitions_to_archive(live, today)
+            # Names match PARTITION_NAME, so they are safe to quote into the DDL
+            for name in pending:
+                conn.execute(text(f'ALTER TABLE bookings DETACH PARTITION "{name}" FINALIZE'))
+            for name in archived:
+                conn.execute(text(f'ALTER TABLE bookings DETACH PARTITION "{name}" CONCURRENTLY'))
+            # The detach left a CHECK matching the bounds, so attaching does not scan the rows
+            for name in sorted(pending + detached + archived):
+                conn.execute(text(f'ALTER TABLE bookings_archive ATTACH PARTITION "{name}" {archive_bound(name)}'))
+            return sorted(pending + detached + archived)
+        finally:
+            conn.execute(text("RESET lock_timeout"))
+            conn.execute(text("SELECT pg_advisory_unlock(:namespace, :key)"), lock)
+    finally:
+        db.close()
+
+
+def start_partition_maintenance(session_factory: Callable[[], Session]) -> None:
+    def _maintain_forever():
+        while True:
+            try:
+                archived = maintain_partitions(session_factory)
+                if archived:
+                    print(f"[booking-command] Partitions archived: {', '.join(archived)}")
+            except Exception as e:
+                print(f"[booking-command] Partition maintenance failed: {e}")
+            time.sleep(PARTITION_MAINTENANCE_SECONDS)
+
+    threading.Thread(target=_maintain_forever, name="partition-maintenance", daemon=True).start()
+
+
+if __name__ == "__main__":
+    # One-off run, e.g. from cron: python -m src.infrastructure.partitions
+    from src.infrastructure.database import SessionLocal
+
+    print(f"[booking-command] Partitions archived: {maintain_partitions(SessionLocal)}")
@@ -1,10 +1,22 @@
 import os
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from src.api.router import router
 from src.middlewares.audit_middleware import audit_middleware
+from src.middlewares.server_timing_middleware import server_timing_middleware
+from src.metrics.latency import render_metrics
+from src.infrastructure.outbox_relay import create_relay
+from src.infrastructure.classroom_replica import get_replica, start_classroom_sync
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.idempotency_store import start_idempotency_janitor
+from src.infrastructure.partitions import start_partition_maintenance
+from src.infrastructure.gateways.timetable_gateway import GrpcTimetableGateway
+from src.infrastructure.gateways.rabbitmq_gateway import close_publishers
 
 ENV = os.getenv("ENV", "development").lower()
 ENABLE_DOCS = os.getenv("ENABLE_DOCS", "true").lower() == "true"
+# Set to false when the relay runs as its own process (python -m src.infrastructure.outbox_relay)
+OUTBOX_RELAY_ENABLED = os.getenv("OUTBOX_RELAY_ENABLED", "true").lower() == "true"
 
 if ENV == "production":
     ENABLE_DOCS = False
@@ -28,9 +40,55 @@ app = FastAPI(
 )
 
 app.middleware("http")(audit_middleware)
+app.middleware("http")(server_timing_middleware)
 
 app.include_router(router, prefix="/api/v1/bookings", tags=["bookings"])
 
+outbox_relay = create_relay() if OUTBOX_RELAY_ENABLED else None
+
+@app.on_event("startup")
+def start_outbox_relay():
+    if outbox_relay is not None:
+        outbox_relay.start()
+
+@app.on_event("startup")
+def start_classroom_replica():
+    # Warm-up runs in the background: until it lands, lookups read through to classroom-service
+    start_classroom_sync(get_replica())
+
+@app.on_event("startup")
+def start_idempotency_purge():
+    start_idempotency_janitor(SessionLocal)
+
+@app.on_event("startup")
+def start_partition_jobs():
+    # Keeps monthly bookings partitions ahead of today and archives the expired ones
+    start_partition_maintenance(SessionLocal)
+
+@app.on_event("shutdown")
+def stop_outbox_relay():
+    if outbox_relay is not None:
+        outbox_relay.stop()
+
+@app.on_event("shutdown")
+def close_rabbitmq_publishers():
+    # After the relay: the pooled connections are shared by every publisher in the process
+    close_publishers()
+
 @app.get("/health", tags=["health"])
 def health_check():
-    return {"status": "ok", "service": "booking-command", "env": ENV, "docs": ENABLE_DOCS}
+    # Non-blocking: last known state of the shared timetable-engine channel
+    timetable = GrpcTimetableGateway().channel_state()
+    return {
+        "status": "ok",
+        "service": "booking-command",
+        "env": ENV,
+        "docs": ENABLE_DOCS,
+        "timetable": timetable,
+        "classrooms_replicated": len(get_replica()),
+    }
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text exposition format, per process
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,99 @@
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; covers a replica hit (~µs) up to a slow engine deadline
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class Histogram:
+    """
+    Prometheus-style histogram with one label, kept in process memory.
+    observe() is a bisect plus a short critical section, cheap enough for every request.
+    """
+
+    def __init__(self, name: str, documentation: str, label: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        # label value -> [count per bucket..., count above the last bucket], sum
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float) -> None:
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            counts = self._counts.get(label_value)
+            if counts is None:
+                counts = self._counts[label_value] = [0] * (len(self.buckets) + 1)
+                self._sums[label_value] = 0.0
+            counts[i] += 1
+            self._sums[label_value] += seconds
+
+    def render(self) -> str:
+        with self._lock:
+            snapshot = [(v, list(c), self._sums[v]) for v, c in sorted(self._counts.items())]
+
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for value, counts, total in snapshot:
+            label = f'{self.label}="{value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+STAGE_SECONDS = Histogram(
+    "booking_stage_seconds",
+    "Time spent in each step of booking writes (classroom lookup, queries, engine, insert, outbox, commit).",
+    label="stage",
+)
+REQUEST_SECONDS = Histogram(
+    "booking_request_seconds",
+    "End-to-end request time by route.",
+    label="route",
+)
+
+# Stages of the request being served; shared with the tasks it spawns (asyncio.gather)
+_request_stages: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_stages", default=None)
+
+def track_request() -> Tuple[List[Tuple[str, float]], Token]:
+    stages: List[Tuple[str, float]] = []
+    return stages, _request_stages.set(stages)
+
+def untrack_request(token: Token) -> None:
+    _request_stages.reset(token)
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Records the block under `stage` in the histogram and in the current request's Server-Timing."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        STAGE_SECONDS.observe(stage, elapsed)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages.append((stage, elapsed))
+
+def server_timing(stages: List[Tuple[str, float]], total: float) -> str:
+    """Server-Timing header value; repeated stages (e.g. one lock per room) are added up."""
+    totals: Dict[str, float] = {}
+    for stage, seconds in stages:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in totals.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+def render_metrics() -> str:
+    return STAGE_SECONDS.render() + REQUEST_SECONDS.render()
@@ -6,6 +6,7 @@ SERVICE_NAME = "booking-command"
 
 EXCLUDE_PREFIXES = (
     "/health",
+    "/metrics",
     "/docs",
     "/redoc",
     "/openapi.json",
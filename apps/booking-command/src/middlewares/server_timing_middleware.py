@@ -0,0 +1,30 @@
+from time import perf_counter
+from fastapi import Request
+from src.metrics.latency import REQUEST_SECONDS, server_timing, track_request, untrack_request
+
+EXCLUDE_PREFIXES = (
+    "/health",
+    "/metrics",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+)
+
+async def server_timing_middleware(request: Request, call_next):
+    if request.url.path.startswith(EXCLUDE_PREFIXES):
+        return await call_next(request)
+
+    stages, token = track_request()
+    start = perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        untrack_request(token)
+    total = perf_counter() - start
+
+    # Route template, not the raw path, to keep the label set bounded
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(f"{request.method} {route.path if route else 'unmatched'}", total)
+
+    response.headers["Server-Timing"] = server_timing(stages, total)
+    return response
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0ftimetable.proto\x12\ttimetable\"\'\n\tTimeRange\x12\r\n\x05start\x18\x01 \x01(\t\x12\x0b\n\x03\x65nd\x18\x02 \x01(\t\"h\n\x0c\x43heckRequest\x12\'\n\tcandidate\x18\x01 \x01(\x0b\x32\x14.timetable.TimeRange\x12/\n\x11\x65xisting_bookings\x18\x02 \x03(\x0b\x32\x14.timetable.TimeRange\"?\n\rCheckResponse\x12\x14\n\x0chas_conflict\x18\x01 \x01(\x08\x12\x18\n\x10\x63onflict_details\x18\x02 \x01(\t2Z\n\x10TimetableChecker\x12\x46\n\x11\x43heckAvailability\x12\x17.timetable.CheckRequest\x1a\x18.timetable.CheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0ftimetable.proto\x12\ttimetable\"I\n\tTimeRange\x12\r\n\x05start\x18\x01 \x01(\t\x12\x0b\n\x03\x65nd\x18\x02 \x01(\t\x12\x10\n\x08start_ms\x18\x03 \x01(\x03\x12\x0e\n\x06\x65nd_ms\x18\x04 \x01(\x03\"h\n\x0c\x43heckRequest\x12\'\n\tcandidate\x18\x01 \x01(\x0b\x32\x14.timetable.TimeRange\x12/\n\x11\x65xisting_bookings\x18\x02 \x03(\x0b\x32\x14.timetable.TimeRange\"V\n\x15\x43lassroomCheckRequest\x12\x14\n\x0c\x63lassroom_id\x18\x01 \x01(\t\x12\'\n\tcandidate\x18\x02 \x01(\x0b\x32\x14.timetable.TimeRange\"?\n\rCheckResponse\x12\x14\n\x0chas_conflict\x18\x01 \x01(\x08\x12\x18\n\x10\x63onflict_details\x18\x02 \x01(\t\"n\n\x11\x42\x61tchCheckRequest\x12(\n\ncandidates\x18\x01 \x03(\x0b\x32\x14.timetable.TimeRange\x12/\n\x11\x65xisting_bookings\x18\x02 \x03(\x0b\x32\x14.timetable.TimeRange\"2\n\x11\x43\x61ndidateConflict\x12\r\n\x05\x66irst\x18\x01 \x01(\x05\x12\x0e\n\x06second\x18\x02 \x01(\x05\"b\n\x12\x42\x61tchCheckResponse\x12\x11\n\tconflicts\x18\x01 \x03(\x08\x12\x39\n\x13\x63\x61ndidate_conflicts\x18\x02 \x03(\x0b\x32\x1c.timetable.CandidateConflict\"J\n\x0cOpeningHours\x12\x0f\n\x07weekday\x18\x01 \x01(\x05\x12\x13\n\x0bopen_minute\x18\x02 \x01(\x05\x12\x14\n\x0c\x63lose_minute\x18\x03 \x01(\x05\"\x8a\x02\n\x10\x46reeSlotsRequest\x12\x14\n\x0c\x63lassroom_id\x18\x01 \x01(\t\x12\"\n\x04\x62usy\x18\x02 \x03(\x0b\x32\x14.timetable.TimeRange\x12$\n\x06window\x18\x03 \x01(\x0b\x32\x14.timetable.TimeRange\x12\x18\n\x10\x64uration_minutes\x18\x04 \x01(\x05\x12\x1b\n\x13granularity_minutes\x18\x05 \x01(\x05\x12.\n\ropening_hours\x18\x06 \x03(\x0b\x32\x17.timetable.OpeningHours\x12\x1a\n\x12utc_offset_minutes\x18\x07 \x01(\x05\x12\x13\n\x0bmax_results\x18\x08 \x01(\x05\"8\n\x11\x46reeSlotsResponse\x12#\n\x05slots\x18\x01 \x03(\x0b\x32\x14.timetable.TimeRange\"\x84\x01\n\x16\x43lassroomSearchRequest\x12$\n\x06window\x18\x01 \x01(\x0b\x32\x14.timetable.TimeRange\x12\x14\n\x0cmin_capacity\x18\x02 \x01(\x05\x12\x1f\n\x17include_non_operational\x18\x03 \x01(\x08\x12\r\n\x05limit\x18\x04 \x01(\x05\"\x7f\n\x15\x43lassroomAvailability\x12\x14\n\x0c\x63lassroom_id\x18\x01 \x01(\t\x12\x0c\n\x04\x63ode\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61pacity\x18\x03 \x01(\x05\x12\x18\n\x10location_details\x18\x04 \x01(\t\x12\x16\n\x0eis_operational\x18\x05 \x01(\x08\"O\n\x17\x43lassroomSearchResponse\x12\x34\n\nclassrooms\x18\x01 \x03(\x0b\x32 .timetable.ClassroomAvailability\"\x83\x01\n\rCourseSession\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0f\n\x07subject\x18\x02 \x01(\t\x12\x18\n\x10\x64uration_minutes\x18\x03 \x01(\x05\x12\x18\n\x10weekly_frequency\x18\x04 \x01(\x05\x12\x19\n\x11required_capacity\x18\x05 \x01(\x05\"2\n\x08RoomSpec\x12\x14\n\x0c\x63lassroom_id\x18\x01 \x01(\t\x12\x10\n\x08\x63\x61pacity\x18\x02 \x01(\x05\"\xff\x01\n\x10TimetableRequest\x12*\n\x08sessions\x18\x01 \x03(\x0b\x32\x18.timetable.CourseSession\x12\'\n\nclassrooms\x18\x02 \x03(\x0b\x32\x13.timetable.RoomSpec\x12\x10\n\x08weekdays\x18\x03 \x03(\x05\x12\x18\n\x10\x64\x61y_start_minute\x18\x04 \x01(\x05\x12\x16\n\x0e\x64\x61y_end_minute\x18\x05 \x01(\x05\x12\x1b\n\x13granularity_minutes\x18\x06 \x01(\x05\x12\x16\n\x0etime_budget_ms\x18\x07 \x01(\x05\x12\x0f\n\x07workers\x18\x08 \x01(\x05\x12\x0c\n\x04seed\x18\t \x01(\x03\"w\n\x10SessionPlacement\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x14\n\x0c\x63lassroom_id\x18\x02 \x01(\t\x12\x0f\n\x07weekday\x18\x03 \x01(\x05\x12\x14\n\x0cstart_minute\x18\x04 \x01(\x05\x12\x12\n\nend_minute\x18\x05 \x01(\x05\"5\n\x0fUnplacedSession\x12\x12\n\nsession_id\x18\x01 \x01(\t\x12\x0e\n\x06reason\x18\x02 \x01(\t\"\x86\x01\n\x11TimetableResponse\x12/\n\nplacements\x18\x01 \x03(\x0b\x32\x1b.timetable.SessionPlacement\x12,\n\x08unplaced\x18\x02 \x03(\x0b\x32\x1a.timetable.UnplacedSession\x12\x12\n\niterations\x18\x03 \x01(\x05\"\x15\n\x13\x43\x61pabilitiesRequest\",\n\x14\x43\x61pabilitiesResponse\x12\x14\n\x0c\x65poch_ranges\x18\x01 \x01(\x08\x32\xdf\x04\n\x10TimetableChecker\x12\x46\n\x11\x43heckAvailability\x12\x17.timetable.CheckRequest\x1a\x18.timetable.CheckResponse\x12X\n\x1a\x43heckClassroomAvailability\x12 .timetable.ClassroomCheckRequest\x1a\x18.timetable.CheckResponse\x12U\n\x16\x43heckAvailabilityBatch\x12\x1c.timetable.BatchCheckRequest\x1a\x1d.timetable.BatchCheckResponse\x12J\n\rFindFreeSlots\x12\x1b.timetable.FreeSlotsRequest\x1a\x1c.timetable.FreeSlotsResponse\x12\x62\n\x19SearchAvailableClassrooms\x12!.timetable.ClassroomSearchRequest\x1a\".timetable.ClassroomSearchResponse\x12N\n\x11GenerateTimetable\x12\x1b.timetable.TimetableRequest\x1a\x1c.timetable.TimetableResponse\x12R\n\x0fGetCapabilities\x12\x1e.timetable.CapabilitiesRequest\x1a\x1f.timetable.CapabilitiesResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -32,11 +32,47 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'timetable_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_TIMERANGE']._serialized_start=30
-  _globals['_TIMERANGE']._serialized_end=69
-  _globals['_CHECKREQUEST']._serialized_start=71
-  _globals['_CHECKREQUEST']._serialized_end=175
-  _globals['_CHECKRESPONSE']._serialized_start=177
-  _globals['_CHECKRESPONSE']._serialized_end=240
-  _globals['_TIMETABLECHECKER']._serialized_start=242
-  _globals['_TIMETABLECHECKER']._serialized_end=332
+  _globals['_TIMERANGE']._serialized_end=103
+  _globals['_CHECKREQUEST']._serialized_start=105
+  _globals['_CHECKREQUEST']._serialized_end=209
+  _globals['_CLASSROOMCHECKREQUEST']._serialized_start=211
+  _globals['_CLASSROOMCHECKREQUEST']._serialized_end=297
+  _globals['_CHECKRESPONSE']._serialized_start=299
+  _globals['_CHECKRESPONSE']._serialized_end=362
+  _globals['_BATCHCHECKREQUEST']._serialized_start=364
+  _globals['_BATCHCHECKREQUEST']._serialized_end=474
+  _globals['_CANDIDATECONFLICT']._serialized_start=476
+  _globals['_CANDIDATECONFLICT']._serialized_end=526
+  _globals['_BATCHCHECKRESPONSE']._serialized_start=528
+  _globals['_BATCHCHECKRESPONSE']._serialized_end=626
+  _globals['_OPENINGHOURS']._serialized_start=628
+  _globals['_OPENINGHOURS']._serialized_end=702
+  _globals['_FREESLOTSREQUEST']._serialized_start=705
+  _globals['_FREESLOTSREQUEST']._serialized_end=971
+  _globals['_FREESLOTSRESPONSE']._serialized_start=973
+  _globals['_FREESLOTSRESPONSE']._serialized_end=1029
+  _globals['_CLASSROOMSEARCHREQUEST']._serialized_start=1032
+  _globals['_CLASSROOMSEARCHREQUEST']._serialized_end=1164
+  _globals['_CLASSROOMAVAILABILITY']._serialized_start=1166
+  _globals['_CLASSROOMAVAILABILITY']._serialized_end=1293
+  _globals['_CLASSROOMSEARCHRESPONSE']._serialized_start=1295
+  _globals['_CLASSROOMSEARCHRESPONSE']._serialized_end=1374
+  _globals['_COURSESESSION']._serialized_start=1377
+  _globals['_COURSESESSION']._serialized_end=1508
+  _globals['_ROOMSPEC']._serialized_start=1510
+  _globals['_ROOMSPEC']._serialized_end=1560
+  _globals['_TIMETABLEREQUEST']._serialized_start=1563
+  _globals['_TIMETABLEREQUEST']._serialized_end=1818
+  _globals['_SESSIONPLACEMENT']._serialized_start=1820
+  _globals['_SESSIONPLACEMENT']._serialized_end=1939
+  _globals['_UNPLACEDSESSION']._serialized_start=1941
+  _globals['_UNPLACEDSESSION']._serialized_end=1994
+  _globals['_TIMETABLERESPONSE']._serialized_start=1997
+  _globals['_TIMETABLERESPONSE']._serialized_end=2131
+  _globals['_CAPABILITIESREQUEST']._serialized_start=2133
+  _globals['_CAPABILITIESREQUEST']._serialized_end=2154
+  _globals['_CAPABILITIESRESPONSE']._serialized_start=2156
+  _globals['_CAPABILITIESRESPONSE']._serialized_end=2200
+  _globals['_TIMETABLECHECKER']._serialized_start=2203
+  _globals['_TIMETABLECHECKER']._serialized_end=2810
 # @@protoc_insertion_point(module_scope)
@@ -40,6 +40,36 @@ class TimetableCheckerStub(object):
                 request_serializer=timetable__pb2.CheckRequest.SerializeToString,
                 response_deserializer=timetable__pb2.CheckResponse.FromString,
                 _registered_method=True)
+        self.CheckClassroomAvailability = channel.unary_unary(
+                '/timetable.TimetableChecker/CheckClassroomAvailability',
+                request_serializer=timetable__pb2.ClassroomCheckRequest.SerializeToString,
+                response_deserializer=timetable__pb2.CheckResponse.FromString,
+                _registered_method=True)
+        self.CheckAvailabilityBatch = channel.unary_unary(
+                '/timetable.TimetableChecker/CheckAvailabilityBatch',
+                request_serializer=timetable__pb2.BatchCheckRequest.SerializeToString,
+                response_deserializer=timetable__pb2.BatchCheckResponse.FromString,
+                _registered_method=True)
+        self.FindFreeSlots = channel.unary_unary(
+                '/timetable.TimetableChecker/FindFreeSlots',
+                request_serializer=timetable__pb2.FreeSlotsRequest.SerializeToString,
+                response_deserializer=timetable__pb2.FreeSlotsResponse.FromString,
+                _registered_method=True)
+        self.SearchAvailableClassrooms = channel.unary_unary(
+                '/timetable.TimetableChecker/SearchAvailableClassrooms',
+                request_serializer=timetable__pb2.ClassroomSearchRequest.SerializeToString,
+                response_deserializer=timetable__pb2.ClassroomSearchResponse.FromString,
+                _registered_method=True)
+        self.GenerateTimetable = channel.unary_unary(
+                '/timetable.TimetableChecker/GenerateTimetable',
+                request_serializer=timetable__pb2.TimetableRequest.SerializeToString,
+                response_deserializer=timetable__pb2.TimetableResponse.FromString,
+                _registered_method=True)
+        self.GetCapabilities = channel.unary_unary(
+                '/timetable.TimetableChecker/GetCapabilities',
+                request_serializer=timetable__pb2.CapabilitiesRequest.SerializeToString,
+                response_deserializer=timetable__pb2.CapabilitiesResponse.FromString,
+                _registered_method=True)
 
 
 class TimetableCheckerServicer(object):
@@ -53,6 +83,50 @@ class TimetableCheckerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CheckClassroomAvailability(self, request, context):
+        """Igual que CheckAvailability pero contra el índice en memoria del aula:
+        solo viaja el candidato. FAILED_PRECONDITION si el índice aún no está listo.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CheckAvailabilityBatch(self, request, context):
+        """Valida muchos candidatos contra las mismas reservas existentes en una sola llamada
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def FindFreeSlots(self, request, context):
+        """Huecos libres de un aula dentro de una ventana, respetando el horario de apertura
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchAvailableClassrooms(self, request, context):
+        """Aulas libres en una ventana con capacidad mínima (catálogo + índice del motor)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GenerateTimetable(self, request, context):
+        """Genera un horario semanal sin choques para las sesiones de un periodo
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetCapabilities(self, request, context):
+        """Qué codificaciones entiende este motor; los clientes lo consultan una vez por canal.
+        Un motor anterior responde UNIMPLEMENTED: solo entiende TimeRange en ISO 8601.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_TimetableCheckerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -61,6 +135,36 @@ def add_TimetableCheckerServicer_to_server(servicer, server):
                     request_deserializer=timetable__pb2.CheckRequest.FromString,
                     response_serializer=timetable__pb2.CheckResponse.SerializeToString,
             ),
+            'CheckClassroomAvailability': grpc.unary_unary_rpc_method_handler(
+                    servicer.CheckClassroomAvailability,
+                    request_deserializer=timetable__pb2.ClassroomCheckRequest.FromString,
+                    response_serializer=timetable__pb2.CheckResponse.SerializeToString,
+            ),
+            'CheckAvailabilityBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.CheckAvailabilityBatch,
+                    request_deserializer=timetable__pb2.BatchCheckRequest.FromString,
+                    response_serializer=timetable__pb2.BatchCheckResponse.SerializeToString,
+            ),
+            'FindFreeSlots': grpc.unary_unary_rpc_method_handler(
+                    servicer.FindFreeSlots,
+                    request_deserializer=timetable__pb2.FreeSlotsRequest.FromString,
+                    response_serializer=timetable__pb2.FreeSlotsResponse.SerializeToString,
+            ),
+            'SearchAvailableClassrooms': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchAvailableClassrooms,
+                    request_deserializer=timetable__pb2.ClassroomSearchRequest.FromString,
+                    response_serializer=timetable__pb2.ClassroomSearchResponse.SerializeToString,
+            ),
+            'GenerateTimetable': grpc.unary_unary_rpc_method_handler(
+                    servicer.GenerateTimetable,
+                    request_deserializer=timetable__pb2.TimetableRequest.FromString,
+                    response_serializer=timetable__pb2.TimetableResponse.SerializeToString,
+            ),
+            'GetCapabilities': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCapabilities,
+                    request_deserializer=timetable__pb2.CapabilitiesRequest.FromString,
+                    response_serializer=timetable__pb2.CapabilitiesResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'timetable.TimetableChecker', rpc_method_handlers)
@@ -99,3 +203,165 @@ class TimetableChecker(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def CheckClassroomAvailability(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/timetable.TimetableChecker/CheckClassroomAvailability',
+            timetable__pb2.ClassroomCheckRequest.SerializeToString,
+            timetable__pb2.CheckResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CheckAvailabilityBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/timetable.TimetableChecker/CheckAvailabilityBatch',
+            timetable__pb2.BatchCheckRequest.SerializeToString,
+            timetable__pb2.BatchCheckResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def FindFreeSlots(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/timetable.TimetableChecker/FindFreeSlots',
+            timetable__pb2.FreeSlotsRequest.SerializeToString,
+            timetable__pb2.FreeSlotsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SearchAvailableClassrooms(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/timetable.TimetableChecker/SearchAvailableClassrooms',
+            timetable__pb2.ClassroomSearchRequest.SerializeToString,
+            timetable__pb2.ClassroomSearchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GenerateTimetable(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/timetable.TimetableChecker/GenerateTimetable',
+            timetable__pb2.TimetableRequest.SerializeToString,
+            timetable__pb2.TimetableResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetCapabilities(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/timetable.TimetableChecker/GetCapabilities',
+            timetable__pb2.CapabilitiesRequest.SerializeToString,
+            timetable__pb2.CapabilitiesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
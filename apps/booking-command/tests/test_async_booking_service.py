@@ -0,0 +1,508 @@
+# tests/test_async_booking_service.py
+import asyncio
+import uuid
+import fakeredis
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from src.domain.async_service import AsyncBookingService
+from src.domain.models import Booking, BookingSeries, IdempotencyKey
+from src.domain.service import (
+    BookingForbiddenError,
+    ClassroomNotFoundError,
+    HoldNotFoundError,
+    ScheduleConflictError,
+)
+from src.domain.ports import HoldStoreUnavailableError, IdempotencyKeyReusedError, SlotHold, TimetableUnavailableError
+from src.infrastructure.hold_store import AsyncRedisHoldStore, hold_key
+from src.infrastructure.idempotency_store import PostgresIdempotencyStore
+
+# ----------------------------
+# Fakes / Doubles
+# ----------------------------
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+
+class FakeAsyncSession:
+    def __init__(self):
+        self.bookings = {}  # confirmadas por commit
+        self.staged = {}    # escritas en la transacción en curso
+        self.series = []
+        self.log = []
+        self.committed = False
+        self.rolled_back = False
+
+    def _rows(self):
+        return {**self.bookings, **self.staged}
+
+    def _begin(self):
+        # Cualquier operación tras un commit abre una transacción nueva
+        self.committed = False
+
+    async def execute(self, statement, params=None):
+        self._begin()
+        if params is not None:
+            # pg_advisory_xact_lock
+            self.log.append("lock")
+            return FakeResult([])
+        entity = statement.column_descriptions[0]["entity"]
+        if entity is BookingSeries:
+            return FakeResult(list(self.series))
+        return FakeResult([(b.start_time, b.end_time) for b in self._rows().values()
+                           if isinstance(b, Booking) and b.status == "CONFIRMED"])
+
+    async def get(self, model, ident):
+        self._begin()
+        return self._rows().get(ident)
+
+    def add(self, obj):
+        self._begin()
+        if isinstance(obj, IdempotencyKey):
+            self.staged[(obj.user_id, obj.key)] = obj
+            return
+        if getattr(obj, "id", None) is None:
+            obj.id = uuid.uuid4()
+        self.staged[obj.id] = obj
+
+    async def delete(self, obj):
+        self.bookings.pop((obj.user_id, obj.key), None)
+
+    async def flush(self):
+        self.log.append("flush")
+
+    async def refresh(self, obj):
+        pass
+
+    async def commit(self):
+        self.log.append("commit")
+        self.bookings.update(self.staged)
+        self.staged.clear()
+        self.committed = True
+
+    async def rollback(self):
+        self.log.append("rollback")
+        self.staged.clear()
+        self.rolled_back = True
+
+
+class FakeAsyncClassroomGateway:
+    def __init__(self, classroom=None, started=None, release=None):
+        self.classroom = classroom
+        self.started = started
+        self.release = release
+        self.calls = 0
+
+    async def get_classroom(self, classroom_id):
+        self.calls += 1
+        if self.started is not None:
+            self.started.set()
+            await self.release.wait()
+        return self.classroom
+
+
+class FakeAsyncTimetableGateway:
+    def __init__(self, index_available=True, available=True, raise_error=False, started=None, release=None):
+        self.index_available = index_available
+        self.available = available
+        self.raise_error = raise_error
+        self.started = started
+        self.release = release
+        self.full_checks = 0
+        self.index_checks = 0
+
+    async def check_classroom_availability(self, classroom_id, start_time, end_time):
+        self.index_checks += 1
+        if self.started is not None:
+            self.started.set()
+            await self.release.wait()
+        if self.raise_error:
+            raise TimetableUnavailableError("Connection refused")
+        return self.index_available
+
+    async def check_availability(self, start_time, end_time, existing_intervals):
+        if self.raise_error:
+            raise TimetableUnavailableError("Connection refused")
+        self.full_checks += 1
+        return self.available
+
+
+class FakeEventBus:
+    def __init__(self, session):
+        self.session = session
+        self.published = []
+
+    def publish(self, topic, payload):
+        # Con el outbox el evento se escribe en la misma transacción, antes del commit
+        assert not self.session.committed
+        self.published.append((topic, payload))
+
+
+class FakeHoldStore:
+    def __init__(self, raise_error=False):
+        self.holds = {}
+        self.raise_error = raise_error
+
+    def _check(self):
+        if self.raise_error:
+            raise HoldStoreUnavailableError("Connection refused")
+
+    async def place(self, user_id, classroom_id, start, end, ttl_seconds):
+        self._check()
+        if await self.overlapping(classroom_id, start, end):
+            return None
+        hold = SlotHold(str(uuid.uuid4()), user_id, classroom_id, start, end,
+                        datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds))
+        self.holds[hold.hold_id] = hold
+        return hold
+
+    async def get(self, hold_id):
+        self._check()
+        return self.holds.get(hold_id)
+
+    async def overlapping(self, classroom_id, start, end):
+        self._check()
+        return [h for h in self.holds.values()
+                if h.classroom_id == classroom_id and h.start_time < end and h.end_time > start]
+
+    async def release(self, hold):
+        self._check()
+        self.holds.pop(hold.hold_id, None)
+
+
+def make_service(classroom=None, timetable=None, mode="optional", holds=None):
+    db = FakeAsyncSession()
+    bus = FakeEventBus(db)
+    service = AsyncBookingService(
+        db=db,
+        classroom_gateway=FakeAsyncClassroomGateway(classroom if classroom is not None else {"is_operational": True}),
+        timetable_gateway=timetable or FakeAsyncTimetableGateway(),
+        event_bus=bus,
+        timetable_check_mode=mode,
+        idempotency_store=PostgresIdempotencyStore(db),
+        hold_store=holds if holds is not None else FakeHoldStore(),
+    )
+    return service, db, bus
+
+
+def window(hours_from_now=24, duration=1):
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(hours=hours_from_now)
+    return start, start + timedelta(hours=duration)
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_create_booking_writes_event_before_commit():
+    service, db, bus = make_service()
+    start, end = window()
+
+    booking = asyncio.run(service.create_booking(uuid.uuid4(), uuid.uuid4(), start, end, subject="Cálculo"))
+
+    assert booking.status == "CONFIRMED"
+    assert db.log == ["lock", "flush", "commit"]
+    assert bus.published[0][0] == "booking.created"
+    assert bus.published[0][1]["subject"] == "Cálculo"
+
+
+def test_create_booking_conflict_rolls_back():
+    timetable = FakeAsyncTimetableGateway(index_available=False)
+    service, db, bus = make_service(timetable=timetable)
+    start, end = window()
+
+    with pytest.raises(ScheduleConflictError):
+        asyncio.run(service.create_booking(uuid.uuid4(), uuid.uuid4(), start, end))
+
+    assert db.rolled_back and not db.committed
+    assert bus.published == []
+
+
+def test_missing_classroom_rolls_back():
+    service, db, _ = make_service(classroom={})
+    service.classroom_gw.classroom = None
+    start, end = window()
+
+    with pytest.raises(ClassroomNotFoundError):
+        asyncio.run(service.create_booking(uuid.uuid4(), uuid.uuid4(), start, end))
+
+    assert db.rolled_back
+    assert db.bookings == {}
+
+
+def test_classroom_lookup_overlaps_engine_check():
+    async def scenario():
+        classroom_started, engine_started = asyncio.Event(), asyncio.Event()
+        release = asyncio.Event()
+        service, db, _ = make_service(
+            timetable=FakeAsyncTimetableGateway(started=engine_started, release=release),
+        )
+        service.classroom_gw = FakeAsyncClassroomGateway({"is_operational": True}, classroom_started, release)
+        start, end = window()
+
+        task = asyncio.create_task(service.create_booking(uuid.uuid4(), uuid.uuid4(), start, end))
+        # Ambas llamadas remotas están en vuelo a la vez antes de que ninguna responda
+        await asyncio.wait_for(asyncio.gather(classroom_started.wait(), engine_started.wait()), timeout=1)
+        release.set()
+        return await task
+
+    assert asyncio.run(scenario()).status == "CONFIRMED"
+
+
+def test_index_not_ready_falls_back_to_full_check():
+    timetable = FakeAsyncTimetableGateway(index_available=None, available=True)
+    service, db, _ = make_service(timetable=timetable)
+    start, end = window()
+
+    asyncio.run(service.create_booking(uuid.uuid4(), uuid.uuid4(), start, end))
+
+    assert timetable.full_checks == 1
+
+
+def test_optional_mode_survives_engine_outage():
+    timetable = FakeAsyncTimetableGateway(raise_error=True)
+    service, db, _ = make_service(timetable=timetable, mode="optional")
+    start, end = window()
+
+    booking = asyncio.run(service.create_booking(uuid.uuid4(), uuid.uuid4(), start, end))
+
+    assert booking.status == "CONFIRMED"
+    assert db.committed
+
+
+def test_required_mode_propagates_engine_outage():
+    timetable = FakeAsyncTimetableGateway(raise_error=True)
+    service, db, _ = make_service(timetable=timetable, mode="required")
+    start, end = window()
+
+    with pytest.raises(TimetableUnavailableError):
+        asyncio.run(service.create_booking(uuid.uuid4(), uuid.uuid4(), start, end))
+
+    assert db.rolled_back
+
+
+def test_cancel_booking_checks_owner_and_publishes():
+    service, db, bus = make_service()
+    start, end = window()
+    owner = uuid.uuid4()
+    booking = asyncio.run(service.create_booking(owner, uuid.uuid4(), start, end))
+
+    with pytest.raises(BookingForbiddenError):
+        asyncio.run(service.cancel_booking(booking.id, uuid.uuid4(), requester_role="STUDENT"))
+
+    cancelled = asyncio.run(service.cancel_booking(booking.id, owner, requester_role="STUDENT"))
+
+    assert cancelled.status == "CANCELLED"
+    assert bus.published[-1][0] == "booking.canceled"
+    assert db.committed
+
+
+def test_replayed_idempotency_key_returns_original_booking_without_side_effects():
+    service, db, bus = make_service()
+    start, end = window()
+    user, room = uuid.uuid4(), uuid.uuid4()
+
+    first = asyncio.run(service.create_booking(user, room, start, end, subject="Redes", idempotency_key="k-1"))
+    # La reserva se cancela después; el reintento devuelve la respuesta original
+    db.bookings[first.id].status = "CANCELLED"
+    db.log.clear()
+
+    replay = asyncio.run(service.create_booking(user, room, start, end, subject="Redes", idempotency_key="k-1"))
+
+    assert replay.id == first.id
+    assert replay.status == "CONFIRMED"
+    assert service.classroom_gw.calls == 1
+    assert service.timetable_gw.index_checks == 1
+    assert len(bus.published) == 1
+    assert db.log == ["lock", "rollback"]
+
+
+def test_idempotency_key_reused_with_another_request_is_rejected():
+    service, db, _ = make_service()
+    start, end = window()
+    user, room = uuid.uuid4(), uuid.uuid4()
+    asyncio.run(service.create_booking(user, room, start, end, subject="Redes", idempotency_key="k-1"))
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        asyncio.run(service.create_booking(user, room, start, end, subject="Otra", idempotency_key="k-1"))
+
+    # La misma clave de otro usuario es independiente
+    other = asyncio.run(service.create_booking(uuid.uuid4(), uuid.uuid4(), *window(48), idempotency_key="k-1"))
+    assert other.status == "CONFIRMED"
+
+
+def test_failed_create_does_not_keep_the_key():
+    timetable = FakeAsyncTimetableGateway(index_available=False)
+    service, db, _ = make_service(timetable=timetable)
+    start, end = window()
+    user, room = uuid.uuid4(), uuid.uuid4()
+
+    with pytest.raises(ScheduleConflictError):
+        asyncio.run(service.create_booking(user, room, start, end, idempotency_key="k-1"))
+
+    # El reintento se evalúa de nuevo
+    timetable.index_available = True
+    booking = asyncio.run(service.create_booking(user, room, start, end, idempotency_key="k-1"))
+    assert booking.status == "CONFIRMED"
+
+
+def test_expired_key_starts_over():
+    service, db, bus = make_service()
+    start, end = window()
+    user = uuid.uuid4()
+    asyncio.run(service.create_booking(user, uuid.uuid4(), start, end, idempotency_key="k-1"))
+    db.bookings[(user, "k-1")].created_at = datetime.now(timezone.utc) - timedelta(days=2)
+
+    again = asyncio.run(service.create_booking(user, uuid.uuid4(), *window(48), idempotency_key="k-1"))
+
+    assert again.status == "CONFIRMED"
+    assert len(bus.published) == 2
+
+
+def test_losing_hold_fails_fast_without_remote_calls():
+    service, db, _ = make_service()
+    start, end = window()
+    room = uuid.uuid4()
+    asyncio.run(service.place_hold(uuid.uuid4(), room, start, end, ttl_seconds=60))
+    service.classroom_gw.calls = service.timetable_gw.index_checks = 0
+
+    with pytest.raises(ScheduleConflictError):
+        asyncio.run(service.place_hold(uuid.uuid4(), room, start + timedelta(minutes=30), end, ttl_seconds=60))
+
+    # El perdedor no consulta aulas, ni el motor, ni Postgres
+    assert service.classroom_gw.calls == 0
+    assert service.timetable_gw.index_checks == 0
+    assert db.log == []
+
+
+def test_hold_on_booked_slot_is_released():
+    timetable = FakeAsyncTimetableGateway(index_available=False)
+    service, _, _ = make_service(timetable=timetable)
+    start, end = window()
+
+    with pytest.raises(ScheduleConflictError):
+        asyncio.run(service.place_hold(uuid.uuid4(), uuid.uuid4(), start, end, ttl_seconds=60))
+
+    assert service.holds.holds == {}
+
+
+def test_hold_from_another_user_blocks_direct_booking():
+    service, db, bus = make_service()
+    start, end = window()
+    holder, room = uuid.uuid4(), uuid.uuid4()
+    asyncio.run(service.place_hold(holder, room, start, end, ttl_seconds=60))
+
+    with pytest.raises(ScheduleConflictError):
+        asyncio.run(service.create_booking(uuid.uuid4(), room, start, end))
+
+    # Se comprueba con el aula bloqueada, como las reservas
+    assert db.log == ["lock", "rollback"]
+    assert bus.published == []
+
+    # El titular de la retención sí puede reservar la franja
+    booking = asyncio.run(service.create_booking(holder, room, start, end))
+    assert booking.status == "CONFIRMED"
+
+
+def test_confirm_hold_books_releases_and_replays():
+    service, db, bus = make_service()
+    start, end = window()
+    user, room = uuid.uuid4(), uuid.uuid4()
+    hold = asyncio.run(service.place_hold(user, room, start, end, ttl_seconds=60))
+
+    booking = asyncio.run(service.confirm_hold(hold.hold_id, user, subject="Redes"))
+
+    assert booking.classroom_id == room and booking.start_time == start
+    assert service.holds.holds == {}
+    assert db.committed
+
+    # Reintento tras consumir la retención: misma reserva, sin nuevos eventos
+    replay = asyncio.run(service.confirm_hold(hold.hold_id, user, subject="Redes"))
+    assert replay.id == booking.id
+    assert len(bus.published) == 1
+
+
+def test_confirm_unknown_or_foreign_hold_is_not_found():
+    service, _, _ = make_service()
+    start, end = window()
+    hold = asyncio.run(service.place_hold(uuid.uuid4(), uuid.uuid4(), start, end, ttl_seconds=60))
+
+    with pytest.raises(HoldNotFoundError):
+        asyncio.run(service.confirm_hold(hold.hold_id, uuid.uuid4(), subject="Redes"))
+    with pytest.raises(HoldNotFoundError):
+        asyncio.run(service.confirm_hold(str(uuid.uuid4()), hold.user_id, subject="Redes"))
+
+
+def test_hold_store_outage_does_not_block_bookings():
+    service, db, _ = make_service(holds=FakeHoldStore(raise_error=True))
+    start, end = window()
+
+    booking = asyncio.run(service.create_booking(uuid.uuid4(), uuid.uuid4(), start, end))
+
+    assert booking.status == "CONFIRMED"
+    assert db.committed
+
+
+def test_overlap_across_a_month_boundary_is_caught_when_the_index_lags():
+    service, db, bus = make_service(timetable=FakeAsyncTimetableGateway(index_available=True))
+    room = uuid.uuid4()
+    existing = Booking(id=uuid.uuid4(), user_id=uuid.uuid4(), classroom_id=room, status="CONFIRMED",
+                       start_time=datetime(2027, 1, 31, 23, tzinfo=timezone.utc),
+                       end_time=datetime(2027, 2, 1, 1, tzinfo=timezone.utc))
+    db.bookings[existing.id] = existing
+
+    with pytest.raises(ScheduleConflictError):
+        asyncio.run(service.create_booking(uuid.uuid4(), room,
+                                           datetime(2027, 2, 1, 0, 30, tzinfo=timezone.utc),
+                                           datetime(2027, 2, 1, 2, tzinfo=timezone.utc)))
+
+    assert "flush" not in db.log
+    assert bus.published == []
+
+
+def redis_hold_service():
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    service, db, bus = make_service(holds=AsyncRedisHoldStore(redis))
+    return service, redis
+
+
+def test_confirming_an_expired_hold_is_not_found():
+    async def scenario():
+        service, redis = redis_hold_service()
+        user = uuid.uuid4()
+        hold = await service.place_hold(user, uuid.uuid4(), *window(), ttl_seconds=60)
+        await redis.pexpire(hold_key(hold.hold_id), 1)
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(HoldNotFoundError):
+            await service.confirm_hold(hold.hold_id, user, subject="Redes")
+        return service.db
+
+    db = asyncio.run(scenario())
+    assert db.bookings == {}
+
+
+def test_only_the_owner_can_release_a_hold():
+    async def scenario():
+        service, _ = redis_hold_service()
+        owner, room = uuid.uuid4(), uuid.uuid4()
+        start, end = window()
+        hold = await service.place_hold(owner, room, start, end, ttl_seconds=60)
+
+        with pytest.raises(HoldNotFoundError):
+            await service.release_hold(hold.hold_id, uuid.uuid4())
+        # La retención sigue en pie y bloquea a los demás
+        with pytest.raises(ScheduleConflictError):
+            await service.place_hold(uuid.uuid4(), room, start, end, ttl_seconds=60)
+
+        await service.release_hold(hold.hold_id, owner)
+        return await service.place_hold(uuid.uuid4(), room, start, end, ttl_seconds=60)
+
+    assert asyncio.run(scenario()) is not None
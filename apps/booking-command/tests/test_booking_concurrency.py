@@ -0,0 +1,182 @@
+# tests/test_booking_concurrency.py
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from src.domain.models import Booking
+from src.domain.service import BookingService, ScheduleConflictError
+
+BASE = datetime(2026, 3, 2, 8, tzinfo=timezone.utc)
+
+# ----------------------------
+# Base de datos en memoria con advisory locks por transacción
+# ----------------------------
+
+class FakeDatabase:
+    """Filas confirmadas compartidas entre sesiones y locks pg_advisory_xact_lock."""
+
+    def __init__(self):
+        self.rows = []
+        self.mutex = threading.Lock()
+        self.advisory_locks = {}
+
+    def advisory_lock(self, key):
+        with self.mutex:
+            lock = self.advisory_locks.setdefault(key, threading.Lock())
+        lock.acquire()
+        return lock
+
+
+class FakeQuery:
+    def __init__(self, database, entities):
+        self.database = database
+        # query(BookingSeries) devuelve objetos; aquí no hay series
+        self.columns = [e.key for e in entities if not isinstance(e, type)]
+
+    def filter(self, *args):
+        return self
+
+    def all(self):
+        if not self.columns:
+            return []
+        # Read committed: solo lo que otras transacciones ya confirmaron
+        with self.database.mutex:
+            rows = [b for b in self.database.rows if isinstance(b, Booking) and b.status == "CONFIRMED"]
+        return [tuple(getattr(b, c) for c in self.columns) for b in rows]
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+        self.pending = []
+        self.held = []
+
+    def execute(self, statement, params=None):
+        if "pg_advisory_xact_lock" in str(statement):
+            self.held.append(self.database.advisory_lock((params["namespace"], params["key"])))
+
+    def query(self, *entities):
+        return FakeQuery(self.database, entities)
+
+    def add(self, obj):
+        obj.id = obj.id or uuid.uuid4()
+        self.pending.append(obj)
+
+    def flush(self):
+        pass
+
+    def commit(self):
+        with self.database.mutex:
+            self.database.rows.extend(self.pending)
+        self._end()
+
+    def rollback(self):
+        self._end()
+
+    def refresh(self, obj):
+        pass
+
+    def _end(self):
+        self.pending = []
+        while self.held:
+            self.held.pop().release()
+
+
+class ClassroomGateway:
+    def get_classroom(self, classroom_id):
+        return {"is_operational": True}
+
+
+class EventBus:
+    def publish(self, topic, payload):
+        pass
+
+
+class SlowTimetableGateway:
+    """Comprueba solapes de verdad, pero tarda lo suficiente para que las carreras ocurran."""
+
+    def __init__(self, barrier=None):
+        self.barrier = barrier
+
+    def check_classroom_availability(self, classroom_id, start_time, end_time):
+        return None
+
+    def check_availability(self, start_time, end_time, existing_intervals):
+        if self.barrier is not None:
+            self.barrier.wait()
+        time.sleep(0.001)
+        return not any(s < end_time and start_time < e for s, e in existing_intervals)
+
+
+def make_service(database, timetable_gateway):
+    return BookingService(
+        db=FakeSession(database),
+        classroom_gateway=ClassroomGateway(),
+        timetable_gateway=timetable_gateway,
+        event_bus=EventBus(),
+        timetable_check_mode="required",
+    )
+
+
+def try_create(database, timetable_gateway, classroom_id, start, end):
+    try:
+        make_service(database, timetable_gateway).create_booking(uuid.uuid4(), classroom_id, start, end, "Carrera")
+        return True
+    except ScheduleConflictError:
+        return False
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_hundreds_of_parallel_creates_on_one_room_never_double_book():
+    database = FakeDatabase()
+    gateway = SlowTimetableGateway()
+    classroom_id = uuid.uuid4()
+    rng = random.Random(7)
+    # 300 candidatos de 1-2 h en 12 h: casi todos chocan con algún otro
+    candidates = []
+    for _ in range(300):
+        start = BASE + timedelta(minutes=30 * rng.randrange(24))
+        candidates.append((start, start + timedelta(hours=rng.randint(1, 2))))
+
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        results = list(pool.map(lambda c: try_create(database, gateway, classroom_id, *c), candidates))
+
+    booked = sorted((b.start_time, b.end_time) for b in database.rows)
+    assert sum(results) == len(booked) > 0
+    assert all(prev_end <= start for (_, prev_end), (start, _) in zip(booked, booked[1:]))
+
+
+def test_identical_parallel_creates_book_exactly_once():
+    database = FakeDatabase()
+    gateway = SlowTimetableGateway()
+    classroom_id = uuid.uuid4()
+
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        results = list(pool.map(
+            lambda _: try_create(database, gateway, classroom_id, BASE, BASE + timedelta(hours=1)),
+            range(200),
+        ))
+
+    assert sum(results) == 1
+    assert len(database.rows) == 1
+
+
+def test_creates_for_different_rooms_run_in_parallel():
+    rooms = 8
+    database = FakeDatabase()
+    # Cada creación espera a que las 8 estén dentro de la comprobación a la vez:
+    # con un lock global la barrera expiraría
+    gateway = SlowTimetableGateway(barrier=threading.Barrier(rooms, timeout=5))
+
+    with ThreadPoolExecutor(max_workers=rooms) as pool:
+        results = list(pool.map(
+            lambda _: try_create(database, gateway, uuid.uuid4(), BASE, BASE + timedelta(hours=1)),
+            range(rooms),
+        ))
+
+    assert all(results)
@@ -0,0 +1,241 @@
+# tests/test_booking_export.py
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from src.domain.models import BookingSeries
+from src.infrastructure.booking_export import iter_ndjson, keyset_page_query
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+from src.api.router import router  # noqa: E402
+from src.infrastructure.database import get_db  # noqa: E402
+
+# ----------------------------
+# Fakes / Doubles
+# ----------------------------
+
+class FakeResult:
+    def __init__(self, rows, chunk):
+        self.rows = rows
+        self.chunk = chunk
+
+    def partitions(self):
+        for i in range(0, len(self.rows), self.chunk):
+            yield self.rows[i:i + self.chunk]
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.options = None
+        self.closed = False
+
+    def execute(self, statement):
+        self.options = statement.get_execution_options()
+        return FakeResult(self.rows, self.options["yield_per"])
+
+    def close(self):
+        self.closed = True
+
+
+def booking_row(i, status="CONFIRMED"):
+    start = datetime(2026, 3, 2, 8, 0, tzinfo=timezone.utc) + timedelta(hours=i)
+    return (uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), status, start, start + timedelta(hours=1), f"Materia {i}")
+
+
+def compile_sql(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_keyset_page_seeks_by_id_without_offset():
+    cursor = uuid.uuid4()
+
+    sql = compile_sql(keyset_page_query(cursor, 1000, "CONFIRMED"))
+
+    assert "bookings.id > " in sql
+    assert "ORDER BY bookings.id" in sql
+    assert "OFFSET" not in sql
+
+
+def test_first_page_has_no_cursor_filter():
+    sql = compile_sql(keyset_page_query(None, 1000))
+
+    assert "WHERE" not in sql
+
+
+def test_ndjson_export_streams_every_row_in_chunks():
+    rows = [booking_row(i) for i in range(12)]
+    session = FakeSession(rows)
+
+    chunks = list(iter_ndjson(lambda: session, chunk_rows=5))
+
+    # Un trozo por cada lote del cursor del servidor
+    assert len(chunks) == 3
+    assert session.options["yield_per"] == 5
+    assert session.closed
+
+    docs = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+    assert [d["booking_id"] for d in docs] == [str(r[0]) for r in rows]
+    assert docs[0]["start_time"] == rows[0][4].isoformat()
+    assert docs[0]["subject"] == "Materia 0"
+
+
+def test_ndjson_export_closes_session_when_client_disconnects():
+    session = FakeSession([booking_row(i) for i in range(10)])
+
+    stream = iter_ndjson(lambda: session, chunk_rows=2)
+    next(stream)
+    stream.close()
+
+    assert session.closed
+
+
+# ----------------------------
+# GET /internal/bookings
+# ----------------------------
+
+class FakeRows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeListSession:
+    """Evalúa la página como lo haría Postgres sobre filas (id, ..., start_time, ...)."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, statement):
+        compiled = statement.compile()
+        limit, offset = compiled.params.get("param_1"), compiled.params.get("param_2", 0)
+        after = compiled.params.get("id_1")
+        first_key = statement._order_by_clauses[0]
+        if getattr(first_key, "element", first_key).key == "start_time":
+            ordered = sorted(self.rows, key=lambda r: r[4], reverse=True)
+        else:
+            ordered = sorted((r for r in self.rows if after is None or r[0] > after), key=lambda r: r[0])
+        return FakeRows(ordered[offset:offset + limit])
+
+
+def list_client(rows):
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/bookings")
+    app.dependency_overrides[get_db] = lambda: FakeListSession(rows)
+    return TestClient(app)
+
+
+def test_deprecated_offset_still_pages_through_every_booking():
+    rows = [booking_row(i) for i in range(5)]
+    client = list_client(rows)
+
+    pages = [client.get("/api/v1/bookings/internal/bookings", params={"limit": 2, "offset": offset})
+             for offset in (0, 2, 4)]
+
+    assert all(r.status_code == 200 and r.headers["Deprecation"] == "true" for r in pages)
+    ids = [item["booking_id"] for r in pages for item in r.json()["items"]]
+    # Mismo orden que antes del paginado por clave: las que empiezan más tarde primero
+    assert ids == [str(r[0]) for r in sorted(rows, key=lambda r: r[4], reverse=True)]
+
+
+def test_after_cursor_pages_by_id():
+    rows = [booking_row(i) for i in range(5)]
+    client = list_client(rows)
+
+    first = client.get("/api/v1/bookings/internal/bookings", params={"limit": 3}).json()
+    second = client.get("/api/v1/bookings/internal/bookings", params={"limit": 3, "after": first["next_cursor"]}).json()
+
+    ids = [item["booking_id"] for item in first["items"] + second["items"]]
+    assert ids == sorted(str(r[0]) for r in rows)
+    assert second["next_cursor"] is None
+
+
+def test_offset_and_after_together_are_rejected():
+    client = list_client([])
+
+    r = client.get("/api/v1/bookings/internal/bookings", params={"offset": 2, "after": str(uuid.uuid4())})
+
+    assert r.status_code == 422
+    assert "after" in r.json()["detail"]
+
+
+# ----------------------------
+# GET /internal/series
+# ----------------------------
+
+class FakeSeriesQuery:
+    """Aplica los filtros `columna == valor` y `columna > valor` sobre objetos BookingSeries."""
+
+    def __init__(self, series):
+        self.series = series
+        self.size = None
+
+    def filter(self, criterion):
+        key, value = criterion.left.key, criterion.right.value
+        if criterion.operator.__name__ == "gt":
+            self.series = [s for s in self.series if getattr(s, key) > value]
+        else:
+            self.series = [s for s in self.series if getattr(s, key) == value]
+        return self
+
+    def order_by(self, column):
+        self.series = sorted(self.series, key=lambda s: getattr(s, column.key))
+        return self
+
+    def offset(self, n):
+        raise AssertionError("/internal/series no pagina por OFFSET")
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def all(self):
+        return self.series[:self.size]
+
+
+class FakeSeriesSession:
+    def __init__(self, series):
+        self.series = series
+
+    def query(self, model):
+        return FakeSeriesQuery(list(self.series))
+
+
+def weekly_series(i, status="CONFIRMED"):
+    start = datetime(2026, 3, 2, 8 + i, 0, tzinfo=timezone.utc)
+    return BookingSeries(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), classroom_id=uuid.uuid4(), subject=f"Materia {i}", status=status,
+        start_time=start, end_time=start + timedelta(hours=1), frequency="WEEKLY", repeat_interval=1,
+        by_weekday=[0], occurrence_count=2, exdates=[], utc_offset_minutes=0,
+    )
+
+
+def test_series_are_paged_by_id_cursor():
+    series = [weekly_series(i) for i in range(5)] + [weekly_series(5, status="CANCELLED")]
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/bookings")
+    app.dependency_overrides[get_db] = lambda: FakeSeriesSession(series)
+    client = TestClient(app)
+
+    pages, params = [], {"limit": 2}
+    while True:
+        page = client.get("/api/v1/bookings/internal/series", params=params).json()
+        pages.append(page)
+        if not page["next_cursor"]:
+            break
+        params = {"limit": 2, "after": page["next_cursor"]}
+
+    ids = [item["series_id"] for page in pages for item in page["items"]]
+    assert ids == sorted(str(s.id) for s in series if s.status == "CONFIRMED")
+    assert [len(page["items"]) for page in pages] == [2, 2, 1]
+    assert all(len(item["occurrences"]) == 2 for page in pages for item in page["items"])
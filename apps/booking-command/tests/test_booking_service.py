@@ -1,17 +1,25 @@
 # tests/test_booking_service.py
+import operator
+import random
 import uuid
 import pytest
 from datetime import datetime, timezone, timedelta
+from sqlalchemy.exc import IntegrityError
 
 # Asegúrate de que los imports coincidan con tu proyecto
 from src.domain.service import (
+    BOOKING_MAX_DURATION,
     BookingService,
     ClassroomNotFoundError,
     ClassroomUnavailableError,
     ScheduleConflictError,
     BookingNotFoundError,
     BookingForbiddenError,
+    BulkBookingItem,
+    candidate_overlap_pairs,
+    classroom_lock_key,
 )
+from src.domain.ports import HoldStoreUnavailableError, SlotHold
 from src.infrastructure.gateways.timetable_gateway import TimetableUnavailableError
 
 # Dummy class si no se puede importar el modelo real
@@ -21,9 +29,9 @@ class FakeBookingModel:
             setattr(self, k, v)
 
 try:
-    from src.domain.models import Booking
+    from src.domain.models import Booking, BookingSeries
 except ImportError:
-    Booking = FakeBookingModel
+    Booking = BookingSeries = FakeBookingModel
 
 # ----------------------------
 # Fakes / Doubles
@@ -38,15 +46,57 @@ class FakeClassroomGateway:
 
 
 class FakeTimetableGateway:
-    def __init__(self, available=True, raise_error=False):
+    def __init__(self, available=True, raise_error=False, index_available=None):
         self.available = available
         self.raise_error = raise_error
+        # None simula un índice que aún no está listo
+        self.index_available = index_available
+        self.full_checks = 0
+        self.batch_checks = 0
+        self.last_existing = None
 
     def check_availability(self, start_time, end_time, existing_intervals):
         if self.raise_error:
             raise TimetableUnavailableError("Connection refused")
+        self.full_checks += 1
+        self.last_existing = existing_intervals
         return self.available
 
+    def check_availability_batch(self, candidates, existing_intervals):
+        if self.raise_error:
+            raise TimetableUnavailableError("Connection refused")
+        self.batch_checks += 1
+        self.last_existing = existing_intervals
+        # Choca cualquier candidato que se solape con lo existente
+        conflicts = [any(s < e2 and s2 < e for s2, e2 in existing_intervals) for s, e in candidates]
+        pairs = [(i, j) for i in range(len(candidates)) for j in range(i + 1, len(candidates))
+                 if candidates[i][0] < candidates[j][1] and candidates[j][0] < candidates[i][1]]
+        return conflicts, pairs
+
+    def check_classroom_availability(self, classroom_id, start_time, end_time):
+        if self.raise_error:
+            raise TimetableUnavailableError("Connection refused")
+        return self.index_available
+
+    def find_free_slots(self, window_start, window_end, duration_minutes, *, classroom_id=None, busy=None, **options):
+        if classroom_id is not None and self.index_available is None:
+            return None
+        self.last_busy = busy
+        return [(window_start, window_end)]
+
+    def search_available_classrooms(self, start, end, *, min_capacity=0, include_non_operational=False, limit=0):
+        self.last_search = dict(min_capacity=min_capacity, include_non_operational=include_non_operational, limit=limit)
+        return [{"classroom_id": str(uuid.uuid4()), "code": "A-101", "capacity": 30,
+                 "location_details": None, "is_operational": True}]
+
+
+class FakeHoldStore:
+    def __init__(self, holds=()):
+        self.holds = list(holds)
+
+    def overlapping(self, classroom_id, start, end):
+        return [h for h in self.holds if h.classroom_id == classroom_id and h.start_time < end and h.end_time > start]
+
 
 class FakeEventBus:
     def __init__(self):
@@ -56,19 +106,37 @@ class FakeEventBus:
         self.published.append((topic, payload))
 
 
+# Comparaciones columna-valor que FakeQuery evalúa en memoria; el resto de filtros se ignora
+COMPARISONS = {operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge}
+
+def matches(obj, criterion):
+    if getattr(criterion, "operator", None) not in COMPARISONS or not hasattr(criterion.right, "value"):
+        return True
+    return criterion.operator(getattr(obj, criterion.left.key), criterion.right.value)
+
+
 class FakeQuery:
-    def __init__(self, session, model):
+    def __init__(self, session, entities):
         self.session = session
-        self.model = model
+        self.entities = entities
+        # query(Booking.start_time, Booking.end_time) consulta columnas del modelo
+        columns = [e for e in entities if not isinstance(e, type)]
+        self.model = columns[0].class_ if columns else entities[0]
+        self.columns = [c.key for c in columns]
+        self.criteria = []
 
     def filter(self, *args, **kwargs):
-        # Simplemente retornamos self para encadenar
+        self.criteria.extend(args)
         return self
 
     def all(self):
-        # Retorna bookings con status CONFIRMED
-        return [b for b in self.session._bookings.values() 
-                if getattr(b, "status", None) == "CONFIRMED"]
+        # Retorna objetos del modelo consultado con status CONFIRMED que cumplen los filtros
+        rows = [b for b in self.session._bookings.values()
+                if isinstance(b, self.model) and getattr(b, "status", None) == "CONFIRMED"
+                and all(matches(b, c) for c in self.criteria)]
+        if self.columns:
+            return [tuple(getattr(b, c) for c in self.columns) for b in rows]
+        return rows
 
     def first(self):
         # Simula búsqueda por ID usando el hack _current_id_lookup
@@ -82,16 +150,35 @@ class FakeSession:
     def __init__(self):
         self._bookings = {}  # Dict[uuid, Booking]
         self._current_id_lookup = None 
+        self.commit_error = None
+        self.rolled_back = False
+        self.executed = []
+        self.flushes = 0
+
+    def query(self, *entities):
+        return FakeQuery(self, entities)
 
-    def query(self, model):
-        return FakeQuery(self, model)
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
 
     def add(self, obj):
         if not hasattr(obj, "id") or obj.id is None:
             obj.id = uuid.uuid4()
         self._bookings[obj.id] = obj
 
-    def commit(self): pass
+    def flush(self):
+        self.flushes += 1
+        # En Postgres la violación de la restricción aparece ya en el INSERT
+        if self.commit_error is not None:
+            raise self.commit_error
+
+    def commit(self):
+        if self.commit_error is not None:
+            raise self.commit_error
+
+    def rollback(self):
+        self.rolled_back = True
+
     def refresh(self, obj): pass
 
 
@@ -102,13 +189,18 @@ class FakeSession:
 def dt(hours_from_now: int):
     return datetime.now(timezone.utc) + timedelta(hours=hours_from_now)
 
-def make_service(*, classroom_payload, timetable_available=True, timetable_error=False):
+def make_service(*, classroom_payload, timetable_available=True, timetable_error=False, index_available=None, timetable_check_mode="optional"):
     db = FakeSession()
     service = BookingService(
         db=db,
         classroom_gateway=FakeClassroomGateway(classroom=classroom_payload),
-        timetable_gateway=FakeTimetableGateway(available=timetable_available, raise_error=timetable_error),
+        timetable_gateway=FakeTimetableGateway(
+            available=timetable_available,
+            raise_error=timetable_error,
+            index_available=index_available,
+        ),
         event_bus=FakeEventBus(),
+        timetable_check_mode=timetable_check_mode,
     )
     return service, db
 
@@ -135,6 +227,134 @@ def test_create_booking_success():
     assert service.event_bus.published[0][0] == "booking.created"
 
 
+def test_create_booking_uses_classroom_index_when_ready():
+    service, db = make_service(
+        classroom_payload={"is_operational": True},
+        index_available=False,
+    )
+
+    with pytest.raises(ScheduleConflictError):
+        service.create_booking(
+            user_id=uuid.uuid4(),
+            classroom_id=uuid.uuid4(),
+            start_time=dt(1),
+            end_time=dt(2),
+            subject="Math 101"
+        )
+
+    # No se envió la lista completa de reservas
+    assert service.timetable_gw.full_checks == 0
+
+
+def test_create_booking_falls_back_to_full_check_when_index_not_ready():
+    service, db = make_service(classroom_payload={"is_operational": True})
+
+    service.create_booking(
+        user_id=uuid.uuid4(),
+        classroom_id=uuid.uuid4(),
+        start_time=dt(1),
+        end_time=dt(2),
+        subject="Math 101"
+    )
+
+    assert service.timetable_gw.full_checks == 1
+
+
+def test_full_check_only_queries_bookings_inside_the_candidate_window():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    classroom_id = uuid.uuid4()
+    base = dt(0)
+
+    def booking(start, end, room=classroom_id):
+        db.add(Booking(id=uuid.uuid4(), user_id=uuid.uuid4(), classroom_id=room,
+                       start_time=start, end_time=end, subject="Physics", status="CONFIRMED"))
+
+    overlapping = (base + timedelta(hours=4), base + timedelta(hours=6))
+    booking(*overlapping)
+    booking(base + timedelta(hours=1), base + timedelta(hours=2))       # antes
+    booking(base + timedelta(hours=5), base + timedelta(hours=7))       # contigua
+    booking(base + timedelta(hours=3), base + timedelta(hours=5), room=uuid.uuid4())
+    # Empieza antes de la cota inferior (la que permite a Postgres descartar particiones
+    # de meses anteriores): no se lee aunque termine dentro de la ventana
+    booking(base + timedelta(hours=2) - BOOKING_MAX_DURATION, base + timedelta(hours=4))
+
+    with pytest.raises(ScheduleConflictError):
+        service.create_booking(
+            user_id=uuid.uuid4(),
+            classroom_id=classroom_id,
+            start_time=base + timedelta(hours=3),
+            end_time=base + timedelta(hours=5),
+            subject="Math 101"
+        )
+
+    # Solo la reserva que se solapa viaja al motor, como tupla (inicio, fin) y no como objeto del ORM
+    assert service.timetable_gw.last_existing == [overlapping]
+
+
+class FakePgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(f"pgcode {pgcode}")
+        self.pgcode = pgcode
+
+
+def test_create_booking_maps_exclusion_violation_to_conflict():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    db.commit_error = IntegrityError("INSERT INTO bookings ...", {}, FakePgError("23P01"))
+
+    with pytest.raises(ScheduleConflictError):
+        service.create_booking(
+            user_id=uuid.uuid4(),
+            classroom_id=uuid.uuid4(),
+            start_time=dt(1),
+            end_time=dt(2),
+            subject="Math 101"
+        )
+
+    assert db.rolled_back is True
+    assert service.event_bus.published == []
+
+
+def test_create_booking_continues_when_engine_down_in_optional_mode():
+    service, db = make_service(classroom_payload={"is_operational": True}, timetable_error=True)
+
+    booking = service.create_booking(
+        user_id=uuid.uuid4(),
+        classroom_id=uuid.uuid4(),
+        start_time=dt(1),
+        end_time=dt(2),
+        subject="Math 101"
+    )
+
+    assert booking.status == "CONFIRMED"
+
+
+def test_create_booking_engine_down_in_required_mode():
+    service, db = make_service(classroom_payload={"is_operational": True}, timetable_error=True, timetable_check_mode="required")
+
+    with pytest.raises(TimetableUnavailableError):
+        service.create_booking(
+            user_id=uuid.uuid4(),
+            classroom_id=uuid.uuid4(),
+            start_time=dt(1),
+            end_time=dt(2),
+            subject="Math 101"
+        )
+
+
+def test_create_booking_check_off_skips_engine():
+    service, db = make_service(classroom_payload={"is_operational": True}, index_available=False, timetable_check_mode="off")
+
+    service.create_booking(
+        user_id=uuid.uuid4(),
+        classroom_id=uuid.uuid4(),
+        start_time=dt(1),
+        end_time=dt(2),
+        subject="Math 101"
+    )
+
+    assert service.timetable_gw.full_checks == 0
+
+
 def test_cancel_booking_not_found():
     service, db = make_service(classroom_payload={"is_operational": True})
     
@@ -208,4 +428,341 @@ def test_cancel_booking_success():
 
     assert cancelled.status == "CANCELLED"
     assert len(service.event_bus.published) == 1
-    assert service.event_bus.published[0][0] == "booking.canceled"
\ No newline at end of file
+    assert service.event_bus.published[0][0] == "booking.canceled"
+
+
+def test_find_free_slots_sends_occupancy_when_index_not_ready():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    classroom_id = uuid.uuid4()
+
+    db.add(Booking(
+        user_id=uuid.uuid4(),
+        classroom_id=classroom_id,
+        start_time=dt(1),
+        end_time=dt(2),
+        status="CONFIRMED",
+        subject="Clase Python"
+    ))
+
+    slots = service.find_free_slots(classroom_id, dt(0), dt(8), 60)
+
+    assert len(slots) == 1
+    assert len(service.timetable_gw.last_busy) == 1
+
+
+def test_find_free_slots_rejects_invalid_window():
+    service, db = make_service(classroom_payload={"is_operational": True})
+
+    with pytest.raises(ValueError):
+        service.find_free_slots(uuid.uuid4(), dt(2), dt(1), 60)
+
+
+def test_search_available_classrooms_goes_through_the_engine():
+    service, db = make_service(classroom_payload={"is_operational": True})
+
+    found = service.search_available_classrooms(dt(0), dt(2), min_capacity=-5, limit=10)
+
+    assert [room["code"] for room in found] == ["A-101"]
+    # Capacidad negativa se normaliza a 0 antes de llegar al motor
+    assert service.timetable_gw.last_search == {"min_capacity": 0, "include_non_operational": False, "limit": 10}
+
+
+def test_search_available_classrooms_rejects_invalid_window():
+    service, db = make_service(classroom_payload={"is_operational": True})
+
+    with pytest.raises(ValueError):
+        service.search_available_classrooms(dt(2), dt(1))
+
+
+
+# ----------------------------
+# Series
+# ----------------------------
+
+SERIES_START = datetime(2026, 3, 3, 8, tzinfo=timezone.utc)
+
+def series_kwargs(**overrides):
+    kwargs = dict(
+        user_id=uuid.uuid4(),
+        classroom_id=uuid.uuid4(),
+        start_time=SERIES_START,
+        end_time=SERIES_START + timedelta(hours=2),
+        frequency="WEEKLY",
+        count=16,
+        subject="Cálculo I",
+    )
+    kwargs.update(overrides)
+    return kwargs
+
+
+def test_create_series_checks_all_occurrences_in_one_batch():
+    service, db = make_service(classroom_payload={"is_operational": True})
+
+    series, occurrences = service.create_series(**series_kwargs())
+
+    assert len(occurrences) == 16
+    assert service.timetable_gw.batch_checks == 1
+    # Una sola fila, un solo evento con todas las ocurrencias
+    assert list(db._bookings.values()) == [series]
+    topic, payload = service.event_bus.published[0]
+    assert topic == "booking.series.created"
+    assert len(payload["occurrences"]) == 16
+
+
+def test_create_series_conflict_stores_nothing():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    classroom_id = uuid.uuid4()
+    db.add(Booking(
+        user_id=uuid.uuid4(),
+        classroom_id=classroom_id,
+        start_time=SERIES_START + timedelta(weeks=5, hours=1),
+        end_time=SERIES_START + timedelta(weeks=5, hours=3),
+        status="CONFIRMED",
+        subject="Examen",
+    ))
+
+    with pytest.raises(ScheduleConflictError):
+        service.create_series(**series_kwargs(classroom_id=classroom_id))
+
+    assert not any(isinstance(b, BookingSeries) for b in db._bookings.values())
+    assert service.event_bus.published == []
+
+
+def test_single_booking_fallback_sees_series_occurrences():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    classroom_id = uuid.uuid4()
+    service.create_series(**series_kwargs(classroom_id=classroom_id))
+
+    # El doble del motor responde "disponible"; la serie se comprueba igual en local
+    with pytest.raises(ScheduleConflictError):
+        service.create_booking(
+            user_id=uuid.uuid4(),
+            classroom_id=classroom_id,
+            start_time=SERIES_START + timedelta(weeks=2, hours=1),
+            end_time=SERIES_START + timedelta(weeks=2, hours=3),
+            subject="Tutoría",
+        )
+
+    # La ocurrencia de esa semana viaja al motor junto con las reservas sueltas
+    assert (SERIES_START + timedelta(weeks=2), SERIES_START + timedelta(weeks=2, hours=2)) in service.timetable_gw.last_existing
+
+
+def test_only_owner_or_admin_lists_series_occurrences():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    owner_id = uuid.uuid4()
+    series, _ = service.create_series(**series_kwargs(user_id=owner_id))
+    db._current_id_lookup = series.id
+
+    with pytest.raises(BookingForbiddenError):
+        service.list_series_occurrences(series.id, uuid.uuid4(), requester_role="student")
+
+    _, occurrences = service.list_series_occurrences(series.id, uuid.uuid4(), requester_role="ADMIN")
+    assert len(occurrences) == 16
+
+
+def test_cancel_series_occurrence_adds_exception():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    owner_id = uuid.uuid4()
+    series, _ = service.create_series(**series_kwargs(user_id=owner_id))
+    db._current_id_lookup = series.id
+
+    service.cancel_series_occurrence(series.id, (SERIES_START + timedelta(weeks=1)).date(), owner_id, requester_role="student")
+
+    _, occurrences = service.list_series_occurrences(series.id, owner_id, requester_role="student")
+    assert len(occurrences) == 15
+    assert service.event_bus.published[-1][0] == "booking.series.occurrence_canceled"
+
+    with pytest.raises(BookingForbiddenError):
+        service.cancel_series(series.id, uuid.uuid4(), requester_role="student")
+
+
+def test_create_series_conflicts_checked_locally_without_engine():
+    service, db = make_service(classroom_payload={"is_operational": True}, timetable_check_mode="off")
+    classroom_id = uuid.uuid4()
+    service.create_series(**series_kwargs(classroom_id=classroom_id))
+
+    with pytest.raises(ScheduleConflictError):
+        service.create_series(**series_kwargs(classroom_id=classroom_id, start_time=SERIES_START + timedelta(weeks=3, hours=1),
+                                              end_time=SERIES_START + timedelta(weeks=3, hours=2), count=2))
+
+    assert service.timetable_gw.batch_checks == 0
+
+
+# ----------------------------
+# Bulk
+# ----------------------------
+
+class FakeClassroomCatalog:
+    def __init__(self, classrooms):
+        self.classrooms = classrooms
+
+    def get_classroom(self, classroom_id):
+        return self.classrooms.get(classroom_id)
+
+
+def test_bulk_create_checks_items_against_each_other_in_one_batch():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    room = uuid.uuid4()
+    items = [
+        BulkBookingItem(room, dt(1), dt(3), "Examen A"),
+        BulkBookingItem(room, dt(2), dt(4), "Examen B"),  # choca con A
+        BulkBookingItem(room, dt(3), dt(5), "Examen C"),  # contigua a A
+    ]
+
+    results = service.create_bookings_bulk(uuid.uuid4(), items)
+
+    assert [r.status for r in results] == ["CREATED", "CONFLICT", "CREATED"]
+    assert [r.index for r in results] == [0, 1, 2]
+    # Una sola llamada al motor y un solo flush para todo el lote
+    assert service.timetable_gw.batch_checks == 1
+    assert db.flushes == 1
+    assert [t for t, _ in service.event_bus.published] == ["booking.created", "booking.created"]
+
+
+def test_bulk_create_without_engine_detects_existing_and_internal_overlaps():
+    service, db = make_service(classroom_payload={"is_operational": True}, timetable_check_mode="off")
+    room = uuid.uuid4()
+    db.add(Booking(id=uuid.uuid4(), user_id=uuid.uuid4(), classroom_id=room,
+                   start_time=dt(1), end_time=dt(2), subject="Physics", status="CONFIRMED"))
+    items = [
+        BulkBookingItem(room, dt(1), dt(2)),
+        BulkBookingItem(room, dt(5), dt(7)),
+        BulkBookingItem(room, dt(6), dt(8)),
+    ]
+
+    results = service.create_bookings_bulk(uuid.uuid4(), items)
+
+    assert [r.status for r in results] == ["CONFLICT", "CREATED", "CONFLICT"]
+    assert service.timetable_gw.batch_checks == 0
+
+
+def test_bulk_create_reports_rooms_per_item_and_locks_in_key_order():
+    service, db = make_service(classroom_payload=None)
+    rooms = [uuid.uuid4() for _ in range(4)]
+    missing, closed = uuid.uuid4(), uuid.uuid4()
+    service.classroom_gw = FakeClassroomCatalog(
+        {r: {"is_operational": True} for r in rooms} | {closed: {"is_operational": False}}
+    )
+    # FakeQuery no filtra por aula: franjas distintas por aula
+    items = [BulkBookingItem(r, dt(2 * k), dt(2 * k + 1)) for k, r in enumerate(rooms)] + [
+        BulkBookingItem(missing, dt(1), dt(2)),
+        BulkBookingItem(closed, dt(1), dt(2)),
+    ]
+
+    results = service.create_bookings_bulk(uuid.uuid4(), items)
+
+    assert [r.status for r in results] == ["CREATED"] * 4 + ["CLASSROOM_NOT_FOUND", "CLASSROOM_UNAVAILABLE"]
+    # Orden fijo de bloqueo: dos lotes con aulas en común no se bloquean mutuamente
+    lock_keys = [params["key"] for _, params in db.executed]
+    assert lock_keys == sorted(classroom_lock_key(r) for r in rooms)
+
+
+def test_bulk_cancel_reports_each_item():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    owner = uuid.uuid4()
+    room = uuid.uuid4()
+    mine = Booking(id=uuid.uuid4(), user_id=owner, classroom_id=room,
+                   start_time=dt(1), end_time=dt(2), subject="A", status="CONFIRMED")
+    other = Booking(id=uuid.uuid4(), user_id=uuid.uuid4(), classroom_id=room,
+                    start_time=dt(3), end_time=dt(4), subject="B", status="CONFIRMED")
+    db.add(mine)
+    db.add(other)
+
+    results = service.cancel_bookings_bulk([mine.id, other.id, uuid.uuid4(), mine.id], owner, requester_role="STUDENT")
+
+    assert [r.status for r in results] == ["CANCELLED", "FORBIDDEN", "NOT_FOUND", "ALREADY_CANCELLED"]
+    assert mine.status == "CANCELLED" and other.status == "CONFIRMED"
+    assert len(service.event_bus.published) == 1
+
+
+def test_candidate_overlap_pairs_matches_brute_force():
+    rng = random.Random(7)
+    base = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    candidates = []
+    for _ in range(60):
+        start = base + timedelta(minutes=15 * rng.randrange(200))
+        candidates.append((start, start + timedelta(minutes=15 * rng.randrange(1, 12))))
+
+    expected = {(i, j) for i in range(len(candidates)) for j in range(i + 1, len(candidates))
+                if candidates[i][0] < candidates[j][1] and candidates[j][0] < candidates[i][1]}
+
+    assert set(candidate_overlap_pairs(candidates)) == expected
+
+
+def test_create_booking_outside_partition_horizon_is_a_validation_error():
+    service, db = make_service(classroom_payload={"is_operational": True})
+    db.commit_error = IntegrityError(
+        "INSERT INTO bookings ...", {},
+        FakePgError("23514"),
+    )
+    db.commit_error.orig.args = ('no partition of relation "bookings" found for row',)
+
+    with pytest.raises(ValueError):
+        service.create_booking(
+            user_id=uuid.uuid4(),
+            classroom_id=uuid.uuid4(),
+            start_time=dt(24 * 365 * 5),
+            end_time=dt(24 * 365 * 5 + 1),
+            subject="Math 101"
+        )
+
+    assert db.rolled_back
+
+
+def test_overlap_across_a_month_boundary_is_caught_when_the_index_lags():
+    # El índice del motor aún no conoce la reserva y cada partición mensual solo ve sus filas
+    service, db = make_service(classroom_payload={"is_operational": True}, index_available=True)
+    classroom_id = uuid.uuid4()
+    db.add(Booking(id=uuid.uuid4(), user_id=uuid.uuid4(), classroom_id=classroom_id, subject="Guardia",
+                   start_time=datetime(2027, 1, 31, 23, tzinfo=timezone.utc),
+                   end_time=datetime(2027, 2, 1, 1, tzinfo=timezone.utc), status="CONFIRMED"))
+
+    with pytest.raises(ScheduleConflictError):
+        service.create_booking(
+            user_id=uuid.uuid4(),
+            classroom_id=classroom_id,
+            start_time=datetime(2027, 2, 1, 0, 30, tzinfo=timezone.utc),
+            end_time=datetime(2027, 2, 1, 2, tzinfo=timezone.utc),
+            subject="Math 101"
+        )
+
+    assert db.flushes == 0
+
+
+def held_by_other(classroom_id, start, end):
+    return FakeHoldStore([SlotHold("h-1", uuid.uuid4(), classroom_id, start, end, dt(1))])
+
+
+def test_every_create_path_respects_other_users_holds():
+    classroom_id, user = uuid.uuid4(), uuid.uuid4()
+    start, end = SERIES_START + timedelta(weeks=2), SERIES_START + timedelta(weeks=2, hours=2)
+
+    service, db = make_service(classroom_payload={"is_operational": True})
+    service.hold_store = held_by_other(classroom_id, start, end)
+    with pytest.raises(ScheduleConflictError):
+        service.create_booking(user, classroom_id, start, end, subject="Tutoría")
+    # La serie choca en la ocurrencia retenida
+    with pytest.raises(ScheduleConflictError):
+        service.create_series(**series_kwargs(user_id=user, classroom_id=classroom_id))
+    assert db.flushes == 0
+
+    results = service.create_bookings_bulk(user, [
+        BulkBookingItem(classroom_id, start, end, "Examen"),
+        BulkBookingItem(classroom_id, start + timedelta(days=1), end + timedelta(days=1), "Examen"),
+    ])
+    assert [r.status for r in results] == ["CONFLICT", "CREATED"]
+
+
+def test_own_holds_do_not_block_and_store_outage_is_ignored():
+    classroom_id, user = uuid.uuid4(), uuid.uuid4()
+    service, db = make_service(classroom_payload={"is_operational": True})
+    service.hold_store = FakeHoldStore([SlotHold("h-1", user, classroom_id, dt(1), dt(2), dt(1))])
+
+    assert service.create_booking(user, classroom_id, dt(1), dt(2), subject="Math 101").status == "CONFIRMED"
+
+    class DownHoldStore:
+        def overlapping(self, *args):
+            raise HoldStoreUnavailableError("Connection refused")
+
+    service.hold_store = DownHoldStore()
+    assert service.create_booking(uuid.uuid4(), uuid.uuid4(), dt(3), dt(4), subject="Math 101").status == "CONFIRMED"
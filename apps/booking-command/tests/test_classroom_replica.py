@@ -0,0 +1,118 @@
+# tests/test_classroom_replica.py
+import uuid
+
+from src.infrastructure.classroom_replica import ClassroomReplica
+from src.infrastructure.gateways.classroom_gateway import ClassroomServiceError
+
+# ----------------------------
+# Fakes / Doubles
+# ----------------------------
+
+class FakeClassroomService:
+    def __init__(self, classrooms=()):
+        self.classrooms = {str(c["id"]): c for c in classrooms}
+        self.down = False
+        self.calls = 0
+
+    def fetch_classroom(self, classroom_id):
+        self.calls += 1
+        if self.down:
+            raise ClassroomServiceError("Connection refused")
+        return self.classrooms.get(str(classroom_id))
+
+    def fetch_all(self):
+        if self.down:
+            raise ClassroomServiceError("Connection refused")
+        return list(self.classrooms.values())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def classroom(is_operational=True):
+    return {"id": str(uuid.uuid4()), "code": "A-101", "capacity": 30, "is_operational": is_operational}
+
+
+def make_replica(*rooms):
+    service = FakeClassroomService(rooms)
+    clock = FakeClock()
+    replica = ClassroomReplica(service, ttl_seconds=60, clock=clock)
+    return replica, service, clock
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_warm_replica_answers_without_http():
+    room = classroom()
+    replica, service, _ = make_replica(room)
+    replica.replace_all(service.fetch_all())
+
+    for _ in range(10):
+        assert replica.get(room["id"])["is_operational"] is True
+
+    assert service.calls == 0
+
+
+def test_miss_reads_through_and_is_cached():
+    room = classroom()
+    replica, service, _ = make_replica(room)
+
+    assert replica.get(room["id"]) == room
+    assert replica.get(room["id"]) == room
+    assert service.calls == 1
+
+
+def test_stale_entry_is_refetched_after_ttl():
+    room = classroom()
+    replica, service, clock = make_replica(room)
+    replica.replace_all(service.fetch_all())
+
+    service.classrooms[room["id"]] = dict(room, is_operational=False)
+    clock.now += 61
+
+    assert replica.get(room["id"])["is_operational"] is False
+    assert service.calls == 1
+
+
+def test_change_event_invalidates_entry():
+    room = classroom()
+    replica, service, _ = make_replica(room)
+    replica.replace_all(service.fetch_all())
+
+    service.classrooms[room["id"]] = dict(room, is_operational=False)
+    replica.invalidate(room["id"])
+
+    assert replica.get(room["id"])["is_operational"] is False
+
+
+def test_outage_serves_stale_entries_and_backs_off():
+    room = classroom()
+    replica, service, clock = make_replica(room)
+    replica.replace_all(service.fetch_all())
+    service.down = True
+    clock.now += 61
+
+    assert replica.get(room["id"]) == room
+    assert replica.get(room["id"]) == room
+    # Tras el primer fallo no se vuelve a esperar a classroom-service en cada reserva
+    assert service.calls == 1
+
+    # Un aula nunca vista no se puede validar durante la caída
+    assert replica.get(uuid.uuid4()) is None
+
+
+def test_deleted_classroom_is_dropped():
+    room = classroom()
+    replica, service, clock = make_replica(room)
+    replica.replace_all(service.fetch_all())
+    del service.classrooms[room["id"]]
+    clock.now += 61
+
+    assert replica.get(room["id"]) is None
+    assert len(replica) == 0
@@ -0,0 +1,136 @@
+# tests/test_hold_store.py
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import fakeredis
+
+from src.infrastructure.hold_store import (
+    AsyncRedisHoldStore,
+    RedisHoldStore,
+    classroom_holds_key,
+    decode_hold,
+    from_ms,
+    hold_key,
+    to_ms,
+)
+
+START = datetime(2027, 3, 2, 8, 0, tzinfo=timezone.utc)
+
+def slot(hours_from_start=0, duration=1):
+    start = START + timedelta(hours=hours_from_start)
+    return start, start + timedelta(hours=duration)
+
+
+def member(room, start, end, expires, user=None):
+    # Mismo formato que arma PLACE_HOLD
+    return "|".join([str(uuid.uuid4()), str(user or uuid.uuid4()), str(room),
+                     str(to_ms(start)), str(to_ms(end)), str(to_ms(expires))])
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_member_round_trip():
+    room = uuid.uuid4()
+    start, end = slot(duration=2)
+    expires = start - timedelta(minutes=5)
+    encoded = member(room, start, end, expires)
+
+    hold = decode_hold(encoded)
+
+    assert hold.hold_id == encoded.split("|")[0]
+    assert hold.classroom_id == room
+    assert (hold.start_time, hold.end_time, hold.expires_at) == (start, end, expires)
+
+
+def test_naive_datetimes_are_utc():
+    naive = datetime(2026, 3, 2, 8, 0)
+
+    assert from_ms(str(to_ms(naive))) == naive.replace(tzinfo=timezone.utc)
+
+
+def test_only_one_of_many_overlapping_places_wins():
+    async def scenario():
+        store = AsyncRedisHoldStore(fakeredis.FakeAsyncRedis(decode_responses=True))
+        room = uuid.uuid4()
+        start, end = slot(duration=2)
+
+        holds = await asyncio.gather(*[
+            store.place(uuid.uuid4(), room, start + timedelta(minutes=i), end, ttl_seconds=60)
+            for i in range(20)
+        ])
+        # Contiguo no es solape: [end, end + 1h) sí se puede retener
+        adjacent = await store.place(uuid.uuid4(), room, *slot(2), ttl_seconds=60)
+        other_room = await store.place(uuid.uuid4(), uuid.uuid4(), start, end, ttl_seconds=60)
+        return holds, adjacent, other_room
+
+    holds, adjacent, other_room = asyncio.run(scenario())
+
+    assert sum(h is not None for h in holds) == 1
+    assert adjacent is not None and other_room is not None
+
+
+def test_expired_holds_are_ignored_and_pruned():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        store = AsyncRedisHoldStore(redis)
+        room = uuid.uuid4()
+        start, end = slot()
+        # Retención caducada cuya clave ya expiró pero sigue en el conjunto del aula
+        stale = member(room, start, end, datetime.now(timezone.utc) - timedelta(seconds=1))
+        await redis.zadd(classroom_holds_key(room), {stale: to_ms(start)})
+
+        live_before = await store.overlapping(room, start, end)
+        hold = await store.place(uuid.uuid4(), room, start, end, ttl_seconds=60)
+        members = await redis.zrange(classroom_holds_key(room), 0, -1)
+        room_ttl = await redis.pttl(classroom_holds_key(room))
+        return live_before, hold, members, room_ttl
+
+    live_before, hold, members, room_ttl = asyncio.run(scenario())
+
+    assert live_before == []
+    assert hold is not None
+    assert [decode_hold(m).hold_id for m in members] == [hold.hold_id]
+    # El conjunto del aula caduca con su última retención
+    assert 0 < room_ttl <= 60_000
+
+
+def test_hold_expires_on_its_own():
+    async def scenario():
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        store = AsyncRedisHoldStore(redis)
+        room = uuid.uuid4()
+        hold = await store.place(uuid.uuid4(), room, *slot(), ttl_seconds=60)
+        await redis.pexpire(hold_key(hold.hold_id), 1)
+        await asyncio.sleep(0.05)
+        return await store.get(hold.hold_id)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_release_frees_the_slot():
+    async def scenario():
+        store = AsyncRedisHoldStore(fakeredis.FakeAsyncRedis(decode_responses=True))
+        room = uuid.uuid4()
+        hold = await store.place(uuid.uuid4(), room, *slot(), ttl_seconds=60)
+        await store.release(hold)
+        return await store.get(hold.hold_id), await store.overlapping(room, *slot()), \
+            await store.place(uuid.uuid4(), room, *slot(), ttl_seconds=60)
+
+    found, live, again = asyncio.run(scenario())
+
+    assert found is None and live == []
+    assert again is not None
+
+
+def test_sync_store_sees_holds_placed_by_the_async_one():
+    server = fakeredis.FakeServer()
+    room, user = uuid.uuid4(), uuid.uuid4()
+
+    hold = asyncio.run(AsyncRedisHoldStore(fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+                       .place(user, room, *slot(duration=2), ttl_seconds=60))
+    sync_store = RedisHoldStore(fakeredis.FakeRedis(server=server, decode_responses=True))
+
+    assert sync_store.overlapping(room, *slot(1)) == [hold]
+    assert sync_store.overlapping(room, *slot(2)) == []
@@ -0,0 +1,95 @@
+# tests/test_latency_metrics.py
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.metrics.latency import Histogram, REQUEST_SECONDS, STAGE_SECONDS, server_timing, timed, track_request, untrack_request
+from src.middlewares.server_timing_middleware import server_timing_middleware
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def make_app():
+    app = FastAPI()
+    app.middleware("http")(server_timing_middleware)
+
+    @app.post("/bookings/{booking_id}")
+    async def create(booking_id: str):
+        # Pasos concurrentes como en AsyncBookingService
+        async def step(name, seconds):
+            with timed(name):
+                await asyncio.sleep(seconds)
+        await asyncio.gather(step("classroom", 0.01), step("timetable", 0.02))
+        return {"ok": True}
+
+    @app.get("/sync")
+    def sync_endpoint():
+        # Endpoint síncrono: corre en el threadpool
+        with timed("bookings_query"):
+            time.sleep(0.005)
+        return {"ok": True}
+
+    return app
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_histogram_renders_cumulative_prometheus_buckets():
+    h = Histogram("demo_seconds", "Demo.", label="stage", buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.01, 0.05, 3.0):
+        h.observe("commit", seconds)
+
+    text = h.render()
+
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{stage="commit",le="0.01"} 2' in text
+    assert 'demo_seconds_bucket{stage="commit",le="0.1"} 3' in text
+    assert 'demo_seconds_bucket{stage="commit",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{stage="commit"} 4' in text
+
+
+def test_timed_feeds_request_stages_from_gathered_tasks():
+    async def scenario():
+        stages, token = track_request()
+        try:
+            async def step(name):
+                with timed(name):
+                    await asyncio.sleep(0)
+            await asyncio.gather(step("classroom"), step("timetable"))
+        finally:
+            untrack_request(token)
+        return stages
+
+    stages = asyncio.run(scenario())
+
+    assert sorted(name for name, _ in stages) == ["classroom", "timetable"]
+
+
+def test_timed_outside_a_request_only_feeds_the_histogram():
+    with timed("outbox"):
+        pass
+
+    assert 'booking_stage_seconds_count{stage="outbox"}' in STAGE_SECONDS.render()
+
+
+def test_server_timing_adds_up_repeated_stages():
+    header = server_timing([("lock", 0.001), ("lock", 0.002), ("commit", 0.004)], 0.010)
+
+    assert header == "lock;dur=3.00, commit;dur=4.00, total;dur=10.00"
+
+
+def test_middleware_sets_server_timing_header_for_async_and_sync_endpoints():
+    client = TestClient(make_app())
+
+    created = client.post("/bookings/abc")
+    listed = client.get("/sync")
+
+    timing = created.headers["Server-Timing"]
+    assert "classroom;dur=" in timing and "timetable;dur=" in timing and "total;dur=" in timing
+    assert "bookings_query;dur=" in listed.headers["Server-Timing"]
+    # Etiqueta con la plantilla de la ruta, no con el path concreto
+    assert 'route="POST /bookings/{booking_id}"' in REQUEST_SECONDS.render()
@@ -0,0 +1,234 @@
+# tests/test_outbox.py
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.domain.models import Booking, OutboxEvent
+from src.domain.service import BOOKING_LOCK_NAMESPACE, BookingService
+from src.infrastructure.gateways.outbox_gateway import OutboxEventBus
+from src.infrastructure.gateways.rabbitmq_gateway import PublishNotConfirmedError
+from src.infrastructure.outbox_relay import OutboxRelay
+
+# ----------------------------
+# Fakes / Doubles
+# ----------------------------
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeOutboxQuery:
+    def __init__(self, table):
+        self.table = table
+        self.ids = None
+        self.size = None
+
+    def order_by(self, *args):
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def filter(self, criterion):
+        # OutboxEvent.id.in_([...]): los ids vienen como parámetro del IN
+        self.ids = set(criterion.right.value)
+        return self
+
+    def all(self):
+        return sorted(self.table.rows, key=lambda e: e.id)[:self.size]
+
+    def delete(self, synchronize_session=False):
+        deleted = [e for e in self.table.rows if e.id in self.ids]
+        self.table.pending_deletes.extend(deleted)
+        return len(deleted)
+
+
+class FakeOutboxTable:
+    def __init__(self, events=(), lock_free=True):
+        self.rows = list(events)
+        self.pending_deletes = []
+        self.lock_free = lock_free
+        self.commits = 0
+        self.closed = 0
+        self.lock_params = []
+
+    # Cada llamada a session_factory() devuelve la propia tabla como sesión
+    def __call__(self):
+        return self
+
+    def execute(self, statement, params=None):
+        self.lock_params.append(params)
+        return FakeResult(self.lock_free)
+
+    def query(self, model):
+        return FakeOutboxQuery(self)
+
+    def commit(self):
+        self.rows = [e for e in self.rows if e not in self.pending_deletes]
+        self.pending_deletes = []
+        self.commits += 1
+
+    def rollback(self):
+        self.pending_deletes = []
+
+    def close(self):
+        self.closed += 1
+
+
+class FakePublisher:
+    """El broker confirma todo hasta `fail_on` (exclusive); cada lote es una sola espera de confirmaciones."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.sent = []
+        self.batches = []
+
+    def publish_confirmed_batch(self, events):
+        self.batches.append([message_id for _, _, message_id in events])
+        for confirmed, (event_type, payload, message_id) in enumerate(events):
+            if message_id == self.fail_on:
+                raise PublishNotConfirmedError(confirmed, "broker gone")
+            self.sent.append((event_type, message_id))
+
+
+class BrokenPublisher:
+    def publish_confirmed_batch(self, events):
+        raise ConnectionError("broker unreachable")
+
+
+class RecordingSession:
+    """Solo lo necesario para create_booking, registrando el orden de las operaciones."""
+
+    def __init__(self):
+        self.log = []
+
+    def execute(self, statement, params=None):
+        pass
+
+    def query(self, *entities):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def all(self):
+        return []
+
+    def add(self, obj):
+        self.log.append(("add", type(obj).__name__))
+
+    def flush(self):
+        self.log.append(("flush", None))
+
+    def refresh(self, obj):
+        obj.id = obj.id or uuid.uuid4()
+        obj.status = obj.status or "CONFIRMED"
+
+    def commit(self):
+        self.log.append(("commit", None))
+
+    def rollback(self):
+        self.log.append(("rollback", None))
+
+
+class AlwaysFree:
+    def check_classroom_availability(self, classroom_id, start_time, end_time):
+        return True
+
+
+class Classrooms:
+    def get_classroom(self, classroom_id):
+        return {"is_operational": True}
+
+
+def outbox_events(count):
+    return [OutboxEvent(id=i, event_type="booking.created", payload={"n": i}) for i in range(1, count + 1)]
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_booking_event_is_written_to_the_outbox_before_commit():
+    db = RecordingSession()
+    service = BookingService(db, Classrooms(), AlwaysFree(), OutboxEventBus(db))
+    start = datetime(2026, 3, 2, 8, tzinfo=timezone.utc)
+
+    service.create_booking(uuid.uuid4(), uuid.uuid4(), start, start + timedelta(hours=1), "Math 101")
+
+    assert db.log == [("add", "Booking"), ("flush", None), ("add", "OutboxEvent"), ("commit", None)]
+
+
+def test_relay_publishes_in_order_and_deletes_confirmed_events():
+    table = FakeOutboxTable(outbox_events(5))
+    publisher = FakePublisher()
+    relay = OutboxRelay(table, publisher, batch_size=3)
+
+    assert relay.relay_batch() == 3
+    assert relay.relay_batch() == 2
+    assert relay.relay_batch() == 0
+
+    assert [message_id for _, message_id in publisher.sent] == ["1", "2", "3", "4", "5"]
+    assert table.rows == []
+    assert table.closed == 3
+
+
+def test_relay_waits_for_confirms_once_per_batch():
+    table = FakeOutboxTable(outbox_events(5))
+    publisher = FakePublisher()
+    relay = OutboxRelay(table, publisher, batch_size=3)
+
+    relay.relay_batch()
+    relay.relay_batch()
+    relay.relay_batch()
+
+    # Un lote = una publicación con una sola espera de confirmaciones; sin eventos no se publica nada
+    assert publisher.batches == [["1", "2", "3"], ["4", "5"]]
+
+
+def test_relay_keeps_unconfirmed_events_for_the_next_batch():
+    table = FakeOutboxTable(outbox_events(4))
+    relay = OutboxRelay(table, FakePublisher(fail_on="3"), batch_size=10)
+
+    with pytest.raises(PublishNotConfirmedError):
+        relay.relay_batch()
+
+    # 1 y 2 confirmados (el prefijo más largo) y borrados; 3 y 4 siguen pendientes, en orden
+    assert [e.id for e in table.rows] == [3, 4]
+
+    relay.publisher = FakePublisher()
+    assert relay.relay_batch() == 2
+    assert table.rows == []
+
+
+def test_relay_keeps_the_whole_batch_when_nothing_was_confirmed():
+    table = FakeOutboxTable(outbox_events(3))
+
+    with pytest.raises(ConnectionError):
+        OutboxRelay(table, BrokenPublisher()).relay_batch()
+
+    assert [e.id for e in table.rows] == [1, 2, 3]
+    assert table.commits == 1
+
+
+def test_relay_skips_batch_while_another_replica_holds_the_lock():
+    table = FakeOutboxTable(outbox_events(2), lock_free=False)
+    publisher = FakePublisher()
+
+    assert OutboxRelay(table, publisher).relay_batch() == 0
+    assert publisher.sent == []
+    assert len(table.rows) == 2
+
+
+def test_relay_lock_cannot_collide_with_a_classroom_lock():
+    table = FakeOutboxTable()
+
+    OutboxRelay(table, FakePublisher()).relay_batch()
+
+    # Las claves de aula cubren todo int4 dentro de BOOKING_LOCK_NAMESPACE
+    assert table.lock_params[0]["namespace"] != BOOKING_LOCK_NAMESPACE
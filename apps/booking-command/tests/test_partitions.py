@@ -0,0 +1,116 @@
+# tests/test_partitions.py
+from datetime import date
+
+from src.infrastructure.partitions import add_months, maintain_partitions, months_to_create, partitions_to_archive
+
+# ----------------------------
+# Fakes / Doubles
+# ----------------------------
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.value
+
+
+class FakeSession:
+    def __init__(self, tables, got_lock=True):
+        # (nombre, tabla padre, detach pendiente)
+        self.tables = tables
+        self.got_lock = got_lock
+        self.calls = []
+        self.options = None
+        self.closed = False
+
+    def connection(self, execution_options=None):
+        self.options = execution_options
+        return self
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.calls.append((sql, params))
+        if "pg_try_advisory_lock" in sql:
+            return FakeResult(self.got_lock)
+        if "pg_inherits" in sql:
+            return FakeResult(self.tables)
+        return FakeResult(None)
+
+    def ddl(self):
+        return [sql for sql, _ in self.calls if sql.startswith("ALTER TABLE")]
+
+    def close(self):
+        self.closed = True
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_add_months_crosses_years():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_months_to_create_starts_at_current_month():
+    months = months_to_create(date(2026, 10, 18), months_ahead=3)
+
+    assert months == [date(2026, 10, 1), date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)]
+
+
+def test_only_whole_months_past_the_horizon_are_archived():
+    partitions = ["bookings_2025_08", "bookings_2025_09", "bookings_2025_10", "bookings_2026_10", "bookings_archive"]
+
+    # Con 12 meses de retención el 18/10/2026 se conservan desde octubre de 2025
+    assert partitions_to_archive(partitions, date(2026, 10, 18), archive_after_months=12) == [
+        "bookings_2025_08",
+        "bookings_2025_09",
+    ]
+    assert partitions_to_archive(partitions, date(2026, 10, 18), archive_after_months=0) == []
+
+
+def test_maintenance_creates_ahead_and_archives_without_locking_bookings():
+    db = FakeSession([("bookings_2024_01", "bookings", False), ("bookings_2026_10", "bookings", False)])
+
+    archived = maintain_partitions(lambda: db, today=date(2026, 10, 18))
+
+    # DETACH ... CONCURRENTLY no admite transacción
+    assert db.options == {"isolation_level": "AUTOCOMMIT"}
+    created = [p["month"] for sql, p in db.calls if "create_booking_partition" in sql]
+    assert created[0] == date(2026, 10, 1) and len(created) == 25
+    assert archived == ["bookings_2024_01"]
+    assert db.ddl() == [
+        'ALTER TABLE bookings DETACH PARTITION "bookings_2024_01" CONCURRENTLY',
+        'ALTER TABLE bookings_archive ATTACH PARTITION "bookings_2024_01" '
+        "FOR VALUES FROM ('2024-01-01 00:00:00+00') TO ('2024-02-01 00:00:00+00')",
+    ]
+    assert "pg_advisory_unlock" in db.calls[-1][0]
+    assert db.closed
+
+
+def test_maintenance_finishes_an_interrupted_archive():
+    db = FakeSession([
+        ("bookings_2023_11", "bookings", True),   # DETACH CONCURRENTLY interrumpido
+        ("bookings_2023_12", None, False),        # separada pero sin adjuntar al archivo
+        ("bookings_2023_10", "bookings_archive", False),
+    ])
+
+    archived = maintain_partitions(lambda: db, today=date(2026, 10, 18))
+
+    assert archived == ["bookings_2023_11", "bookings_2023_12"]
+    assert db.ddl()[0] == 'ALTER TABLE bookings DETACH PARTITION "bookings_2023_11" FINALIZE'
+    assert [sql.split('"')[1] for sql in db.ddl()[1:]] == ["bookings_2023_11", "bookings_2023_12"]
+
+
+def test_maintenance_is_skipped_when_another_replica_holds_the_lock():
+    db = FakeSession([("bookings_2024_01", "bookings", False)], got_lock=False)
+
+    assert maintain_partitions(lambda: db, today=date(2026, 10, 18)) == []
+    assert len(db.calls) == 1
+    assert db.closed
@@ -0,0 +1,254 @@
+# tests/test_rabbitmq_gateway.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pika
+import pytest
+
+from src.infrastructure.gateways import rabbitmq_gateway
+from src.infrastructure.gateways.rabbitmq_gateway import PublishNotConfirmedError, RabbitMQPublisher
+
+# ----------------------------
+# Fakes / Doubles
+# ----------------------------
+
+class FakeChannel:
+    def __init__(self, connection):
+        self.connection = connection
+        self.is_open = True
+        self.confirms = False
+        self.on_confirm = None
+        self.delivery_tag = 0
+        self.unconfirmed = []
+        self.declared = []
+        # El canal AMQP de pika debajo del BlockingChannel; ahí se activan los confirms
+        self._impl = self
+
+    def exchange_declare(self, exchange, exchange_type):
+        self.declared.append(exchange)
+
+    def confirm_delivery(self, ack_nack_callback, callback):
+        self.confirms = True
+        self.on_confirm = ack_nack_callback
+        callback(None)
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        if self.connection.broken:
+            self.connection.is_open = False
+            raise pika.exceptions.StreamLostError("connection reset")
+        self.connection.broker.published.append((routing_key, body))
+        if self.confirms:
+            self.delivery_tag += 1
+            self.unconfirmed.append((self.delivery_tag, body))
+
+    def deliver_confirms(self):
+        if not self.unconfirmed:
+            return
+        nacked = self.connection.broker.nack
+        if not any(body in nacked for _, body in self.unconfirmed):
+            # Como RabbitMQ con un lote sano: un solo ack multiple=True hasta el último tag
+            self.on_confirm(pika.frame.Method(1, pika.spec.Basic.Ack(delivery_tag=self.unconfirmed[-1][0], multiple=True)))
+        else:
+            for tag, body in self.unconfirmed:
+                method = pika.spec.Basic.Nack if body in nacked else pika.spec.Basic.Ack
+                self.on_confirm(pika.frame.Method(1, method(delivery_tag=tag)))
+        self.unconfirmed = []
+
+
+class FakeConnection:
+    def __init__(self, broker):
+        self.broker = broker
+        self.is_open = True
+        self.broken = False
+        self.channels = []
+        self.waits = 0
+        self.drop_after_confirms = False
+
+    def channel(self):
+        channel = FakeChannel(self)
+        self.channels.append(channel)
+        return channel
+
+    def process_data_events(self, time_limit=0):
+        self.waits += 1
+        for channel in self.channels:
+            channel.deliver_confirms()
+        if self.drop_after_confirms:
+            self.is_open = False
+            raise pika.exceptions.StreamLostError("connection reset")
+
+    def add_callback_threadsafe(self, callback):
+        callback()
+
+    def close(self):
+        self.is_open = False
+
+
+class FakeBroker:
+    def __init__(self, refuse=0):
+        self.connections = []
+        self.published = []
+        self.nack = set()
+        self.refuse = refuse
+        self.lock = threading.Lock()
+
+    def connect(self, params):
+        with self.lock:
+            if self.refuse:
+                self.refuse -= 1
+                raise pika.exceptions.AMQPConnectionError("refused")
+            connection = FakeConnection(self)
+            self.connections.append(connection)
+            return connection
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = FakeBroker()
+    monkeypatch.setattr(rabbitmq_gateway.pika, "BlockingConnection", broker.connect)
+    return broker
+
+# ----------------------------
+# Tests
+# ----------------------------
+
+def test_publishes_reuse_pooled_connections(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=2)
+
+    for i in range(50):
+        publisher.publish("booking.created", f'{{"n": {i}}}')
+
+    # Un solo handshake (y una sola declaración del exchange) para 50 publicaciones secuenciales
+    assert len(broker.connections) == 1
+    assert broker.connections[0].channels[0].declared == ["booking_events"]
+    assert len(broker.published) == 50
+    publisher.close()
+
+
+def test_concurrent_publishes_never_exceed_pool_size(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=3)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(lambda i: publisher.publish("booking.created", str(i)), range(200)))
+
+    assert len(broker.published) == 200
+    assert len(broker.connections) <= 3
+    publisher.close()
+    assert not any(c.is_open for c in broker.connections)
+
+
+def test_broken_connection_is_replaced_and_publish_retried(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=1)
+    publisher.publish("booking.created", "1")
+    broker.connections[0].broken = True
+
+    publisher.publish("booking.created", "2")
+
+    assert [body for _, body in broker.published] == ["1", "2"]
+    assert len(broker.connections) == 2
+    publisher.close()
+
+
+def test_connect_retries_with_backoff(monkeypatch):
+    broker = FakeBroker(refuse=2)
+    monkeypatch.setattr(rabbitmq_gateway.pika, "BlockingConnection", broker.connect)
+    monkeypatch.setattr(rabbitmq_gateway.time, "sleep", lambda seconds: None)
+
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=1, connect_attempts=3)
+    publisher.publish("booking.created", "1")
+
+    assert len(broker.published) == 1
+    publisher.close()
+
+
+def test_confirm_mode_enables_publisher_confirms(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=1, confirm_delivery=True)
+    publisher.publish("booking.created", "1")
+
+    assert broker.connections[0].channels[0].confirms is True
+    publisher.close()
+
+
+def test_confirm_mode_raises_when_the_broker_nacks(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=1, confirm_delivery=True)
+    broker.nack.add("1")
+
+    with pytest.raises(PublishNotConfirmedError):
+        publisher.publish("booking.created", "1")
+
+    # El canal con tags sin resolver no vuelve al pool
+    publisher.publish("booking.created", "2")
+    assert [c.is_open for c in broker.connections] == [False, True]
+    publisher.close()
+
+
+def test_batch_is_published_before_a_single_confirm_wait(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=1, confirm_delivery=True)
+    publisher.publish("booking.created", "warm-up")
+    connection = broker.connections[0]
+    waits = connection.waits
+
+    publisher.publish_batch([("booking.created", str(i), None) for i in range(50)])
+
+    assert len(broker.published) == 51
+    assert connection.waits - waits == 1
+    assert connection.channels[0].confirms is True
+    publisher.close()
+
+
+def test_batch_reports_the_confirmed_prefix(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=1, confirm_delivery=True)
+    broker.nack.add("2")
+
+    with pytest.raises(PublishNotConfirmedError) as error:
+        publisher.publish_batch([("booking.created", str(i), None) for i in range(5)])
+
+    # 0 y 1 confirmados; 3 y 4 llegaron con ack pero quedan detrás del nack de 2
+    assert error.value.confirmed == 2
+    assert len(broker.published) == 5
+    publisher.close()
+
+
+def test_acks_received_before_a_lost_connection_still_count(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=1, confirm_delivery=True)
+    publisher.publish("booking.created", "warm-up")
+    broker.connections[0].drop_after_confirms = True
+    broker.nack.add("2")
+
+    with pytest.raises(PublishNotConfirmedError) as error:
+        publisher.publish_batch([("booking.created", str(i), None) for i in range(4)])
+
+    assert error.value.confirmed == 2
+    assert isinstance(error.value.__cause__, pika.exceptions.StreamLostError)
+    publisher.close()
+
+
+def test_batch_needs_confirm_mode(broker):
+    publisher = RabbitMQPublisher("rabbitmq", 5672, pool_size=1)
+
+    with pytest.raises(RuntimeError):
+        publisher.publish_batch([("booking.created", "1", None)])
+    publisher.close()
+
+
+
+def test_failed_publish_leaves_the_shared_pool_open(broker, monkeypatch):
+    monkeypatch.setattr(rabbitmq_gateway, "_publishers", {})
+    monkeypatch.setattr(rabbitmq_gateway.time, "sleep", lambda seconds: None)
+    gateway = rabbitmq_gateway.RabbitMQGateway(confirm_delivery=True)
+    gateway.publish_confirmed("booking.created", {"n": 1})
+    # La conexión se rompe y el broker tampoco acepta una nueva: el publish falla
+    broker.connections[0].broken = True
+    broker.refuse = rabbitmq_gateway.RABBITMQ_CONNECT_ATTEMPTS
+
+    with pytest.raises(pika.exceptions.AMQPConnectionError):
+        gateway.publish_confirmed("booking.created", {"n": 2})
+
+    # Solo se descartó la conexión rota; el pool compartido sigue sirviendo al resto
+    other = rabbitmq_gateway.RabbitMQGateway(confirm_delivery=True)
+    other.publish_confirmed("booking.created", {"n": 3})
+
+    assert other.publisher is gateway.publisher
+    assert [body for _, body in broker.published] == ['{"n": 1}', '{"n": 3}']
+    assert [c.is_open for c in broker.connections] == [False, True]
+    rabbitmq_gateway.close_publishers()
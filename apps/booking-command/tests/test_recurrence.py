@@ -0,0 +1,89 @@
+# tests/test_recurrence.py
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.domain.recurrence import (
+    MAX_SERIES_OCCURRENCES,
+    RecurrenceRule,
+    iter_occurrences,
+    validate_rule,
+)
+
+# Martes 2026-03-03, 08:00-10:00 UTC
+FIRST_START = datetime(2026, 3, 3, 8, tzinfo=timezone.utc)
+FIRST_END = FIRST_START + timedelta(hours=2)
+
+
+def weekly(**kwargs):
+    return RecurrenceRule(FIRST_START, FIRST_END, "WEEKLY", **kwargs)
+
+
+def test_weekly_semester_expands_sixteen_tuesdays():
+    rule = weekly(count=16)
+    validate_rule(rule)
+
+    occurrences = list(iter_occurrences(rule))
+
+    assert len(occurrences) == 16
+    assert all(start.weekday() == 1 for start, _ in occurrences)
+    assert occurrences[-1][0] == FIRST_START + timedelta(weeks=15)
+    assert all(end - start == timedelta(hours=2) for start, end in occurrences)
+
+
+def test_weekly_by_weekday_and_until_are_inclusive():
+    # Martes y jueves hasta el jueves de la segunda semana (inclusive)
+    rule = weekly(by_weekday=(1, 3), until=datetime(2026, 3, 12, 8, tzinfo=timezone.utc))
+
+    starts = [start for start, _ in iter_occurrences(rule)]
+
+    assert [s.day for s in starts] == [3, 5, 10, 12]
+
+
+def test_exceptions_are_skipped_but_count_includes_them():
+    rule = weekly(count=4, exdates=(date(2026, 3, 10),))
+
+    starts = [start.date() for start, _ in iter_occurrences(rule)]
+
+    assert starts == [date(2026, 3, 3), date(2026, 3, 17), date(2026, 3, 24)]
+
+
+def test_daily_with_interval_and_weekdays():
+    # Cada dos días, solo de lunes a viernes
+    rule = RecurrenceRule(FIRST_START, FIRST_END, "DAILY", interval=2, by_weekday=(0, 1, 2, 3, 4), count=4)
+
+    starts = [start.date() for start, _ in iter_occurrences(rule)]
+
+    assert starts == [date(2026, 3, 3), date(2026, 3, 5), date(2026, 3, 9), date(2026, 3, 11)]
+
+
+def test_weekdays_follow_local_offset():
+    # 20:00 del lunes en UTC-5 es 01:00 del martes en UTC
+    start = datetime(2026, 3, 3, 1, tzinfo=timezone.utc)
+    rule = RecurrenceRule(start, start + timedelta(hours=1), "WEEKLY", by_weekday=(0,), count=2,
+                          exdates=(date(2026, 3, 9),), utc_offset_minutes=-300)
+
+    assert [s for s, _ in iter_occurrences(rule)] == [start]
+
+
+def test_window_only_returns_touching_occurrences():
+    rule = weekly(count=16)
+    window_start = FIRST_START + timedelta(weeks=4, hours=1)
+    window_end = FIRST_START + timedelta(weeks=6)
+
+    starts = [s for s, _ in iter_occurrences(rule, window_start, window_end)]
+
+    assert starts == [FIRST_START + timedelta(weeks=4), FIRST_START + timedelta(weeks=5)]
+
+
+@pytest.mark.parametrize("rule", [
+    weekly(),                                                      # sin until ni count
+    weekly(count=MAX_SERIES_OCCURRENCES + 1),
+    RecurrenceRule(FIRST_START, FIRST_END, "DAILY", until=FIRST_START + timedelta(days=800)),
+    RecurrenceRule(FIRST_START, FIRST_START + timedelta(hours=30), "DAILY", count=3),   # se solapan
+    weekly(count=2, by_weekday=(7,)),
+    RecurrenceRule(FIRST_START, FIRST_END, "MONTHLY", count=2),
+])
+def test_invalid_rules_are_rejected(rule):
+    with pytest.raises(ValueError):
+        validate_rule(rule)
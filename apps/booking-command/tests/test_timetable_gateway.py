@@ -0,0 +1,208 @@
+# tests/test_timetable_gateway.py
+import asyncio
+import time
+import uuid
+from concurrent import futures
+from datetime import datetime, timedelta, timezone
+
+import grpc
+import pytest
+
+import src.timetable_pb2 as pb2
+import src.timetable_pb2_grpc as pb2_grpc
+from src.domain.ports import TimetableUnavailableError
+from src.infrastructure.gateways.timetable_gateway import (
+    AsyncGrpcTimetableGateway,
+    GrpcTimetableGateway,
+    epoch_range,
+    iso_range,
+    to_epoch_ms,
+)
+
+
+def test_to_epoch_ms_treats_naive_as_utc():
+    naive = datetime(2026, 1, 15, 8, 0)
+    aware = datetime(2026, 1, 15, 3, 0, tzinfo=timezone(timedelta(hours=-5)))
+
+    assert to_epoch_ms(naive) == to_epoch_ms(aware) == 1768464000000
+
+
+def test_epoch_range_is_smaller_than_iso_range():
+    start = datetime(2026, 1, 15, 8, 0, tzinfo=timezone.utc)
+    end = start + timedelta(hours=2)
+
+    epoch = epoch_range(start, end)
+    iso = iso_range(start, end)
+
+    assert (epoch.start_ms, epoch.end_ms) == (to_epoch_ms(start), to_epoch_ms(end))
+    assert epoch.start == "" and epoch.end == ""
+    assert len(epoch.SerializeToString()) * 3 < len(iso.SerializeToString())
+
+
+# ----------------------------
+# Canal compartido contra un servidor gRPC en proceso
+# ----------------------------
+
+class RecordingChecker(pb2_grpc.TimetableCheckerServicer):
+    """Sin GetCapabilities, como un motor anterior a los campos epoch."""
+
+    def __init__(self, unavailable_first=0, delay=0.0):
+        self.peers = []
+        self.candidates = []
+        self.unavailable_first = unavailable_first
+        self.delay = delay
+
+    def CheckClassroomAvailability(self, request, context):
+        self.peers.append(context.peer())
+        self.candidates.append(request.candidate)
+        if self.unavailable_first:
+            self.unavailable_first -= 1
+            context.abort(grpc.StatusCode.UNAVAILABLE, "restarting")
+        time.sleep(self.delay)
+        return pb2.CheckResponse(has_conflict=False)
+
+
+class EpochChecker(RecordingChecker):
+    def __init__(self, failing_probes=0):
+        super().__init__()
+        self.probes = 0
+        self.failing_probes = failing_probes
+
+    def GetCapabilities(self, request, context):
+        self.probes += 1
+        if self.failing_probes:
+            self.failing_probes -= 1
+            context.abort(grpc.StatusCode.UNKNOWN, "boom")
+        return pb2.CapabilitiesResponse(epoch_ranges=True)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    servers = []
+
+    def start(servicer):
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        pb2_grpc.add_TimetableCheckerServicer_to_server(servicer, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+        servers.append(server)
+        monkeypatch.setenv("TIMETABLE_SERVICE_HOST", "127.0.0.1")
+        monkeypatch.setenv("TIMETABLE_SERVICE_PORT", str(port))
+        return servicer
+
+    yield start
+    for server in servers:
+        server.stop(0)
+
+
+def check(gateway):
+    start = datetime(2026, 1, 15, 8, 0, tzinfo=timezone.utc)
+    return gateway.check_classroom_availability(uuid.uuid4(), start, start + timedelta(hours=1))
+
+
+async def check_async(gateway):
+    start = datetime(2026, 1, 15, 8, 0, tzinfo=timezone.utc)
+    return await gateway.check_classroom_availability(uuid.uuid4(), start, start + timedelta(hours=1))
+
+
+def test_gateways_share_one_connection(engine):
+    servicer = engine(RecordingChecker())
+
+    for _ in range(20):
+        assert check(GrpcTimetableGateway()) is True
+
+    # Una sola conexión HTTP/2 (mismo puerto de origen) para las 20 llamadas
+    assert len(servicer.peers) == 20
+    assert len(set(servicer.peers)) == 1
+    assert GrpcTimetableGateway().channel_state() == "READY"
+
+
+def test_unavailable_is_retried_on_the_shared_channel(engine):
+    servicer = engine(RecordingChecker(unavailable_first=1))
+
+    assert check(GrpcTimetableGateway()) is True
+    assert len(servicer.peers) == 2
+
+
+def test_deadline_surfaces_as_unavailable(engine):
+    engine(RecordingChecker(delay=0.5))
+    gateway = GrpcTimetableGateway()
+    gateway.deadline_seconds = 0.05
+
+    with pytest.raises(TimetableUnavailableError):
+        check(gateway)
+
+
+def test_probe_reports_unreachable_engine(monkeypatch):
+    monkeypatch.setenv("TIMETABLE_SERVICE_HOST", "127.0.0.1")
+    monkeypatch.setenv("TIMETABLE_SERVICE_PORT", "1")
+
+    assert GrpcTimetableGateway().probe(timeout=0.2) is False
+
+
+# ----------------------------
+# Negociación de la codificación de TimeRange
+# ----------------------------
+
+def is_epoch(time_range):
+    return time_range.start_ms > 0 and time_range.start == ""
+
+
+def test_engine_that_confirms_epoch_gets_epoch_ranges(engine):
+    servicer = engine(EpochChecker())
+
+    check(GrpcTimetableGateway())
+    check(GrpcTimetableGateway())
+
+    assert [is_epoch(c) for c in servicer.candidates] == [True, True]
+    # Se pregunta una vez por canal, no por llamada
+    assert servicer.probes == 1
+
+
+def test_engine_without_capabilities_gets_iso_ranges(engine):
+    servicer = engine(RecordingChecker())
+
+    check(GrpcTimetableGateway())
+
+    candidate = servicer.candidates[0]
+    assert not is_epoch(candidate)
+    assert datetime.fromisoformat(candidate.start) == datetime(2026, 1, 15, 8, 0, tzinfo=timezone.utc)
+
+
+def test_failed_probe_does_not_downgrade_the_channel(engine):
+    servicer = engine(EpochChecker(failing_probes=1))
+
+    check(GrpcTimetableGateway())
+    check(GrpcTimetableGateway())
+
+    # Un error cualquiera no prueba nada: esa llamada va en ISO y la siguiente vuelve a preguntar
+    assert [is_epoch(c) for c in servicer.candidates] == [False, True]
+    assert servicer.probes == 2
+
+
+def test_downgrade_is_scoped_to_the_channel(engine):
+    old = engine(RecordingChecker())
+    check(GrpcTimetableGateway())
+    new = engine(EpochChecker())
+    check(GrpcTimetableGateway())
+
+    assert not is_epoch(old.candidates[0])
+    assert is_epoch(new.candidates[0])
+
+
+def test_async_gateway_negotiates_per_channel(engine):
+    old = engine(RecordingChecker())
+
+    async def old_engine():
+        return await check_async(AsyncGrpcTimetableGateway())
+
+    asyncio.run(old_engine())
+    new = engine(EpochChecker())
+
+    async def new_engine():
+        return await check_async(AsyncGrpcTimetableGateway()), await check_async(AsyncGrpcTimetableGateway())
+
+    assert asyncio.run(new_engine()) == (True, True)
+    assert not is_epoch(old.candidates[0])
+    assert [is_epoch(c) for c in new.candidates] == [True, True]
+    assert new.probes == 1
@@ -35,6 +35,7 @@ app.include_router(router, prefix="/api/v1/queries", tags=["queries"])
 
 BOOKING_COMMAND_URL = os.getenv("BOOKING_COMMAND_URL", "http://booking-command:8000")
 INTERNAL_API_KEY = os.getenv("INTERNAL_API_KEY", "")
+REHYDRATE_BATCH_SIZE = int(os.getenv("REHYDRATE_BATCH_SIZE", 1000))
 
 async def rehydrate_from_command():
     r = get_redis_client()
@@ -51,24 +52,20 @@ async def rehydrate_from_command():
     if INTERNAL_API_KEY:
         headers["X-Internal-API-Key"] = INTERNAL_API_KEY
 
-    limit = 1000
-    offset = 0
     total_loaded = 0
+    pipe = r.pipeline(transaction=False)
+    pending = 0
 
+    # Una sola respuesta NDJSON en lugar de páginas con offset (coste cuadrático)
+    url = f"{BOOKING_COMMAND_URL}/api/v1/bookings/internal/bookings/export"
     async with httpx.AsyncClient(timeout=30.0) as client:
-        while True:
-            url = f"{BOOKING_COMMAND_URL}/api/v1/bookings/internal/bookings?limit={limit}&offset={offset}"
-            resp = await client.get(url, headers=headers)
+        async with client.stream("GET", url, headers=headers) as resp:
             resp.raise_for_status()
-            data = resp.json()
-            items = data.get("items", [])
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                doc = json.loads(line)
 
-            if not items:
-                break
-
-            pipe = r.pipeline(transaction=False)
-
-            for doc in items:
                 booking_id = doc["booking_id"]
                 pipe.set(f"booking:{booking_id}", json.dumps(doc))
                 pipe.sadd("bookings:all", booking_id)
@@ -80,10 +77,15 @@ async def rehydrate_from_command():
                 if classroom_id:
                     pipe.sadd(f"classroom:{classroom_id}:bookings", booking_id)
 
-            pipe.execute()
+                total_loaded += 1
+                pending += 1
+                if pending >= REHYDRATE_BATCH_SIZE:
+                    pipe.execute()
+                    pipe = r.pipeline(transaction=False)
+                    pending = 0
 
-            total_loaded += len(items)
-            offset += limit
+    if pending:
+        pipe.execute()
 
     print(f"[booking-query] Rehydrate completo. Bookings cargados: {total_loaded}")
 
@@ -39,7 +39,8 @@ def create_classroom(payload: ClassroomCreate, db: Session = Depends(get_db)):
 @router.get("/", 
             response_model=list[ClassroomResponse],
             summary="List classrooms",
-            description="Retrieve a list of classrooms with optional filtering for operational status.",
+            description="Retrieve a list of classrooms ordered by id, with optional filtering for operational status. "
+                        "Pass the last id of a page as `after` to get the next one.",
             responses={
                 200: {"description": "List of classrooms retrieved successfully."},
             })
@@ -47,12 +48,16 @@ def list_classrooms(
     skip: int = 0,
     limit: int = 100,
     only_operational: bool | None = None,
+    after: UUID | None = None,
     db: Session = Depends(get_db)
 ):
     q = db.query(Classroom)
     if only_operational is True:
         q = q.filter(Classroom.is_operational.is_(True))
-    return q.offset(skip).limit(limit).all()
+    # Keyset paging: rows created or deleted meanwhile don't shift later pages
+    if after is not None:
+        q = q.filter(Classroom.id > after)
+    return q.order_by(Classroom.id).offset(skip).limit(limit).all()
 
 @router.get("/{classroom_id}", 
             response_model=ClassroomResponse,
@@ -117,6 +117,18 @@ def test_list_classrooms_only_operational_filter():
     assert items[0]["is_operational"] is True
 
 
+def test_list_classrooms_pages_by_id_with_after():
+    ids = sorted(create_classroom(code=f"A{i}").json()["id"] for i in range(5))
+
+    first = client.get("/api/v1/classrooms/?limit=2").json()
+    second = client.get(f"/api/v1/classrooms/?limit=2&after={first[-1]['id']}").json()
+    # Deleting a row already read does not shift the following pages
+    client.delete(f"/api/v1/classrooms/{first[0]['id']}")
+    third = client.get(f"/api/v1/classrooms/?limit=2&after={second[-1]['id']}").json()
+
+    assert [x["id"] for x in first + second + third] == ids
+
+
 def test_get_classroom_by_id_success():
     created = create_classroom(code="A1", capacity=10)
     classroom_id = created.json()["id"]
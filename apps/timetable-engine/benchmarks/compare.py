@@ -0,0 +1,55 @@
+"""
+Compara dos reportes de benchmarks/run.py por (benchmark, distribución, tamaño).
+
+  python benchmarks/compare.py baseline.json current.json --threshold 1.25
+
+Sale con código 1 si alguna mediana empeora más que `threshold` veces.
+Las celdas por debajo de --min-us se ignoran: a esa escala domina el ruido.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+Key = Tuple[str, str, int]
+
+
+def load(path: str) -> Dict[Key, dict]:
+    with open(path) as f:
+        report = json.load(f)
+    return {(r["benchmark"], r["distribution"], r["size"]): r for r in report["results"]}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compara dos reportes de benchmarks")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Razón actual/base que cuenta como regresión")
+    parser.add_argument("--min-us", type=float, default=5.0, help="Mediana base mínima para evaluar una celda")
+    args = parser.parse_args(argv)
+
+    baseline = load(args.baseline)
+    current = load(args.current)
+
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        base_us = baseline[key]["median_us"]
+        cur_us = current[key]["median_us"]
+        ratio = cur_us / base_us if base_us else float("inf")
+        flag = ""
+        if base_us >= args.min_us and ratio > args.threshold:
+            flag = "  REGRESIÓN"
+            regressions += 1
+        name, distribution, size = key
+        print(f"{name:<34} {distribution:>9} {size:>9}  {base_us:>12.3f} -> {cur_us:>12.3f} µs  x{ratio:6.2f}{flag}")
+
+    missing = sorted(baseline.keys() - current.keys())
+    for name, distribution, size in missing:
+        print(f"{name:<34} {distribution:>9} {size:>9}  ausente en el reporte actual")
+
+    print(f"\n{regressions} regresiones (umbral x{args.threshold})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
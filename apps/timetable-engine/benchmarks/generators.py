@@ -0,0 +1,104 @@
+"""
+Generadores sintéticos de reservas (epoch ms) para los benchmarks.
+
+Todos son deterministas dada la semilla y devuelven exactamente `size`
+intervalos [start, end) sin ordenar, como llegarían en una petición.
+"""
+import random
+from typing import Callable, Dict, List, Tuple
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+WEEK_MS = 7 * DAY_MS
+
+# Lunes 2026-03-02 00:00 UTC: inicio de un semestre típico
+BASE_MS = 1_772_409_600_000
+
+Interval = Tuple[int, int]
+
+
+def _duration(rng: random.Random) -> int:
+    # Bloques de 30 min entre 30 min y 3 h, como en las reservas reales
+    return rng.randint(1, 6) * 30 * MINUTE_MS
+
+
+def dense(size: int, seed: int = 0) -> List[Interval]:
+    """Reservas apiñadas: ~30 min entre inicios, muchas se solapan entre sí."""
+    rng = random.Random(seed)
+    span = max(size, 1) * 30 * MINUTE_MS
+    out = []
+    for _ in range(size):
+        start = BASE_MS + rng.randrange(0, span, 15 * MINUTE_MS)
+        out.append((start, start + _duration(rng)))
+    return out
+
+
+def sparse(size: int, seed: int = 0) -> List[Interval]:
+    """Una o dos reservas por día: la mayoría de las consultas no chocan."""
+    rng = random.Random(seed)
+    span = max(size, 1) * DAY_MS
+    out = []
+    for _ in range(size):
+        start = BASE_MS + rng.randrange(0, span, 30 * MINUTE_MS)
+        out.append((start, start + rng.randint(1, 4) * 30 * MINUTE_MS))
+    return out
+
+
+def clustered(size: int, seed: int = 0) -> List[Interval]:
+    """Ráfagas (semanas de exámenes, eventos): grupos densos separados por huecos largos."""
+    rng = random.Random(seed)
+    clusters = max(1, size // 200)
+    span = clusters * 2 * WEEK_MS
+    centers = [BASE_MS + rng.randrange(0, span, HOUR_MS) for _ in range(clusters)]
+    out = []
+    for _ in range(size):
+        center = rng.choice(centers)
+        offset = int(rng.gauss(0, 2 * DAY_MS)) // (30 * MINUTE_MS) * (30 * MINUTE_MS)
+        start = center + offset
+        out.append((start, start + _duration(rng)))
+    return out
+
+
+def semester(size: int, seed: int = 0, weeks: int = 16) -> List[Interval]:
+    """
+    Clases recurrentes: cada curso repite su franja (día, hora) todas las
+    semanas del semestre. Con muchos cursos las franjas se reutilizan,
+    como pasa en un edificio con varias aulas.
+    """
+    rng = random.Random(seed)
+    out: List[Interval] = []
+    while len(out) < size:
+        weekday = rng.randrange(5)
+        start_of_day = rng.randrange(7 * 60, 20 * 60, 30) * MINUTE_MS
+        duration = rng.choice((60, 90, 120)) * MINUTE_MS
+        for week in range(weeks):
+            if len(out) == size:
+                break
+            start = BASE_MS + week * WEEK_MS + weekday * DAY_MS + start_of_day
+            out.append((start, start + duration))
+    rng.shuffle(out)
+    return out
+
+
+DISTRIBUTIONS: Dict[str, Callable[..., List[Interval]]] = {
+    "dense": dense,
+    "sparse": sparse,
+    "clustered": clustered,
+    "semester": semester,
+}
+
+
+def queries_for(intervals: List[Interval], count: int, seed: int = 0) -> List[Interval]:
+    """Candidatos dentro del mismo rango temporal que `intervals` (para que algunos choquen)."""
+    rng = random.Random(seed + 1)
+    if intervals:
+        lo = min(s for s, _ in intervals)
+        hi = max(e for _, e in intervals)
+    else:
+        lo, hi = BASE_MS, BASE_MS + WEEK_MS
+    out = []
+    for _ in range(count):
+        start = rng.randrange(lo, max(hi, lo + 1), 15 * MINUTE_MS)
+        out.append((start, start + rng.randint(1, 4) * 30 * MINUTE_MS))
+    return out
@@ -0,0 +1,386 @@
+"""
+Benchmarks de detección de solapamientos del timetable-engine.
+
+Mide, por distribución (dense, sparse, clustered, semester) y tamaño del
+conjunto de reservas existentes:
+
+  check_overlap              referencia con strings ISO (lo que hacía el motor original)
+  linear_scan                el mismo barrido lineal sobre epoch ms, sin parseo
+  interval_set.build         ordenar + fusionar (costo por petición de CheckAvailability)
+  interval_set.query         consulta por búsqueda binaria sobre el conjunto ya construido
+  check_overlap_batch        lote completo de candidatos; tiempos por candidato
+  room_index.query           consulta sobre RoomIntervals (índice por aula)
+  grpc.*                     RPC reales contra un servidor grpc.aio en el mismo proceso
+
+Uso (desde apps/timetable-engine):
+
+  python benchmarks/run.py --output report.json
+  python benchmarks/run.py --quick --no-grpc --output -
+  python benchmarks/compare.py baseline.json report.json
+
+El reporte es JSON; cada resultado trae min/mediana/p95/media en microsegundos
+y ops/s, y la metadata incluye el commit para comparar entre versiones.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = SERVICE_ROOT / "src"
+PROTOS_DIR = SERVICE_ROOT / "protos"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generators import DISTRIBUTIONS, Interval, queries_for  # noqa: E402
+from index import ClassroomIndex, RoomIntervals  # noqa: E402
+from logic import IntervalSet, check_overlap, check_overlap_batch  # noqa: E402
+
+REPORT_SCHEMA = 1
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10, 1_000, 10_000)
+BENCH_ROOM = "bench-room"
+
+
+# ----------------------------
+# Medición
+# ----------------------------
+
+def summarize(samples_ns: Sequence[int], per_call: int = 1) -> Dict[str, float]:
+    """Estadísticas en µs por operación; `per_call` reparte el tiempo de una llamada por lote."""
+    ordered = sorted(s / per_call for s in samples_ns)
+    n = len(ordered)
+    total = sum(ordered)
+    return {
+        "calls": n,
+        "ops": n * per_call,
+        "min_us": round(ordered[0] / 1000, 3),
+        "median_us": round(ordered[n // 2] / 1000, 3),
+        "p95_us": round(ordered[min(n - 1, int(n * 0.95))] / 1000, 3),
+        "mean_us": round(total / n / 1000, 3),
+        "ops_per_s": round(n / (total / 1e9), 1) if total else None,
+    }
+
+
+def time_calls(fn: Callable, args: Sequence, budget_s: float, min_calls: int = 1) -> List[int]:
+    """Llama fn(*a) por cada a en args hasta agotar el presupuesto de tiempo."""
+    samples = []
+    deadline = time.perf_counter() + budget_s
+    for a in args:
+        t0 = time.perf_counter_ns()
+        fn(*a)
+        samples.append(time.perf_counter_ns() - t0)
+        if len(samples) >= min_calls and time.perf_counter() > deadline:
+            break
+    return samples
+
+
+def linear_scan(start: int, end: int, existing: Sequence[Interval]) -> bool:
+    for s, e in existing:
+        if s < end and start < e:
+            return True
+    return False
+
+
+def _iso(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
+
+
+# ----------------------------
+# gRPC en proceso
+# ----------------------------
+
+def load_stubs() -> None:
+    """Los stubs se generan en el build de la imagen; fuera de ella se compilan a un directorio temporal."""
+    try:
+        import timetable_pb2  # noqa: F401
+        import timetable_pb2_grpc  # noqa: F401
+    except ImportError:
+        from grpc_tools import protoc
+
+        out = tempfile.mkdtemp(prefix="timetable-stubs-")
+        protoc.main((
+            "",
+            f"-I{PROTOS_DIR}",
+            f"--python_out={out}",
+            f"--grpc_python_out={out}",
+            str(PROTOS_DIR / "timetable.proto"),
+        ))
+        sys.path.insert(0, out)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class InProcessEngine:
+    """
+    Servidor grpc.aio del motor en un hilo con su propio event loop, y un
+    cliente síncrono en el hilo principal. Cliente y servidor comparten el GIL,
+    así que los números son una cota conservadora de un despliegue real.
+    """
+
+    def __init__(self, index: ClassroomIndex):
+        self.index = index
+
+    async def _start(self):
+        import server
+        from catalog import ClassroomCatalog
+
+        self.server = server.create_server(
+            server.TimetableService(self.index, ClassroomCatalog()), f"127.0.0.1:{self.port}"
+        )
+        await self.server.start()
+
+    def __enter__(self):
+        import grpc
+        import server
+        import timetable_pb2_grpc
+
+        self.port = _free_port()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+
+        options = [
+            ("grpc.max_send_message_length", server.MAX_MESSAGE_BYTES),
+            ("grpc.max_receive_message_length", server.MAX_MESSAGE_BYTES),
+        ]
+        self.channel = grpc.insecure_channel(f"127.0.0.1:{self.port}", options=options)
+        grpc.channel_ready_future(self.channel).result(timeout=10)
+        self.stub = timetable_pb2_grpc.TimetableCheckerStub(self.channel)
+        return self
+
+    def __exit__(self, *exc):
+        self.channel.close()
+        asyncio.run_coroutine_threadsafe(self.server.stop(None), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def bench_grpc(existing: List[Interval], queries: List[Interval], budget_s: float, repeat: int) -> Dict[str, Dict]:
+    import timetable_pb2 as pb2
+
+    def rng(s: int, e: int):
+        return pb2.TimeRange(start_ms=s, end_ms=e)
+
+    index = ClassroomIndex()
+    index.load((BENCH_ROOM, str(i), s, e) for i, (s, e) in enumerate(sorted(existing)))
+    index.mark_ready()
+
+    existing_pb = [rng(s, e) for s, e in existing]
+    check_requests = [(pb2.CheckRequest(candidate=rng(s, e), existing_bookings=existing_pb),) for s, e in queries]
+    classroom_requests = [(pb2.ClassroomCheckRequest(classroom_id=BENCH_ROOM, candidate=rng(s, e)),) for s, e in queries]
+    batch_request = pb2.BatchCheckRequest(candidates=[rng(s, e) for s, e in queries], existing_bookings=existing_pb)
+
+    results = {}
+    # El servidor imprime una línea por RPC; se descarta para no medir la terminal
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), InProcessEngine(index) as engine:
+        engine.stub.CheckClassroomAvailability(classroom_requests[0][0])   # calentamiento
+        results["grpc.check_availability"] = summarize(
+            time_calls(engine.stub.CheckAvailability, check_requests, budget_s, min_calls=3)
+        )
+        results["grpc.check_classroom_availability"] = summarize(
+            time_calls(engine.stub.CheckClassroomAvailability, classroom_requests, budget_s, min_calls=3)
+        )
+        results["grpc.check_availability_batch"] = summarize(
+            time_calls(engine.stub.CheckAvailabilityBatch, [(batch_request,)] * repeat, budget_s),
+            per_call=len(queries),
+        )
+    return results
+
+
+# ----------------------------
+# Motores en proceso
+# ----------------------------
+
+def bench_engines(
+    existing: List[Interval],
+    queries: List[Interval],
+    budget_s: float,
+    repeat: int,
+    reference_max_size: int,
+) -> Dict[str, Dict]:
+    results = {}
+    size = len(existing)
+
+    if size <= reference_max_size:
+        iso_existing = [(_iso(s), _iso(e)) for s, e in existing]
+        iso_queries = [(_iso(s), _iso(e), iso_existing) for s, e in queries]
+        results["check_overlap"] = summarize(time_calls(check_overlap, iso_queries, budget_s))
+
+    results["linear_scan"] = summarize(
+        time_calls(linear_scan, [(s, e, existing) for s, e in queries], budget_s)
+    )
+
+    results["interval_set.build"] = summarize(time_calls(IntervalSet, [(existing,)] * repeat, budget_s))
+    interval_set = IntervalSet(existing)
+    results["interval_set.query"] = summarize(time_calls(interval_set.overlaps, queries, budget_s, min_calls=len(queries)))
+
+    results["check_overlap_batch"] = summarize(
+        time_calls(check_overlap_batch, [(queries, interval_set)] * repeat, budget_s),
+        per_call=len(queries),
+    )
+
+    room = RoomIntervals()
+    for i, (s, e) in enumerate(sorted(existing)):
+        room.add(str(i), s, e)
+    results["room_index.query"] = summarize(time_calls(room.overlaps, queries, budget_s, min_calls=len(queries)))
+
+    # Los motores rápidos deben coincidir con el barrido lineal; se verifica una muestra acotada
+    sample = queries[: max(5, min(len(queries), 10_000_000 // max(size, 1)))]
+    batch_conflicts, _ = check_overlap_batch(sample, interval_set)
+    for (s, e), batch_hit in zip(sample, batch_conflicts):
+        expected = linear_scan(s, e, existing)
+        if interval_set.overlaps(s, e) != expected or room.overlaps(s, e) != expected or batch_hit != expected:
+            raise AssertionError(f"Resultado distinto al barrido lineal para [{s}, {e}) con {size} reservas")
+
+    return results
+
+
+# ----------------------------
+# Reporte
+# ----------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=SERVICE_ROOT, capture_output=True, text=True, timeout=5
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _git_dirty() -> Optional[bool]:
+    try:
+        out = subprocess.run(
+            ["git", "status", "--porcelain", "--", "src"], cwd=SERVICE_ROOT, capture_output=True, text=True, timeout=10
+        )
+        return bool(out.stdout.strip()) if out.returncode == 0 else None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def metadata() -> Dict:
+    meta = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "git_dirty_src": _git_dirty(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import grpc
+        meta["grpcio"] = grpc.__version__
+    except ImportError:
+        pass
+    return meta
+
+
+def run(args) -> Dict:
+    budget_s = args.budget_ms / 1000
+    results = []
+
+    if not args.no_grpc:
+        load_stubs()
+
+    for distribution in args.distributions:
+        generate = DISTRIBUTIONS[distribution]
+        for size in args.sizes:
+            existing = generate(size, seed=args.seed)
+            queries = queries_for(existing, args.queries, seed=args.seed)
+
+            cells = bench_engines(existing, queries, budget_s, args.repeat, args.reference_max_size)
+            if not args.no_grpc and size <= args.grpc_max_size:
+                cells.update(bench_grpc(existing, queries, budget_s, args.repeat))
+
+            for name, stats in cells.items():
+                results.append({"benchmark": name, "distribution": distribution, "size": size, **stats})
+                print(
+                    f"{distribution:>9} {size:>9} {name:<34} median {stats['median_us']:>12.3f} µs  "
+                    f"p95 {stats['p95_us']:>12.3f} µs",
+                    file=sys.stderr,
+                )
+
+    return {
+        "schema": REPORT_SCHEMA,
+        "meta": metadata(),
+        "params": {
+            "sizes": list(args.sizes),
+            "distributions": list(args.distributions),
+            "queries": args.queries,
+            "repeat": args.repeat,
+            "budget_ms": args.budget_ms,
+            "seed": args.seed,
+            "grpc": not args.no_grpc,
+            "grpc_max_size": args.grpc_max_size,
+            "reference_max_size": args.reference_max_size,
+        },
+        "results": results,
+    }
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v.replace("_", "")) for v in value.split(",") if v]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de solapamiento del timetable-engine")
+    parser.add_argument("--sizes", type=_int_list, default=None, help="Tamaños separados por coma (10 a 1000000)")
+    parser.add_argument("--distributions", type=lambda v: v.split(","), default=list(DISTRIBUTIONS))
+    parser.add_argument("--queries", type=int, default=None, help="Candidatos por celda")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de construcción y lote")
+    parser.add_argument("--budget-ms", type=int, default=None, help="Tiempo máximo por benchmark y celda")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-grpc", action="store_true", help="Omitir las mediciones por gRPC")
+    parser.add_argument("--grpc-max-size", type=int, default=100_000,
+                        help="Tamaño máximo enviado por gRPC (1M reservas supera el límite de mensaje)")
+    parser.add_argument("--reference-max-size", type=int, default=1_000_000,
+                        help="Tamaño máximo para check_overlap con ISO (es lento)")
+    parser.add_argument("--quick", action="store_true", help="Tamaños y presupuesto reducidos, para CI")
+    parser.add_argument("--output", default="benchmark-report.json", help="Ruta del reporte JSON, o - para stdout")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.distributions) - set(DISTRIBUTIONS)
+    if unknown:
+        parser.error(f"Distribuciones desconocidas: {', '.join(sorted(unknown))}")
+
+    args.sizes = args.sizes or list(QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    args.queries = args.queries or (200 if args.quick else 1000)
+    args.budget_ms = args.budget_ms or (200 if args.quick else 1000)
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = run(args)
+    payload = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        Path(args.output).write_text(payload + "\n")
+        print(f"Reporte escrito en {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
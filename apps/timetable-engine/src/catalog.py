@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Iterable, List, Optional
+
+import requests
+
+from index import ClassroomIndex
+
+CLASSROOM_SERVICE_URL = os.getenv("CLASSROOM_SERVICE_URL", "http://classroom-service:8000")
+CATALOG_TTL_SECONDS = int(os.getenv("TIMETABLE_CATALOG_TTL_SECONDS", 60))
+CATALOG_PAGE_SIZE = 500
+
+
+class ClassroomCatalog:
+    """
+    Réplica en memoria del catálogo de aulas, ordenada por capacidad.
+
+    Cada refresco construye una instantánea nueva (tupla inmutable) y la
+    reemplaza de una vez, así las búsquedas no necesitan lock.
+    """
+
+    def __init__(self):
+        # (capacities, classrooms) en paralelo, ordenados por capacidad
+        self._snapshot = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def __len__(self) -> int:
+        return len(self._snapshot[1]) if self._snapshot else 0
+
+    def replace(self, classrooms: Iterable[dict]) -> None:
+        rows = sorted(
+            (
+                {
+                    "classroom_id": str(c["id"]),
+                    "code": c.get("code") or "",
+                    "capacity": int(c.get("capacity") or 0),
+                    "location_details": c.get("location_details") or "",
+                    "is_operational": bool(c.get("is_operational", True)),
+                }
+                for c in classrooms
+            ),
+            key=lambda c: (c["capacity"], c["code"]),
+        )
+        self._snapshot = ([c["capacity"] for c in rows], rows)
+
+    def rooms(self, include_non_operational: bool = False) -> Optional[List[dict]]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return [room for room in snapshot[1] if include_non_operational or room["is_operational"]]
+
+    def search(
+        self,
+        index: ClassroomIndex,
+        start: int,
+        end: int,
+        min_capacity: int = 0,
+        include_non_operational: bool = False,
+        limit: int = 0,
+    ) -> Optional[List[dict]]:
+        """
+        Aulas libres en [start, end) con capacidad >= min_capacity, de menor a mayor
+        capacidad (el mejor ajuste primero). None si el catálogo o el índice no están listos.
+
+        La capacidad se ubica por búsqueda binaria y cada aula se valida contra el
+        índice en O(log n), así que el costo depende de cuántas aulas se recorren.
+        Con un índice particionado solo se devuelven las aulas de su shard.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or not index.ready:
+            return None
+
+        capacities, rows = snapshot
+        found = []
+        for room in rows[bisect_left(capacities, min_capacity):]:
+            if not include_non_operational and not room["is_operational"]:
+                continue
+            if not index.owns(room["classroom_id"]):
+                continue
+            if index.has_conflict(room["classroom_id"], start, end):
+                continue
+            found.append(room)
+            if limit and len(found) >= limit:
+                break
+        return found
+
+
+def fetch_classrooms() -> List[dict]:
+    url = f"{CLASSROOM_SERVICE_URL}/api/v1/classrooms/"
+    classrooms: List[dict] = []
+    params = {"limit": CATALOG_PAGE_SIZE}
+
+    with requests.Session() as session:
+        while True:
+            # Paginación por clave (`after` = último id): altas y bajas concurrentes no saltan aulas
+            resp = session.get(url, params=params, timeout=10)
+            resp.raise_for_status()
+            page = resp.json()
+            classrooms.extend(page)
+            if len(page) < CATALOG_PAGE_SIZE:
+                return classrooms
+            params["after"] = page[-1]["id"]
+
+
+def start_catalog_sync(catalog: ClassroomCatalog) -> None:
+    """
+    Refresca el catálogo cada TIMETABLE_CATALOG_TTL_SECONDS. Si classroom-service
+    falla se conserva la última instantánea.
+    """
+
+    def _refresh_forever():
+        attempt = 0
+        while True:
+            try:
+                catalog.replace(fetch_classrooms())
+                attempt = 0
+                time.sleep(CATALOG_TTL_SECONDS)
+            except Exception as e:
+                attempt += 1
+                wait = min(2 ** attempt, CATALOG_TTL_SECONDS)
+                print(f"[Timetable Engine] Refresco del catálogo de aulas falló: ({e}). Reintentando en {wait}s...")
+                time.sleep(wait)
+
+    threading.Thread(target=_refresh_forever, daemon=True).start()
@@ -0,0 +1,186 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import signal
+from typing import Callable, List, Optional, Sequence
+
+import grpc
+
+import server
+import timetable_pb2
+from index import shard_of
+
+SERVICE_NAME = "timetable.TimetableChecker"
+WORKER_BASE_PORT = int(os.getenv("TIMETABLE_WORKER_BASE_PORT", 50100))
+WATCHDOG_INTERVAL_SECONDS = 2
+
+
+def worker_address(shard_id: int) -> str:
+    return f"127.0.0.1:{WORKER_BASE_PORT + shard_id}"
+
+
+class ShardDispatcher:
+    """
+    Frente del modo multiproceso. Recibe las RPC en el puerto público y las
+    reenvía como bytes a los workers (sin deserializar salvo para enrutar):
+
+    - CheckClassroomAvailability y FindFreeSlots con aula: al shard dueño del aula.
+    - SearchAvailableClassrooms: a todos los shards; se mezclan los resultados.
+    - El resto no usa el índice y se reparte en round-robin.
+    """
+
+    def __init__(self, worker_addresses: Sequence[str]):
+        options = [
+            ("grpc.max_send_message_length", server.MAX_MESSAGE_BYTES),
+            ("grpc.max_receive_message_length", server.MAX_MESSAGE_BYTES),
+        ]
+        self.channels = [grpc.aio.insecure_channel(address, options=options) for address in worker_addresses]
+        self._round_robin = itertools.cycle(range(len(self.channels)))
+        self._stubs = {}
+
+    def _stub(self, worker: int, method: str):
+        stub = self._stubs.get((worker, method))
+        if stub is None:
+            # Sin serializadores: request y response viajan como bytes
+            stub = self.channels[worker].unary_unary(f"/{SERVICE_NAME}/{method}")
+            self._stubs[(worker, method)] = stub
+        return stub
+
+    async def _forward(self, worker: int, method: str, payload: bytes, context) -> bytes:
+        try:
+            return await self._stub(worker, method)(
+                payload, timeout=context.time_remaining(), wait_for_ready=True
+            )
+        except grpc.aio.AioRpcError as e:
+            await context.abort(e.code(), e.details())
+
+    def _keyed(self, method: str, classroom_of: Callable[[bytes], str]):
+        async def handler(payload: bytes, context) -> bytes:
+            classroom_id = classroom_of(payload)
+            if classroom_id:
+                worker = shard_of(classroom_id, len(self.channels))
+            else:
+                worker = next(self._round_robin)
+            return await self._forward(worker, method, payload, context)
+        return handler
+
+    def _any(self, method: str):
+        async def handler(payload: bytes, context) -> bytes:
+            return await self._forward(next(self._round_robin), method, payload, context)
+        return handler
+
+    async def _search(self, payload: bytes, context) -> bytes:
+        request = timetable_pb2.ClassroomSearchRequest.FromString(payload)
+        replies = await asyncio.gather(*(
+            self._forward(worker, "SearchAvailableClassrooms", payload, context)
+            for worker in range(len(self.channels))
+        ))
+
+        # Cada shard ya respeta el límite; se mezcla por capacidad como lo haría un solo proceso
+        classrooms = [
+            room
+            for reply in replies
+            for room in timetable_pb2.ClassroomSearchResponse.FromString(reply).classrooms
+        ]
+        classrooms.sort(key=lambda room: (room.capacity, room.code))
+        if request.limit:
+            classrooms = classrooms[:request.limit]
+        return timetable_pb2.ClassroomSearchResponse(classrooms=classrooms).SerializeToString()
+
+    def generic_handler(self) -> grpc.GenericRpcHandler:
+        keyed = {
+            "CheckClassroomAvailability": lambda b: timetable_pb2.ClassroomCheckRequest.FromString(b).classroom_id,
+            "FindFreeSlots": lambda b: timetable_pb2.FreeSlotsRequest.FromString(b).classroom_id,
+        }
+        handlers = {}
+        for method in timetable_pb2.DESCRIPTOR.services_by_name["TimetableChecker"].methods_by_name:
+            if method == "SearchAvailableClassrooms":
+                handler = self._search
+            elif method in keyed:
+                handler = self._keyed(method, keyed[method])
+            else:
+                handler = self._any(method)
+            handlers[method] = grpc.unary_unary_rpc_method_handler(handler)
+        return grpc.method_handlers_generic_handler(SERVICE_NAME, handlers)
+
+    async def close(self) -> None:
+        for channel in self.channels:
+            await channel.close()
+
+
+async def serve_dispatcher(address: str, shard_count: int, children: Sequence[multiprocessing.Process] = ()) -> int:
+    dispatcher = ShardDispatcher([worker_address(i) for i in range(shard_count)])
+
+    # so_reuseport: varios procesos dispatcher pueden compartir el puerto público
+    grpc_server = grpc.aio.server(
+        options=server.server_options() + [("grpc.so_reuseport", 1)],
+        maximum_concurrent_rpcs=server.MAX_CONCURRENT_RPCS or None,
+    )
+    grpc_server.add_generic_rpc_handlers((dispatcher.generic_handler(),))
+    grpc_server.add_insecure_port(address)
+    await grpc_server.start()
+    print(f"Timetable Engine dispatcher listening on {address} ({shard_count} shards)...")
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: asyncio.ensure_future(grpc_server.stop(server.SHUTDOWN_GRACE_SECONDS)))
+
+    exit_code = 0
+
+    async def _watchdog():
+        nonlocal exit_code
+        # Si un shard muere sus aulas quedan sin dueño: mejor salir y que el orquestador reinicie
+        while True:
+            await asyncio.sleep(WATCHDOG_INTERVAL_SECONDS)
+            dead = [child.name for child in children if not child.is_alive()]
+            if dead:
+                print(f"[Timetable Engine] Procesos caídos: {', '.join(dead)}. Deteniendo...")
+                exit_code = 1
+                await grpc_server.stop(server.SHUTDOWN_GRACE_SECONDS)
+                return
+
+    watchdog = asyncio.ensure_future(_watchdog()) if children else None
+    await grpc_server.wait_for_termination()
+    if watchdog:
+        watchdog.cancel()
+    await dispatcher.close()
+    return exit_code
+
+
+def _run_worker(shard_id: int, shard_count: int) -> None:
+    asyncio.run(server.serve(shard=(shard_id, shard_count), address=worker_address(shard_id)))
+
+
+def _run_dispatcher(address: str, shard_count: int) -> None:
+    asyncio.run(serve_dispatcher(address, shard_count))
+
+
+def run_cluster(address: str, shard_count: int, dispatcher_count: int = 1) -> int:
+    """
+    Arranca `shard_count` workers (cada uno dueño de sus aulas) y
+    `dispatcher_count` dispatchers en el puerto público; este proceso es uno de ellos.
+    """
+    # spawn: cada proceso arranca limpio, sin hilos ni canales heredados
+    context = multiprocessing.get_context("spawn")
+    children: List[multiprocessing.Process] = [
+        context.Process(target=_run_worker, args=(i, shard_count), name=f"timetable-shard-{i}")
+        for i in range(shard_count)
+    ]
+    children += [
+        context.Process(target=_run_dispatcher, args=(address, shard_count), name=f"timetable-dispatcher-{i}")
+        for i in range(1, dispatcher_count)
+    ]
+    for child in children:
+        child.start()
+
+    exit_code: Optional[int] = 1
+    try:
+        exit_code = asyncio.run(serve_dispatcher(address, shard_count, children))
+    finally:
+        for child in children:
+            if child.is_alive():
+                child.terminate()
+        for child in children:
+            child.join(server.SHUTDOWN_GRACE_SECONDS + 1)
+    return exit_code
@@ -0,0 +1,224 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import pika
+import requests
+
+from index import ClassroomIndex
+from logic import to_epoch_ms
+
+BOOKING_COMMAND_URL = os.getenv("BOOKING_COMMAND_URL", "http://booking-command:8000")
+INTERNAL_API_KEY = os.getenv("INTERNAL_API_KEY", "")
+REHYDRATE_PAGE_SIZE = int(os.getenv("TIMETABLE_REHYDRATE_PAGE_SIZE", 1000))
+# Cada serie trae hasta cientos de ocurrencias: páginas más chicas
+SERIES_PAGE_SIZE = 100
+
+
+SERIES_ROUTING_KEYS = ("booking.series.created", "booking.series.canceled", "booking.series.occurrence_canceled")
+
+
+def series_rows(event_data: dict) -> list:
+    """(classroom_id, occurrence_id, start, end) de cada ocurrencia de un evento o ítem de serie."""
+    classroom_id = event_data.get("classroom_id")
+    return [
+        (classroom_id, o["occurrence_id"], to_epoch_ms(o["start_time"]), to_epoch_ms(o["end_time"]))
+        for o in event_data.get("occurrences") or []
+        if o.get("occurrence_id") and o.get("start_time") and o.get("end_time")
+    ]
+
+
+def apply_series_event(index: ClassroomIndex, routing_key: str, event_data: dict) -> bool:
+    """
+    Las series llegan con sus ocurrencias ya expandidas; cada una se indexa
+    como una reserva más bajo su occurrence_id.
+    """
+    if not event_data.get("classroom_id"):
+        return False
+
+    rows = series_rows(event_data)
+    if routing_key == "booking.series.created":
+        for classroom_id, occurrence_id, start, end in rows:
+            index.add(classroom_id, occurrence_id, start, end)
+    else:
+        # Serie completa o una sola ocurrencia: el evento trae las que se liberan
+        for _, occurrence_id, _, _ in rows:
+            index.remove(occurrence_id)
+    return True
+
+
+def apply_event(index: ClassroomIndex, routing_key: str, event_data: dict) -> bool:
+    """
+    Aplica un evento de booking_events sobre el índice.
+    Retorna True si el evento era válido y se aplicó.
+    """
+    if routing_key in SERIES_ROUTING_KEYS:
+        return apply_series_event(index, routing_key, event_data)
+
+    booking_id = event_data.get("booking_id")
+    if not booking_id:
+        return False
+
+    if routing_key == "booking.canceled" or event_data.get("status") == "CANCELLED":
+        index.remove(booking_id)
+        return True
+
+    if routing_key == "booking.created":
+        classroom_id = event_data.get("classroom_id")
+        start_time = event_data.get("start_time")
+        end_time = event_data.get("end_time")
+        if not (classroom_id and start_time and end_time):
+            return False
+        index.add(classroom_id, booking_id, to_epoch_ms(start_time), to_epoch_ms(end_time))
+        return True
+
+    return False
+
+
+class BookingEventConsumer(threading.Thread):
+    """
+    Mantiene el índice al día con los eventos de booking-command.
+    Cada réplica del motor usa su propia cola exclusiva para recibir todos los eventos.
+
+    La cola exclusiva muere con la conexión y lo publicado mientras tanto se
+    pierde: al caer la conexión el índice se vacía (deja de estar listo) y,
+    cada vez que la cola vuelve a estar enlazada, `on_subscribed` dispara una
+    precarga nueva. Los eventos que llegan durante esa precarga se aplican con
+    lápidas, igual que en el primer arranque.
+    """
+
+    def __init__(self, index: ClassroomIndex, on_subscribed: Optional[Callable[[], None]] = None):
+        super().__init__()
+        self.host = os.getenv("RABBITMQ_HOST", "rabbitmq")
+        self.port = int(os.getenv("RABBITMQ_PORT", 5672))
+        self.index = index
+        self.on_subscribed = on_subscribed
+        self.daemon = True
+
+    def run(self):
+        attempt = 0
+        while True:
+            try:
+                params = pika.ConnectionParameters(host=self.host, port=self.port)
+                connection = pika.BlockingConnection(params)
+                channel = connection.channel()
+
+                channel.exchange_declare(exchange='booking_events', exchange_type='topic')
+
+                result = channel.queue_declare(queue='', exclusive=True)
+                queue_name = result.method.queue
+
+                channel.queue_bind(exchange='booking_events', queue=queue_name, routing_key='booking.created')
+                channel.queue_bind(exchange='booking_events', queue=queue_name, routing_key='booking.canceled')
+                channel.queue_bind(exchange='booking_events', queue=queue_name, routing_key='booking.series.*')
+
+                print("[Timetable Engine] Índice escuchando eventos de reservas...")
+                attempt = 0
+                # La cola ya recibe eventos: la precarga puede empezar sin dejar huecos
+                if self.on_subscribed is not None:
+                    self.on_subscribed()
+                channel.basic_consume(queue=queue_name, on_message_callback=self.process_event, auto_ack=True)
+                channel.start_consuming()
+
+            except Exception as e:
+                # Sin cola no llegan eventos: el índice deja de valer hasta la próxima precarga
+                self.index.reset()
+                attempt += 1
+                wait = min(2 ** attempt, 30)
+                print(f"[Timetable Engine] Error en consumidor RabbitMQ: ({e}). Índice invalidado, reintentando en {wait}s...")
+                time.sleep(wait)
+
+    def process_event(self, ch, method, properties, body):
+        try:
+            event_data = json.loads(body)
+            if not apply_event(self.index, method.routing_key, event_data):
+                print(f"[Timetable Engine] Evento ignorado: {method.routing_key}")
+        except Exception as e:
+            print(f"[Timetable Engine] Error procesando evento: {e}")
+
+
+def rehydrate_index(index: ClassroomIndex, generation: Optional[int] = None) -> Optional[int]:
+    """
+    Precarga el índice con las reservas confirmadas y las series activas de booking-command.
+    Retorna None si un reset del índice la dejó obsoleta a mitad de camino.
+    """
+    if generation is None:
+        generation = index.generation
+    headers = {}
+    if INTERNAL_API_KEY:
+        headers["X-Internal-API-Key"] = INTERNAL_API_KEY
+
+    # Export NDJSON en una sola respuesta; solo las confirmadas entran al índice
+    url = f"{BOOKING_COMMAND_URL}/api/v1/bookings/internal/bookings/export"
+    total_loaded = 0
+
+    with requests.Session() as session:
+        with session.get(url, params={"status": "CONFIRMED"}, headers=headers, timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            rows = []
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                doc = json.loads(line)
+                if doc.get("status") == "CONFIRMED" and doc.get("start_time") and doc.get("end_time"):
+                    rows.append((doc["classroom_id"], doc["booking_id"], to_epoch_ms(doc["start_time"]), to_epoch_ms(doc["end_time"])))
+                if len(rows) >= REHYDRATE_PAGE_SIZE:
+                    total_loaded += index.load(rows, generation)
+                    rows = []
+            total_loaded += index.load(rows, generation)
+
+        # Series activas, con sus ocurrencias ya expandidas por booking-command
+        series_url = f"{BOOKING_COMMAND_URL}/api/v1/bookings/internal/series"
+        params = {"limit": SERIES_PAGE_SIZE}
+        while True:
+            resp = session.get(series_url, params=params, headers=headers, timeout=30)
+            if resp.status_code == 404:
+                # booking-command anterior a las series
+                break
+            resp.raise_for_status()
+            page = resp.json()
+
+            items = page.get("items", [])
+            total_loaded += index.load((row for item in items for row in series_rows(item)), generation)
+
+            # Paginación por cursor (id de la serie): sin next_cursor no hay más páginas
+            if not page.get("next_cursor"):
+                break
+            params = {"limit": SERIES_PAGE_SIZE, "after": page["next_cursor"]}
+
+    if not index.mark_ready(generation):
+        return None
+    return total_loaded
+
+
+def rehydrate_until_ready(index: ClassroomIndex, generation: int) -> None:
+    """
+    Reintenta la precarga (booking-command puede arrancar después del motor)
+    hasta lograrla o hasta que un reset posterior la reemplace.
+    """
+    attempt = 0
+    while index.generation == generation:
+        try:
+            loaded = rehydrate_index(index, generation)
+            if loaded is not None:
+                print(f"[Timetable Engine] Índice listo. Reservas cargadas: {loaded}")
+            return
+        except Exception as e:
+            attempt += 1
+            wait = min(2 ** attempt, 30)
+            print(f"[Timetable Engine] Precarga del índice falló: ({e}). Reintentando en {wait}s...")
+            time.sleep(wait)
+
+
+def start_index_sync(index: ClassroomIndex) -> None:
+    """
+    Arranca el consumidor; cada vez que su cola queda enlazada (al arrancar y
+    tras cada reconexión) se lanza una precarga en segundo plano.
+    """
+
+    def _rehydrate_in_background():
+        threading.Thread(target=rehydrate_until_ready, args=(index, index.generation), daemon=True).start()
+
+    BookingEventConsumer(index, on_subscribed=_rehydrate_in_background).start()
@@ -0,0 +1,214 @@
+import threading
+import zlib
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def shard_of(classroom_id: str, shard_count: int) -> int:
+    """Shard dueño de un aula; estable entre procesos (a diferencia de hash())."""
+    return zlib.crc32(classroom_id.encode("utf-8")) % shard_count
+
+
+class RoomIntervals:
+    """
+    Intervalos confirmados de un aula, ordenados por inicio (epoch ms).
+
+    Mantiene arreglos paralelos starts/ends/ids y un prefijo del máximo fin
+    (max_end[i] = max(ends[0..i])). Con eso la consulta de solapamiento es
+    una búsqueda binaria: los intervalos que empiezan antes del fin del
+    candidato son starts[:i], y hay conflicto si alguno termina después del
+    inicio del candidato, es decir, si max_end[i - 1] > candidate_start.
+    """
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.ids: List[str] = []
+        self.max_end: List[int] = []
+        self._by_id: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, booking_id: str) -> bool:
+        return booking_id in self._by_id
+
+    def _refresh_max_end(self, pos: int) -> None:
+        del self.max_end[pos:]
+        running = self.max_end[pos - 1] if pos > 0 else None
+        for end in self.ends[pos:]:
+            running = end if running is None or end > running else running
+            self.max_end.append(running)
+
+    def _position_of(self, booking_id: str, start: int) -> int:
+        lo = bisect_left(self.starts, start)
+        hi = bisect_right(self.starts, start)
+        for pos in range(lo, hi):
+            if self.ids[pos] == booking_id:
+                return pos
+        raise KeyError(booking_id)
+
+    def add(self, booking_id: str, start: int, end: int) -> None:
+        if booking_id in self._by_id:
+            self.remove(booking_id)
+
+        pos = bisect_right(self.starts, start)
+        self.starts.insert(pos, start)
+        self.ends.insert(pos, end)
+        self.ids.insert(pos, booking_id)
+        self._by_id[booking_id] = (start, end)
+        self._refresh_max_end(pos)
+
+    def remove(self, booking_id: str) -> bool:
+        interval = self._by_id.pop(booking_id, None)
+        if interval is None:
+            return False
+
+        pos = self._position_of(booking_id, interval[0])
+        del self.starts[pos]
+        del self.ends[pos]
+        del self.ids[pos]
+        self._refresh_max_end(pos)
+        return True
+
+    def overlaps(self, start: int, end: int) -> bool:
+        i = bisect_left(self.starts, end)
+        return i > 0 and self.max_end[i - 1] > start
+
+    def between(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Intervalos que se solapan con [start, end). max_end no decrece, así que
+        el primer candidato posible también se ubica por búsqueda binaria.
+        """
+        lo = bisect_right(self.max_end, start)
+        hi = bisect_left(self.starts, end)
+        return [(self.starts[i], self.ends[i]) for i in range(lo, hi) if self.ends[i] > start]
+
+
+class ClassroomIndex:
+    """
+    Índice en memoria de reservas confirmadas por aula.
+
+    Se alimenta de los eventos booking.created / booking.canceled y se
+    precarga desde booking-command al arrancar. Hasta terminar la precarga
+    el índice no está listo (`ready` es False) y los clientes deben usar
+    CheckAvailability con la lista completa.
+
+    Con `shard=(shard_id, shard_count)` el índice solo guarda las aulas que le
+    tocan a ese shard (ver `shard_of`) e ignora el resto.
+
+    `reset()` lo vacía y vuelve a "no listo" (p. ej. si se perdieron eventos);
+    cada reset abre una generación nueva y las precargas de una generación
+    anterior ya no cargan filas ni lo marcan listo.
+    """
+
+    def __init__(self, shard: Optional[Tuple[int, int]] = None):
+        self.shard = shard
+        self._rooms: Dict[str, RoomIntervals] = {}
+        self._room_of: Dict[str, str] = {}
+        self._tombstones: Set[str] = set()
+        self._lock = threading.RLock()
+        self.ready = False
+        self.generation = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._room_of)
+
+    def owns(self, classroom_id: str) -> bool:
+        return self.shard is None or shard_of(classroom_id, self.shard[1]) == self.shard[0]
+
+    def add(self, classroom_id: str, booking_id: str, start: int, end: int) -> bool:
+        """False si el aula es de otro shard y la reserva no se indexó."""
+        with self._lock:
+            previous_room = self._room_of.get(booking_id)
+            if previous_room is not None and previous_room != classroom_id:
+                self._remove_from_room(booking_id, previous_room)
+
+            if not self.owns(classroom_id):
+                return False
+
+            room = self._rooms.setdefault(classroom_id, RoomIntervals())
+            room.add(booking_id, start, end)
+            self._room_of[booking_id] = classroom_id
+            self._tombstones.discard(booking_id)
+            return True
+
+    def remove(self, booking_id: str) -> bool:
+        with self._lock:
+            if not self.ready:
+                # Evita que la precarga resucite una reserva ya cancelada
+                self._tombstones.add(booking_id)
+
+            classroom_id = self._room_of.get(booking_id)
+            if classroom_id is None:
+                return False
+
+            self._remove_from_room(booking_id, classroom_id)
+            return True
+
+    def _remove_from_room(self, booking_id: str, classroom_id: str) -> None:
+        del self._room_of[booking_id]
+        room = self._rooms[classroom_id]
+        room.remove(booking_id)
+        if not len(room):
+            del self._rooms[classroom_id]
+
+    def reset(self) -> int:
+        """Descarta todo el contenido hasta la próxima precarga; retorna la nueva generación."""
+        with self._lock:
+            self._rooms.clear()
+            self._room_of.clear()
+            self._tombstones.clear()
+            self.ready = False
+            self.generation += 1
+            return self.generation
+
+    def load(self, rows: Iterable[Tuple[str, str, int, int]], generation: Optional[int] = None) -> int:
+        """
+        Carga masiva (classroom_id, booking_id, start, end) durante la precarga.
+        Ignora reservas canceladas por eventos llegados mientras tanto, y todo
+        si `generation` ya no es la actual.
+        """
+        loaded = 0
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return 0
+            for classroom_id, booking_id, start, end in rows:
+                if booking_id in self._tombstones:
+                    continue
+                if booking_id in self._room_of:
+                    # Un evento más reciente ya la registró
+                    continue
+                if self.add(classroom_id, booking_id, start, end):
+                    loaded += 1
+        return loaded
+
+    def mark_ready(self, generation: Optional[int] = None) -> bool:
+        """False (y sigue sin estar listo) si un reset posterior invalidó la precarga."""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self.ready = True
+            self._tombstones.clear()
+            return True
+
+    def busy_between(self, classroom_id: str, start: int, end: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Ocupación del aula que toca [start, end); None si aún se está precargando.
+        """
+        with self._lock:
+            if not self.ready:
+                return None
+            room = self._rooms.get(classroom_id)
+            return room.between(start, end) if room is not None else []
+
+    def has_conflict(self, classroom_id: str, start: int, end: int) -> Optional[bool]:
+        """
+        True/False si el índice está listo; None si aún se está precargando.
+        """
+        with self._lock:
+            if not self.ready:
+                return None
+            room = self._rooms.get(classroom_id)
+            return room is not None and room.overlaps(start, end)
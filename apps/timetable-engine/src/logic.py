@@ -1,6 +1,12 @@
+import heapq
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timezone
 from dateutil import parser
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MINUTE_MS = 60_000
+DAY_MS = 24 * 60 * MINUTE_MS
 
 def parse_iso_to_utc(date_str: str) -> datetime:
     """
@@ -17,10 +23,20 @@ def parse_iso_to_utc(date_str: str) -> datetime:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
+def to_epoch_ms(date_str: str) -> int:
+    """
+    Converts an ISO 8601 string into integer milliseconds since the Unix epoch (UTC).
+    Integer keys compare cheaply and keep sorted structures free of datetimes.
+    """
+    delta = parse_iso_to_utc(date_str) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
 def check_overlap(candidate_start: str, candidate_end: str, existing_intervals: List[Tuple[str, str]]) -> bool:
     """
     Algoritmo de intersección de intervalos.
     Retorna True si hay conflicto (solapamiento).
+
+    Implementación de referencia (barrido lineal); IntervalSet debe dar siempre el mismo resultado.
     """
     cand_start = parse_iso_to_utc(candidate_start)
     cand_end = parse_iso_to_utc(candidate_end)
@@ -35,4 +51,183 @@ def check_overlap(candidate_start: str, candidate_end: str, existing_intervals:
         if max(cand_start, exist_start) < min(cand_end, exist_end):
             return True
 
-    return False
\ No newline at end of file
+    return False
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+    """
+    Ordena y fusiona intervalos [start, end) que se solapan o son contiguos.
+    Descarta intervalos vacíos (end <= start), que nunca generan conflicto.
+    Retorna arreglos paralelos (starts, ends) disjuntos y crecientes.
+    """
+    starts: List[int] = []
+    ends: List[int] = []
+
+    for start, end in sorted(iv for iv in intervals if iv[1] > iv[0]):
+        if ends and start <= ends[-1]:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+
+    return starts, ends
+
+
+class IntervalSet:
+    """
+    Conjunto de intervalos ocupados en epoch ms, ordenado y fusionado.
+
+    Como los intervalos son disjuntos, starts y ends quedan ambos ordenados y
+    la consulta de solapamiento es una búsqueda binaria: O(log n).
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self.starts, self.ends = merge_intervals(intervals)
+
+    @classmethod
+    def from_iso(cls, intervals: Iterable[Tuple[str, str]]) -> "IntervalSet":
+        return cls((to_epoch_ms(start), to_epoch_ms(end)) for start, end in intervals)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """
+        True si [start, end) se solapa con algún intervalo del conjunto.
+        """
+        if end <= start:
+            return False
+        # starts[:i] empiezan antes del fin del candidato; el último es el que termina más tarde
+        i = bisect_left(self.starts, end)
+        return i > 0 and self.ends[i - 1] > start
+
+def check_overlap_batch(candidates: Sequence[Tuple[int, int]], existing: IntervalSet) -> Tuple[List[bool], List[Tuple[int, int]]]:
+    """
+    Valida muchos candidatos de una vez contra un mismo conjunto ocupado.
+
+    Retorna:
+      - conflicts[i]: True si candidates[i] se solapa con `existing`.
+      - candidate_conflicts: pares (i, j), i < j, de candidatos que se solapan entre sí.
+
+    Los candidatos se recorren ordenados por inicio en un solo barrido sobre
+    los intervalos fusionados de `existing` (dos punteros), y un heap por fin
+    mantiene los candidatos aún abiertos para detectar choques entre ellos.
+    """
+    conflicts = [False] * len(candidates)
+    candidate_conflicts: List[Tuple[int, int]] = []
+
+    order = sorted((i for i, (start, end) in enumerate(candidates) if end > start), key=lambda i: candidates[i][0])
+
+    starts, ends = existing.starts, existing.ends
+    j = 0
+    active: List[Tuple[int, int]] = []  # (end, idx)
+
+    for i in order:
+        start, end = candidates[i]
+
+        # Los intervalos que terminan antes de este inicio tampoco sirven para los siguientes
+        while j < len(ends) and ends[j] <= start:
+            j += 1
+        conflicts[i] = j < len(starts) and starts[j] < end
+
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, other in active:
+            candidate_conflicts.append((min(i, other), max(i, other)))
+        heapq.heappush(active, (end, i))
+
+    candidate_conflicts.sort()
+    return conflicts, candidate_conflicts
+
+def opening_intervals(window_start: int, window_end: int, opening_hours: Sequence[Tuple[int, int, int]], utc_offset_ms: int = 0) -> List[Tuple[int, int]]:
+    """
+    Expande el horario de apertura semanal a intervalos concretos dentro de la ventana.
+
+    opening_hours: (weekday, open_minute, close_minute) en hora local,
+    weekday como datetime.weekday() (0 = lunes). utc_offset_ms: desfase de la hora local.
+    """
+    by_weekday = {}
+    for weekday, open_minute, close_minute in opening_hours:
+        by_weekday.setdefault(weekday, []).append((open_minute, close_minute))
+
+    intervals = []
+    # Medianoche local del primer día de la ventana, en epoch ms UTC
+    day = (window_start + utc_offset_ms) // DAY_MS * DAY_MS - utc_offset_ms
+    while day < window_end:
+        # 1970-01-01 fue jueves (weekday 3)
+        weekday = ((day + utc_offset_ms) // DAY_MS + 3) % 7
+        for open_minute, close_minute in by_weekday.get(weekday, ()):
+            start = max(day + open_minute * MINUTE_MS, window_start)
+            end = min(day + close_minute * MINUTE_MS, window_end)
+            if end > start:
+                intervals.append((start, end))
+        day += DAY_MS
+
+    starts, ends = merge_intervals(intervals)
+    return list(zip(starts, ends))
+
+
+def find_free_slots(
+    busy: IntervalSet,
+    window_start: int,
+    window_end: int,
+    duration_ms: int,
+    granularity_ms: int = 0,
+    opening_hours: Optional[Sequence[Tuple[int, int, int]]] = None,
+    utc_offset_ms: int = 0,
+    max_results: int = 0,
+) -> List[Tuple[int, int]]:
+    """
+    Huecos libres de al menos `duration_ms` dentro de la ventana (epoch ms).
+
+    Un solo barrido: para cada tramo abierto se avanza un puntero sobre los
+    intervalos ocupados (ya fusionados) y se emiten los huecos entre ellos.
+    Sin granularidad devuelve los huecos completos; con granularidad devuelve
+    franjas de `duration_ms` que empiezan alineadas a la granularidad (hora local).
+    """
+    if duration_ms <= 0 or window_end <= window_start:
+        return []
+
+    if opening_hours:
+        open_ranges = opening_intervals(window_start, window_end, opening_hours, utc_offset_ms)
+    else:
+        open_ranges = [(window_start, window_end)]
+
+    starts, ends = busy.starts, busy.ends
+    # Primer ocupado que termina después del inicio de la ventana
+    j = bisect_right(ends, window_start)
+    slots: List[Tuple[int, int]] = []
+
+    def emit(gap_start: int, gap_end: int) -> bool:
+        if gap_end - gap_start < duration_ms:
+            return True
+        if not granularity_ms:
+            slots.append((gap_start, gap_end))
+        else:
+            local = gap_start + utc_offset_ms
+            t = -(-local // granularity_ms) * granularity_ms - utc_offset_ms
+            while t + duration_ms <= gap_end:
+                slots.append((t, t + duration_ms))
+                if max_results and len(slots) >= max_results:
+                    return False
+                t += granularity_ms
+        return not (max_results and len(slots) >= max_results)
+
+    for open_start, open_end in open_ranges:
+        while j < len(ends) and ends[j] <= open_start:
+            j += 1
+
+        cursor = open_start
+        k = j
+        while k < len(starts) and starts[k] < open_end:
+            if starts[k] > cursor and not emit(cursor, starts[k]):
+                return slots
+            cursor = max(cursor, ends[k])
+            k += 1
+        if cursor < open_end and not emit(cursor, open_end):
+            return slots
+
+    return slots
+
@@ -1,42 +1,95 @@
-import grpc
-from concurrent import futures
-import time
-import sys
+import asyncio
 import os
+import signal
+from concurrent import futures
+from datetime import datetime, timezone
+from functools import partial, wraps
+
+import grpc
+
+# Los stubs se generan al construir la imagen (ver Dockerfile). En desarrollo local:
+#   python -m grpc_tools.protoc -I./protos --python_out=./src --grpc_python_out=./src ./protos/timetable.proto
+try:
+    import timetable_pb2
+    import timetable_pb2_grpc
+except ImportError as e:
+    raise ImportError("Stubs gRPC no encontrados: genera timetable_pb2*.py con grpc_tools.protoc") from e
+
+from logic import IntervalSet, MINUTE_MS, check_overlap_batch, find_free_slots, to_epoch_ms
+from index import ClassroomIndex
+from events import start_index_sync
+from catalog import ClassroomCatalog, start_catalog_sync
+from solver import CourseSession, Room, WeekGrid, solve_timetable
 
-import grpc_tools.protoc
-from grpc_tools import protoc
+SOLVER_MAX_BUDGET_MS = int(os.getenv("TIMETABLE_SOLVER_MAX_BUDGET_MS", 30000))
+SOLVER_MAX_WORKERS = int(os.getenv("TIMETABLE_SOLVER_MAX_WORKERS", os.cpu_count() or 1))
+# Cuántas generaciones de horario corren a la vez fuera del event loop
+SOLVER_CONCURRENCY = int(os.getenv("TIMETABLE_SOLVER_CONCURRENCY", 2))
 
-# 1. Compilación al vuelo de los .proto (Solo para desarrollo)
-# Esto genera timetable_pb2.py y timetable_pb2_grpc.py automáticamente
-protoc.main((
-    '',
-    '-I./protos',
-    '--python_out=./src',
-    '--grpc_python_out=./src',
-    './protos/timetable.proto',
-))
+GRPC_PORT = int(os.getenv("TIMETABLE_GRPC_PORT", 50051))
+# 0 = sin límite de RPCs en vuelo
+MAX_CONCURRENT_RPCS = int(os.getenv("TIMETABLE_MAX_CONCURRENT_RPCS", 1000))
+MAX_MESSAGE_BYTES = int(os.getenv("TIMETABLE_MAX_MESSAGE_MB", 16)) * 1024 * 1024
+KEEPALIVE_TIME_MS = int(os.getenv("TIMETABLE_KEEPALIVE_TIME_MS", 30000))
+KEEPALIVE_TIMEOUT_MS = int(os.getenv("TIMETABLE_KEEPALIVE_TIMEOUT_MS", 10000))
+# Intervalo mínimo aceptado entre pings de clientes (keepalive del lado cliente)
+MIN_CLIENT_PING_INTERVAL_MS = int(os.getenv("TIMETABLE_MIN_CLIENT_PING_INTERVAL_MS", 10000))
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("TIMETABLE_SHUTDOWN_GRACE_SECONDS", 5))
+# > 1: un proceso por shard de aulas detrás de un dispatcher (ver dispatcher.py)
+ENGINE_WORKERS = int(os.getenv("TIMETABLE_WORKERS", 1))
+ENGINE_DISPATCHERS = int(os.getenv("TIMETABLE_DISPATCHERS", 1))
 
-# Agregamos src al path para poder importar los archivos generados
-sys.path.append('./src')
+class InvalidTimeRange(ValueError):
+    """TimeRange en ISO 8601 que no se pudo parsear."""
 
-import timetable_pb2
-import timetable_pb2_grpc
-from logic import check_overlap
+def range_to_epoch(time_range) -> tuple:
+    """
+    Convierte un TimeRange a (start_ms, end_ms), prefiriendo la codificación epoch
+    si el cliente la envió y parseando ISO solo como compatibilidad.
+    """
+    if time_range.start_ms or time_range.end_ms:
+        return time_range.start_ms, time_range.end_ms
+    try:
+        return to_epoch_ms(time_range.start), to_epoch_ms(time_range.end)
+    except ValueError as e:
+        raise InvalidTimeRange(f"TimeRange inválido ({time_range.start!r}, {time_range.end!r}): {e}") from e
+
+def rejects_invalid_ranges(handler):
+    """Un TimeRange mal formado es un error del cliente: INVALID_ARGUMENT en vez de UNKNOWN."""
+    @wraps(handler)
+    async def wrapper(self, request, context):
+        try:
+            return await handler(self, request, context)
+        except InvalidTimeRange as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+    return wrapper
+
+def epoch_to_range(start_ms: int, end_ms: int):
+    def _iso(ms: int) -> str:
+        return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
+    return timetable_pb2.TimeRange(start=_iso(start_ms), end=_iso(end_ms), start_ms=start_ms, end_ms=end_ms)
 
 class TimetableService(timetable_pb2_grpc.TimetableCheckerServicer):
-    def CheckAvailability(self, request, context):
-        print(f"[Timetable Engine] Validando candidato: {request.candidate.start} - {request.candidate.end}")
+    """
+    Servicer asyncio. Las validaciones son cortas y corren en el event loop;
+    la generación de horarios (segundos de CPU) se delega a `solver_executor`.
+    """
+
+    def __init__(self, index: ClassroomIndex, catalog: ClassroomCatalog, solver_executor: futures.Executor = None):
+        self.index = index
+        self.catalog = catalog
+        self.solver_executor = solver_executor or futures.ThreadPoolExecutor(max_workers=SOLVER_CONCURRENCY)
+
+    @rejects_invalid_ranges
+    async def CheckAvailability(self, request, context):
+        cand_start, cand_end = range_to_epoch(request.candidate)
+        print(f"[Timetable Engine] Validando candidato: {cand_start} - {cand_end}")
         
-        # Convertimos el formato gRPC a una lista simple de tuplas para nuestra lógica
-        existing_list = [(x.start, x.end) for x in request.existing_bookings]
+        # Convertimos el formato gRPC a una lista simple de tuplas (epoch ms) para nuestra lógica
+        existing_list = [range_to_epoch(x) for x in request.existing_bookings]
         
-        # Ejecutamos la lógica pura
-        has_conflict = check_overlap(
-            request.candidate.start,
-            request.candidate.end,
-            existing_list
-        )
+        # Ejecutamos la lógica pura: intervalos ordenados y fusionados + búsqueda binaria
+        has_conflict = IntervalSet(existing_list).overlaps(cand_start, cand_end)
         
         msg = "Conflicto detectado" if has_conflict else "Horario disponible"
         if has_conflict:
@@ -46,19 +99,186 @@ class TimetableService(timetable_pb2_grpc.TimetableCheckerServicer):
 
         return timetable_pb2.CheckResponse(has_conflict=has_conflict, conflict_details=msg)
 
-def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    timetable_pb2_grpc.add_TimetableCheckerServicer_to_server(TimetableService(), server)
-    
-    # gRPC puerto 50051 por defecto
-    server.add_insecure_port('[::]:50051')
-    print("Timetable Engine listening on port 50051...")
-    server.start()
-    try:
-        while True:
-            time.sleep(86400)
-    except KeyboardInterrupt:
-        server.stop(0)
+    @rejects_invalid_ranges
+    async def CheckClassroomAvailability(self, request, context):
+        has_conflict = self.index.has_conflict(request.classroom_id, *range_to_epoch(request.candidate))
+
+        if has_conflict is None:
+            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Índice de aulas aún no disponible")
+
+        msg = "Conflicto detectado" if has_conflict else "Horario disponible"
+        print(f"[Timetable Engine] Aula {request.classroom_id}: {msg}")
+
+        return timetable_pb2.CheckResponse(has_conflict=has_conflict, conflict_details=msg)
+
+    @rejects_invalid_ranges
+    async def CheckAvailabilityBatch(self, request, context):
+        print(f"[Timetable Engine] Validando lote de {len(request.candidates)} candidatos")
+
+        # Las reservas existentes se ordenan y fusionan una sola vez para todo el lote
+        existing = IntervalSet(range_to_epoch(x) for x in request.existing_bookings)
+        candidates = [range_to_epoch(x) for x in request.candidates]
+
+        conflicts, candidate_conflicts = check_overlap_batch(candidates, existing)
+
+        return timetable_pb2.BatchCheckResponse(
+            conflicts=conflicts,
+            candidate_conflicts=[
+                timetable_pb2.CandidateConflict(first=i, second=j) for i, j in candidate_conflicts
+            ],
+        )
+
+    @rejects_invalid_ranges
+    async def FindFreeSlots(self, request, context):
+        window_start, window_end = range_to_epoch(request.window)
+        if request.duration_minutes <= 0 or window_end <= window_start:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Ventana o duración inválida")
+
+        if request.classroom_id:
+            busy = self.index.busy_between(request.classroom_id, window_start, window_end)
+            if busy is None:
+                await context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Índice de aulas aún no disponible")
+        else:
+            busy = [range_to_epoch(x) for x in request.busy]
+
+        slots = find_free_slots(
+            IntervalSet(busy),
+            window_start,
+            window_end,
+            duration_ms=request.duration_minutes * MINUTE_MS,
+            granularity_ms=request.granularity_minutes * MINUTE_MS,
+            opening_hours=[(h.weekday, h.open_minute, h.close_minute) for h in request.opening_hours],
+            utc_offset_ms=request.utc_offset_minutes * MINUTE_MS,
+            max_results=request.max_results,
+        )
+        print(f"[Timetable Engine] {len(slots)} franjas libres encontradas")
+
+        return timetable_pb2.FreeSlotsResponse(slots=[epoch_to_range(s, e) for s, e in slots])
+
+    @rejects_invalid_ranges
+    async def SearchAvailableClassrooms(self, request, context):
+        window_start, window_end = range_to_epoch(request.window)
+        if window_end <= window_start:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Ventana inválida")
+
+        found = self.catalog.search(
+            self.index,
+            window_start,
+            window_end,
+            min_capacity=request.min_capacity,
+            include_non_operational=request.include_non_operational,
+            limit=request.limit,
+        )
+        if found is None:
+            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Catálogo o índice de aulas aún no disponible")
+
+        print(f"[Timetable Engine] {len(found)} aulas libres (capacidad >= {request.min_capacity})")
+
+        return timetable_pb2.ClassroomSearchResponse(
+            classrooms=[timetable_pb2.ClassroomAvailability(**room) for room in found]
+        )
+
+    async def GenerateTimetable(self, request, context):
+        sessions = [
+            CourseSession(s.session_id, s.subject, s.duration_minutes, max(s.weekly_frequency, 1), s.required_capacity)
+            for s in request.sessions
+        ]
+        if any(s.duration_minutes <= 0 for s in sessions):
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Toda sesión necesita duración positiva")
+
+        if request.classrooms:
+            rooms = [Room(r.classroom_id, r.capacity) for r in request.classrooms]
+        else:
+            catalog_rooms = self.catalog.rooms()
+            if catalog_rooms is None:
+                await context.abort(grpc.StatusCode.FAILED_PRECONDITION, "Catálogo de aulas aún no disponible")
+            rooms = [Room(r["classroom_id"], r["capacity"]) for r in catalog_rooms]
+
+        defaults = WeekGrid()
+        grid = WeekGrid(
+            weekdays=tuple(sorted(set(request.weekdays))) or defaults.weekdays,
+            day_start_minute=request.day_start_minute or defaults.day_start_minute,
+            day_end_minute=request.day_end_minute or defaults.day_end_minute,
+            granularity_minutes=request.granularity_minutes or defaults.granularity_minutes,
+        )
+
+        try:
+            solution = await asyncio.get_running_loop().run_in_executor(
+                self.solver_executor,
+                partial(
+                    solve_timetable,
+                    sessions,
+                    rooms,
+                    grid,
+                    time_budget_ms=min(request.time_budget_ms or 2000, SOLVER_MAX_BUDGET_MS),
+                    workers=max(1, min(request.workers, SOLVER_MAX_WORKERS)),
+                    seed=request.seed,
+                ),
+            )
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        print(f"[Timetable Engine] Horario generado: {len(solution.placements)} ubicaciones, "
+              f"{len(solution.unplaced)} sesiones sin ubicar, {solution.iterations} iteraciones")
+
+        return timetable_pb2.TimetableResponse(
+            placements=[timetable_pb2.SessionPlacement(**p._asdict()) for p in solution.placements],
+            unplaced=[timetable_pb2.UnplacedSession(session_id=sid, reason=reason) for sid, reason in solution.unplaced],
+            iterations=solution.iterations,
+        )
+
+    async def GetCapabilities(self, request, context):
+        # Los clientes negocian aquí la codificación de TimeRange en vez de adivinarla por errores
+        return timetable_pb2.CapabilitiesResponse(epoch_ranges=True)
+
+def server_options() -> list:
+    return [
+        ("grpc.max_send_message_length", MAX_MESSAGE_BYTES),
+        ("grpc.max_receive_message_length", MAX_MESSAGE_BYTES),
+        ("grpc.keepalive_time_ms", KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.min_recv_ping_interval_without_data_ms", MIN_CLIENT_PING_INTERVAL_MS),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+
+def create_server(service: TimetableService, address: str) -> grpc.aio.Server:
+    """Debe llamarse dentro del event loop que va a servir."""
+    server = grpc.aio.server(
+        options=server_options(),
+        maximum_concurrent_rpcs=MAX_CONCURRENT_RPCS or None,
+    )
+    timetable_pb2_grpc.add_TimetableCheckerServicer_to_server(service, server)
+    server.add_insecure_port(address)
+    return server
+
+async def serve(shard: tuple = None, address: str = None):
+    """
+    Un proceso completo del motor. Con `shard` solo indexa las aulas de ese
+    shard y escucha en `address` (un puerto privado detrás del dispatcher).
+    """
+    index = ClassroomIndex(shard=shard)
+    start_index_sync(index)
+
+    catalog = ClassroomCatalog()
+    start_catalog_sync(catalog)
+
+    address = address or f"[::]:{GRPC_PORT}"
+    server = create_server(TimetableService(index, catalog), address)
+    await server.start()
+    label = f"shard {shard[0]}/{shard[1]}" if shard else "single process"
+    print(f"Timetable Engine listening on {address} ({label}, "
+          f"max {MAX_CONCURRENT_RPCS or 'unlimited'} concurrent RPCs)...")
+
+    # SIGTERM (docker stop) deja terminar las RPCs en vuelo
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: asyncio.ensure_future(server.stop(SHUTDOWN_GRACE_SECONDS)))
+
+    await server.wait_for_termination()
 
 if __name__ == '__main__':
-    serve()
\ No newline at end of file
+    if ENGINE_WORKERS > 1:
+        from dispatcher import run_cluster
+        raise SystemExit(run_cluster(f"[::]:{GRPC_PORT}", ENGINE_WORKERS, ENGINE_DISPATCHERS))
+    asyncio.run(serve())
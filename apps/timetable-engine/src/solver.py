@@ -0,0 +1,202 @@
+import multiprocessing
+import random
+import time
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class CourseSession(NamedTuple):
+    session_id: str
+    subject: str
+    duration_minutes: int
+    weekly_frequency: int
+    required_capacity: int
+
+
+class Room(NamedTuple):
+    classroom_id: str
+    capacity: int
+
+
+class WeekGrid(NamedTuple):
+    weekdays: Tuple[int, ...] = (0, 1, 2, 3, 4)
+    day_start_minute: int = 7 * 60
+    day_end_minute: int = 22 * 60
+    granularity_minutes: int = 30
+
+
+class Placement(NamedTuple):
+    session_id: str
+    classroom_id: str
+    weekday: int
+    start_minute: int
+    end_minute: int
+
+
+class Solution(NamedTuple):
+    placements: List[Placement]
+    unplaced: List[Tuple[str, str]]   # (session_id, motivo)
+    iterations: int
+
+    def score(self) -> Tuple[int, int, int]:
+        # Menos sesiones sin ubicar; luego más minutos ubicados; luego franjas más temprano
+        placed_minutes = sum(p.end_minute - p.start_minute for p in self.placements)
+        return len(self.unplaced), -placed_minutes, sum(p.start_minute for p in self.placements)
+
+
+class _Schedule:
+    """
+    Ocupación semanal por (aula, día): lista ordenada de (inicio, fin) en minutos.
+    """
+
+    def __init__(self):
+        self.busy: Dict[Tuple[str, int], List[Tuple[int, int]]] = {}
+
+    def first_fit(self, classroom_id: str, weekday: int, duration: int, grid: WeekGrid) -> Optional[int]:
+        taken = self.busy.get((classroom_id, weekday), [])
+        start = grid.day_start_minute
+        i = 0
+        while start + duration <= grid.day_end_minute:
+            # Salta los intervalos que ya terminaron antes del inicio propuesto
+            while i < len(taken) and taken[i][1] <= start:
+                i += 1
+            if i == len(taken) or taken[i][0] >= start + duration:
+                return start
+            # Choca: probar la siguiente franja alineada después del intervalo ocupado
+            steps = -(-(taken[i][1] - grid.day_start_minute) // grid.granularity_minutes)
+            start = grid.day_start_minute + steps * grid.granularity_minutes
+        return None
+
+    def add(self, classroom_id: str, weekday: int, start: int, end: int) -> None:
+        insort(self.busy.setdefault((classroom_id, weekday), []), (start, end))
+
+    def remove(self, classroom_id: str, weekday: int, start: int, end: int) -> None:
+        taken = self.busy[(classroom_id, weekday)]
+        del taken[bisect_left(taken, (start, end))]
+
+
+def _greedy(sessions: Sequence[CourseSession], rooms: Sequence[Room], grid: WeekGrid, rng: Optional[random.Random]) -> Solution:
+    """
+    Una pasada voraz: sesiones más difíciles primero (capacidad, duración,
+    frecuencia); cada ocurrencia va a un día distinto, al aula más chica que
+    alcance y a la primera franja libre. Con `rng` se perturba el orden de
+    sesiones (capacidad con ruido de ±30%) y de días para diversificar los reinicios.
+    """
+    capacities = [room.capacity for room in rooms]
+
+    def difficulty(s: CourseSession):
+        if rng is None:
+            return (-s.required_capacity, -s.duration_minutes, -s.weekly_frequency)
+        return (-s.required_capacity * rng.uniform(0.7, 1.3), -s.duration_minutes, -s.weekly_frequency)
+
+    schedule = _Schedule()
+    day_load = {day: 0 for day in grid.weekdays}
+    placements: List[Placement] = []
+    unplaced: List[Tuple[str, str]] = []
+
+    for session in sorted(sessions, key=difficulty):
+        if session.weekly_frequency > len(grid.weekdays):
+            unplaced.append((session.session_id, "Frecuencia semanal mayor que los días disponibles"))
+            continue
+        if session.duration_minutes > grid.day_end_minute - grid.day_start_minute:
+            unplaced.append((session.session_id, "Duración mayor que la jornada"))
+            continue
+
+        fitting = rooms[bisect_left(capacities, session.required_capacity):]
+        if not fitting:
+            unplaced.append((session.session_id, "Ninguna aula con capacidad suficiente"))
+            continue
+
+        placed: List[Placement] = []
+        used_days = set()
+        for _ in range(session.weekly_frequency):
+            days = sorted(
+                (d for d in grid.weekdays if d not in used_days),
+                key=lambda d: (day_load[d], rng.random() if rng else d),
+            )
+            spot = None
+            for day in days:
+                # Mejor ajuste: primera aula (la de menor capacidad) con una franja libre
+                for room in fitting:
+                    start = schedule.first_fit(room.classroom_id, day, session.duration_minutes, grid)
+                    if start is not None:
+                        spot = Placement(session.session_id, room.classroom_id, day, start, start + session.duration_minutes)
+                        break
+                if spot:
+                    break
+            if spot is None:
+                break
+            schedule.add(spot.classroom_id, spot.weekday, spot.start_minute, spot.end_minute)
+            day_load[spot.weekday] += session.duration_minutes
+            used_days.add(spot.weekday)
+            placed.append(spot)
+
+        if len(placed) < session.weekly_frequency:
+            # Todo o nada: una materia con menos sesiones de las pedidas no sirve
+            for p in placed:
+                schedule.remove(p.classroom_id, p.weekday, p.start_minute, p.end_minute)
+                day_load[p.weekday] -= session.duration_minutes
+            unplaced.append((session.session_id, "Sin franjas libres suficientes"))
+            continue
+
+        placements.extend(placed)
+
+    return Solution(placements, unplaced, 1)
+
+
+def _search(sessions: Sequence[CourseSession], rooms: Sequence[Room], grid: WeekGrid, deadline: float, seed: int) -> Solution:
+    """
+    Pasada determinista y luego reinicios aleatorios hasta agotar el tiempo;
+    se queda con la mejor solución.
+    """
+    best = _greedy(sessions, rooms, grid, None)
+    iterations = 1
+    rng = random.Random(seed)
+
+    while best.unplaced and time.monotonic() < deadline:
+        candidate = _greedy(sessions, rooms, grid, rng)
+        iterations += 1
+        if candidate.score() < best.score():
+            best = candidate
+
+    return Solution(best.placements, best.unplaced, iterations)
+
+
+def _search_worker(args) -> Solution:
+    # time.monotonic() es el mismo reloj del sistema en todos los procesos
+    return _search(*args)
+
+
+def solve_timetable(
+    sessions: Sequence[CourseSession],
+    rooms: Sequence[Room],
+    grid: WeekGrid = WeekGrid(),
+    time_budget_ms: int = 2000,
+    workers: int = 1,
+    seed: int = 0,
+) -> Solution:
+    """
+    Construye un horario semanal sin choques de aula.
+
+    Heurística voraz (más difícil primero, mejor ajuste de aula, primera franja
+    libre) con reinicios aleatorios dentro de `time_budget_ms`. Con workers > 1
+    cada proceso explora con una semilla distinta y gana la mejor solución.
+    """
+    if grid.granularity_minutes <= 0 or grid.day_end_minute <= grid.day_start_minute:
+        raise ValueError("Jornada o granularidad inválida")
+
+    rooms = sorted(rooms, key=lambda r: (r.capacity, r.classroom_id))
+    deadline = time.monotonic() + max(time_budget_ms, 0) / 1000
+
+    if workers <= 1:
+        return _search(sessions, rooms, grid, deadline, seed)
+
+    # spawn: el servidor gRPC tiene hilos propios y no es seguro hacer fork
+    context = multiprocessing.get_context("spawn")
+    jobs = [(list(sessions), rooms, grid, deadline, seed + i) for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        results = list(pool.map(_search_worker, jobs))
+
+    best = min(results, key=Solution.score)
+    return Solution(best.placements, best.unplaced, sum(r.iterations for r in results))
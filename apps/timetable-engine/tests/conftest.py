@@ -9,3 +9,14 @@ SRC_DIR = SERVICE_ROOT / "src"
 
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
+
+BENCH_DIR = SERVICE_ROOT / "benchmarks"
+
+if str(BENCH_DIR) not in sys.path:
+    sys.path.append(str(BENCH_DIR))
+
+# Los stubs gRPC no se versionan (se generan en el build de la imagen);
+# fuera de ella se compilan a un directorio temporal, igual que en los benchmarks
+from run import load_stubs  # noqa: E402
+
+load_stubs()
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+import run as bench_run
+from generators import DISTRIBUTIONS, queries_for
+
+
+@pytest.mark.parametrize("name", sorted(DISTRIBUTIONS))
+def test_generators_are_deterministic_and_exact_size(name):
+    generate = DISTRIBUTIONS[name]
+    intervals = generate(500, seed=7)
+
+    assert len(intervals) == 500
+    assert intervals == generate(500, seed=7)
+    assert all(end > start for start, end in intervals)
+
+
+def test_quick_report_has_schema_and_all_engines(tmp_path):
+    output = tmp_path / "report.json"
+
+    bench_run.main([
+        "--sizes", "10,200", "--distributions", "dense,semester", "--queries", "20",
+        "--budget-ms", "5", "--repeat", "1", "--no-grpc", "--output", str(output),
+    ])
+    report = json.loads(output.read_text())
+
+    assert report["schema"] == bench_run.REPORT_SCHEMA
+    assert {r["benchmark"] for r in report["results"]} == {
+        "check_overlap", "linear_scan", "interval_set.build", "interval_set.query",
+        "check_overlap_batch", "room_index.query",
+    }
+    assert all(r["median_us"] >= 0 for r in report["results"])
+    assert len(queries_for([], 3)) == 3
+
+
+def test_smoke_run_includes_the_grpc_path(tmp_path):
+    output = tmp_path / "report.json"
+
+    bench_run.main([
+        "--sizes", "10,50", "--distributions", "dense", "--queries", "5",
+        "--budget-ms", "5", "--repeat", "1", "--grpc-max-size", "10", "--output", str(output),
+    ])
+    report = json.loads(output.read_text())
+
+    grpc_cells = {(r["benchmark"], r["size"]) for r in report["results"] if r["benchmark"].startswith("grpc.")}
+    assert report["params"]["grpc"] is True
+    # Solo los tamaños hasta --grpc-max-size pasan por gRPC
+    assert grpc_cells == {
+        ("grpc.check_availability", 10),
+        ("grpc.check_classroom_availability", 10),
+        ("grpc.check_availability_batch", 10),
+    }
+    assert all(r["calls"] >= 1 for r in report["results"] if r["benchmark"].startswith("grpc."))
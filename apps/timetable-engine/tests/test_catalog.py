@@ -0,0 +1,113 @@
+import uuid
+
+import catalog as catalog_module
+from catalog import ClassroomCatalog, fetch_classrooms
+from index import ClassroomIndex
+
+HOUR = 3_600_000
+
+
+def make_room(code, capacity, is_operational=True):
+    return {
+        "id": str(uuid.uuid4()),
+        "code": code,
+        "capacity": capacity,
+        "location_details": None,
+        "is_operational": is_operational,
+    }
+
+
+def ready_index():
+    index = ClassroomIndex()
+    index.mark_ready()
+    return index
+
+
+def test_search_returns_none_until_catalog_and_index_are_ready():
+    catalog = ClassroomCatalog()
+    index = ClassroomIndex()
+
+    assert catalog.search(index, 0, HOUR) is None
+
+    catalog.replace([make_room("A-101", 30)])
+    assert catalog.search(index, 0, HOUR) is None
+
+    index.mark_ready()
+    assert len(catalog.search(index, 0, HOUR)) == 1
+
+
+def test_search_filters_capacity_operational_and_occupancy():
+    small = make_room("A-101", 20)
+    busy = make_room("B-201", 40)
+    free = make_room("C-301", 60)
+    broken = make_room("D-401", 80, is_operational=False)
+
+    catalog = ClassroomCatalog()
+    catalog.replace([broken, free, busy, small])
+
+    index = ready_index()
+    index.add(busy["id"], "booking-1", 10 * HOUR, 12 * HOUR)
+
+    found = catalog.search(index, 11 * HOUR, 13 * HOUR, min_capacity=40)
+    assert [room["code"] for room in found] == ["C-301"]
+
+    found = catalog.search(index, 12 * HOUR, 13 * HOUR, min_capacity=40, include_non_operational=True)
+    assert [room["code"] for room in found] == ["B-201", "C-301", "D-401"]
+
+
+def test_search_orders_by_capacity_and_respects_limit():
+    catalog = ClassroomCatalog()
+    catalog.replace([make_room(f"R-{i}", capacity) for i, capacity in enumerate([90, 10, 50, 45, 70])])
+
+    found = catalog.search(ready_index(), 0, HOUR, min_capacity=45, limit=2)
+
+    assert [room["capacity"] for room in found] == [45, 50]
+
+
+def test_search_on_sharded_indexes_partitions_the_catalog():
+    catalog = ClassroomCatalog()
+    catalog.replace([make_room(f"R-{i}", 10 + i) for i in range(30)])
+
+    found = []
+    for shard_id in range(3):
+        index = ClassroomIndex(shard=(shard_id, 3))
+        index.mark_ready()
+        found.extend(room["code"] for room in catalog.search(index, 0, HOUR))
+
+    assert sorted(found) == sorted(room["code"] for room in catalog.rooms())
+
+
+class FakeClassroomService:
+    """Sirve /classrooms ordenado por id; `during_paging` corre entre la primera y la segunda página."""
+
+    def __init__(self, rooms, during_paging=None):
+        self.rooms = rooms
+        self.during_paging = during_paging
+        self.calls = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get(self, url, params, timeout):
+        if self.calls == 1 and self.during_paging:
+            self.during_paging(self.rooms)
+        self.calls += 1
+        rows = sorted(self.rooms, key=lambda r: r["id"])
+        if "after" in params:
+            rows = [r for r in rows if r["id"] > params["after"]]
+        page = rows[:params["limit"]]
+        return type("Resp", (), {"raise_for_status": lambda self: None, "json": lambda self: page})()
+
+
+def test_fetch_classrooms_pages_by_id_without_skipping_rooms(monkeypatch):
+    rooms = [make_room(f"R-{i}", 10) for i in range(5)]
+    ids = sorted(r["id"] for r in rooms)
+    # Se borra un aula ya leída: con skip/offset la página siguiente se saltaría una
+    service = FakeClassroomService(rooms, during_paging=lambda rs: rs.remove(next(r for r in rs if r["id"] == ids[0])))
+    monkeypatch.setattr(catalog_module, "CATALOG_PAGE_SIZE", 2)
+    monkeypatch.setattr(catalog_module.requests, "Session", lambda: service)
+
+    assert [r["id"] for r in fetch_classrooms()] == ids
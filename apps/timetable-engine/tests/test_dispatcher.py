@@ -0,0 +1,157 @@
+import asyncio
+import socket
+from concurrent import futures
+
+import grpc
+import pytest
+
+import server
+import timetable_pb2 as pb2
+import timetable_pb2_grpc
+from catalog import ClassroomCatalog
+from dispatcher import ShardDispatcher
+from index import ClassroomIndex, shard_of
+
+HOUR = 3_600_000
+SHARDS = 2
+ROOMS = [f"A-{100 + i}" for i in range(8)]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def epoch(start, end):
+    return pb2.TimeRange(start_ms=start, end_ms=end)
+
+
+class RecordingService(server.TimetableService):
+    """Worker que anota qué RPCs le llegaron, para comprobar el enrutamiento."""
+
+    def __init__(self, shard_id, index, catalog, calls):
+        super().__init__(index, catalog, futures.ThreadPoolExecutor(max_workers=1))
+        self.shard_id = shard_id
+        self.calls = calls
+
+    async def CheckClassroomAvailability(self, request, context):
+        self.calls.append((self.shard_id, "CheckClassroomAvailability", request.classroom_id))
+        return await super().CheckClassroomAvailability(request, context)
+
+    async def GetCapabilities(self, request, context):
+        self.calls.append((self.shard_id, "GetCapabilities", None))
+        return await super().GetCapabilities(request, context)
+
+
+def run_cluster(scenario, bookings=(), ready=True):
+    """
+    Dos workers grpc.aio con índices particionados detrás de un ShardDispatcher,
+    todo en el mismo event loop. `scenario(stub, calls)` habla con el dispatcher.
+    """
+    catalog = ClassroomCatalog()
+    catalog.replace({"id": room, "code": room, "capacity": 10 * (i + 1)} for i, room in enumerate(ROOMS))
+    calls = []
+
+    async def _run():
+        workers, addresses = [], []
+        for shard_id in range(SHARDS):
+            index = ClassroomIndex(shard=(shard_id, SHARDS))
+            index.load(bookings)
+            if ready:
+                index.mark_ready()
+            address = f"127.0.0.1:{free_port()}"
+            worker = server.create_server(RecordingService(shard_id, index, catalog, calls), address)
+            await worker.start()
+            workers.append(worker)
+            addresses.append(address)
+
+        dispatcher = ShardDispatcher(addresses)
+        front = grpc.aio.server()
+        front.add_generic_rpc_handlers((dispatcher.generic_handler(),))
+        front_address = f"127.0.0.1:{free_port()}"
+        front.add_insecure_port(front_address)
+        await front.start()
+
+        channel = grpc.aio.insecure_channel(front_address)
+        try:
+            await scenario(timetable_pb2_grpc.TimetableCheckerStub(channel), calls)
+        finally:
+            await channel.close()
+            await front.stop(None)
+            await dispatcher.close()
+            for worker in workers:
+                await worker.stop(None)
+
+    asyncio.run(_run())
+
+
+def test_rooms_fixture_spans_every_shard():
+    assert {shard_of(room, SHARDS) for room in ROOMS} == set(range(SHARDS))
+
+
+def test_classroom_checks_go_to_the_shard_that_owns_the_room():
+    bookings = [(room, f"b-{room}", 0, HOUR) for room in ROOMS]
+
+    async def scenario(stub, calls):
+        for room in ROOMS:
+            reply = await stub.CheckClassroomAvailability(
+                pb2.ClassroomCheckRequest(classroom_id=room, candidate=epoch(0, HOUR)), timeout=10
+            )
+            # Solo el shard dueño tiene la reserva: en otro shard el aula saldría libre
+            assert reply.has_conflict is True, room
+
+        assert calls == [(shard_of(room, SHARDS), "CheckClassroomAvailability", room) for room in ROOMS]
+
+    run_cluster(scenario, bookings)
+
+
+def test_find_free_slots_uses_the_owning_shard_index():
+    room = ROOMS[0]
+
+    async def scenario(stub, calls):
+        reply = await stub.FindFreeSlots(pb2.FreeSlotsRequest(
+            classroom_id=room, window=epoch(0, 3 * HOUR), duration_minutes=60), timeout=10)
+
+        assert [(s.start_ms, s.end_ms) for s in reply.slots] == [(0, HOUR), (2 * HOUR, 3 * HOUR)]
+
+    run_cluster(scenario, [(room, "b1", HOUR, 2 * HOUR)])
+
+
+def test_search_merges_every_shard_by_capacity_and_applies_the_limit():
+    busy = ROOMS[1]
+
+    async def scenario(stub, calls):
+        everything = await stub.SearchAvailableClassrooms(
+            pb2.ClassroomSearchRequest(window=epoch(0, HOUR)), timeout=10)
+        limited = await stub.SearchAvailableClassrooms(
+            pb2.ClassroomSearchRequest(window=epoch(0, HOUR), min_capacity=25, limit=3), timeout=10)
+
+        assert [room.classroom_id for room in everything.classrooms] == [r for r in ROOMS if r != busy]
+        assert [room.capacity for room in limited.classrooms] == [30, 40, 50]
+
+    run_cluster(scenario, [(busy, "b1", 0, HOUR)])
+
+
+def test_unkeyed_methods_are_spread_round_robin():
+    async def scenario(stub, calls):
+        for _ in range(2 * SHARDS):
+            assert (await stub.GetCapabilities(pb2.CapabilitiesRequest(), timeout=10)).epoch_ranges
+
+        assert sorted(shard for shard, _, _ in calls) == sorted(list(range(SHARDS)) * 2)
+
+    run_cluster(scenario)
+
+
+def test_worker_status_codes_pass_through_the_dispatcher():
+    async def scenario(stub, calls):
+        with pytest.raises(grpc.aio.AioRpcError) as not_ready:
+            await stub.CheckClassroomAvailability(
+                pb2.ClassroomCheckRequest(classroom_id=ROOMS[0], candidate=epoch(0, HOUR)), timeout=10)
+        with pytest.raises(grpc.aio.AioRpcError) as malformed:
+            await stub.CheckAvailability(pb2.CheckRequest(candidate=pb2.TimeRange(start="ayer", end="hoy")), timeout=10)
+
+        assert not_ready.value.code() == grpc.StatusCode.FAILED_PRECONDITION
+        assert malformed.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    run_cluster(scenario, ready=False)
@@ -0,0 +1,379 @@
+import json
+import random
+
+import pytest
+
+from index import ClassroomIndex, RoomIntervals, shard_of
+import events
+from events import apply_event
+from logic import to_epoch_ms
+
+ROOM = "room-1"
+HOUR = 3_600_000
+
+# ----------------------------
+# RoomIntervals
+# ----------------------------
+
+def test_room_intervals_detects_overlap_and_boundaries():
+    room = RoomIntervals()
+    room.add("a", 10 * HOUR, 12 * HOUR)
+    room.add("b", 14 * HOUR, 15 * HOUR)
+
+    assert room.overlaps(11 * HOUR, 13 * HOUR) is True
+    assert room.overlaps(12 * HOUR, 14 * HOUR) is False   # bordes exactos no chocan
+    assert room.overlaps(8 * HOUR, 9 * HOUR) is False
+    assert room.overlaps(14 * HOUR + 1, 14 * HOUR + 2) is True
+
+
+def test_room_intervals_long_interval_is_seen_past_later_starts():
+    # Un intervalo largo que empieza antes debe seguir detectándose
+    room = RoomIntervals()
+    room.add("long", 0, 100 * HOUR)
+    room.add("short", 10 * HOUR, 11 * HOUR)
+
+    assert room.overlaps(50 * HOUR, 51 * HOUR) is True
+
+
+def test_room_intervals_remove_and_readd():
+    room = RoomIntervals()
+    room.add("a", 10 * HOUR, 12 * HOUR)
+    room.add("b", 10 * HOUR, 11 * HOUR)
+
+    assert room.remove("a") is True
+    assert room.remove("a") is False
+    assert room.overlaps(11 * HOUR, 12 * HOUR) is False
+
+    room.add("b", 20 * HOUR, 21 * HOUR)   # re-add mueve el intervalo
+    assert len(room) == 1
+    assert room.overlaps(10 * HOUR, 11 * HOUR) is False
+
+
+def test_room_intervals_matches_linear_scan():
+    rng = random.Random(42)
+    room = RoomIntervals()
+    intervals = {}
+
+    for i in range(300):
+        start = rng.randrange(0, 1000)
+        end = start + rng.randrange(1, 50)
+        room.add(str(i), start, end)
+        intervals[str(i)] = (start, end)
+
+    for booking_id in rng.sample(sorted(intervals), 100):
+        room.remove(booking_id)
+        del intervals[booking_id]
+
+    for _ in range(500):
+        s = rng.randrange(0, 1100)
+        e = s + rng.randrange(1, 30)
+        expected = any(max(s, a) < min(e, b) for a, b in intervals.values())
+        assert room.overlaps(s, e) is expected
+
+
+def test_room_intervals_between_returns_only_touching_intervals():
+    room = RoomIntervals()
+    room.add("a", 0, 10 * HOUR)
+    room.add("b", 2 * HOUR, 3 * HOUR)
+    room.add("c", 12 * HOUR, 13 * HOUR)
+
+    assert room.between(4 * HOUR, 11 * HOUR) == [(0, 10 * HOUR)]
+    assert room.between(10 * HOUR, 12 * HOUR) == []
+    assert room.between(2 * HOUR, 13 * HOUR) == [(0, 10 * HOUR), (2 * HOUR, 3 * HOUR), (12 * HOUR, 13 * HOUR)]
+
+
+# ----------------------------
+# ClassroomIndex
+# ----------------------------
+
+def test_index_not_ready_returns_none():
+    index = ClassroomIndex()
+    index.add(ROOM, "a", 0, HOUR)
+
+    assert index.has_conflict(ROOM, 0, HOUR) is None
+
+    index.mark_ready()
+    assert index.has_conflict(ROOM, 0, HOUR) is True
+    assert index.has_conflict("other-room", 0, HOUR) is False
+
+
+def test_index_load_skips_bookings_canceled_during_warmup():
+    index = ClassroomIndex()
+    index.remove("a")   # llega la cancelación antes que la precarga
+
+    loaded = index.load([(ROOM, "a", 0, HOUR), (ROOM, "b", 2 * HOUR, 3 * HOUR)])
+    index.mark_ready()
+
+    assert loaded == 1
+    assert index.has_conflict(ROOM, 0, HOUR) is False
+    assert index.has_conflict(ROOM, 2 * HOUR, 3 * HOUR) is True
+
+
+def test_shard_of_is_stable_and_spreads_rooms():
+    rooms = [f"room-{i}" for i in range(400)]
+    shards = [shard_of(room, 4) for room in rooms]
+
+    assert shards == [shard_of(room, 4) for room in rooms]
+    assert all(sum(1 for s in shards if s == k) > 60 for k in range(4))
+
+
+def test_sharded_index_only_keeps_owned_rooms():
+    owned = next(f"room-{i}" for i in range(100) if shard_of(f"room-{i}", 2) == 0)
+    foreign = next(f"room-{i}" for i in range(100) if shard_of(f"room-{i}", 2) == 1)
+    index = ClassroomIndex(shard=(0, 2))
+
+    loaded = index.load([(owned, "a", 0, HOUR), (foreign, "b", 0, HOUR)])
+    index.mark_ready()
+
+    assert loaded == 1
+    assert index.owns(owned) and not index.owns(foreign)
+    assert index.has_conflict(owned, 0, HOUR) is True
+
+    # La reserva se mueve a un aula de otro shard: deja de estar aquí
+    assert index.add(foreign, "a", 0, HOUR) is False
+    assert index.has_conflict(owned, 0, HOUR) is False
+    assert len(index) == 0
+
+# ----------------------------
+# apply_event
+# ----------------------------
+
+@pytest.fixture
+def ready_index():
+    index = ClassroomIndex()
+    index.mark_ready()
+    return index
+
+
+def test_apply_event_created_then_canceled(ready_index):
+    event = {
+        "booking_id": "b-1",
+        "classroom_id": ROOM,
+        "status": "CONFIRMED",
+        "start_time": "2026-01-15T08:00:00+00:00",
+        "end_time": "2026-01-15T10:00:00+00:00",
+    }
+    start = to_epoch_ms("2026-01-15T09:00:00Z")
+    end = to_epoch_ms("2026-01-15T09:30:00Z")
+
+    assert apply_event(ready_index, "booking.created", event) is True
+    assert ready_index.has_conflict(ROOM, start, end) is True
+
+    assert apply_event(ready_index, "booking.canceled", dict(event, status="CANCELLED")) is True
+    assert ready_index.has_conflict(ROOM, start, end) is False
+
+
+def test_apply_event_ignores_invalid_payload(ready_index):
+    assert apply_event(ready_index, "booking.created", {"classroom_id": ROOM}) is False
+    assert len(ready_index) == 0
+
+
+def test_apply_series_events(ready_index):
+    occurrences = [
+        {"occurrence_id": f"s-1@2026-03-0{d}T08:00:00+00:00",
+         "start_time": f"2026-03-0{d}T08:00:00+00:00", "end_time": f"2026-03-0{d}T10:00:00+00:00"}
+        for d in (3, 5)
+    ]
+    event = {"series_id": "s-1", "classroom_id": ROOM, "status": "CONFIRMED", "occurrences": occurrences}
+    first = (to_epoch_ms("2026-03-03T09:00:00Z"), to_epoch_ms("2026-03-03T09:30:00Z"))
+    second = (to_epoch_ms("2026-03-05T09:00:00Z"), to_epoch_ms("2026-03-05T09:30:00Z"))
+
+    assert apply_event(ready_index, "booking.series.created", event) is True
+    assert ready_index.has_conflict(ROOM, *first) is True
+    assert ready_index.has_conflict(ROOM, *second) is True
+
+    # Una ocurrencia cancelada libera solo ese día
+    assert apply_event(ready_index, "booking.series.occurrence_canceled", dict(event, occurrences=occurrences[:1])) is True
+    assert ready_index.has_conflict(ROOM, *first) is False
+    assert ready_index.has_conflict(ROOM, *second) is True
+
+    assert apply_event(ready_index, "booking.series.canceled", dict(event, status="CANCELLED")) is True
+    assert len(ready_index) == 0
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, lines=(), payload=None):
+        self.status_code = status_code
+        self.lines = lines
+        self.payload = payload or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def json(self):
+        return self.payload
+
+
+class FakeHttpSession:
+    def __init__(self, lines, series=()):
+        self.lines = lines
+        # Series ordenadas por id, paginadas por cursor como /internal/series
+        self.series = sorted(series, key=lambda item: item["series_id"])
+        self.requests = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get(self, url, params=None, **kwargs):
+        self.requests.append((url, params))
+        if url.endswith("/internal/bookings/export"):
+            return FakeResponse(lines=self.lines)
+        after, limit = params.get("after"), params["limit"]
+        items = [item for item in self.series if after is None or item["series_id"] > after][:limit]
+        next_cursor = items[-1]["series_id"] if len(items) == limit else None
+        return FakeResponse(payload={"items": items, "next_cursor": next_cursor})
+
+
+def test_rehydrate_reads_the_ndjson_export_in_one_request(monkeypatch):
+    docs = [
+        {"booking_id": f"b-{i}", "classroom_id": ROOM, "status": "CONFIRMED",
+         "start_time": f"2026-01-15T{8 + i:02d}:00:00+00:00", "end_time": f"2026-01-15T{8 + i:02d}:30:00+00:00"}
+        for i in range(5)
+    ]
+    http = FakeHttpSession([json.dumps(d).encode() for d in docs] + [b""])
+    monkeypatch.setattr(events.requests, "Session", lambda: http)
+    monkeypatch.setattr(events, "REHYDRATE_PAGE_SIZE", 2)
+    index = ClassroomIndex()
+
+    assert events.rehydrate_index(index) == 5
+    assert index.has_conflict(ROOM, to_epoch_ms("2026-01-15T12:10:00Z"), to_epoch_ms("2026-01-15T12:20:00Z")) is True
+
+    # Un único GET para las reservas, sin paginación por offset
+    export_calls = [r for r in http.requests if r[0].endswith("/export")]
+    assert export_calls == [(export_calls[0][0], {"status": "CONFIRMED"})]
+
+
+def test_rehydrate_follows_the_series_cursor(monkeypatch):
+    series = [
+        {"series_id": f"s-{i}", "classroom_id": ROOM, "status": "CONFIRMED", "occurrences": [
+            {"occurrence_id": f"s-{i}@1", "start_time": f"2026-03-0{i + 2}T08:00:00+00:00",
+             "end_time": f"2026-03-0{i + 2}T09:00:00+00:00"},
+        ]}
+        for i in range(5)
+    ]
+    http = FakeHttpSession([], series)
+    monkeypatch.setattr(events.requests, "Session", lambda: http)
+    monkeypatch.setattr(events, "SERIES_PAGE_SIZE", 2)
+    index = ClassroomIndex()
+
+    assert events.rehydrate_index(index) == 5
+
+    series_calls = [params for url, params in http.requests if url.endswith("/internal/series")]
+    assert series_calls == [{"limit": 2}, {"limit": 2, "after": "s-1"}, {"limit": 2, "after": "s-3"}]
+
+
+# ----------------------------
+# Reconexión del consumidor
+# ----------------------------
+
+class StopConsumer(BaseException):
+    """Corta el bucle de run() al final del guion (no es un Exception)."""
+
+
+class FakeMethod:
+    def __init__(self, routing_key="", queue="amq.gen-1"):
+        self.routing_key = routing_key
+        self.queue = queue
+
+
+class FakeChannel:
+    def __init__(self, session):
+        self.session = session
+        self.callback = None
+
+    def exchange_declare(self, **kwargs):
+        pass
+
+    def queue_declare(self, queue, exclusive):
+        return type("Declared", (), {"method": FakeMethod()})()
+
+    def queue_bind(self, **kwargs):
+        pass
+
+    def basic_consume(self, queue, on_message_callback, auto_ack):
+        self.callback = on_message_callback
+
+    def start_consuming(self):
+        self.session(self.callback)
+
+
+class FakeBroker:
+    """Cada conexión corre la siguiente sesión del guion dentro de start_consuming()."""
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        self.connects = 0
+
+    def connect(self, params):
+        self.connects += 1
+        if not self.sessions:
+            raise StopConsumer()
+        session = self.sessions.pop(0)
+        return type("Conn", (), {"channel": lambda conn: FakeChannel(session)})()
+
+
+def booking_doc(booking_id, hour):
+    return {"booking_id": booking_id, "classroom_id": ROOM, "status": "CONFIRMED",
+            "start_time": f"2026-01-15T{hour:02d}:00:00+00:00", "end_time": f"2026-01-15T{hour:02d}:30:00+00:00"}
+
+
+def busy_at(index, hour):
+    return index.has_conflict(ROOM, to_epoch_ms(f"2026-01-15T{hour:02d}:10:00Z"), to_epoch_ms(f"2026-01-15T{hour:02d}:20:00Z"))
+
+
+def test_reconnect_invalidates_and_rebuilds_the_index(monkeypatch):
+    index = ClassroomIndex()
+    database = {"a": booking_doc("a", 8), "b": booking_doc("b", 9)}
+    ready_before_rehydrate = []
+
+    def first_session(deliver):
+        database["c"] = booking_doc("c", 10)
+        deliver(None, FakeMethod("booking.created"), None, json.dumps(database["c"]))
+        # Sin cola: la cancelación de "a" y la creación de "d" no llegan nunca
+        del database["a"]
+        database["d"] = booking_doc("d", 11)
+        raise ConnectionError("connection reset")
+
+    def second_session(deliver):
+        pass
+
+    monkeypatch.setattr(events.pika, "BlockingConnection", FakeBroker([first_session, second_session]).connect)
+    monkeypatch.setattr(events.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(events.requests, "Session",
+                        lambda: FakeHttpSession([json.dumps(d).encode() for d in database.values()]))
+
+    def rehydrate():
+        ready_before_rehydrate.append(index.ready)
+        events.rehydrate_until_ready(index, index.generation)
+
+    with pytest.raises(StopConsumer):
+        events.BookingEventConsumer(index, on_subscribed=rehydrate).run()
+
+    # Una precarga por suscripción; tras la caída el índice ya no estaba listo
+    assert ready_before_rehydrate == [False, False]
+    assert index.ready is True
+    assert [busy_at(index, h) for h in (8, 9, 10, 11)] == [False, True, True, True]
+
+
+def test_reset_discards_a_rehydrate_that_was_already_running():
+    index = ClassroomIndex()
+    generation = index.generation
+    index.load([(ROOM, "a", 0, HOUR)], generation)
+
+    index.reset()
+
+    assert index.load([(ROOM, "b", HOUR, 2 * HOUR)], generation) == 0
+    assert index.mark_ready(generation) is False
+    assert index.ready is False and len(index) == 0
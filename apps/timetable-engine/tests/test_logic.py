@@ -1,7 +1,11 @@
+import random
 import pytest
-from datetime import timezone
+from datetime import datetime, timedelta, timezone
 
-from logic import parse_iso_to_utc, check_overlap
+from logic import (
+    parse_iso_to_utc, check_overlap, check_overlap_batch, merge_intervals, IntervalSet, to_epoch_ms,
+    find_free_slots, opening_intervals, MINUTE_MS,
+)
 
 # ----------------------------
 # parse_iso_to_utc
@@ -80,3 +84,163 @@ def test_check_overlap_with_timezones_equivalent_instants():
     existing = [("2025-01-01T05:30:00-04:30", "2025-01-01T06:30:00-04:30")]
 
     assert check_overlap(candidate_start, candidate_end, existing) is True
+
+
+# ----------------------------
+# merge_intervals / IntervalSet
+# ----------------------------
+
+def test_merge_intervals_fuses_overlapping_and_adjacent():
+    starts, ends = merge_intervals([(5, 7), (0, 2), (2, 3), (1, 2), (10, 10), (6, 9)])
+
+    # (10, 10) es vacío y se descarta
+    assert starts == [0, 5]
+    assert ends == [3, 9]
+
+
+def test_interval_set_boundaries():
+    intervals = IntervalSet([(10, 20), (30, 40)])
+
+    assert intervals.overlaps(20, 30) is False
+    assert intervals.overlaps(19, 21) is True
+    assert intervals.overlaps(0, 10) is False
+    assert intervals.overlaps(40, 50) is False
+    assert intervals.overlaps(35, 35) is False
+
+
+def test_interval_set_from_iso_matches_examples():
+    existing = [("2025-01-01T05:30:00-04:30", "2025-01-01T06:30:00-04:30")]
+    intervals = IntervalSet.from_iso(existing)
+
+    assert intervals.overlaps(to_epoch_ms("2025-01-01T10:00:00Z"), to_epoch_ms("2025-01-01T11:00:00Z")) is True
+    assert intervals.overlaps(to_epoch_ms("2025-01-01T11:00:00Z"), to_epoch_ms("2025-01-01T12:00:00Z")) is False
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_interval_set_equivalent_to_check_overlap(seed):
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def iso(minutes):
+        return (base + timedelta(minutes=minutes)).isoformat()
+
+    existing = []
+    for _ in range(rng.randrange(0, 60)):
+        start = rng.randrange(0, 24 * 60)
+        existing.append((iso(start), iso(start + rng.randrange(0, 180))))
+
+    intervals = IntervalSet.from_iso(existing)
+
+    for _ in range(200):
+        start = rng.randrange(-60, 25 * 60)
+        end = start + rng.randrange(-30, 240)
+        expected = check_overlap(iso(start), iso(end), existing)
+        assert intervals.overlaps(to_epoch_ms(iso(start)), to_epoch_ms(iso(end))) is expected
+
+
+# ----------------------------
+# check_overlap_batch
+# ----------------------------
+
+def test_check_overlap_batch_flags_existing_and_candidate_conflicts():
+    existing = IntervalSet([(10, 20), (40, 50)])
+    candidates = [
+        (0, 10),    # 0: libre
+        (15, 25),   # 1: choca con existente, y con 2
+        (22, 30),   # 2: libre frente a existentes
+        (45, 46),   # 3: choca con existente
+        (60, 60),   # 4: vacío, nunca choca
+    ]
+
+    conflicts, pairs = check_overlap_batch(candidates, existing)
+
+    assert conflicts == [False, True, False, True, False]
+    assert pairs == [(1, 2)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_check_overlap_batch_matches_pairwise_scan(seed):
+    rng = random.Random(seed)
+
+    existing_raw = []
+    for _ in range(50):
+        start = rng.randrange(0, 1000)
+        existing_raw.append((start, start + rng.randrange(1, 40)))
+
+    candidates = []
+    for _ in range(80):
+        start = rng.randrange(0, 1000)
+        candidates.append((start, start + rng.randrange(0, 40)))
+
+    conflicts, pairs = check_overlap_batch(candidates, IntervalSet(existing_raw))
+
+    def overlap(a, b):
+        return max(a[0], b[0]) < min(a[1], b[1])
+
+    assert conflicts == [any(overlap(c, e) for e in existing_raw) for c in candidates]
+    assert pairs == [
+        (i, j)
+        for i in range(len(candidates))
+        for j in range(i + 1, len(candidates))
+        if overlap(candidates[i], candidates[j])
+    ]
+
+
+# ----------------------------
+# find_free_slots
+# ----------------------------
+
+HOUR = 60 * MINUTE_MS
+
+
+def test_find_free_slots_returns_gaps_between_busy_ranges():
+    busy = IntervalSet([(2 * HOUR, 3 * HOUR), (5 * HOUR, 6 * HOUR), (5 * HOUR, 7 * HOUR)])
+
+    slots = find_free_slots(busy, 0, 8 * HOUR, duration_ms=HOUR)
+
+    assert slots == [(0, 2 * HOUR), (3 * HOUR, 5 * HOUR), (7 * HOUR, 8 * HOUR)]
+
+
+def test_find_free_slots_skips_gaps_shorter_than_duration():
+    busy = IntervalSet([(1 * HOUR, 2 * HOUR), (2 * HOUR + 30 * MINUTE_MS, 4 * HOUR)])
+
+    slots = find_free_slots(busy, HOUR, 5 * HOUR, duration_ms=HOUR)
+
+    assert slots == [(4 * HOUR, 5 * HOUR)]
+
+
+def test_find_free_slots_with_granularity_and_limit():
+    busy = IntervalSet([(2 * HOUR, 3 * HOUR)])
+
+    slots = find_free_slots(busy, 10 * MINUTE_MS, 8 * HOUR, duration_ms=HOUR, granularity_ms=30 * MINUTE_MS, max_results=3)
+
+    # alineadas a :00 / :30, nunca pisan 02:00-03:00
+    assert slots == [
+        (30 * MINUTE_MS, 90 * MINUTE_MS),
+        (HOUR, 2 * HOUR),
+        (3 * HOUR, 4 * HOUR),
+    ]
+
+
+def test_opening_intervals_respect_weekday_and_offset():
+    # 2026-01-12 es lunes; horario local UTC-5, abierto lunes 08:00-12:00
+    window_start = to_epoch_ms("2026-01-10T00:00:00Z")
+    window_end = to_epoch_ms("2026-01-17T00:00:00Z")
+
+    intervals = opening_intervals(window_start, window_end, [(0, 8 * 60, 12 * 60)], utc_offset_ms=-5 * HOUR)
+
+    assert intervals == [(to_epoch_ms("2026-01-12T13:00:00Z"), to_epoch_ms("2026-01-12T17:00:00Z"))]
+
+
+def test_find_free_slots_only_inside_opening_hours():
+    window_start = to_epoch_ms("2026-01-12T00:00:00Z")
+    window_end = to_epoch_ms("2026-01-13T00:00:00Z")
+    busy = IntervalSet([(to_epoch_ms("2026-01-12T09:00:00Z"), to_epoch_ms("2026-01-12T10:00:00Z"))])
+
+    slots = find_free_slots(busy, window_start, window_end, duration_ms=HOUR, opening_hours=[(0, 8 * 60, 12 * 60)])
+
+    assert slots == [
+        (to_epoch_ms("2026-01-12T08:00:00Z"), to_epoch_ms("2026-01-12T09:00:00Z")),
+        (to_epoch_ms("2026-01-12T10:00:00Z"), to_epoch_ms("2026-01-12T12:00:00Z")),
+    ]
+
@@ -0,0 +1,228 @@
+import asyncio
+import contextlib
+import socket
+from concurrent import futures
+
+import grpc
+import pytest
+
+import server
+import timetable_pb2 as pb2
+import timetable_pb2_grpc
+from catalog import ClassroomCatalog
+from index import ClassroomIndex
+from logic import to_epoch_ms
+
+HOUR = 3_600_000
+# Lunes 2 de marzo de 2026, 08:00 UTC
+BASE = to_epoch_ms("2026-03-02T08:00:00Z")
+
+
+def epoch(start, end):
+    return pb2.TimeRange(start_ms=start, end_ms=end)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def serving(service):
+    address = f"127.0.0.1:{free_port()}"
+    grpc_server = server.create_server(service, address)
+    await grpc_server.start()
+    channel = grpc.aio.insecure_channel(address)
+    try:
+        yield timetable_pb2_grpc.TimetableCheckerStub(channel)
+    finally:
+        await channel.close()
+        await grpc_server.stop(None)
+
+
+def call(method, request, index=None, catalog=None):
+    """Una RPC real contra un servidor grpc.aio en proceso; devuelve la respuesta o el AioRpcError."""
+    service = server.TimetableService(
+        index or ClassroomIndex(), catalog or ClassroomCatalog(), futures.ThreadPoolExecutor(max_workers=1)
+    )
+
+    async def _call():
+        async with serving(service) as stub:
+            try:
+                return await getattr(stub, method)(request, timeout=10)
+            except grpc.aio.AioRpcError as e:
+                return e
+    return asyncio.run(_call())
+
+
+def ready_index(*bookings):
+    index = ClassroomIndex()
+    index.load(bookings)
+    index.mark_ready()
+    return index
+
+
+def status_of(reply):
+    assert isinstance(reply, grpc.aio.AioRpcError), reply
+    return reply.code()
+
+
+# ----------------------------
+# Codificación de TimeRange
+# ----------------------------
+
+def test_range_to_epoch_prefers_epoch_and_falls_back_to_iso():
+    iso = pb2.TimeRange(start="2026-03-02T08:00:00Z", end="2026-03-02T09:00:00-00:00")
+
+    assert server.range_to_epoch(iso) == (BASE, BASE + HOUR)
+    # Con ambas codificaciones manda epoch: el string ni se mira
+    both = pb2.TimeRange(start="no es una fecha", end="tampoco", start_ms=BASE, end_ms=BASE + 1)
+    assert server.range_to_epoch(both) == (BASE, BASE + 1)
+
+
+def test_range_to_epoch_rejects_malformed_iso():
+    with pytest.raises(server.InvalidTimeRange):
+        server.range_to_epoch(pb2.TimeRange(start="2026-13-45", end="2026-03-02T09:00:00Z"))
+
+
+def test_epoch_to_range_carries_both_encodings():
+    time_range = server.epoch_to_range(BASE, BASE + HOUR)
+
+    assert (time_range.start_ms, time_range.end_ms) == (BASE, BASE + HOUR)
+    assert server.range_to_epoch(pb2.TimeRange(start=time_range.start, end=time_range.end)) == (BASE, BASE + HOUR)
+
+
+# ----------------------------
+# RPCs
+# ----------------------------
+
+def test_get_capabilities_announces_epoch_ranges():
+    assert call("GetCapabilities", pb2.CapabilitiesRequest()).epoch_ranges is True
+
+
+def test_check_availability_accepts_iso_and_epoch_in_the_same_request():
+    request = pb2.CheckRequest(
+        candidate=pb2.TimeRange(start="2026-03-02T08:30:00Z", end="2026-03-02T09:30:00Z"),
+        existing_bookings=[epoch(BASE, BASE + HOUR)],
+    )
+    assert call("CheckAvailability", request).has_conflict is True
+
+    request.existing_bookings[0].CopyFrom(epoch(BASE + 2 * HOUR, BASE + 3 * HOUR))
+    assert call("CheckAvailability", request).has_conflict is False
+
+
+def test_malformed_iso_is_invalid_argument():
+    request = pb2.CheckRequest(candidate=pb2.TimeRange(start="ayer", end="hoy"))
+
+    reply = call("CheckAvailability", request)
+
+    assert status_of(reply) == grpc.StatusCode.INVALID_ARGUMENT
+    assert "ayer" in reply.details()
+
+
+def test_check_classroom_availability_uses_the_index():
+    index = ready_index(("A-101", "b1", BASE, BASE + HOUR))
+
+    busy = call("CheckClassroomAvailability", pb2.ClassroomCheckRequest(
+        classroom_id="A-101", candidate=epoch(BASE + HOUR // 2, BASE + 2 * HOUR)), index)
+    free = call("CheckClassroomAvailability", pb2.ClassroomCheckRequest(
+        classroom_id="A-101", candidate=epoch(BASE + HOUR, BASE + 2 * HOUR)), index)
+
+    assert busy.has_conflict is True
+    assert free.has_conflict is False
+
+
+def test_check_classroom_availability_before_the_index_is_ready():
+    reply = call("CheckClassroomAvailability", pb2.ClassroomCheckRequest(
+        classroom_id="A-101", candidate=epoch(BASE, BASE + HOUR)))
+
+    assert status_of(reply) == grpc.StatusCode.FAILED_PRECONDITION
+
+
+def test_check_availability_batch_reports_existing_and_candidate_conflicts():
+    request = pb2.BatchCheckRequest(
+        candidates=[
+            epoch(BASE, BASE + HOUR),
+            epoch(BASE + 2 * HOUR, BASE + 3 * HOUR),
+            epoch(BASE + 2 * HOUR + HOUR // 2, BASE + 4 * HOUR),
+        ],
+        existing_bookings=[epoch(BASE + HOUR // 2, BASE + HOUR)],
+    )
+
+    reply = call("CheckAvailabilityBatch", request)
+
+    assert list(reply.conflicts) == [True, False, False]
+    assert [(c.first, c.second) for c in reply.candidate_conflicts] == [(1, 2)]
+
+
+def test_find_free_slots_from_the_index_and_from_busy():
+    window = epoch(BASE, BASE + 4 * HOUR)
+    expected = [(BASE, BASE + HOUR), (BASE + 2 * HOUR, BASE + 4 * HOUR)]
+    index = ready_index(("A-101", "b1", BASE + HOUR, BASE + 2 * HOUR))
+
+    from_index = call("FindFreeSlots", pb2.FreeSlotsRequest(
+        classroom_id="A-101", window=window, duration_minutes=60), index)
+    from_busy = call("FindFreeSlots", pb2.FreeSlotsRequest(
+        busy=[epoch(BASE + HOUR, BASE + 2 * HOUR)], window=window, duration_minutes=60))
+
+    assert [(s.start_ms, s.end_ms) for s in from_index.slots] == expected
+    assert [(s.start_ms, s.end_ms) for s in from_busy.slots] == expected
+    assert from_index.slots[0].start == "2026-03-02T08:00:00+00:00"
+
+
+def test_find_free_slots_rejects_an_empty_window():
+    reply = call("FindFreeSlots", pb2.FreeSlotsRequest(window=epoch(BASE, BASE), duration_minutes=60))
+
+    assert status_of(reply) == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_search_available_classrooms_skips_occupied_and_small_rooms():
+    catalog = ClassroomCatalog()
+    catalog.replace([
+        {"id": "small", "code": "A-101", "capacity": 10},
+        {"id": "busy", "code": "A-102", "capacity": 40},
+        {"id": "free", "code": "A-103", "capacity": 60},
+    ])
+    index = ready_index(("busy", "b1", BASE, BASE + HOUR))
+
+    reply = call("SearchAvailableClassrooms", pb2.ClassroomSearchRequest(
+        window=epoch(BASE, BASE + HOUR), min_capacity=30), index, catalog)
+
+    assert [(room.classroom_id, room.capacity) for room in reply.classrooms] == [("free", 60)]
+
+
+def test_search_available_classrooms_before_the_catalog_is_loaded():
+    reply = call("SearchAvailableClassrooms", pb2.ClassroomSearchRequest(
+        window=epoch(BASE, BASE + HOUR)), ready_index())
+
+    assert status_of(reply) == grpc.StatusCode.FAILED_PRECONDITION
+
+
+def test_generate_timetable_places_sessions_without_room_clashes():
+    request = pb2.TimetableRequest(
+        sessions=[
+            pb2.CourseSession(session_id="calc", subject="Cálculo", duration_minutes=120, weekly_frequency=2,
+                              required_capacity=30),
+            pb2.CourseSession(session_id="fis", subject="Física", duration_minutes=90, weekly_frequency=1,
+                              required_capacity=30),
+        ],
+        classrooms=[pb2.RoomSpec(classroom_id="A-101", capacity=40)],
+        time_budget_ms=50,
+    )
+
+    reply = call("GenerateTimetable", request)
+
+    assert not reply.unplaced
+    assert sorted(p.session_id for p in reply.placements) == ["calc", "calc", "fis"]
+    slots = sorted((p.weekday, p.start_minute, p.end_minute) for p in reply.placements)
+    assert all(a[0] != b[0] or a[2] <= b[1] for a, b in zip(slots, slots[1:]))
+
+
+def test_generate_timetable_rejects_sessions_without_duration():
+    reply = call("GenerateTimetable", pb2.TimetableRequest(
+        sessions=[pb2.CourseSession(session_id="calc", duration_minutes=0)],
+        classrooms=[pb2.RoomSpec(classroom_id="A-101", capacity=40)],
+    ))
+
+    assert status_of(reply) == grpc.StatusCode.INVALID_ARGUMENT
@@ -0,0 +1,76 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+from solver import CourseSession, Room, WeekGrid, solve_timetable
+
+
+def assert_conflict_free(solution, sessions):
+    by_room_day = defaultdict(list)
+    for p in solution.placements:
+        by_room_day[(p.classroom_id, p.weekday)].append((p.start_minute, p.end_minute))
+    for intervals in by_room_day.values():
+        intervals.sort()
+        assert all(a[1] <= b[0] for a, b in zip(intervals, intervals[1:]))
+
+    # Cada sesión ubicada tiene todas sus ocurrencias, en días distintos
+    by_session = defaultdict(list)
+    for p in solution.placements:
+        by_session[p.session_id].append(p.weekday)
+    for s in sessions:
+        if s.session_id in by_session:
+            days = by_session[s.session_id]
+            assert len(days) == s.weekly_frequency == len(set(days))
+
+
+def test_solver_places_sessions_in_best_fitting_rooms():
+    rooms = [Room("big", 100), Room("small", 30)]
+    sessions = [
+        CourseSession("calc", "Cálculo", 120, 2, 25),
+        CourseSession("phys", "Física", 90, 3, 80),
+    ]
+
+    solution = solve_timetable(sessions, rooms, time_budget_ms=0)
+
+    assert solution.unplaced == []
+    assert {p.classroom_id for p in solution.placements if p.session_id == "calc"} == {"small"}
+    assert {p.classroom_id for p in solution.placements if p.session_id == "phys"} == {"big"}
+    assert_conflict_free(solution, sessions)
+
+
+def test_solver_reports_sessions_it_cannot_place():
+    rooms = [Room("a", 30)]
+    grid = WeekGrid(weekdays=(0, 1), day_start_minute=8 * 60, day_end_minute=10 * 60)
+    sessions = [
+        CourseSession("too-big", "Auditorio", 60, 1, 200),
+        CourseSession("too-often", "Inglés", 60, 3, 10),
+        CourseSession("fits-1", "Química", 120, 2, 10),
+        CourseSession("fits-2", "Historia", 60, 1, 10),
+    ]
+
+    solution = solve_timetable(sessions, rooms, grid, time_budget_ms=50)
+
+    unplaced = dict(solution.unplaced)
+    assert set(unplaced) == {"too-big", "too-often", "fits-2"}
+    assert_conflict_free(solution, sessions)
+
+
+def test_solver_random_restarts_keep_solutions_valid():
+    rng = random.Random(7)
+    rooms = [Room(f"r{i}", capacity) for i, capacity in enumerate([30, 30, 30, 60, 60, 120])]
+    sessions = [
+        CourseSession(f"s{i}", f"Materia {i}", rng.choice([60, 90, 120]), rng.choice([1, 2, 3]), rng.choice([20, 40, 100]))
+        for i in range(150)
+    ]
+
+    solution = solve_timetable(sessions, rooms, time_budget_ms=200, seed=1)
+
+    assert solution.iterations >= 1
+    assert len(solution.placements) > 0
+    assert_conflict_free(solution, sessions)
+
+
+def test_solver_rejects_invalid_grid():
+    with pytest.raises(ValueError):
+        solve_timetable([], [], WeekGrid(granularity_minutes=0))